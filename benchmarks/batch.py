@@ -0,0 +1,75 @@
+"""
+Benchmark of the batch engine.
+
+Replays the same set of random games on the Cell-based GameField and the BitboardGameField one game after another,
+ and on the BatchGameField all games in lockstep checking the lines through the last moves. Reports the number of
+ the boards checked per second, every registered move is followed by the check of its board.
+
+Usage:
+    python -m benchmarks.batch --games 20000
+    python -m benchmarks.batch --games 2000 --size 15 --win-length 5
+"""
+
+import time
+
+import click
+import numpy as np
+
+from benchmarks.game_field import ENGINES, make_game_metadata, make_games, play
+from src.components.game.batch import FIRST, ONGOING, SECOND, BatchGameField
+from src.components.game.model import FIELD_SIZE, WIN_LENGTH
+
+
+def play_batch(moves: np.ndarray, size: int, win_length: int) -> int:
+    """
+    Plays all games on one batch: on every ply the next move of each unfinished game is registered and the boards of
+     all of them are checked together.
+
+    Args:
+        moves (np.ndarray): Coordinates of the moves of every game of the shape (games, size * size, 2).
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        int: Number of registered moves.
+    """
+    game_field = BatchGameField(len(moves), size, win_length)
+    active = np.arange(len(moves))
+    result = 0
+    for ply in range(size * size):
+        if active.size == 0:
+            break
+        game_field.set_cells(active, moves[active, ply, 0], moves[active, ply, 1], FIRST if ply % 2 == 0 else SECOND)
+        result += active.size
+        last_cells = moves[active, ply, 0] * size + moves[active, ply, 1]
+        active = active[game_field.get_outcomes(active, last_cells) == ONGOING]
+    return result
+
+
+@click.command()
+@click.option("--games", default=20000, show_default=True, help="Number of random games to replay.")
+@click.option("--size", default=FIELD_SIZE, show_default=True, help="Length of the side of the game field.")
+@click.option("--win-length", default=WIN_LENGTH, show_default=True, help="Number of marks in a row to win.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generator.")
+def main(games: int, size: int, win_length: int, seed: int) -> None:
+    game_metadata = make_game_metadata()
+    game_list = make_games(games, size, seed)
+    game_moves = np.array(game_list, dtype=np.intp)
+    results = {}
+    for engine in (*ENGINES, BatchGameField):
+        started_at = time.perf_counter()
+        if engine is BatchGameField:
+            boards = play_batch(game_moves, size, win_length)
+        else:
+            boards = play(engine, game_metadata, game_list, size, win_length)
+        elapsed = time.perf_counter() - started_at
+        results[engine.__name__] = boards / elapsed
+        click.echo(f"{engine.__name__:<20} {boards:>10} boards {elapsed:>8.3f} s {boards / elapsed:>14,.0f} boards/s")
+    for engine in ENGINES:
+        click.echo(
+            f"Speedup over {engine.__name__}: {results[BatchGameField.__name__] / results[engine.__name__]:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
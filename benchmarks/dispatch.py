@@ -0,0 +1,118 @@
+"""
+Benchmark of the dispatch of the menu handlers.
+
+Generates the controllers with the screens of the menu and the routes to every screen, then reports the time of
+ getting the method of a handler by the scan of the controllers comparing the names of their classes and by the
+ dispatch table of the BaseHandler, and the time of building and checking the dispatch table at the start.
+
+Usage:
+    python -m benchmarks.dispatch --controllers 50 --screens 10
+"""
+import random
+import time
+from typing import Any, Callable, List, Optional
+
+import click
+
+from src.components.model import BaseController
+from src.handler.base import BaseHandler
+from src.handler.model import Handler, HandlerResponse
+
+
+def make_controllers(controllers: int, screens: int) -> List[BaseController]:
+    """
+    Generates the controllers with the screen methods.
+
+    Args:
+        controllers (int): Number of the controllers.
+        screens (int): Number of the screen methods of every controller.
+
+    Returns:
+        List[BaseController]: Controller objects.
+    """
+
+    def screen(  # pylint: disable=unused-argument
+        self: BaseController, handler: Handler, **kwargs: Any
+    ) -> HandlerResponse:
+        return HandlerResponse()
+
+    return [
+        type(f"Controller{i}", (BaseController,), {f"screen{j}": screen for j in range(screens)})()
+        for i in range(controllers)
+    ]
+
+
+def make_routes(controllers_registry: List[BaseController], screens: int) -> Handler:
+    """
+    Builds the menu with a submenu of every controller leading to its screens.
+
+    Args:
+        controllers_registry (List[BaseController]): Controller objects.
+        screens (int): Number of the screen methods of every controller.
+
+    Returns:
+        Handler: Root handler of the menu.
+    """
+    result = Handler(name="Main menu", component=controllers_registry[0].__class__, method="screen0")
+    for controller in controllers_registry:
+        submenu = Handler(name=controller.__class__.__name__, component=controller.__class__, method="screen0")
+        result.add_children(submenu)
+        for j in range(screens):
+            submenu.add_children(Handler(name=f"Screen {j}", component=controller.__class__, method=f"screen{j}"))
+    return result
+
+
+def scan_executor(controllers_registry: List[BaseController], handler: Handler) -> Callable:
+    """
+    Gets the method of the handler by the scan of the controllers, the way BaseHandler did before the dispatch table.
+
+    Args:
+        controllers_registry (List[BaseController]): Controller objects.
+        handler (Handler): Handler whose method is called.
+
+    Returns:
+        Callable: Bound method of the controller.
+    """
+    controller = next(
+        (i for i in controllers_registry if i.__class__.__name__ == handler.component.__name__),
+        None,
+    )
+    if controller is None:
+        raise AttributeError(f"Component {handler.component} does not exist")
+    executor: Optional[Callable] = getattr(controller, handler.method)
+    if executor is None:
+        raise AttributeError(f"Method {handler.method}  in Component {handler.component} does not exist")
+    return executor
+
+
+@click.command()
+@click.option("--controllers", default=50, show_default=True, help="Number of the controllers.")
+@click.option("--screens", default=10, show_default=True, help="Number of the screens of every controller.")
+@click.option("--lookups", default=100000, show_default=True, help="Number of the dispatched handlers.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generator.")
+def main(controllers: int, screens: int, lookups: int, seed: int) -> None:
+    controllers_registry = make_controllers(controllers, screens)
+    routes = make_routes(controllers_registry, screens)
+    started_at = time.perf_counter()
+    base_handler = BaseHandler(controllers_registry, routes)
+    click.echo(
+        f"Routes: {controllers * (screens + 1) + 1}, dispatch table of {len(base_handler.executors)} methods built and "
+        f"checked in {(time.perf_counter() - started_at) * 1000:.2f} ms"
+    )
+    generator = random.Random(seed)
+    handlers = [i for submenu in routes.children for i in submenu.children]
+    handlers = [generator.choice(handlers) for _ in range(lookups)]
+    get_executor = base_handler._BaseHandler__get_executor  # type: ignore [attr-defined] # pylint: disable=protected-access
+    for name, dispatch in (
+        ("Scan of the controllers", lambda handler: scan_executor(controllers_registry, handler)),
+        ("Dispatch table", get_executor),
+    ):
+        started_at = time.perf_counter()
+        for handler in handlers:
+            dispatch(handler)
+        elapsed = time.perf_counter() - started_at
+        click.echo(f"{name:<24} {elapsed / lookups * 1e9:>10,.0f} ns per handler")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
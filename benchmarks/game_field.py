@@ -0,0 +1,114 @@
+"""
+Benchmark of the game field engines.
+
+Replays the same set of random games on the Cell-based GameField and on the BitboardGameField and reports
+ the number of moves per second registered by each engine.
+
+Usage:
+    python -m benchmarks.game_field --games 20000
+    python -m benchmarks.game_field --games 1000 --size 15 --win-length 5
+"""
+
+import random
+import time
+from types import SimpleNamespace
+from typing import Callable, List, Tuple
+
+import click
+
+from src.components.game.model import (
+    FIELD_SIZE,
+    WIN_LENGTH,
+    BitboardGameField,
+    GameField,
+)
+
+SYMBOLS = ("x", "o")
+# Game field engines replaying the games one after another
+ENGINES = (GameField, BitboardGameField)
+
+
+def make_game_metadata() -> List[SimpleNamespace]:
+    """
+    Builds lightweight game metadata with the attributes read by the game field engines.
+
+    Returns:
+        List[SimpleNamespace]: Game metadata of two players.
+    """
+    return [
+        SimpleNamespace(User=SimpleNamespace(id=i, nickname=f"Player{i}"), GameResult=SimpleNamespace(symbol=symbol))
+        for i, symbol in enumerate(SYMBOLS)
+    ]
+
+
+def make_games(games: int, size: int, seed: int) -> List[List[Tuple[int, int]]]:
+    """
+    Generates random move sequences covering the whole game field.
+
+    Args:
+        games (int): Number of games.
+        size (int): Length of the side of the game field.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[List[Tuple[int, int]]]: Coordinates of the moves of every game.
+    """
+    generator = random.Random(seed)
+    cells = [(x, y) for x in range(size) for y in range(size)]
+    result = []
+    for _ in range(games):
+        generator.shuffle(cells)
+        result.append(cells[:])
+    return result
+
+
+def play(
+    engine: Callable,
+    game_metadata: List[SimpleNamespace],
+    games: List[List[Tuple[int, int]]],
+    size: int,
+    win_length: int,
+) -> int:
+    """
+    Plays every game on a fresh game field until it ends.
+
+    Args:
+        engine (Callable): Class of the game field engine.
+        game_metadata (List[SimpleNamespace]): Game metadata of the players.
+        games (List[List[Tuple[int, int]]]): Coordinates of the moves of every game.
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        int: Number of registered moves.
+    """
+    moves = 0
+    for game in games:
+        game_field = engine(game_metadata, size=size, win_length=win_length)
+        for ply, (x_coordinate, y_coordinate) in enumerate(game):
+            moves += 1
+            if game_field.set_cell_value(x_coordinate, y_coordinate, SYMBOLS[ply % 2]).is_end:
+                break
+    return moves
+
+
+@click.command()
+@click.option("--games", default=20000, show_default=True, help="Number of random games to replay.")
+@click.option("--size", default=FIELD_SIZE, show_default=True, help="Length of the side of the game field.")
+@click.option("--win-length", default=WIN_LENGTH, show_default=True, help="Number of marks in a row to win.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generator.")
+def main(games: int, size: int, win_length: int, seed: int) -> None:
+    game_metadata = make_game_metadata()
+    game_list = make_games(games, size, seed)
+    results = {}
+    for engine in ENGINES:
+        started_at = time.perf_counter()
+        moves = play(engine, game_metadata, game_list, size, win_length)
+        elapsed = time.perf_counter() - started_at
+        results[engine.__name__] = moves / elapsed
+        click.echo(f"{engine.__name__:<20} {moves:>10} moves {elapsed:>8.3f} s {moves / elapsed:>14,.0f} moves/s")
+    click.echo(f"Speedup: {results['BitboardGameField'] / results['GameField']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
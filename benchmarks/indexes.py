@@ -0,0 +1,269 @@
+"""
+Benchmark of the database indexes.
+
+Seeds a fresh SQLite database with the game results, then runs the queries of the past games statistics, the points
+ chart, the game metadata and the standings aggregation without the indexes and with them, and reports the query
+ plans and the timings of every query.
+
+Usage:
+    python -m benchmarks.indexes --results 1000000
+"""
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, scoped_session
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.base import Base
+from src.database.model.game import Game, GameResult, LeagueSeason
+from src.database.model.user import User
+from src.database.repository import SqlAlchemyRepository
+from src.database.standing import select_league_standings
+
+CHUNK_SIZE = 50000
+# Number of the SQLite virtual machine instructions between the checks of the query deadline
+PROGRESS_STEPS = 100000
+
+
+def seed(db_engine: Engine, results: int, users: int, leagues: int, generator: random.Random) -> None:
+    """
+    Seeds the database with the games of two players, every tenth game is a draw.
+
+    Args:
+        db_engine (Engine): Engine of the database.
+        results (int): Number of the game results, two per game.
+        users (int): Number of the users.
+        leagues (int): Number of the league seasons.
+        generator (random.Random): Random generator.
+    """
+    with db_engine.begin() as connection:
+        connection.execute(
+            LeagueSeason.__table__.insert(),  # type: ignore [attr-defined] # pylint: disable=no-member
+            [{"id": i + 1, "name": f"League{i + 1}"} for i in range(leagues)],
+        )
+        connection.execute(
+            User.__table__.insert(),  # type: ignore [attr-defined] # pylint: disable=no-member
+            [{"id": i + 1, "nickname": f"Player{i + 1}"} for i in range(users)],
+        )
+        games = results // 2
+        for start in range(0, games, CHUNK_SIZE):
+            game_rows: List[Dict[str, int]] = []
+            result_rows: List[Dict[str, object]] = []
+            for game_id in range(start + 1, min(start + CHUNK_SIZE, games) + 1):
+                game_rows.append({"id": game_id, "league_season_id": generator.randint(1, leagues)})
+                players = generator.sample(range(1, users + 1), 2)
+                winner = None if generator.random() < 0.1 else generator.choice(players)
+                result_rows.extend(
+                    {"game_id": game_id, "user_id": user_id, "is_winner": user_id == winner, "symbol": symbol}
+                    for user_id, symbol in zip(players, "xo")
+                )
+            connection.execute(Game.__table__.insert(), game_rows)  # type: ignore [attr-defined] # pylint: disable=no-member
+            connection.execute(
+                GameResult.__table__.insert(), result_rows  # type: ignore [attr-defined] # pylint: disable=no-member
+            )
+
+
+def make_queries(db_session: scoped_session, league_id: int, user_id: int, game_id: int) -> Dict[str, Query]:
+    """
+    Builds the queries of the application for the benchmark.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_id (int): LeagueSeason object identifier.
+        user_id (int): User object identifier.
+        game_id (int): Game object identifier.
+
+    Returns:
+        Dict[str, Query]: Queries by their names.
+    """
+    return {
+        # SqlAlchemyRepository.get_past_games
+        "Past games page": SqlAlchemyRepository(db_session).query_past_games(league_id).limit(21),
+        # SqlAlchemyRepository.get_user_game_results
+        "Points chart": db_session.query(GameResult)
+        .join(Game, Game.id == GameResult.game_id)
+        .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+        .filter(LeagueSeason.id == league_id)
+        .filter(GameResult.user_id == user_id)
+        .order_by(GameResult.game_id.asc()),
+        # SqlAlchemyRepository.create_game
+        "Game metadata": db_session.query(Game, GameResult, User, LeagueSeason)
+        .outerjoin(GameResult, GameResult.game_id == Game.id)
+        .outerjoin(User, User.id == GameResult.user_id)
+        .outerjoin(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+        .filter(Game.id == game_id),
+        # src.database.standing.rebuild_league_standings
+        "Standings aggregation": db_session.query(select_league_standings(league_id).subquery()),
+    }
+
+
+@dataclass
+class QueryDeadline:
+    """
+    Deadline of the running query, the queries running longer than the timeout are interrupted by SQLite, e.g. the full
+     table scans of a large database.
+    """
+
+    timeout: float
+    expires_at: float = float("inf")
+
+    def listen(self, db_engine: Engine) -> None:
+        """
+        Checks the deadline on every connection of the engine.
+
+        Args:
+            db_engine (Engine): Engine of the database.
+        """
+
+        def on_connect(dbapi_connection: sqlite3.Connection, _: object) -> None:
+            dbapi_connection.set_progress_handler(lambda: int(time.perf_counter() > self.expires_at), PROGRESS_STEPS)
+
+        event.listen(db_engine, "connect", on_connect)
+
+
+def measure(
+    db_session: scoped_session, queries: Dict[str, Query], repeat: int, deadline: QueryDeadline
+) -> Dict[str, Tuple[Optional[float], str]]:
+    """
+    Measures the average time of the queries and gets their plans.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        queries (Dict[str, Query]): Queries by their names.
+        repeat (int): Number of the runs of every query.
+        deadline (QueryDeadline): Deadline of the running query.
+
+    Returns:
+        Dict[str, Tuple[Optional[float], str]]: Average time in seconds, None if the query was interrupted by
+         the timeout, and the plan of every query.
+    """
+    result: Dict[str, Tuple[Optional[float], str]] = {}
+    for name, query in queries.items():
+        statement = str(
+            query.statement.compile(
+                dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}  # type: ignore [union-attr]
+            )
+        )
+        plan = "\n".join(
+            f"    {row[3]}" for row in db_session.execute(f"EXPLAIN QUERY PLAN {statement}")  # type: ignore [arg-type]
+        )
+        started_at = time.perf_counter()
+        deadline.expires_at = started_at + deadline.timeout
+        try:
+            for _ in range(repeat):
+                query.all()
+        except OperationalError:
+            db_session.rollback()
+            result[name] = None, plan
+            continue
+        finally:
+            deadline.expires_at = float("inf")
+        result[name] = (time.perf_counter() - started_at) / repeat, plan
+    return result
+
+
+def run_stage(  # pylint: disable=too-many-arguments
+    db_engine: Engine,
+    name: str,
+    prepare: Callable[[Engine], None],
+    arguments: Tuple[int, int, int],
+    repeat: int,
+    deadline: QueryDeadline,
+) -> Dict[str, Tuple[Optional[float], str]]:
+    """
+    Prepares the schema and measures the queries on a new session.
+
+    Args:
+        db_engine (Engine): Engine of the database.
+        name (str): Name of the stage.
+        prepare (Callable[[Engine], None]): Function changing the indexes.
+        arguments (Tuple[int, int, int]): Identifiers of the league, the user and the game of the queries.
+        repeat (int): Number of the runs of every query.
+        deadline (QueryDeadline): Deadline of the running query.
+
+    Returns:
+        Dict[str, Tuple[Optional[float], str]]: Average time in seconds and the plan of every query.
+    """
+    prepare(db_engine)
+    with db_engine.connect() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    db_session = make_session(db_engine)
+    result = measure(db_session, make_queries(db_session, *arguments), repeat, deadline)
+    delete_session(db_session)
+    click.echo(f"\n{name}:")
+    for query_name, (elapsed, plan) in result.items():
+        duration = f"{elapsed * 1000:.2f} ms" if elapsed is not None else f"more than {deadline.timeout:.0f} s"
+        click.echo(f"  {query_name}: {duration}\n{plan}")
+    return result
+
+
+def drop_indexes(db_engine: Engine) -> None:
+    """
+    Drops the indexes of the models, the indexes of the unique constraints are kept.
+
+    Args:
+        db_engine (Engine): Engine of the database.
+    """
+    for table in Base.metadata.sorted_tables:  # type: ignore [attr-defined] # pylint: disable=no-member
+        for index in table.indexes:
+            index.drop(db_engine)
+
+
+def create_indexes(db_engine: Engine) -> None:
+    """
+    Creates the indexes of the models.
+
+    Args:
+        db_engine (Engine): Engine of the database.
+    """
+    for table in Base.metadata.sorted_tables:  # type: ignore [attr-defined] # pylint: disable=no-member
+        for index in table.indexes:
+            index.create(db_engine)
+
+
+@click.command()
+@click.option("--results", default=1000000, show_default=True, help="Number of the game results to seed.")
+@click.option("--users", default=100, show_default=True, help="Number of the users.")
+@click.option("--leagues", default=10, show_default=True, help="Number of the league seasons.")
+@click.option("--repeat", default=5, show_default=True, help="Number of the runs of every query.")
+@click.option("--timeout", default=60.0, show_default=True, help="Maximum duration of a query in seconds.")
+@click.option("--seed", "seed_value", default=0, show_default=True, help="Seed of the random generator.")
+def main(  # pylint: disable=too-many-arguments,too-many-locals
+    results: int, users: int, leagues: int, repeat: int, timeout: float, seed_value: int
+) -> None:
+    generator = random.Random(seed_value)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "benchmark.db")  # pylint: disable=no-member
+        db_engine = make_engine({"db_url": f"sqlite:///{db_path}"})
+        deadline = QueryDeadline(timeout)
+        deadline.listen(db_engine)
+        Base.metadata.create_all(db_engine)  # type: ignore [attr-defined] # pylint: disable=no-member
+        started_at = time.perf_counter()
+        seed(db_engine, results, users, leagues, generator)
+        click.echo(f"{results} game results were seeded in {time.perf_counter() - started_at:.1f} s")
+        arguments = (generator.randint(1, leagues), generator.randint(1, users), generator.randint(1, results // 2))
+
+        without_indexes = run_stage(db_engine, "Without indexes", drop_indexes, arguments, repeat, deadline)
+        with_indexes = run_stage(db_engine, "With indexes", create_indexes, arguments, repeat, deadline)
+
+        click.echo("\nSpeedup:")
+        for name, (elapsed, _) in with_indexes.items():
+            before = without_indexes[name][0]
+            if before is None or elapsed is None:
+                click.echo(f"  {name}: unknown, the query was interrupted")
+            else:
+                click.echo(f"  {name}: {before / elapsed:,.1f}x")
+        db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
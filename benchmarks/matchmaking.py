@@ -0,0 +1,134 @@
+"""
+Benchmark of the matchmaking queue.
+
+Simulates the players joining the queue at a steady rate with the ratings of a normal distribution and the sweeps
+ of the queue every simulated second, once on the MatchmakingQueue and once on a list scanned by every join, and
+ reports the time of the joins, the depth of the queue and the waiting times.
+
+Usage:
+    python -m benchmarks.matchmaking --players 50000 --rate 2000
+"""
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from src.components.game.matchmaking import MatchmakingQueue, get_tolerance
+from src.components.game.simulator import percentile
+
+
+class ListQueue:
+    """
+    Queue of the same pairing rules keeping the waiting players in a list scanned by every join.
+    """
+
+    def __init__(self) -> None:
+        self.tickets: Dict[int, Tuple[float, float]] = {}
+        self.matches = 0
+
+    def join(self, user_id: int, rating: float, now: float) -> Optional[int]:
+        opponent = self.__find_opponent(user_id, rating, now)
+        if opponent is None:
+            self.tickets[user_id] = (rating, now)
+            return None
+        del self.tickets[opponent]
+        self.matches += 1
+        return opponent
+
+    def match_waiting(self, now: float) -> None:
+        for user_id, (rating, joined_at) in list(self.tickets.items()):
+            if user_id not in self.tickets:
+                continue
+            del self.tickets[user_id]
+            opponent = self.__find_opponent(user_id, rating, now, joined_at)
+            if opponent is None:
+                self.tickets[user_id] = (rating, joined_at)
+            else:
+                del self.tickets[opponent]
+                self.matches += 1
+
+    def __find_opponent(
+        self, user_id: int, rating: float, now: float, joined_at: Optional[float] = None
+    ) -> Optional[int]:
+        joined_at = now if joined_at is None else joined_at
+        result, result_difference = None, 0.0
+        for opponent_id, (opponent_rating, opponent_joined_at) in self.tickets.items():
+            difference = abs(opponent_rating - rating)
+            if opponent_id != user_id and difference <= get_tolerance(now - min(joined_at, opponent_joined_at)):
+                if result is None or difference < result_difference:
+                    result, result_difference = opponent_id, difference
+        return result
+
+
+def make_arrivals(players: int, rate: float, spread: float, seed: int) -> List[Tuple[float, float]]:
+    """
+    Generates the joining times and the ratings of the players.
+
+    Args:
+        players (int): Number of the players.
+        rate (float): Number of the players joining per second.
+        spread (float): Standard deviation of the ratings around 1500.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[Tuple[float, float]]: Joining time in seconds and rating of every player.
+    """
+    generator = random.Random(seed)
+    return [(i / rate, generator.gauss(1500, spread)) for i in range(players)]
+
+
+def simulate(queue, arrivals: List[Tuple[float, float]]) -> Tuple[List[float], int]:  # type: ignore [no-untyped-def]
+    """
+    Joins the players to the queue in the order of their joining times and sweeps the queue every second.
+
+    Args:
+        queue: MatchmakingQueue or ListQueue.
+        arrivals (List[Tuple[float, float]]): Joining time and rating of every player.
+
+    Returns:
+        Tuple[List[float], int]: Time of every join in seconds and the maximal depth of the queue.
+    """
+    latencies = []
+    max_depth = 0
+    next_sweep = 1.0
+    for user_id, (now, rating) in enumerate(arrivals):
+        if now >= next_sweep:
+            queue.match_waiting(now)
+            next_sweep += 1.0
+        started_at = time.perf_counter()
+        queue.join(user_id, rating, now)
+        latencies.append(time.perf_counter() - started_at)
+        max_depth = max(max_depth, len(queue.tickets))
+    return latencies, max_depth
+
+
+@click.command()
+@click.option("--players", default=50000, show_default=True, help="Number of the players joining the queue.")
+@click.option("--rate", default=2000.0, show_default=True, help="Number of the players joining per second.")
+@click.option("--spread", default=400.0, show_default=True, help="Standard deviation of the ratings.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generator.")
+@click.option("--skip-list", is_flag=True, help="Skip the list scanned by every join, it is slow on deep queues.")
+def main(players: int, rate: float, spread: float, seed: int, skip_list: bool) -> None:
+    arrivals = make_arrivals(players, rate, spread, seed)
+    end = arrivals[-1][0] if arrivals else 0.0
+    matchmaking_queue = MatchmakingQueue()
+    queues = [matchmaking_queue] + ([] if skip_list else [ListQueue()])
+    for queue in queues:
+        started_at = time.perf_counter()
+        latencies, max_depth = simulate(queue, arrivals)
+        elapsed = time.perf_counter() - started_at
+        click.echo(
+            f"{queue.__class__.__name__:<18} {len(latencies) / elapsed:>12,.0f} joins/s, join "
+            + ", ".join(f"p{round(i * 100)} {percentile(latencies, i) * 1e6:.1f} us" for i in (0.5, 0.99))
+            + f", max depth {max_depth}, matches {queue.matches}"
+        )
+    metrics = matchmaking_queue.get_metrics(end)
+    click.echo(
+        f"Queue depth at the end: {metrics.depth}, average wait {metrics.average_wait:.2f} s, "
+        f"average wait of the paired players {metrics.average_match_wait:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,52 @@
+"""
+Benchmark of the Monte Carlo Tree Search.
+
+Plays the first moves of a game of the computer against itself on one search, so the tree is reused between the
+ moves, and reports the iterations per second and the size of the tree of every move. The number of the worker
+ processes and the budget of a move are tuned for the hardware by comparing these numbers.
+
+Usage:
+    python -m benchmarks.mcts
+    python -m benchmarks.mcts --size 15 --win-length 5 --workers 4 --time-limit 2
+"""
+import click
+
+from src.components.game.mcts import TIME_LIMIT, MonteCarloTreeSearch
+
+FIELD_SIZE = 15
+WIN_LENGTH = 5
+
+
+@click.command()
+@click.option("--size", default=FIELD_SIZE, show_default=True, help="Length of the side of the game field.")
+@click.option("--win-length", default=WIN_LENGTH, show_default=True, help="Number of marks in a row to win.")
+@click.option("--moves", default=6, show_default=True, help="Number of the moves to search.")
+@click.option("--time-limit", default=TIME_LIMIT, show_default=True, help="Time of the search of a move in seconds.")
+@click.option("--iterations", default=None, type=int, help="Number of the iterations of a move instead of the time.")
+@click.option("--workers", default=1, show_default=True, help="Number of the processes searching every move.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generators.")
+def main(  # pylint: disable=too-many-arguments
+    size: int, win_length: int, moves: int, time_limit: float, iterations: int, workers: int, seed: int
+) -> None:
+    tree_search = MonteCarloTreeSearch(size, win_length, workers=workers, seed=seed)
+    own, opponent = 0, 0
+    total_iterations, total_elapsed = 0, 0.0
+    for ply in range(moves):
+        result = tree_search.search(own, opponent, iterations, None if iterations is not None else time_limit)
+        if result.move is None:
+            break
+        total_iterations += result.iterations
+        total_elapsed += result.elapsed
+        click.echo(
+            f"Move {ply + 1}: {result.move[0]},{result.move[1]} {result.iterations:>9} iterations "
+            f"{result.iterations_per_second:>12,.0f} iterations/s, tree size {result.tree_size:>9}, "
+            f"win rate {result.value:.0%}"
+        )
+        own, opponent = opponent, own | 1 << (result.move[0] * size + result.move[1])
+    tree_search.close()
+    if total_elapsed > 0:
+        click.echo(f"Total: {total_iterations} iterations, {total_iterations / total_elapsed:,.0f} iterations/s")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
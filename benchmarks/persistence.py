@@ -0,0 +1,87 @@
+"""
+Benchmark of the persistence of the games.
+
+Plays the same random games between scripted players through GameSession on a fresh SQLite database and reports
+ the number of games persisted per second when every decision is committed immediately and in the write-behind mode
+ with and without the journal.
+
+Usage:
+    python -m benchmarks.persistence --games 200
+"""
+import os
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+import click
+
+from benchmarks.game_field import make_games
+from src.components.game.player import ScriptedPlayer
+from src.components.game.service import GameSession
+from src.database import delete_session, make_engine, make_session
+from src.database.journal import MoveJournal
+from src.database.model.base import Base
+from src.database.model.game import LeagueSeason
+from src.database.model.user import User
+
+
+def persist(
+    directory: str, games: List[List[Tuple[int, int]]], write_behind: bool, flush_every: Optional[int], journal: bool
+) -> float:
+    """
+    Plays the games on a fresh database and measures the time spent.
+
+    Args:
+        directory (str): Directory for the database and the journal files.
+        games (List[List[Tuple[int, int]]]): Coordinates of the moves of every game.
+        write_behind (bool): Buffer the decisions and commit them in batches.
+        flush_every (Optional[int]): Number of the buffered decisions committed together.
+        journal (bool): Append the buffered decisions to the journal.
+
+    Returns:
+        float: Elapsed time in seconds.
+    """
+    db_path = os.path.join(directory, f"benchmark_{time.monotonic_ns()}.db")  # pylint: disable=no-member
+    db_engine = make_engine({"db_url": f"sqlite:///{db_path}"})
+    Base.metadata.create_all(db_engine)  # type: ignore [attr-defined] # pylint: disable=no-member
+    db_session = make_session(db_engine, expire_on_commit=False)
+    league = LeagueSeason(name="Benchmark", field_size=3, win_length=3)  # type: ignore [call-arg]
+    users = [User(nickname="Player1"), User(nickname="Player2")]  # type: ignore [call-arg]
+    db_session.add_all([league, *users])  # pylint: disable=no-member
+    db_session.commit()  # pylint: disable=no-member
+    move_journal = MoveJournal(db_path + ".journal") if journal else None
+
+    started_at = time.perf_counter()
+    for moves in games:
+        game_session = GameSession(
+            db_session, league, write_behind=write_behind, flush_every=flush_every, journal=move_journal, render=False
+        )
+        game_session.start_game([(users[0], ScriptedPlayer(moves[0::2])), (users[1], ScriptedPlayer(moves[1::2]))])
+    elapsed = time.perf_counter() - started_at
+
+    if move_journal is not None:
+        move_journal.close()
+    delete_session(db_session)
+    db_engine.dispose()
+    return elapsed
+
+
+@click.command()
+@click.option("--games", default=200, show_default=True, help="Number of random games to persist.")
+@click.option("--flush-every", default=None, type=int, help="Commit the buffered decisions every N moves.")
+@click.option("--seed", default=0, show_default=True, help="Seed of the random generator.")
+def main(games: int, flush_every: Optional[int], seed: int) -> None:
+    game_list = make_games(games, 3, seed)
+    modes = (
+        ("Commit every decision", False, None, False),
+        ("Write-behind", True, flush_every, False),
+        ("Write-behind + journal", True, flush_every, True),
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write_behind, mode_flush_every, journal in modes:
+            elapsed = persist(directory, game_list, write_behind, mode_flush_every, journal)
+            click.echo(f"{name:<25} {games:>6} games {elapsed:>8.3f} s {games / elapsed:>10,.1f} games/s")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
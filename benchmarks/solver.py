@@ -0,0 +1,40 @@
+"""
+Benchmark of the perfect play solver.
+
+Solves the empty game field from scratch and reports the time, the number of searched positions, the transposition
+ table hits and the size of the table. With a time limit the search is deepened iteratively and the depth reached
+ in the time is reported.
+
+Usage:
+    python -m benchmarks.solver
+    python -m benchmarks.solver --size 4 --win-length 3
+    python -m benchmarks.solver --size 4 --win-length 4 --time-limit 1
+"""
+import time
+from typing import Optional
+
+import click
+
+from src.components.game.model import FIELD_SIZE, WIN_LENGTH
+from src.components.game.solver import Solver
+
+
+@click.command()
+@click.option("--size", default=FIELD_SIZE, show_default=True, help="Length of the side of the game field.")
+@click.option("--win-length", default=WIN_LENGTH, show_default=True, help="Number of marks in a row to win.")
+@click.option("--time-limit", default=None, type=float, help="Time of the search in seconds, unlimited by default.")
+def main(size: int, win_length: int, time_limit: Optional[float]) -> None:
+    solver = Solver(size, win_length)
+    started_at = time.perf_counter()
+    result = solver.solve(0, 0, time_limit)
+    elapsed = time.perf_counter() - started_at
+    click.echo(f"Value: {result.value}{'' if result.exact else ' (not proven)'}, best move: {result.move}")
+    click.echo(f"Time: {elapsed:.4f} s, depth: {result.depth}")
+    click.echo(
+        f"Nodes searched: {result.nodes}, {result.nodes / elapsed:,.0f} nodes/s, cache hits: {result.cache_hits}"
+    )
+    click.echo(f"Transposition table size: {len(solver.transposition_table)}")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
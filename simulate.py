@@ -0,0 +1,4 @@
+from src.components.game.simulator import main
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
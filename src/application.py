@@ -1,10 +1,15 @@
+import logging
+
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm.session import Session
 
+from src.components.game.book import get_opening_book
 from src.components.model import BaseController
 from src.components.routing import main_menu
 from src.database import delete_session, make_engine, make_session
+from src.database.journal import MoveJournal
 from src.handler.base import BaseHandler
+from src.settings import get_settings
 
 
 class Application:
@@ -20,11 +25,14 @@ class Application:
 
     Methods:
         run(self):
-            Starts the application by initializing the database connection and routing.
+            Starts the application by initializing the log, the database connection, the opening book and routing.
         stop(self):
             Stops the application and disconnects from external applications.
+        __init_log(self):
+            Initializes the log of the application.
         __init_database(self):
-            Initializes the database connection engine and the database connection session.
+            Initializes the database connection engine and the database connection session and recovers the decisions
+             journaled by the previous run.
         __init_routing(self):
             Initializes the base controller and specific controllers to create a list of objects with an active
              database session.
@@ -37,12 +45,14 @@ class Application:
 
     def run(self) -> None:
         """
-        Starts the application. Initializes the database connection and the routing.
+        Starts the application. Initializes the log, the database connection, the opening book and the routing.
 
         Returns:
             None
         """
+        self.__init_log()
         self.__init_database()
+        get_opening_book()
         self.__init_routing()
         self.base_handler.run()
 
@@ -55,15 +65,35 @@ class Application:
         """
         delete_session(self.db_session)
 
+    @staticmethod
+    def __init_log() -> None:
+        """
+        Initializes the log of the application with the settings, the screen is used by the menu, so the log is
+         written to a file only.
+
+        Returns:
+            None
+        """
+        log_path = get_settings()["log_path"]
+        if log_path:
+            logging.basicConfig(
+                filename=log_path, level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+            )
+
     def __init_database(self) -> None:
         """
-        Initializes the database connection engine and the database connection session.
+        Initializes the database connection engine and the database connection session with the settings from
+         the config file and the environment.
+        The game decisions journaled but not committed by the previous run, e.g. because of a crash, are saved in
+         the storage format of the moves of the settings.
 
         Returns:
             None
         """
-        self.db_engine = make_engine({"db_url": "sqlite:///src/database/db"})
+        settings = get_settings()
+        self.db_engine = make_engine(settings)
         self.db_session = make_session(self.db_engine)
+        MoveJournal.recover(self.db_session, compact_moves=settings["db_compact_moves"])
 
     def __init_routing(self) -> None:
         """
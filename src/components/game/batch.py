@@ -0,0 +1,242 @@
+"""
+Batch engine of the game field.
+
+Keeps many game fields of the same variant as one (B, N, N) int8 numpy array, where a cell is 1 for the first
+ symbol, -1 for the second one and 0 for an empty cell. The outcomes of all fields are evaluated at once: the cells of
+ every line of win_length cells are gathered by the precomputed line indexes and summed, a line of one player sums
+ to +-win_length. While the games are played move by move only the lines through the last moves are gathered.
+ So the cost of a check is a few numpy operations for the whole batch instead of a Python call per field, which is
+ what the simulation and the replay of thousands of games need.
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.components.game.model import FIELD_SIZE, WIN_LENGTH
+
+# Symbols of the FIRST and the SECOND values
+SYMBOLS = ("x", "o")
+# Values of the cells
+EMPTY = 0
+FIRST = 1
+SECOND = -1
+# Outcomes of the game fields
+ONGOING = 0
+FIRST_WINS = 1
+SECOND_WINS = 2
+DRAW = 3
+
+
+@lru_cache(maxsize=None)
+def build_line_indexes(size: int, win_length: int) -> np.ndarray:
+    """
+    Precomputes the indexes of the cells of every line of win_length cells in a row, a column or a diagonal.
+    The result is cached, so the indexes are built once for every combination of the size and the win length.
+
+    Args:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        np.ndarray: Array of the shape (lines, win_length) with the cell indexes x * size + y.
+    """
+    result = []
+    for x_step, y_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for x_coordinate in range(size):
+            for y_coordinate in range(size):
+                x_last = x_coordinate + x_step * (win_length - 1)
+                y_last = y_coordinate + y_step * (win_length - 1)
+                if 0 <= x_last < size and 0 <= y_last < size:
+                    result.append(
+                        [(x_coordinate + x_step * i) * size + y_coordinate + y_step * i for i in range(win_length)]
+                    )
+    line_indexes = np.array(result, dtype=np.intp)
+    line_indexes.flags.writeable = False
+    return line_indexes
+
+
+@lru_cache(maxsize=None)
+def build_cell_lines(size: int, win_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precomputes the lines passing through every cell, see build_line_indexes. The cells have different numbers of
+     the lines, so the lines of a cell are padded by its first line and masked.
+
+    Args:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Cell indexes of the lines of every cell of the shape
+         (size * size, lines per cell, win_length) and the mask of the padding lines of the shape
+         (size * size, lines per cell).
+    """
+    line_indexes = build_line_indexes(size, win_length)
+    lines: List[List[int]] = [[] for _ in range(size * size)]
+    for line, cells in enumerate(line_indexes.tolist()):
+        for cell in cells:
+            lines[cell].append(line)
+    width = max(len(i) for i in lines)
+    cell_lines = np.array([i + i[:1] * (width - len(i)) for i in lines], dtype=np.intp)
+    padding = np.array([[j >= len(i) for j in range(width)] for i in lines], dtype=bool)
+    result = line_indexes[cell_lines], padding
+    for i in result:
+        i.flags.writeable = False
+    return result
+
+
+class BatchGameField:
+    """
+    Many game fields of the same variant evaluated together.
+
+    Attributes:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+        boards (np.ndarray): Cells of the game fields of the shape (B, size, size).
+        filled (np.ndarray): Number of the filled cells of every game field.
+
+    Methods:
+        __init__(self, batch_size, size=FIELD_SIZE, win_length=WIN_LENGTH):
+            Initializes the empty game fields.
+        from_marks(cls, marks, size, win_length) -> BatchGameField:
+            Builds the game fields from the bitmasks of the players.
+        set_cells(self, board_indexes, x_coordinates, y_coordinates, values):
+            Registers one decision on each of the game fields.
+        get_outcomes(self, board_indexes=None, last_cells=None) -> np.ndarray:
+            Evaluates the outcomes of the game fields.
+    """
+
+    def __init__(self, batch_size: int, size: int = FIELD_SIZE, win_length: int = WIN_LENGTH) -> None:
+        """
+        Initializes the empty game fields.
+
+        Args:
+            batch_size (int): Number of the game fields.
+            size (int): Length of the side of the game field.
+            win_length (int): Number of marks in a row required to win.
+        """
+        if not 0 < win_length <= size:
+            raise ValueError(f"Win length should be between 1 and {size}")
+        self.size = size
+        self.win_length = win_length
+        self.boards = np.zeros((batch_size, size, size), dtype=np.int8)
+        self.filled = np.zeros(batch_size, dtype=np.int32)
+
+    @classmethod
+    def from_marks(cls, marks: List[Tuple[int, int]], size: int, win_length: int) -> "BatchGameField":
+        """
+        Builds the game fields from the bitmasks of the cells of the first and the second symbols, cell (x, y) is
+         the bit number x * size + y like in the BitboardGameField.
+
+        Args:
+            marks (List[Tuple[int, int]]): Bitmasks of the first and the second symbols of every game field.
+            size (int): Length of the side of the game field.
+            win_length (int): Number of marks in a row required to win.
+
+        Returns:
+            BatchGameField: Game fields with the marks.
+        """
+        result = cls(len(marks), size, win_length)
+        cells_number = size * size
+        bytes_number = (cells_number + 7) // 8
+        for value, index in ((FIRST, 0), (SECOND, 1)):
+            buffer = b"".join(i[index].to_bytes(bytes_number, "little") for i in marks)
+            bits = np.unpackbits(
+                np.frombuffer(buffer, dtype=np.uint8).reshape(len(marks), bytes_number), axis=1, bitorder="little"
+            )[:, :cells_number]
+            result.boards.reshape(len(marks), -1)[bits.astype(bool)] = value
+            result.filled += bits.sum(axis=1, dtype=np.int32)
+        return result
+
+    def set_cells(
+        self,
+        board_indexes: np.ndarray,
+        x_coordinates: np.ndarray,
+        y_coordinates: np.ndarray,
+        values: Union[int, np.ndarray],
+    ) -> None:
+        """
+        Registers one decision on each of the game fields.
+
+        Args:
+            board_indexes (np.ndarray): Indexes of the game fields, every field at most once.
+            x_coordinates (np.ndarray): X coordinates.
+            y_coordinates (np.ndarray): Y coordinates.
+            values (Union[int, np.ndarray]): Values of the symbols, FIRST or SECOND.
+        """
+        coordinates = np.concatenate([x_coordinates, y_coordinates])
+        if np.any((coordinates < 0) | (coordinates >= self.size)):
+            raise ValueError("This cell is out of the game field, please, choose another")
+        if np.any(self.boards[board_indexes, x_coordinates, y_coordinates] != EMPTY):
+            raise ValueError("This cell is filled, please, choose another")
+        self.boards[board_indexes, x_coordinates, y_coordinates] = values
+        self.filled[board_indexes] += 1
+
+    def get_outcomes(
+        self, board_indexes: Optional[np.ndarray] = None, last_cells: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Evaluates the outcomes of the game fields. A line of win_length cells of one symbol wins, a full field
+         without such lines is a draw. When the last filled cells are known only the lines passing through them are
+         checked, a game played move by move can be won only by them.
+
+        Args:
+            board_indexes (Optional[np.ndarray]): Indexes of the game fields to evaluate, all fields by default.
+            last_cells (Optional[np.ndarray]): Cell indexes x * size + y of the last moves on the evaluated game
+             fields, all lines are checked by default.
+
+        Returns:
+            np.ndarray: ONGOING, FIRST_WINS, SECOND_WINS or DRAW for every evaluated game field.
+        """
+        cells = self.boards.reshape(len(self.boards), -1)
+        rows = np.arange(len(self.boards)) if board_indexes is None else board_indexes
+        if last_cells is None:
+            sums = cells[rows][:, build_line_indexes(self.size, self.win_length)].sum(axis=2, dtype=np.int8)
+        else:
+            cell_lines, padding = build_cell_lines(self.size, self.win_length)
+            sums = cells[rows[:, None, None], cell_lines[last_cells]].sum(axis=2, dtype=np.int8)
+            sums[padding[last_cells]] = 0
+        result = np.full(len(rows), ONGOING, dtype=np.int8)
+        result[self.filled[rows] == self.size * self.size] = DRAW
+        result[np.any(sums == SECOND * self.win_length, axis=1)] = SECOND_WINS
+        result[np.any(sums == FIRST * self.win_length, axis=1)] = FIRST_WINS
+        return result
+
+
+def play_random_games(  # pylint: disable=too-many-locals
+    games: int, size: int = FIELD_SIZE, win_length: int = WIN_LENGTH, seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Plays the games of two random players in lockstep on one batch: on every ply each unfinished game takes a random
+     empty cell and the outcomes of all of them are evaluated together. The first symbol moves first.
+
+    Args:
+        games (int): Number of the games.
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+        seed (Optional[int]): Seed of the random generator.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Cell indexes x * size + y of the moves of the shape
+         (games, size * size) padded by -1, numbers of the moves and outcomes of the games.
+    """
+    generator = np.random.default_rng(seed)
+    cells_number = size * size
+    game_field = BatchGameField(games, size, win_length)
+    cells = game_field.boards.reshape(games, cells_number)
+    moves = np.full((games, cells_number), -1, dtype=np.int16)
+    outcomes = np.full(games, ONGOING, dtype=np.int8)
+    active = np.arange(games)
+    for ply in range(cells_number):
+        if active.size == 0:
+            break
+        # The empty cell with the greatest random key is chosen, the filled cells never win
+        keys = generator.random((len(active), cells_number))
+        keys[cells[active] != EMPTY] = -1
+        chosen = keys.argmax(axis=1)
+        x_coordinates, y_coordinates = np.divmod(chosen, size)
+        game_field.set_cells(active, x_coordinates, y_coordinates, FIRST if ply % 2 == 0 else SECOND)
+        moves[active, ply] = chosen
+        outcomes[active] = game_field.get_outcomes(active, chosen)
+        active = active[outcomes[active] == ONGOING]
+    return moves, np.count_nonzero(moves >= 0, axis=1), outcomes
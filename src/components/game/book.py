@@ -0,0 +1,197 @@
+"""
+Opening book of the classic game.
+
+Every reachable position of the 3x3 field is solved once and stored in a binary file of fixed-size records indexed
+ by the base-3 code of the position, so a computer player looks its move up in O(1) instead of searching.
+
+The book is built by the command:
+    python -m src.components.game.book
+"""
+import mmap
+import os
+import struct
+from functools import lru_cache
+from typing import Dict, Optional
+
+import click
+
+from src.components.game.model import FIELD_SIZE, WIN_LENGTH, build_win_masks
+from src.components.game.solver import Solver, SolverResult
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")  # pylint: disable=no-member
+
+# Magic bytes, field size, win length and number of the records
+HEADER = struct.Struct("<4sBBI")
+# Index of the best cell (-1 for positions absent from the book), value and score of the position for the player
+#  to move
+RECORD = struct.Struct("<bbb")
+MAGIC = b"TTTB"
+EMPTY_CELL = -1
+
+
+def encode_position(own: int, opponent: int, cells_number: int) -> int:
+    """
+    Encodes the position as a base-3 number, where the digit of the cell is 0 for an empty cell, 1 for a cell of
+     the player to move and 2 for a cell of the opponent. Cell (x, y) is the digit number x * size + y.
+
+    Args:
+        own (int): Bitmask of the cells of the player to move.
+        opponent (int): Bitmask of the cells of the opponent.
+        cells_number (int): Number of the cells of the game field.
+
+    Returns:
+        int: Code of the position.
+    """
+    result = 0
+    for cell in reversed(range(cells_number)):
+        result *= 3
+        if own >> cell & 1:
+            result += 1
+        elif opponent >> cell & 1:
+            result += 2
+    return result
+
+
+class OpeningBook:
+    """
+    Read-only table of the solved positions mapped into memory.
+
+    Attributes:
+        size (int): Length of the side of the game field covered by the book.
+        win_length (int): Number of marks in a row required to win in the book.
+
+    Methods:
+        __init__(self, path):
+            Maps the book file into memory.
+        covers(self, size, win_length) -> bool:
+            Checks if the book covers the variant of the game.
+        lookup(self, own, opponent) -> Optional[SolverResult]:
+            Looks up the best move and the value of the position.
+        close(self):
+            Unmaps the book file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Maps the book file into memory.
+
+        Args:
+            path (str): Path to the book file.
+        """
+        with open(path, "rb") as book_file:
+            self._buffer = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, win_length, self._records_number = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or len(self._buffer) != HEADER.size + RECORD.size * self._records_number:
+            self._buffer.close()
+            raise ValueError(f"File {path} is not an opening book")
+        self.size: int = size
+        self.win_length: int = win_length
+        self._cells_number = size * size
+
+    def covers(self, size: int, win_length: int) -> bool:
+        """
+        Checks if the book covers the variant of the game.
+
+        Args:
+            size (int): Length of the side of the game field.
+            win_length (int): Number of marks in a row required to win.
+
+        Returns:
+            bool: True if the positions of the variant are stored in the book.
+        """
+        return self.size == size and self.win_length == win_length
+
+    def lookup(self, own: int, opponent: int) -> Optional[SolverResult]:
+        """
+        Looks up the best move and the value of the position.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+
+        Returns:
+            Optional[SolverResult]: Best move and value of the position or None if the position is not in the book.
+        """
+        cell, value, score = RECORD.unpack_from(
+            self._buffer, HEADER.size + RECORD.size * encode_position(own, opponent, self._cells_number)
+        )
+        if cell == EMPTY_CELL:
+            return None
+        return SolverResult(value=value, score=score, move=(cell // self.size, cell % self.size))
+
+    def close(self) -> None:
+        """
+        Unmaps the book file.
+        """
+        self._buffer.close()
+
+
+def build_opening_book(path: str, size: int = FIELD_SIZE, win_length: int = WIN_LENGTH) -> int:
+    """
+    Solves every position reachable from the empty field and writes them to the book file.
+
+    Args:
+        path (str): Path to the book file.
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        int: Number of the stored positions.
+    """
+    cells_number = size * size
+    win_masks = build_win_masks(size, win_length)
+    solver = Solver(size, win_length)
+    positions: Dict[int, SolverResult] = {}
+
+    def visit(own: int, opponent: int) -> None:
+        code = encode_position(own, opponent, cells_number)
+        if code in positions:
+            return
+        result = solver.solve(own, opponent)
+        if result.move is None:
+            return
+        positions[code] = result
+        occupied = own | opponent
+        for cell in range(cells_number):
+            bit = 1 << cell
+            if occupied & bit or any((own | bit) & mask == mask for mask in win_masks[cell]):
+                continue
+            visit(opponent, own | bit)
+
+    visit(0, 0)
+
+    records = bytearray(RECORD.pack(EMPTY_CELL, 0, 0) * 3**cells_number)
+    for code, result in positions.items():
+        x_coordinate, y_coordinate = result.move  # type: ignore [misc]
+        RECORD.pack_into(records, RECORD.size * code, x_coordinate * size + y_coordinate, result.value, result.score)
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(MAGIC, size, win_length, 3**cells_number))
+        book_file.write(records)
+    return len(positions)
+
+
+@lru_cache(maxsize=None)
+def get_opening_book(path: str = BOOK_PATH) -> Optional[OpeningBook]:
+    """
+    Gets the opening book, the file is mapped into memory once per process.
+
+    Args:
+        path (str): Path to the book file.
+
+    Returns:
+        Optional[OpeningBook]: The opening book or None if the book has not been built.
+    """
+    if not os.path.exists(path):  # pylint: disable=no-member
+        return None
+    return OpeningBook(path)
+
+
+@click.command()
+@click.option("--path", default=BOOK_PATH, show_default=True, help="Path to the book file.")
+def main(path: str) -> None:
+    positions_number = build_opening_book(path)
+    click.echo(f"{positions_number} positions were written to {path}")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
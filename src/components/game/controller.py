@@ -4,7 +4,10 @@ from sqlalchemy.orm import Session
 
 from src.components.game.service import GameService
 from src.components.model import BaseController
+from src.database.journal import JOURNAL_PATH, MoveJournal
+from src.database.repository import SqlAlchemyRepository
 from src.handler.model import Handler, HandlerResponse
+from src.settings import get_settings
 
 
 class Game(BaseController):
@@ -13,6 +16,7 @@ class Game(BaseController):
 
     Attributes:
         db_session (Any): The database session.
+        journal (Optional[MoveJournal]): Journal of the buffered decisions in the write-behind mode.
         service (GameService): Instance of the GameService.
 
     Methods:
@@ -24,14 +28,23 @@ class Game(BaseController):
 
     def __init__(self, db_session: Session) -> None:
         """
-        Initializes a Game instance.
+        Initializes a Game instance. In the write-behind mode of the settings the decisions are journaled to
+         JOURNAL_PATH, which is replayed by the next start of the application after a crash.
 
         Args:
             db_session (Any): The database session.
         """
         super().__init__()
         self.db_session = db_session
-        self.service = GameService(self.db_session)
+        settings = get_settings()
+        self.journal = MoveJournal(JOURNAL_PATH) if settings["db_write_behind"] else None
+        self.service = GameService(
+            self.db_session,
+            write_behind=settings["db_write_behind"],
+            flush_every=settings["db_flush_every"] or None,
+            journal=self.journal,
+            repository=SqlAlchemyRepository(self.db_session, compact_moves=settings["db_compact_moves"]),
+        )
 
     def start_game(
         self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
@@ -0,0 +1,247 @@
+"""
+Load generator of the game server.
+
+Opens many connections to the server at once, every connection plays its games by random moves one after another,
+ and the time from sending a move to receiving its answer is measured, so the latency of the moves is reported
+ under the load of all the connections. Every connection needs a file descriptor on both sides, the limit of the
+ open files of the shell (ulimit -n) should be above the number of the connections.
+By default every connection makes the moves of both users of its games. With --matchmaking every connection queues
+ its own user, the users with the ids from --first-user-id on, and plays against the opponents found by the server.
+
+Usage:
+    python -m src.components.game.load --connections 1000 --games 10 --first-user-id 1 --second-user-id 2
+    python -m src.components.game.load --connections 1000 --games 10 --first-user-id 1 --matchmaking
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import click
+
+from src.components.game.server import HOST, PORT
+from src.components.game.simulator import percentile
+
+
+@dataclass
+class LoadReport:
+    """
+    Results of the load.
+    """
+
+    connections: int = 0
+    games: int = 0
+    moves: int = 0
+    latencies: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+async def receive(reader: asyncio.StreamReader, command: str) -> List[str]:
+    """
+    Waits for a line of the server.
+
+    Args:
+        reader (asyncio.StreamReader): Stream of the lines.
+        command (str): Last command sent to the server, it is shown in the error.
+
+    Returns:
+        List[str]: Words of the line.
+    """
+    answer = (await reader.readline()).decode().split()
+    if not answer or answer[0] == "ERROR":
+        raise ValueError(f"The server answered {' '.join(answer) or 'nothing'} to {command}")
+    return answer
+
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, command: str) -> List[str]:
+    """
+    Sends the command to the server and waits for its answer.
+
+    Args:
+        reader (asyncio.StreamReader): Stream of the answers.
+        writer (asyncio.StreamWriter): Stream of the commands.
+        command (str): Command and its arguments.
+
+    Returns:
+        List[str]: Words of the answer.
+    """
+    writer.write(f"{command}\n".encode())
+    await writer.drain()
+    return await receive(reader, command)
+
+
+async def play_connection(  # pylint: disable=too-many-arguments
+    host: str, port: int, user_ids: List[int], games: int, seed: Optional[int], report: LoadReport
+) -> None:
+    """
+    Plays the games of one connection by random moves and measures the latency of every move.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        user_ids (List[int]): Identifiers of the users playing the games.
+        games (int): Number of the games to play.
+        seed (Optional[int]): Seed of the random moves.
+        report (LoadReport): Results of the load to update.
+    """
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    report.connections += 1
+    try:
+        for _ in range(games):
+            _, game_id, field_size, _ = await send(reader, writer, f"NEW {user_ids[0]} {user_ids[1]}")
+            cells = list(range(int(field_size) ** 2))
+            generator.shuffle(cells)
+            for cell in cells:
+                started_at = time.perf_counter()
+                answer = await send(
+                    reader, writer, f"MOVE {game_id} {cell // int(field_size)} {cell % int(field_size)}"
+                )
+                report.latencies.append(time.perf_counter() - started_at)
+                report.moves += 1
+                if answer[0] == "END":
+                    break
+            report.games += 1
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def play_matched_connection(  # pylint: disable=too-many-arguments,too-many-locals
+    host: str, port: int, user_id: int, games: int, seed: Optional[int], report: LoadReport
+) -> None:
+    """
+    Queues the user of the connection for every game and plays its moves against the opponent found by the server,
+     the latency of the moves of the user is measured.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        user_id (int): Identifier of the user of the connection.
+        games (int): Number of the games to play.
+        seed (Optional[int]): Seed of the random moves.
+        report (LoadReport): Results of the load to update, a game is counted by its first player.
+    """
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    report.connections += 1
+    try:
+        for _ in range(games):
+            answer = await send(reader, writer, f"QUEUE {user_id}")
+            if answer[0] == "QUEUED":
+                answer = await receive(reader, f"QUEUE {user_id}")
+            _, game_id, field_size, _, symbol, _ = answer
+            size = int(field_size)
+            free_cells = set(range(size * size))
+            is_turn = symbol == "x"
+            while True:
+                if is_turn:
+                    cell = generator.choice(sorted(free_cells))
+                    free_cells.discard(cell)
+                    started_at = time.perf_counter()
+                    answer = await send(reader, writer, f"MOVE {game_id} {cell // size} {cell % size}")
+                    report.latencies.append(time.perf_counter() - started_at)
+                    report.moves += 1
+                else:
+                    answer = await receive(reader, f"QUEUE {user_id}")
+                    if answer[0] == "MOVED":
+                        free_cells.discard(int(answer[2]) * size + int(answer[3]))
+                if answer[0] == "END":
+                    break
+                is_turn = not is_turn
+            report.games += symbol == "x"
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(  # pylint: disable=too-many-arguments
+    host: str,
+    port: int,
+    connections: int,
+    games: int,
+    user_ids: List[int],
+    seed: Optional[int] = None,
+    matchmaking: bool = False,
+) -> LoadReport:
+    """
+    Plays the games on all the connections at once.
+
+    Args:
+        host (str): Address of the server.
+        port (int): Port of the server.
+        connections (int): Number of the connections.
+        games (int): Number of the games of every connection.
+        user_ids (List[int]): Identifiers of the two users playing the games, or of the users of every connection
+         with the matchmaking.
+        seed (Optional[int]): Seed of the random moves.
+        matchmaking (bool): Queue the users of the connections and let the server pair them.
+
+    Returns:
+        LoadReport: Results of the load.
+    """
+    report = LoadReport()
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(
+            (
+                play_matched_connection(host, port, user_ids[i], games, None if seed is None else seed + i, report)
+                if matchmaking
+                else play_connection(host, port, user_ids, games, None if seed is None else seed + i, report)
+            )
+            for i in range(connections)
+        )
+    )
+    report.elapsed = time.perf_counter() - started_at
+    return report
+
+
+@click.command()
+@click.option("--host", default=HOST, show_default=True, help="Address of the server.")
+@click.option("--port", default=PORT, show_default=True, help="Port of the server.")
+@click.option("--connections", default=100, show_default=True, help="Number of the connections.")
+@click.option("--games", default=10, show_default=True, help="Number of the games of every connection.")
+@click.option("--first-user-id", default=1, show_default=True, help="User moving first in the games.")
+@click.option("--second-user-id", default=2, show_default=True, help="User moving second in the games.")
+@click.option("--seed", default=None, type=int, help="Seed of the random moves.")
+@click.option(
+    "--matchmaking",
+    is_flag=True,
+    help="Queue a user per connection, the users with the ids from --first-user-id on, and let the server pair them.",
+)
+def main(  # pylint: disable=too-many-arguments
+    host: str,
+    port: int,
+    connections: int,
+    games: int,
+    first_user_id: int,
+    second_user_id: int,
+    seed: Optional[int],
+    matchmaking: bool,
+) -> None:
+    user_ids = (
+        list(range(first_user_id, first_user_id + connections)) if matchmaking else [first_user_id, second_user_id]
+    )
+    try:
+        report = asyncio.run(run_load(host, port, connections, games, user_ids, seed, matchmaking))
+    except (ConnectionError, ValueError) as error:
+        raise click.UsageError(str(error)) from error
+    elapsed = max(report.elapsed, 1e-9)
+    click.echo(f"Connections: {report.connections}, games: {report.games} in {report.elapsed:.3f} s")
+    click.echo(f"Moves: {report.moves}, {report.moves / elapsed:,.1f} moves/s")
+    click.echo(
+        "Move latency "
+        + ", ".join(
+            f"p{round(fraction * 100)} {percentile(report.latencies, fraction) * 1000:.2f} ms"
+            for fraction in (0.5, 0.99)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,319 @@
+"""
+Matchmaking of the players waiting for a game.
+
+The waiting players are indexed by their ratings in buckets of BUCKET_WIDTH rating points, every bucket is a sorted
+ list and the keys of the non-empty buckets are a sorted list too, so a player joining the queue is placed by two
+ binary searches and the opponents closest by rating are found by walking outwards from that place. Two players are
+ paired when the difference of their ratings is within the tolerance of the one who waits longer, the tolerance
+ grows with the waiting time from BASE_TOLERANCE up to MAX_TOLERANCE, so a player is paired on joining when a close
+ opponent waits and the players left are paired by the periodic sweeps of the queue as their tolerances grow.
+"""
+import bisect
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Width of the rating bands of the buckets
+BUCKET_WIDTH = 50.0
+# Difference of the ratings accepted on joining the queue
+BASE_TOLERANCE = 50.0
+# Growth of the accepted difference per second of waiting
+TOLERANCE_GROWTH = 10.0
+MAX_TOLERANCE = 400.0
+
+# rating, sequence number of the joining
+QueueKey = Tuple[float, int]
+
+
+@dataclass
+class Ticket:
+    """
+    Player waiting in the queue.
+    """
+
+    user_id: int
+    rating: float
+    joined_at: float
+    sequence: int
+
+
+class Match(NamedTuple):
+    """
+    Players paired by the queue, the one who waited longer goes first.
+    """
+
+    first: Ticket
+    second: Ticket
+
+
+class MatchmakingMetrics(NamedTuple):
+    depth: int
+    average_wait: float
+    matches: int
+    average_match_wait: float
+
+
+def get_tolerance(wait: float) -> float:
+    """
+    Gets the difference of the ratings accepted by a player after waiting.
+
+    Args:
+        wait (float): Waiting time in seconds.
+
+    Returns:
+        float: Accepted difference of the ratings.
+    """
+    return min(MAX_TOLERANCE, BASE_TOLERANCE + TOLERANCE_GROWTH * max(0.0, wait))
+
+
+class MatchmakingQueue:
+    """
+    Queue of the players waiting for a game, paired by the proximity of their ratings and their waiting time.
+
+    Attributes:
+        tickets (Dict[int, Ticket]): Waiting players by the ids of their users in the order of joining.
+        buckets (Dict[int, List[QueueKey]]): Sorted keys of the waiting players by the rating bands.
+        bucket_keys (List[int]): Sorted rating bands of the non-empty buckets.
+        by_key (Dict[QueueKey, Ticket]): Waiting players by their keys in the buckets.
+        matches (int): Number of the pairs made.
+        sequence (int): Sequence number of the last joining, it makes the keys of the equal ratings unique.
+
+    Methods:
+        join(self, user_id, rating, now=None) -> Optional[Match]:
+            Adds the player to the queue or pairs them with a waiting opponent.
+        leave(self, user_id) -> bool:
+            Removes the player from the queue.
+        match_waiting(self, now=None) -> List[Match]:
+            Pairs the waiting players accepting each other after their waiting time.
+        get_metrics(self, now=None) -> MatchmakingMetrics:
+            Gets the depth of the queue and the average waiting times.
+        __find_opponent(self, ticket, now) -> Optional[Ticket]:
+            Finds the closest opponent by rating accepting the player.
+        __iterate_down(self, key) -> Iterator[QueueKey]:
+            Iterates the keys below the key in the descending order.
+        __iterate_up(self, key) -> Iterator[QueueKey]:
+            Iterates the keys above the key in the ascending order.
+        __add(self, ticket):
+            Indexes the player.
+        __remove(self, ticket):
+            Removes the player from the index.
+        __pair(self, ticket, opponent, now) -> Match:
+            Removes the pair from the queue and counts it.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a MatchmakingQueue instance.
+        """
+        self.tickets: Dict[int, Ticket] = {}
+        self.buckets: Dict[int, List[QueueKey]] = {}
+        self.bucket_keys: List[int] = []
+        self.by_key: Dict[QueueKey, Ticket] = {}
+        self.matches = 0
+        self.sequence = 0
+        # Sums of the joining times of the waiting players and of the waiting times of the paired ones
+        self.joined_at_sum = 0.0
+        self.match_wait_sum = 0.0
+
+    def join(self, user_id: int, rating: float, now: Optional[float] = None) -> Optional[Match]:
+        """
+        Adds the player to the queue or pairs them with the closest waiting opponent by rating accepting them.
+
+        Args:
+            user_id (int): User object identifier.
+            rating (float): Rating of the user.
+            now (Optional[float]): Current time in seconds, time.monotonic() by default.
+
+        Returns:
+            Optional[Match]: Pair of the players or None if the player waits.
+        """
+        if user_id in self.tickets:
+            raise ValueError(f"User {user_id} is already in the queue")
+        now = time.monotonic() if now is None else now
+        self.sequence += 1
+        ticket = Ticket(user_id, rating, now, self.sequence)
+        opponent = self.__find_opponent(ticket, now)
+        if opponent is not None:
+            return self.__pair(ticket, opponent, now)
+        self.__add(ticket)
+        return None
+
+    def leave(self, user_id: int) -> bool:
+        """
+        Removes the player from the queue.
+
+        Args:
+            user_id (int): User object identifier.
+
+        Returns:
+            bool: True if the player was waiting.
+        """
+        ticket = self.tickets.get(user_id)
+        if ticket is None:
+            return False
+        self.__remove(ticket)
+        return True
+
+    def match_waiting(self, now: Optional[float] = None) -> List[Match]:
+        """
+        Pairs the waiting players accepting each other after their waiting time, the longest waiting first.
+
+        Args:
+            now (Optional[float]): Current time in seconds, time.monotonic() by default.
+
+        Returns:
+            List[Match]: Pairs of the players.
+        """
+        now = time.monotonic() if now is None else now
+        result = []
+        for ticket in list(self.tickets.values()):
+            if ticket.user_id not in self.tickets:
+                continue
+            opponent = self.__find_opponent(ticket, now)
+            if opponent is not None:
+                self.__remove(ticket)
+                result.append(self.__pair(ticket, opponent, now))
+        return result
+
+    def get_metrics(self, now: Optional[float] = None) -> MatchmakingMetrics:
+        """
+        Gets the depth of the queue and the average waiting times.
+
+        Args:
+            now (Optional[float]): Current time in seconds, time.monotonic() by default.
+
+        Returns:
+            MatchmakingMetrics: Number of the waiting players, their average waiting time, number of the pairs and the
+             average waiting time of the paired players.
+        """
+        now = time.monotonic() if now is None else now
+        depth = len(self.tickets)
+        return MatchmakingMetrics(
+            depth,
+            now - self.joined_at_sum / depth if depth else 0.0,
+            self.matches,
+            self.match_wait_sum / (self.matches * 2) if self.matches else 0.0,
+        )
+
+    def __find_opponent(self, ticket: Ticket, now: float) -> Optional[Ticket]:
+        """
+        Finds the closest opponent by rating accepting the player. The keys are walked outwards from the rating of
+         the player until the difference exceeds the tolerance of the player and of the longest waiting opponent.
+
+        Args:
+            ticket (Ticket): Player looking for an opponent, their own key is skipped if they are indexed.
+            now (float): Current time in seconds.
+
+        Returns:
+            Optional[Ticket]: Opponent or None if nobody accepts the player.
+        """
+        if not self.tickets:
+            return None
+        oldest = next(iter(self.tickets.values()))
+        limit = max(get_tolerance(now - ticket.joined_at), get_tolerance(now - oldest.joined_at))
+        key = (ticket.rating, ticket.sequence)
+        descending, ascending = self.__iterate_down(key), self.__iterate_up(key)
+        lower, upper = next(descending, None), next(ascending, None)
+        while lower is not None or upper is not None:
+            if upper is None or (lower is not None and ticket.rating - lower[0] <= upper[0] - ticket.rating):
+                candidate, lower = lower, next(descending, None)
+            else:
+                candidate, upper = upper, next(ascending, None)
+            difference = abs(candidate[0] - ticket.rating)  # type: ignore [index]
+            if difference > limit:
+                break
+            opponent = self.by_key[candidate]  # type: ignore [index]
+            if difference <= get_tolerance(now - min(ticket.joined_at, opponent.joined_at)):
+                return opponent
+        return None
+
+    def __iterate_down(self, key: QueueKey) -> Iterator[QueueKey]:
+        """
+        Iterates the indexed keys below the key in the descending order.
+
+        Args:
+            key (QueueKey): Key to start from, it is skipped.
+
+        Returns:
+            Iterator[QueueKey]: Keys of the waiting players.
+        """
+        bucket_key = int(key[0] // BUCKET_WIDTH)
+        position = bisect.bisect_right(self.bucket_keys, bucket_key)
+        for i in range(position - 1, -1, -1):
+            bucket = self.buckets[self.bucket_keys[i]]
+            start = bisect.bisect_left(bucket, key) if self.bucket_keys[i] == bucket_key else len(bucket)
+            for j in range(start - 1, -1, -1):
+                yield bucket[j]
+
+    def __iterate_up(self, key: QueueKey) -> Iterator[QueueKey]:
+        """
+        Iterates the indexed keys above the key in the ascending order.
+
+        Args:
+            key (QueueKey): Key to start from, it is skipped.
+
+        Returns:
+            Iterator[QueueKey]: Keys of the waiting players.
+        """
+        bucket_key = int(key[0] // BUCKET_WIDTH)
+        position = bisect.bisect_left(self.bucket_keys, bucket_key)
+        for i in range(position, len(self.bucket_keys)):
+            bucket = self.buckets[self.bucket_keys[i]]
+            start = bisect.bisect_right(bucket, key) if self.bucket_keys[i] == bucket_key else 0
+            for j in range(start, len(bucket)):
+                yield bucket[j]
+
+    def __add(self, ticket: Ticket) -> None:
+        """
+        Indexes the player in the bucket of their rating.
+
+        Args:
+            ticket (Ticket): Player to index.
+        """
+        bucket_key = int(ticket.rating // BUCKET_WIDTH)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self.buckets[bucket_key] = []
+            bisect.insort(self.bucket_keys, bucket_key)
+        key = (ticket.rating, ticket.sequence)
+        bisect.insort(bucket, key)
+        self.by_key[key] = ticket
+        self.tickets[ticket.user_id] = ticket
+        self.joined_at_sum += ticket.joined_at
+
+    def __remove(self, ticket: Ticket) -> None:
+        """
+        Removes the player from the index.
+
+        Args:
+            ticket (Ticket): Indexed player.
+        """
+        bucket_key = int(ticket.rating // BUCKET_WIDTH)
+        bucket = self.buckets[bucket_key]
+        key = (ticket.rating, ticket.sequence)
+        del bucket[bisect.bisect_left(bucket, key)]
+        if not bucket:
+            del self.buckets[bucket_key]
+            del self.bucket_keys[bisect.bisect_left(self.bucket_keys, bucket_key)]
+        del self.by_key[key]
+        del self.tickets[ticket.user_id]
+        self.joined_at_sum -= ticket.joined_at
+
+    def __pair(self, ticket: Ticket, opponent: Ticket, now: float) -> Match:
+        """
+        Removes the pair from the queue and counts it.
+
+        Args:
+            ticket (Ticket): Player, removed from the index.
+            opponent (Ticket): Opponent, indexed.
+            now (float): Current time in seconds.
+
+        Returns:
+            Match: Pair of the players, the one who waited longer goes first.
+        """
+        self.__remove(opponent)
+        self.matches += 1
+        self.match_wait_sum += now - ticket.joined_at + now - opponent.joined_at
+        if opponent.sequence < ticket.sequence:
+            return Match(opponent, ticket)
+        return Match(ticket, opponent)
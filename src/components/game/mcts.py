@@ -0,0 +1,550 @@
+"""
+Monte Carlo Tree Search of the moves.
+
+The perfect play solver can not search the game tree of the large fields, so on them the computer player estimates
+ the moves by random playouts: the tree of the searched positions is grown by UCT, every new position is played out
+ to the end by random moves on the bitboards and the result is propagated back to the root. The search is limited
+ by the number of iterations or by time.
+The tree of the last search is reused on the next move, so the playouts below the position reached by the moves of
+ both players are not lost. The search can also run in several processes at once, each with its own tree, and the
+ statistics of their root moves are merged (root parallelization).
+"""
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from multiprocessing.pool import Pool
+from multiprocessing.synchronize import Event as ProcessEvent
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.components.game.model import (
+    FIELD_SIZE,
+    MOVE_TIME_LIMIT,
+    WIN_LENGTH,
+    build_win_masks,
+)
+
+# Exploration constant of UCT
+EXPLORATION = math.sqrt(2)
+# Default time of the search of a move in seconds
+TIME_LIMIT = MOVE_TIME_LIMIT / 1000
+# Default number of the processes searching a position, all cores
+WORKERS = os.cpu_count() or 1  # pylint: disable=no-member
+# Number of the iterations between the checks of the time limit
+TIME_CHECK_INTERVAL = 16
+# The moves farther than this number of cells from all filled cells are not searched
+NEIGHBOURHOOD = 2
+# Rewards of the player who made the move
+WIN = 1.0
+DRAW = 0.5
+LOSS = 0.0
+
+# Event cancelling the searches of the worker process, shared with the process which started the worker
+worker_cancelled: Optional[ProcessEvent] = None
+
+
+@lru_cache(maxsize=None)
+def build_neighbour_masks(size: int, distance: int = NEIGHBOURHOOD) -> Tuple[int, ...]:
+    """
+    Precomputes the bitmasks of the cells around every cell of the game field.
+
+    Args:
+        size (int): Length of the side of the game field.
+        distance (int): Maximal distance from the cell along both coordinates.
+
+    Returns:
+        Tuple[int, ...]: Bitmask of the neighbour cells for every cell index x * size + y.
+    """
+    result = []
+    for x_coordinate in range(size):
+        for y_coordinate in range(size):
+            mask = 0
+            for x_neighbour in range(max(0, x_coordinate - distance), min(size, x_coordinate + distance + 1)):
+                for y_neighbour in range(max(0, y_coordinate - distance), min(size, y_coordinate + distance + 1)):
+                    mask |= 1 << (x_neighbour * size + y_neighbour)
+            result.append(mask)
+    return tuple(result)
+
+
+class MctsNode:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Position of the search tree.
+
+    Attributes:
+        own (int): Bitmask of the cells of the player to move.
+        opponent (int): Bitmask of the cells of the opponent, who made the last move.
+        cell (Optional[int]): Index of the cell of the last move, None for the root of a new tree.
+        parent (Optional[MctsNode]): Position before the last move.
+        children (List[MctsNode]): Expanded positions after the moves of the player to move.
+        untried (List[int]): Cells of the moves not expanded yet, in random order.
+        candidates (int): Bitmask of the cells the moves are searched among.
+        visits (int): Number of the playouts passed through the position.
+        reward (float): Sum of the rewards of the playouts for the player who made the last move.
+        terminal (Optional[float]): Reward of the player who made the last move if it ended the game.
+    """
+
+    __slots__ = (
+        "own",
+        "opponent",
+        "cell",
+        "parent",
+        "children",
+        "untried",
+        "candidates",
+        "visits",
+        "reward",
+        "terminal",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        own: int,
+        opponent: int,
+        cell: Optional[int],
+        parent: Optional["MctsNode"],
+        candidates: int,
+        terminal: Optional[float],
+    ) -> None:
+        """
+        Initializes a MctsNode instance.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            cell (Optional[int]): Index of the cell of the last move.
+            parent (Optional[MctsNode]): Position before the last move.
+            candidates (int): Bitmask of the empty cells the moves are searched among.
+            terminal (Optional[float]): Reward of the player who made the last move if it ended the game.
+        """
+        self.own = own
+        self.opponent = opponent
+        self.cell = cell
+        self.parent = parent
+        self.children: List[MctsNode] = []
+        self.untried: List[int] = []
+        self.candidates = candidates
+        self.visits = 0
+        self.reward = 0.0
+        self.terminal = terminal
+
+
+@dataclass
+class MctsResult:
+    """
+    Data model of the system entity - MctsResult.
+
+    Attributes:
+        move (Optional[Tuple[int, int]]): Coordinates of the most visited move or None if the game is over.
+        visits (int): Number of the playouts of the move.
+        value (float): Average reward of the move, from 0 for a sure loss to 1 for a sure win.
+        iterations (int): Number of the iterations of the search in all processes.
+        tree_size (int): Number of the positions in the trees of all processes.
+        depth (int): Maximal depth in moves of the positions expanded by the search.
+        elapsed (float): Time of the search in seconds.
+        iterations_per_second (float): Speed of the search.
+    """
+
+    move: Optional[Tuple[int, int]] = field()
+    visits: int = field(default=0)
+    value: float = field(default=0.0)
+    iterations: int = field(default=0)
+    tree_size: int = field(default=0)
+    depth: int = field(default=0)
+    elapsed: float = field(default=0.0)
+    iterations_per_second: float = field(default=0.0)
+
+
+class MonteCarloTreeSearch:
+    """
+    Monte Carlo Tree Search of the moves.
+
+    A position is a pair of bitmasks of the player to move and of the opponent, where cell (x, y) is the bit number
+     x * size + y, the same layout as BitboardGameField and Solver use. Only the empty cells near the filled ones
+     are searched, see NEIGHBOURHOOD, while the playouts fill the whole game field.
+
+    Attributes:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+        exploration (float): Exploration constant of UCT.
+        workers (int): Number of the processes searching the position, every process has its own tree.
+        seed (Optional[int]): Seed of the random generators.
+        root (Optional[MctsNode]): Root of the tree of the last search, reused by the next one.
+        tree_size (int): Number of the positions in the tree.
+        depth (int): Maximal depth of the positions expanded by the last search below its root.
+        pool (Optional[Pool]): Processes of the workers, started by the first search and reused by the next ones.
+
+    Methods:
+        __init__(self, size=FIELD_SIZE, win_length=WIN_LENGTH, exploration=EXPLORATION, workers=1, seed=None,
+         cancelled=None):
+            Initializes a MonteCarloTreeSearch instance.
+        search(self, own, opponent, iterations=None, time_limit=None) -> MctsResult:
+            Searches the best move of the position.
+        get_root_statistics(self) -> Dict[int, Tuple[int, float]]:
+            Gets the visits and the rewards of the moves of the root.
+        cancel(self):
+            Stops the running search.
+        close(self):
+            Stops the processes of the workers.
+        run(self, own, opponent, iterations, time_limit) -> int:
+            Grows the tree of the position.
+        __move_root(self, own, opponent):
+            Makes the position the root of the tree.
+        __expand(self, node):
+            Adds the position after the next untried move.
+        __make_node(self, own, opponent, cell, parent):
+            Makes the position after the move.
+        __play_out(self, node):
+            Plays the position out by random moves.
+        __is_win(self, marks, cell):
+            Checks if the marks contain a winning line passing through the cell.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        size: int = FIELD_SIZE,
+        win_length: int = WIN_LENGTH,
+        exploration: float = EXPLORATION,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        cancelled: Optional[ProcessEvent] = None,
+    ) -> None:
+        """
+        Initializes a MonteCarloTreeSearch instance.
+
+        Args:
+            size (int): Length of the side of the game field.
+            win_length (int): Number of marks in a row required to win.
+            exploration (float): Exploration constant of UCT.
+            workers (int): Number of the processes searching the position.
+            seed (Optional[int]): Seed of the random generators, the process number is added in every worker.
+            cancelled (Optional[ProcessEvent]): Event stopping the search, shared with the processes of the workers.
+             A new one is made by default.
+        """
+        if not 0 < win_length <= size:
+            raise ValueError(f"Win length should be between 1 and {size}")
+        if workers < 1:
+            raise ValueError("Number of the workers should be positive")
+        self.size = size
+        self.win_length = win_length
+        self.exploration = exploration
+        self.workers = workers
+        self.seed = seed
+        self.root: Optional[MctsNode] = None
+        self.tree_size = 0
+        self.depth = 0
+        self.pool: Optional[Pool] = None
+        self._cancelled: Union[threading.Event, ProcessEvent]
+        if cancelled is not None:
+            self._cancelled = cancelled
+        elif workers > 1:
+            self._cancelled = multiprocessing.Event()
+        else:
+            self._cancelled = threading.Event()
+        self._random = random.Random(seed)
+        self._cells_number = size * size
+        self._full_mask = (1 << self._cells_number) - 1
+        self._win_masks = build_win_masks(size, win_length)
+        self._neighbour_masks = build_neighbour_masks(size)
+        self._searches = 0
+
+    def search(  # pylint: disable=too-many-locals
+        self, own: int, opponent: int, iterations: Optional[int] = None, time_limit: Optional[float] = None
+    ) -> MctsResult:
+        """
+        Searches the best move of the position. The budget is spent by every process, the workers start with the
+         new trees and the tree of this process is reused from the previous search. The processes of the workers are
+         started once and serve the next searches until the search is closed. A cancelled search returns the best
+         moves found by the processes so far.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            iterations (Optional[int]): Number of the iterations of every process.
+            time_limit (Optional[float]): Time of the search in seconds, TIME_LIMIT if neither budget is set.
+
+        Returns:
+            MctsResult: Most visited move and the metrics of the search.
+        """
+        if iterations is None and time_limit is None:
+            time_limit = TIME_LIMIT
+        started_at = time.perf_counter()
+        self._searches += 1
+        self._cancelled.clear()
+        worker_results = []
+        if self.workers > 1:
+            tasks = [
+                (
+                    self.size,
+                    self.win_length,
+                    self.exploration,
+                    None if self.seed is None else self.seed + self._searches * self.workers + i,
+                    own,
+                    opponent,
+                    iterations,
+                    time_limit,
+                )
+                for i in range(1, self.workers)
+            ]
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+                    len(tasks), initializer=start_worker, initargs=(self._cancelled,)
+                )
+            pending = self.pool.map_async(search_position, tasks)
+            total_iterations = self.run(own, opponent, iterations, time_limit)
+            worker_results = pending.get()
+        else:
+            total_iterations = self.run(own, opponent, iterations, time_limit)
+        statistics = self.get_root_statistics()
+        tree_size = self.tree_size
+        depth = self.depth
+        for worker_statistics, worker_iterations, worker_tree_size, worker_depth in worker_results:
+            for cell, (visits, reward) in worker_statistics.items():
+                current_visits, current_reward = statistics.get(cell, (0, 0.0))
+                statistics[cell] = current_visits + visits, current_reward + reward
+            total_iterations += worker_iterations
+            tree_size += worker_tree_size
+            depth = max(depth, worker_depth)
+        elapsed = time.perf_counter() - started_at
+        result = MctsResult(
+            move=None,
+            iterations=total_iterations,
+            tree_size=tree_size,
+            depth=depth,
+            elapsed=elapsed,
+            iterations_per_second=total_iterations / elapsed if elapsed > 0 else 0.0,
+        )
+        if statistics:
+            cell, (result.visits, reward) = max(statistics.items(), key=lambda item: item[1][0])
+            result.move = cell // self.size, cell % self.size
+            result.value = reward / result.visits if result.visits else 0.0
+        return result
+
+    def get_root_statistics(self) -> Dict[int, Tuple[int, float]]:
+        """
+        Gets the visits and the rewards of the moves of the root.
+
+        Returns:
+            Dict[int, Tuple[int, float]]: Number of the playouts and the sum of their rewards by the cells of the moves.
+        """
+        if self.root is None:
+            return {}
+        return {i.cell: (i.visits, i.reward) for i in self.root.children if i.cell is not None}
+
+    def cancel(self) -> None:
+        """
+        Stops the running search, e.g. from another thread. The event is shared with the workers, so they stop too.
+        """
+        self._cancelled.set()
+
+    def close(self) -> None:
+        """
+        Stops the processes of the workers, e.g. at the end of the game. The next search starts them again.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def run(self, own: int, opponent: int, iterations: Optional[int], time_limit: Optional[float]) -> int:
+        """
+        Grows the tree of the position until the budget is spent. Every iteration descends the tree by UCT, expands
+         one new position, plays it out and propagates the reward back to the root, the reward of every position is
+         kept for the player who made its last move.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            iterations (Optional[int]): Number of the iterations, unlimited if None.
+            time_limit (Optional[float]): Time of the search in seconds, unlimited if None.
+
+        Returns:
+            int: Number of the iterations made.
+        """
+        root = self.__move_root(own, opponent)
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.depth = 0
+        result = 0
+        while iterations is None or result < iterations:
+            if result % TIME_CHECK_INTERVAL == 0 and (
+                self._cancelled.is_set() or deadline is not None and time.perf_counter() >= deadline
+            ):
+                break
+            if root.terminal is not None or not (root.untried or root.children):
+                break
+            node = root
+            depth = 0
+            while not node.untried and node.children:
+                depth += 1
+                log_visits = math.log(node.visits)
+                node = max(
+                    node.children,
+                    key=lambda child: child.reward / child.visits
+                    + self.exploration * math.sqrt(log_visits / child.visits),
+                )
+            if node.untried:
+                node = self.__expand(node)
+                depth += 1
+            self.depth = max(self.depth, depth)
+            reward = node.terminal if node.terminal is not None else self.__play_out(node)
+            current: Optional[MctsNode] = node
+            while current is not None:
+                current.visits += 1
+                current.reward += reward
+                reward = WIN - reward
+                current = current.parent
+            result += 1
+        return result
+
+    def __move_root(self, own: int, opponent: int) -> MctsNode:
+        """
+        Makes the position the root of the tree. The position is looked for among the root of the last search and
+         the positions one and two moves below it, then the rest of the tree is dropped. A new tree is started if
+         the position is not found.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+
+        Returns:
+            MctsNode: Root of the tree.
+        """
+        found = None
+        if self.root is not None:
+            levels = [[self.root], self.root.children, [j for i in self.root.children for j in i.children]]
+            found = next((j for i in levels for j in i if j.own == own and j.opponent == opponent), None)
+        if found is None:
+            self.root = self.__make_node(own, opponent, None, None)
+            self.tree_size = 1
+            return self.root
+        found.parent = None
+        self.root = found
+        self.tree_size = 0
+        stack = [found]
+        while stack:
+            node = stack.pop()
+            self.tree_size += 1
+            stack.extend(node.children)
+        return found
+
+    def __expand(self, node: MctsNode) -> MctsNode:
+        """
+        Adds the position after the next untried move of the position.
+
+        Args:
+            node (MctsNode): Position with the untried moves.
+
+        Returns:
+            MctsNode: New position.
+        """
+        cell = node.untried.pop()
+        child = self.__make_node(node.opponent, node.own | 1 << cell, cell, node)
+        node.children.append(child)
+        self.tree_size += 1
+        return child
+
+    def __make_node(self, own: int, opponent: int, cell: Optional[int], parent: Optional[MctsNode]) -> MctsNode:
+        """
+        Makes the position after the move, its candidate moves are the empty cells near the filled ones.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent, who made the move.
+            cell (Optional[int]): Index of the cell of the move, None for a new root.
+            parent (Optional[MctsNode]): Position before the move.
+
+        Returns:
+            MctsNode: Position after the move.
+        """
+        occupied = own | opponent
+        terminal = None
+        if cell is not None and self.__is_win(opponent, cell):
+            terminal = WIN
+        elif occupied == self._full_mask:
+            terminal = DRAW
+        if parent is not None and cell is not None:
+            candidates = (parent.candidates | self._neighbour_masks[cell]) & ~occupied
+        elif occupied:
+            candidates = 0
+            for i in range(self._cells_number):
+                if occupied >> i & 1:
+                    candidates |= self._neighbour_masks[i]
+            candidates &= ~occupied
+        else:
+            candidates = 1 << (self.size // 2 * self.size + self.size // 2)
+        if not candidates:
+            candidates = self._full_mask & ~occupied
+        result = MctsNode(own, opponent, cell, parent, candidates, terminal)
+        if terminal is None:
+            result.untried = [i for i in range(self._cells_number) if candidates >> i & 1]
+            self._random.shuffle(result.untried)
+        return result
+
+    def __play_out(self, node: MctsNode) -> float:
+        """
+        Plays the position out by random moves of both players until one of them wins or the game field is filled.
+
+        Args:
+            node (MctsNode): Position to play out.
+
+        Returns:
+            float: Reward of the player who made the last move of the position.
+        """
+        occupied = node.own | node.opponent
+        cells = [i for i in range(self._cells_number) if not occupied >> i & 1]
+        self._random.shuffle(cells)
+        marks = [node.own, node.opponent]
+        for ply, cell in enumerate(cells):
+            player = ply & 1
+            marks[player] |= 1 << cell
+            if self.__is_win(marks[player], cell):
+                return LOSS if player == 0 else WIN
+        return DRAW
+
+    def __is_win(self, marks: int, cell: int) -> bool:
+        """
+        Checks if the marks contain a winning line passing through the cell.
+
+        Args:
+            marks (int): Bitmask of the cells of the player.
+            cell (int): Index of the last filled cell.
+
+        Returns:
+            bool: True if the player wins.
+        """
+        return any(marks & mask == mask for mask in self._win_masks[cell])
+
+
+def start_worker(cancelled: ProcessEvent) -> None:
+    """
+    Initializes the worker process of the search, the event is passed to the worker when its process is started.
+
+    Args:
+        cancelled (ProcessEvent): Event cancelling the searches, set by the process which started the worker.
+    """
+    global worker_cancelled  # pylint: disable=global-statement,invalid-name
+    worker_cancelled = cancelled
+
+
+def search_position(
+    task: Tuple[int, int, float, Optional[int], int, int, Optional[int], Optional[float]]
+) -> Tuple[Dict[int, Tuple[int, float]], int, int, int]:
+    """
+    Searches the position in a worker process with a new tree, the search stops when the event of the worker is set.
+
+    Args:
+        task (Tuple[int, int, float, Optional[int], int, int, Optional[int], Optional[float]]): Size of the game
+         field, win length, exploration constant, seed, bitmasks of the player to move and of the opponent,
+         iterations and time limit of the search.
+
+    Returns:
+        Tuple[Dict[int, Tuple[int, float]], int, int, int]: Visits and rewards of the moves of the root, number of
+         the iterations, size and depth of the tree.
+    """
+    size, win_length, exploration, seed, own, opponent, iterations, time_limit = task
+    tree_search = MonteCarloTreeSearch(size, win_length, exploration, seed=seed, cancelled=worker_cancelled)
+    result = tree_search.run(own, opponent, iterations, time_limit)
+    return tree_search.get_root_statistics(), result, tree_search.tree_size, tree_search.depth
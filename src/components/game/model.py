@@ -1,9 +1,19 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 from src.database.model.game import Game, GameResult, LeagueSeason
 from src.database.model.user import User
 
+FIELD_SIZE = 3
+WIN_LENGTH = 3
+MAX_FIELD_SIZE = 19
+MAX_WIN_LENGTH = 5
+# Time of the search of a computer move in milliseconds
+MOVE_TIME_LIMIT = 1000
+MIN_MOVE_TIME_LIMIT = 10
+MAX_MOVE_TIME_LIMIT = 60000
+
 
 class GameResultType:
     GameResult: GameResult
@@ -15,11 +25,66 @@ class PlayerType(GameResultType):
     LeagueSeason: LeagueSeason
 
 
+class PastGameType(NamedTuple):
+    id: int
+    players: str
+    winner: Optional[str]
+
+
+class UserSummaryType(NamedTuple):
+    id: int
+    nickname: str
+
+
+class RankingType(NamedTuple):
+    nickname: str
+    total_games: int
+    win: int
+    loss: int
+    draw: int
+    pts: int
+    rating: float
+
+
 class GameState:
     is_end: bool = False
     winner: Optional[User] = None
 
 
+def get_move_time_limit(league: LeagueSeason) -> float:
+    """
+    Gets the time of the search of a computer move in the league.
+
+    Args:
+        league (LeagueSeason): League defining the variant of the game.
+
+    Returns:
+        float: Time in seconds, MOVE_TIME_LIMIT if the league does not set it.
+    """
+    return (league.move_time_limit or MOVE_TIME_LIMIT) / 1000
+
+
+def render_field(size: int, show_cell: Callable[[int, int], str]) -> str:
+    """
+    Renders the game field as a text table.
+
+    Args:
+        size (int): Length of the side of the game field.
+        show_cell (Callable[[int, int], str]): Function returning the text of the cell by its coordinates.
+
+    Returns:
+        str: Text of the game field ready to be printed.
+    """
+    width = max(3, len(f"{size - 1},{size - 1}"))
+    separator = "+" + "+".join("-" * (width + 2) for _ in range(size)) + "+"
+    rows = [separator]
+    for x_coordinate in range(size):
+        cells = (show_cell(x_coordinate, y_coordinate).center(width) for y_coordinate in range(size))
+        rows.append("| " + " | ".join(cells) + " |")
+        rows.append(separator)
+    return "\n" + "".join(f"        {row}\n" for row in rows) + "        "
+
+
 @dataclass
 class Cell:
     """
@@ -43,41 +108,54 @@ class GameField:
 
     Attributes:
         game_metadata (List): List of game metadata.
+        size (int): Length of the side of the game field (default: FIELD_SIZE).
+        win_length (int): Number of marks in a row required to win (default: WIN_LENGTH).
         _field (List[List[Cell]]): 2D list representing the game field (initialized later).
+        _filled_cells (int): Running counter of the filled cells (initialized later).
 
     Methods:
         __post_init__(self):
             Initializes the GameField instance.
         __get_cell(self, x, y):
             Gets the value contained in the specified cell.
-        set_cell_value(self, x, y, value) -> Optional[User]:
+        set_cell_value(self, x, y, value) -> GameState:
             Registers a custom decision on the game field.
-        __create_field():
+        get_marks(self, value) -> Tuple[int, int]:
+            Gets the bitmasks of the cells filled by the player and by the opponent.
+        __create_field(self):
             Creates the game field.
         show_field(self):
             Renders the current state of the game field.
         __show_cell(self, x, y):
             Post-processes values for rendering.
-        __calculate_win_positions(self):
+        __calculate_win_positions(self, cell):
             Entry point into the calculation of winning positions or positions of a draw.
-        __calculate_win_positions_by_rows(self, player):
+        __calculate_win_positions_by_rows(self, cell):
             Calculates winning positions horizontally.
-        __calculate_win_positions_by_columns(self, player):
+        __calculate_win_positions_by_columns(self, cell):
             Calculates winning positions vertically.
-        __calculate_win_positions_by_diagonals(self, player):
+        __calculate_win_positions_by_diagonals(self, cell):
             Calculates winning positions diagonally.
+        __calculate_line_length(self, cell, x_step, y_step):
+            Counts the marks in a row on the line passing through the cell.
         __calculate_draw_game(self):
             Calculates draw positions.
     """
 
     game_metadata: List = field(default_factory=list)
+    size: int = field(default=FIELD_SIZE)
+    win_length: int = field(default=WIN_LENGTH)
     _field: List[List[Cell]] = field(init=False)
+    _filled_cells: int = field(init=False)
 
     def __post_init__(self) -> None:
         """
         Initializes a GameField instance.
         """
+        if not 0 < self.win_length <= self.size:
+            raise ValueError(f"Win length should be between 1 and {self.size}")
         self._field = self.__create_field()
+        self._filled_cells = 0
 
     def __get_cell(self, x_coordinate: int, y_coordinate: int) -> Cell:
         """
@@ -90,6 +168,8 @@ class GameField:
         Returns:
             Cell: Returns the content of the requested cell.
         """
+        if not (0 <= x_coordinate < self.size and 0 <= y_coordinate < self.size):
+            raise ValueError("This cell is out of the game field, please, choose another")
         return self._field[x_coordinate][y_coordinate]
 
     def set_cell_value(self, x_coordinate: int, y_coordinate: int, value: str) -> GameState:
@@ -102,58 +182,56 @@ class GameField:
             value (str): The user's symbol.
 
         Returns:
-            Optional[User]: Winner User object or None if played a draw.
+            GameState: State of the game after the decision.
         """
         cell = self.__get_cell(x_coordinate, y_coordinate)
         if not cell.value:
-            self.__get_cell(x_coordinate, y_coordinate).value = value
-            result = self.__calculate_win_positions()
+            cell.value = value
+            self._filled_cells += 1
+            result = self.__calculate_win_positions(cell)
         else:
             raise ValueError("This cell is filled, please, choose another")
         return result
 
-    @staticmethod
-    def __create_field() -> List[List[Cell]]:
+    def get_marks(self, value: str) -> Tuple[int, int]:
+        """
+        Gets the bitmasks of the cells filled by the player and by the opponent, cell (x, y) is the bit number
+         x * size + y.
+
+        Args:
+            value (str): The player's symbol.
+
+        Returns:
+            Tuple[int, int]: Bitmasks of the player's and the opponent's cells.
+        """
+        own, opponent = 0, 0
+        for row in self._field:
+            for cell in row:
+                if cell.value is not None:
+                    bit = 1 << (cell.x_coordinate * self.size + cell.y_coordinate)
+                    if cell.value == value:
+                        own |= bit
+                    else:
+                        opponent |= bit
+        return own, opponent
+
+    def __create_field(self) -> List[List[Cell]]:
         """
         Creates the game field.
 
         Returns:
             List[List[Cell]]: Game field.
         """
-
         return [
-            [
-                Cell(x_coordinate=0, y_coordinate=0),
-                Cell(x_coordinate=0, y_coordinate=1),
-                Cell(x_coordinate=0, y_coordinate=2),
-            ],
-            [
-                Cell(x_coordinate=1, y_coordinate=0),
-                Cell(x_coordinate=1, y_coordinate=1),
-                Cell(x_coordinate=1, y_coordinate=2),
-            ],
-            [
-                Cell(x_coordinate=2, y_coordinate=0),
-                Cell(x_coordinate=2, y_coordinate=1),
-                Cell(x_coordinate=2, y_coordinate=2),
-            ],
+            [Cell(x_coordinate=x_coordinate, y_coordinate=y_coordinate) for y_coordinate in range(self.size)]
+            for x_coordinate in range(self.size)
         ]
 
     def show_field(self) -> None:
         """
         Renders the current state of the game field.
         """
-        print(
-            f"""
-        +-----+-----+-----+
-        | {self.__show_cell(0, 0)} | {self.__show_cell(0, 1)} | {self.__show_cell(0, 2)} |
-        +-----+-----+-----+
-        | {self.__show_cell(1, 0)} | {self.__show_cell(1, 1)} | {self.__show_cell(1, 2)} |
-        +-----+-----+-----+
-        | {self.__show_cell(2, 0)} | {self.__show_cell(2, 1)} | {self.__show_cell(2, 2)} |
-        +-----+-----+-----+
-        """
-        )
+        print(render_field(self.size, self.__show_cell))
 
     def __show_cell(self, x_coordinate: int, y_coordinate: int) -> str:
         """
@@ -171,90 +249,98 @@ class GameField:
             return f" {cell.value} "
         return ",".join([str(x_coordinate), str(y_coordinate)])
 
-    def __calculate_win_positions(self) -> GameState:
+    def __calculate_win_positions(self, cell: Cell) -> GameState:
         """
         Entry point into the calculation of winning positions or positions of a draw.
+        Only the lines passing through the last filled cell can be completed by it, so only they are inspected.
+
+        Args:
+            cell (Cell): The last filled cell.
 
         Returns:
-            Union[User, bool]: Winner User object or False if played a draw.
+            GameState: State of the game after the decision.
         """
         result = GameState()
-        game_state_result = []
-
-        for player in self.game_metadata:
-            game_state_result.append(self.__calculate_win_positions_by_rows(player=player))
-            game_state_result.append(self.__calculate_win_positions_by_columns(player=player))
-            game_state_result.append(self.__calculate_win_positions_by_diagonals(player=player))
-            if any(game_state_result):
-                print(
-                    f"""
-        {player.User.nickname} wins!"""
-                )
-                result.is_end = True
-                result.winner = player.User
-                break
-
-            if self.__calculate_draw_game():
-                print(
-                    """
-        Played a draw!"""
-                )
-                result.is_end = True
-                result.winner = None
-                break
+
+        if (
+            self.__calculate_win_positions_by_rows(cell)
+            or self.__calculate_win_positions_by_columns(cell)
+            or self.__calculate_win_positions_by_diagonals(cell)
+        ):
+            player = next((i for i in self.game_metadata if i.GameResult.symbol == cell.value), None)
+            result.is_end = True
+            result.winner = player.User if player is not None else None
+        elif self.__calculate_draw_game():
+            result.is_end = True
+            result.winner = None
         return result
 
-    def __calculate_win_positions_by_rows(self, player: PlayerType) -> bool:
+    def __calculate_win_positions_by_rows(self, cell: Cell) -> bool:
         """
         Calculates winning positions only horizontally.
 
         Args:
-            player: User representing a player.
+            cell (Cell): The last filled cell.
 
         Returns:
             bool: Boolean with the result of the calculation of winning positions.
         """
-        result = []
-        for row in self._field:
-            result.append(all(player.GameResult.symbol == cell.value for cell in row))
-        return any(result)
+        return self.__calculate_line_length(cell, 0, 1) >= self.win_length
 
-    def __calculate_win_positions_by_columns(self, player: PlayerType) -> bool:
+    def __calculate_win_positions_by_columns(self, cell: Cell) -> bool:
         """
         Calculates winning positions only vertically.
 
         Args:
-            player: User representing a player.
+            cell (Cell): The last filled cell.
 
         Returns:
             bool: Boolean with the result of the calculation of winning positions.
         """
-        result = []
-        columns = []
-        for column_number in range(3):
-            columns.append([row[column_number] for row in self._field])
-        for column in columns:
-            result.append(all(player.GameResult.symbol == cell.value for cell in column))
-        return any(result)
+        return self.__calculate_line_length(cell, 1, 0) >= self.win_length
 
-    def __calculate_win_positions_by_diagonals(self, player: PlayerType) -> bool:
+    def __calculate_win_positions_by_diagonals(self, cell: Cell) -> bool:
         """
         Calculates winning positions only diagonally.
 
         Args:
-            player: User representing a player.
+            cell (Cell): The last filled cell.
 
         Returns:
             bool: Boolean with the result of the calculation of winning positions.
         """
-        result = []
-        diagonal_1 = [[self._field[0][0], self._field[1][1], self._field[2][2]]]
-        diagonal_2 = [[self._field[2][0], self._field[1][1], self._field[0][2]]]
-        for diagonal in diagonal_1:
-            result.append(all(player.GameResult.symbol == cell.value for cell in diagonal))
-        for diagonal in diagonal_2:
-            result.append(all(player.GameResult.symbol == cell.value for cell in diagonal))
-        return any(result)
+        return (
+            self.__calculate_line_length(cell, 1, 1) >= self.win_length
+            or self.__calculate_line_length(cell, 1, -1) >= self.win_length
+        )
+
+    def __calculate_line_length(self, cell: Cell, x_step: int, y_step: int) -> int:
+        """
+        Counts the marks in a row on the line passing through the cell in both directions.
+        The count stops at win_length, so it inspects no more than 2 * win_length cells.
+
+        Args:
+            cell (Cell): The last filled cell.
+            x_step (int): Step of the line along the X coordinate.
+            y_step (int): Step of the line along the Y coordinate.
+
+        Returns:
+            int: Number of the marks in a row including the cell.
+        """
+        result = 1
+        for direction in (1, -1):
+            x_coordinate = cell.x_coordinate + x_step * direction
+            y_coordinate = cell.y_coordinate + y_step * direction
+            while (
+                result < self.win_length
+                and 0 <= x_coordinate < self.size
+                and 0 <= y_coordinate < self.size
+                and self._field[x_coordinate][y_coordinate].value == cell.value
+            ):
+                result += 1
+                x_coordinate += x_step * direction
+                y_coordinate += y_step * direction
+        return result
 
     def __calculate_draw_game(self) -> bool:
         """
@@ -263,7 +349,171 @@ class GameField:
         Returns:
             bool: Boolean with the result of the calculation of draw positions.
         """
-        result = []
-        for row in self._field:
-            result.append(all(cell.value is not None for cell in row))
-        return all(result)
+        return self._filled_cells == self.size * self.size
+
+
+@lru_cache(maxsize=None)
+def build_win_masks(size: int, win_length: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Precomputes the winning masks of the bitboard grouped by the cells they pass through.
+    The result is cached, so the masks are built once for every combination of the size and the win length.
+
+    Cell (x, y) is stored in the bit number x * size + y. Every run of win_length cells in a row, a column or
+     a diagonal is turned into one mask and registered for each cell it covers.
+
+    Args:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: Winning masks for every cell index of the game field.
+    """
+    result: List[List[int]] = [[] for _ in range(size * size)]
+    directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+    for x_coordinate in range(size):
+        for y_coordinate in range(size):
+            for x_step, y_step in directions:
+                x_last = x_coordinate + x_step * (win_length - 1)
+                y_last = y_coordinate + y_step * (win_length - 1)
+                if not (0 <= x_last < size and 0 <= y_last < size):
+                    continue
+                cells = [(x_coordinate + x_step * i) * size + y_coordinate + y_step * i for i in range(win_length)]
+                mask = sum(1 << cell for cell in cells)
+                for cell in cells:
+                    result[cell].append(mask)
+    return tuple(tuple(masks) for masks in result)
+
+
+@dataclass
+class BitboardGameField:
+    """
+    Data model of the system entity - BitboardGameField.
+
+    An alternative engine of the game field that keeps the marks of every player as an integer bitmask, where
+     cell (x, y) is the bit number x * size + y. A win is detected by a single AND against every precomputed
+     winning mask passing through the last filled cell, so no lists are rebuilt on a move.
+    It keeps the public contract of GameField and can be used by GameSession in its place.
+
+    Attributes:
+        game_metadata (List): List of game metadata.
+        size (int): Length of the side of the game field (default: FIELD_SIZE).
+        win_length (int): Number of marks in a row required to win (default: WIN_LENGTH).
+        _marks (Dict[str, int]): Bitmask of the filled cells for every player's symbol (initialized later).
+        _occupied (int): Bitmask of all filled cells (initialized later).
+        _win_masks (Tuple[Tuple[int, ...], ...]): Winning masks for every cell index (initialized later).
+        _full_mask (int): Bitmask of the completely filled game field (initialized later).
+
+    Methods:
+        __post_init__(self):
+            Initializes the BitboardGameField instance.
+        set_cell_value(self, x, y, value) -> GameState:
+            Registers a custom decision on the game field.
+        get_marks(self, value) -> Tuple[int, int]:
+            Gets the bitmasks of the cells filled by the player and by the opponent.
+        show_field(self):
+            Renders the current state of the game field.
+        __show_cell(self, x, y):
+            Post-processes values for rendering.
+        __calculate_win_positions(self, value, cell_index):
+            Calculates winning positions or positions of a draw after the last decision.
+    """
+
+    game_metadata: List = field(default_factory=list)
+    size: int = field(default=FIELD_SIZE)
+    win_length: int = field(default=WIN_LENGTH)
+    _marks: Dict[str, int] = field(init=False)
+    _occupied: int = field(init=False)
+    _win_masks: Tuple[Tuple[int, ...], ...] = field(init=False, repr=False, compare=False)
+    _full_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """
+        Initializes a BitboardGameField instance.
+        """
+        if not 0 < self.win_length <= self.size:
+            raise ValueError(f"Win length should be between 1 and {self.size}")
+        self._marks = {}
+        self._occupied = 0
+        self._win_masks = build_win_masks(self.size, self.win_length)
+        self._full_mask = (1 << self.size * self.size) - 1
+
+    def set_cell_value(self, x_coordinate: int, y_coordinate: int, value: str) -> GameState:
+        """
+        Registers a custom decision on the game field.
+
+        Args:
+            x_coordinate (int): X coordinate.
+            y_coordinate (int): Y coordinate.
+            value (str): The user's symbol.
+
+        Returns:
+            GameState: State of the game after the decision.
+        """
+        if not (0 <= x_coordinate < self.size and 0 <= y_coordinate < self.size):
+            raise ValueError("This cell is out of the game field, please, choose another")
+        cell_index = x_coordinate * self.size + y_coordinate
+        bit = 1 << cell_index
+        if self._occupied & bit:
+            raise ValueError("This cell is filled, please, choose another")
+        self._occupied |= bit
+        self._marks[value] = self._marks.get(value, 0) | bit
+        return self.__calculate_win_positions(value, cell_index)
+
+    def get_marks(self, value: str) -> Tuple[int, int]:
+        """
+        Gets the bitmasks of the cells filled by the player and by the opponent.
+
+        Args:
+            value (str): The player's symbol.
+
+        Returns:
+            Tuple[int, int]: Bitmasks of the player's and the opponent's cells.
+        """
+        own = self._marks.get(value, 0)
+        return own, self._occupied & ~own
+
+    def show_field(self) -> None:
+        """
+        Renders the current state of the game field.
+        """
+        print(render_field(self.size, self.__show_cell))
+
+    def __show_cell(self, x_coordinate: int, y_coordinate: int) -> str:
+        """
+        Post-processes values for rendering.
+
+        Args:
+            x_coordinate (int): X coordinate.
+            y_coordinate (int): Y coordinate.
+
+        Returns:
+            str: A string with the value to be displayed when rendering the game field.
+        """
+        bit = 1 << (x_coordinate * self.size + y_coordinate)
+        for symbol, marks in self._marks.items():
+            if marks & bit:
+                return f" {symbol} "
+        return ",".join([str(x_coordinate), str(y_coordinate)])
+
+    def __calculate_win_positions(self, value: str, cell_index: int) -> GameState:
+        """
+        Calculates winning positions or positions of a draw after the last decision.
+        Only the player who made the decision can win by it, and only by a line passing through the filled cell.
+
+        Args:
+            value (str): The symbol of the player who made the last decision.
+            cell_index (int): Index of the filled cell.
+
+        Returns:
+            GameState: State of the game after the decision.
+        """
+        result = GameState()
+        marks = self._marks[value]
+        if any(marks & mask == mask for mask in self._win_masks[cell_index]):
+            player = next((i for i in self.game_metadata if i.GameResult.symbol == value), None)
+            result.is_end = True
+            result.winner = player.User if player is not None else None
+        elif self._occupied == self._full_mask:
+            result.is_end = True
+            result.winner = None
+        return result
@@ -0,0 +1,278 @@
+import logging
+import random
+import re
+from typing import Iterable, Iterator, Optional, Protocol, Tuple
+
+from src.components.game.book import OpeningBook
+from src.components.game.mcts import MctsResult, MonteCarloTreeSearch
+from src.components.game.solver import Solver, SolverResult
+
+logger = logging.getLogger(__name__)
+
+
+class GameFieldType(Protocol):
+    size: int
+    win_length: int
+
+    def get_marks(self, value: str) -> Tuple[int, int]:
+        ...
+
+
+class Player(Protocol):
+    def choose_move(self, game_field: GameFieldType, value: str) -> Optional[Tuple[int, int]]:
+        ...
+
+
+class HumanPlayer:
+    """
+    Player entering the moves from the keyboard.
+
+    Methods:
+        choose_move(self, game_field, value) -> Optional[Tuple[int, int]]:
+            Requests the move from the user.
+    """
+
+    @staticmethod
+    def choose_move(
+        game_field: GameFieldType, value: str  # pylint: disable=unused-argument
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Requests the move from the user.
+
+        Args:
+            game_field (GameFieldType): Current game field.
+            value (str): The player's symbol.
+
+        Returns:
+            Optional[Tuple[int, int]]: Coordinates of the chosen cell or None if the input is not two numbers
+             separated by a comma.
+        """
+        player_choice = input("Select field with two digits and comma between: ")
+        if coordinates := re.fullmatch(r"\s*(\d+)\s*,\s*(\d+)\s*", player_choice):
+            return int(coordinates.group(1)), int(coordinates.group(2))
+        return None
+
+
+class ScriptedPlayer:
+    """
+    Player making the moves from a prepared sequence, e.g. a recorded game or a test scenario.
+
+    Methods:
+        __init__(self, moves):
+            Initializes a ScriptedPlayer instance.
+        choose_move(self, game_field, value) -> Optional[Tuple[int, int]]:
+            Takes the next move from the sequence.
+    """
+
+    def __init__(self, moves: Iterable[Optional[Tuple[int, int]]]) -> None:
+        """
+        Initializes a ScriptedPlayer instance.
+
+        Args:
+            moves (Iterable[Optional[Tuple[int, int]]]): Coordinates of the moves, None stands for a wrong choice.
+        """
+        self._moves: Iterator[Optional[Tuple[int, int]]] = iter(moves)
+
+    def choose_move(
+        self, game_field: GameFieldType, value: str  # pylint: disable=unused-argument
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Takes the next move from the sequence.
+
+        Args:
+            game_field (GameFieldType): Current game field.
+            value (str): The player's symbol.
+
+        Returns:
+            Optional[Tuple[int, int]]: Coordinates of the chosen cell or None if the sequence is exhausted.
+        """
+        return next(self._moves, None)
+
+
+class RandomPlayer:
+    """
+    Player choosing a random empty cell, e.g. for the simulation of the games.
+
+    Methods:
+        __init__(self, seed=None):
+            Initializes a RandomPlayer instance.
+        choose_move(self, game_field, value) -> Optional[Tuple[int, int]]:
+            Chooses a random empty cell.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        Initializes a RandomPlayer instance.
+
+        Args:
+            seed (Optional[int]): Seed of the random generator.
+        """
+        self._random = random.Random(seed)
+
+    def choose_move(self, game_field: GameFieldType, value: str) -> Optional[Tuple[int, int]]:
+        """
+        Chooses a random empty cell.
+
+        Args:
+            game_field (GameFieldType): Current game field.
+            value (str): The player's symbol.
+
+        Returns:
+            Optional[Tuple[int, int]]: Coordinates of the chosen cell or None if there are no empty cells left.
+        """
+        own, opponent = game_field.get_marks(value)
+        occupied = own | opponent
+        empty_cells = [cell for cell in range(game_field.size * game_field.size) if not occupied >> cell & 1]
+        if not empty_cells:
+            return None
+        cell = self._random.choice(empty_cells)
+        return cell // game_field.size, cell % game_field.size
+
+
+class ComputerPlayer:
+    """
+    Computer player choosing its moves with the perfect play solver.
+    The moves of the variants covered by the opening book are looked up in the book instead of searching. With a time
+     limit the solver deepens its search iteratively and plays the best move found when the time expires.
+
+    Attributes:
+        solver (Solver): Solver of the positions, its transposition table is shared between the moves of the game.
+        opening_book (Optional[OpeningBook]): Opening book used when it covers the variant of the game.
+        time_limit (Optional[float]): Time of the search of a move in seconds, None searches to the end of the game.
+        last_result (Optional[SolverResult]): Result of the search for the last chosen move.
+
+    Methods:
+        __init__(self, solver, opening_book=None, time_limit=None):
+            Initializes a ComputerPlayer instance.
+        choose_move(self, game_field, value) -> Tuple[int, int]:
+            Chooses the move for the player.
+        cancel(self):
+            Stops the running search of the move.
+    """
+
+    def __init__(
+        self, solver: Solver, opening_book: Optional[OpeningBook] = None, time_limit: Optional[float] = None
+    ) -> None:
+        """
+        Initializes a ComputerPlayer instance.
+
+        Args:
+            solver (Solver): Solver of the positions.
+            opening_book (Optional[OpeningBook]): Opening book of the solved positions.
+            time_limit (Optional[float]): Time of the search of a move in seconds.
+        """
+        self.solver = solver
+        self.time_limit = time_limit
+        if opening_book is not None and not opening_book.covers(solver.size, solver.win_length):
+            opening_book = None
+        self.opening_book = opening_book
+        self.last_result: Optional[SolverResult] = None
+
+    def choose_move(self, game_field: GameFieldType, value: str) -> Tuple[int, int]:
+        """
+        Chooses the move for the player.
+
+        Args:
+            game_field (GameFieldType): Current game field.
+            value (str): The player's symbol.
+
+        Returns:
+            Tuple[int, int]: Coordinates of the chosen cell.
+        """
+        own, opponent = game_field.get_marks(value)
+        self.last_result = self.opening_book.lookup(own, opponent) if self.opening_book is not None else None
+        if self.last_result is None:
+            self.last_result = self.solver.solve(own, opponent, self.time_limit)
+            logger.info(
+                "Solver chose %s: depth %d%s, %d nodes, %.0f nodes/s",
+                self.last_result.move,
+                self.last_result.depth,
+                "" if self.last_result.exact else " (not proven)",
+                self.last_result.nodes,
+                self.last_result.nodes / self.last_result.elapsed if self.last_result.elapsed > 0 else 0.0,
+            )
+        if self.last_result.move is None:
+            raise ValueError("There are no empty cells left on the game field")
+        return self.last_result.move
+
+    def cancel(self) -> None:
+        """
+        Stops the running search of the move, e.g. from another thread, the best move found so far is played.
+        """
+        self.solver.cancel()
+
+
+class MctsPlayer:
+    """
+    Computer player choosing its moves with the Monte Carlo Tree Search, e.g. on the fields too large for the solver.
+
+    Attributes:
+        tree_search (MonteCarloTreeSearch): Search of the moves, its tree is reused between the moves of the game.
+        iterations (Optional[int]): Number of the iterations of the search of a move.
+        time_limit (Optional[float]): Time of the search of a move in seconds.
+        last_result (Optional[MctsResult]): Result of the search for the last chosen move.
+
+    Methods:
+        __init__(self, tree_search, iterations=None, time_limit=None):
+            Initializes a MctsPlayer instance.
+        choose_move(self, game_field, value) -> Tuple[int, int]:
+            Chooses the move for the player.
+        cancel(self):
+            Stops the running search of the move.
+        close(self):
+            Stops the processes of the search at the end of the game.
+    """
+
+    def __init__(
+        self, tree_search: MonteCarloTreeSearch, iterations: Optional[int] = None, time_limit: Optional[float] = None
+    ) -> None:
+        """
+        Initializes a MctsPlayer instance.
+
+        Args:
+            tree_search (MonteCarloTreeSearch): Search of the moves.
+            iterations (Optional[int]): Number of the iterations of the search of a move.
+            time_limit (Optional[float]): Time of the search of a move in seconds, see TIME_LIMIT of the search if
+             neither budget is set.
+        """
+        self.tree_search = tree_search
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.last_result: Optional[MctsResult] = None
+
+    def choose_move(self, game_field: GameFieldType, value: str) -> Tuple[int, int]:
+        """
+        Chooses the move for the player.
+
+        Args:
+            game_field (GameFieldType): Current game field.
+            value (str): The player's symbol.
+
+        Returns:
+            Tuple[int, int]: Coordinates of the chosen cell.
+        """
+        own, opponent = game_field.get_marks(value)
+        self.last_result = self.tree_search.search(own, opponent, self.iterations, self.time_limit)
+        logger.info(
+            "Monte Carlo Tree Search chose %s: depth %d, %d iterations, %.0f iterations/s, tree size %d",
+            self.last_result.move,
+            self.last_result.depth,
+            self.last_result.iterations,
+            self.last_result.iterations_per_second,
+            self.last_result.tree_size,
+        )
+        if self.last_result.move is None:
+            raise ValueError("There are no empty cells left on the game field")
+        return self.last_result.move
+
+    def cancel(self) -> None:
+        """
+        Stops the running search of the move, e.g. from another thread, the best move found so far is played.
+        """
+        self.tree_search.cancel()
+
+    def close(self) -> None:
+        """
+        Stops the processes of the search at the end of the game.
+        """
+        self.tree_search.close()
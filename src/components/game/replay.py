@@ -0,0 +1,364 @@
+"""
+Replay of the recorded games.
+
+The moves of a game are read back from its game_user_decision rows or from its encoded moves and played on the
+ bitboard engine. The position after every ply is kept as a pair of bitmasks, so a viewer seeks to any ply in O(1)
+ instead of replaying the game from the first move. Many games are streamed in chunks by the server-side cursors,
+ so replaying a whole league season keeps only one chunk of the rows in memory, and the outcomes of their final
+ positions are evaluated together on the batch engine.
+
+A game is shown by the command:
+    python -m src.components.game.replay --game-id 1 --ply 3
+and the games of a league season are replayed by the command:
+    python -m src.components.game.replay --league-season-id 1
+"""
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import click
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.orm import scoped_session
+
+from src.components.game.batch import (
+    DRAW,
+    FIRST_WINS,
+    ONGOING,
+    SECOND_WINS,
+    SYMBOLS,
+    BatchGameField,
+)
+from src.components.game.model import BitboardGameField, build_win_masks, render_field
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import Game, GameResult, GameUserDecision, LeagueSeason
+from src.database.moves import decode_moves
+from src.settings import get_settings
+
+CHUNK_SIZE = 1000
+OUTCOME_NAMES = {
+    FIRST_WINS: f"{SYMBOLS[0]} wins",
+    SECOND_WINS: f"{SYMBOLS[1]} wins",
+    DRAW: "draw",
+    ONGOING: "unfinished",
+}
+
+
+class Position(NamedTuple):
+    ply: int
+    x_marks: int
+    o_marks: int
+    last_move: Optional[Tuple[int, int]]
+    winner: Optional[str]
+
+
+@dataclass
+class GameReplay:
+    """
+    Data model of the system entity - GameReplay.
+
+    Attributes:
+        game_id (int): Game object identifier.
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+        moves (List[Tuple[str, int, int]]): Symbol of the player and coordinates of the cell of every move.
+        positions (List[Position]): Position after every ply, the empty field is the ply 0 (initialized later).
+
+    Methods:
+        __post_init__(self):
+            Plays the moves on the bitboard engine and keeps the position after every ply.
+        seek(self, ply) -> Position:
+            Gets the position after the ply.
+        show(self, ply):
+            Renders the position after the ply.
+        __get_winner(self, game_field, symbol, cell_index) -> Optional[str]:
+            Checks whether the last move won the game.
+    """
+
+    game_id: int
+    size: int
+    win_length: int
+    moves: List[Tuple[str, int, int]]
+    positions: List[Position] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """
+        Plays the moves on the bitboard engine and keeps the position after every ply.
+        """
+        game_field = BitboardGameField(size=self.size, win_length=self.win_length)
+        self.positions = [Position(0, 0, 0, None, None)]
+        for ply, (symbol, x_coordinate, y_coordinate) in enumerate(self.moves, 1):
+            game_state = game_field.set_cell_value(x_coordinate, y_coordinate, symbol)
+            winner = None
+            if game_state.is_end:
+                winner = self.__get_winner(game_field, symbol, x_coordinate * self.size + y_coordinate)
+            x_marks, o_marks = game_field.get_marks(SYMBOLS[0])
+            self.positions.append(Position(ply, x_marks, o_marks, (x_coordinate, y_coordinate), winner))
+
+    def seek(self, ply: int) -> Position:
+        """
+        Gets the position after the ply.
+
+        Args:
+            ply (int): Number of the moves made, from 0 for the empty field to the number of the moves of the game.
+
+        Returns:
+            Position: Marks of the players, the last move and the winner after the ply.
+        """
+        if not 0 <= ply < len(self.positions):
+            raise ValueError(f"Ply should be between 0 and {len(self.positions) - 1}")
+        return self.positions[ply]
+
+    def show(self, ply: int) -> None:
+        """
+        Renders the position after the ply.
+
+        Args:
+            ply (int): Number of the moves made.
+        """
+        position = self.seek(ply)
+
+        def show_cell(x_coordinate: int, y_coordinate: int) -> str:
+            bit = 1 << (x_coordinate * self.size + y_coordinate)
+            for symbol, marks in zip(SYMBOLS, (position.x_marks, position.o_marks)):
+                if marks & bit:
+                    return f" {symbol} "
+            return ",".join([str(x_coordinate), str(y_coordinate)])
+
+        print(
+            f"""
+        Game {self.game_id}, ply {ply} of {len(self.moves)}"""
+        )
+        print(render_field(self.size, show_cell))
+        if position.winner is not None:
+            print(
+                f"""
+        {position.winner} wins!"""
+            )
+
+    def __get_winner(self, game_field: BitboardGameField, symbol: str, cell_index: int) -> Optional[str]:
+        """
+        Checks whether the last move won the game, the game also ends by a draw.
+
+        Args:
+            game_field (BitboardGameField): Game field after the move.
+            symbol (str): Symbol of the player who made the move.
+            cell_index (int): Index of the filled cell.
+
+        Returns:
+            Optional[str]: Symbol of the winner or None for a draw.
+        """
+        marks, _ = game_field.get_marks(symbol)
+        if any(marks & mask == mask for mask in build_win_masks(self.size, self.win_length)[cell_index]):
+            return symbol
+        return None
+
+
+def decode_replay_moves(moves: bytes, field_size: int, first_symbol: str) -> List[Tuple[str, int, int]]:
+    """
+    Decodes the moves encoded on the game row, the players move in turn starting from the first one.
+
+    Args:
+        moves (bytes): Encoded moves of the game.
+        field_size (int): Length of the side of the game field.
+        first_symbol (str): Symbol of the player who moved first.
+
+    Returns:
+        List[Tuple[str, int, int]]: Symbol of the player and coordinates of the cell of every move.
+    """
+    symbols = (first_symbol, SYMBOLS[1] if first_symbol == SYMBOLS[0] else SYMBOLS[0])
+    return [(symbols[ply % 2], *move) for ply, move in enumerate(decode_moves(moves, field_size))]
+
+
+def iter_replays(
+    db_session: scoped_session,
+    game_ids: Optional[Iterable[int]] = None,
+    league_season_id: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[GameReplay]:
+    """
+    Replays the games in the order of their ids. The games and the decisions are read by two queries in the same
+     order streamed in chunks by the server-side cursors and merged by the ids of the games. The passed game ids are
+     read in chunks too, so a stream of them is not collected in memory.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        game_ids (Optional[Iterable[int]]): Game object identifiers, all games by default.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+        chunk_size (int): Number of the rows fetched at once.
+
+    Yields:
+        GameReplay: Replay of every game.
+    """
+    if game_ids is None:
+        yield from iter_chunk_replays(db_session, None, league_season_id, chunk_size)
+        return
+    game_ids = iter(game_ids)
+    while chunk := list(itertools.islice(game_ids, chunk_size)):
+        yield from iter_chunk_replays(db_session, sorted(chunk), league_season_id, chunk_size)
+
+
+def iter_chunk_replays(  # pylint: disable=too-many-locals
+    db_session: scoped_session, game_ids: Optional[List[int]], league_season_id: Optional[int], chunk_size: int
+) -> Iterator[GameReplay]:
+    """
+    Replays the games selected by the filters, see iter_replays.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        game_ids (Optional[List[int]]): Game object identifiers, all games by default.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+        chunk_size (int): Number of the rows fetched at once.
+
+    Yields:
+        GameReplay: Replay of every game.
+    """
+    filters = []
+    if game_ids is not None:
+        filters.append(Game.id.in_(game_ids))
+    if league_season_id is not None:
+        filters.append(Game.league_season_id == league_season_id)
+    first_symbol = (
+        select(GameResult.symbol)
+        .where(GameResult.game_id == Game.id, GameResult.user_id == Game.first_user_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    games = (
+        db_session.query(Game.id, Game.moves, LeagueSeason.field_size, LeagueSeason.win_length, first_symbol)
+        .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+        .filter(*filters)
+        .order_by(Game.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    decisions = (
+        db_session.query(
+            GameUserDecision.game_id, GameResult.symbol, GameUserDecision.coordinate_x, GameUserDecision.coordinate_y
+        )
+        .join(Game, Game.id == GameUserDecision.game_id)
+        .join(
+            GameResult,
+            and_(GameResult.game_id == GameUserDecision.game_id, GameResult.user_id == GameUserDecision.user_id),
+        )
+        .filter(Game.moves.is_(None), *filters)
+        .order_by(GameUserDecision.game_id, GameUserDecision.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    game_decisions = itertools.groupby(decisions, key=lambda i: i.game_id)
+    decisions_game_id, game_moves = next(game_decisions, (None, iter(())))
+    for game_id, moves, field_size, win_length, symbol in games:
+        if moves is not None:
+            result = decode_replay_moves(moves, field_size, symbol)
+        else:
+            while decisions_game_id is not None and decisions_game_id < game_id:
+                decisions_game_id, game_moves = next(game_decisions, (None, iter(())))
+            result = []
+            if decisions_game_id == game_id:
+                result = [(i.symbol, i.coordinate_x, i.coordinate_y) for i in game_moves]
+        yield GameReplay(game_id, field_size, win_length, result)
+
+
+def count_outcomes(replays: Iterable[GameReplay], chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Counts the outcomes of the final positions of the games. The positions of every variant of the game are collected
+     in chunks and evaluated by one call of the batch engine per chunk.
+
+    Args:
+        replays (Iterable[GameReplay]): Replays of the games.
+        chunk_size (int): Number of the positions evaluated together.
+
+    Returns:
+        Dict[str, int]: Number of the games by the names of the outcomes, see OUTCOME_NAMES.
+    """
+    counts = np.zeros(len(OUTCOME_NAMES), dtype=np.int64)
+    chunks: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+    def count(variant: Tuple[int, int]) -> None:
+        outcomes = BatchGameField.from_marks(chunks.pop(variant), *variant).get_outcomes()
+        counts[:] += np.bincount(outcomes, minlength=len(OUTCOME_NAMES))
+
+    for replay in replays:
+        variant = replay.size, replay.win_length
+        chunk = chunks.setdefault(variant, [])
+        chunk.append(replay.positions[-1][1:3])
+        if len(chunk) >= chunk_size:
+            count(variant)
+    for variant in list(chunks):
+        count(variant)
+    return {name: int(counts[outcome]) for outcome, name in OUTCOME_NAMES.items()}
+
+
+def get_replay(db_session: scoped_session, game_id: int) -> Optional[GameReplay]:
+    """
+    Replays one game.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        game_id (int): Game object identifier.
+
+    Returns:
+        Optional[GameReplay]: Replay of the game or None if there is no such game.
+    """
+    return next(iter_replays(db_session, [game_id]), None)
+
+
+def get_last_game_id(db_session: scoped_session, user_id: int, league_season_id: Optional[int] = None) -> Optional[int]:
+    """
+    Gets the last game of the user.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        user_id (int): User object identifier.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        Optional[int]: Game object identifier or None if the user has not played.
+    """
+    query = db_session.query(GameResult.game_id).filter(GameResult.user_id == user_id)
+    if league_season_id is not None:
+        query = query.join(Game, Game.id == GameResult.game_id).filter(Game.league_season_id == league_season_id)
+    result: Optional[int] = query.order_by(GameResult.game_id.desc()).limit(1).scalar()
+    return result
+
+
+@click.command()
+@click.option("--db-url", default=None, help="Database to read the games from, the game database by default.")
+@click.option("--game-id", default=None, type=int, help="Game to show.")
+@click.option("--ply", default=None, type=int, help="Ply of the game to show, the last one by default.")
+@click.option("--league-season-id", default=None, type=int, help="League season to replay, all by default.")
+def main(db_url: Optional[str], game_id: Optional[int], ply: Optional[int], league_season_id: Optional[int]) -> None:
+    settings = get_settings()
+    db_engine = make_engine({**settings, "db_url": db_url or settings["db_url"]})
+    db_session = make_session(db_engine)
+    try:
+        if game_id is not None:
+            replay = get_replay(db_session, game_id)
+            if replay is None:
+                raise click.UsageError(f"There is no game {game_id}")
+            try:
+                replay.show(len(replay.moves) if ply is None else ply)
+            except ValueError as error:
+                raise click.UsageError(str(error)) from error
+            return
+        started_at = time.perf_counter()
+        games = positions = 0
+
+        def iter_counted() -> Iterator[GameReplay]:
+            nonlocal games, positions
+            for replay in iter_replays(db_session, league_season_id=league_season_id):
+                games += 1
+                positions += len(replay.positions)
+                yield replay
+
+        outcomes = count_outcomes(iter_counted())
+        elapsed = time.perf_counter() - started_at
+        click.echo(f"Replayed {games:,} games, {positions:,} positions in {elapsed:.2f} s")
+        click.echo(", ".join(f"{name}: {count:,}" for name, count in outcomes.items()))
+    finally:
+        delete_session(db_session)
+        db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
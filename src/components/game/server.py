@@ -0,0 +1,777 @@
+"""
+Network game server.
+
+Hosts many games at once in one process on the asyncio event loop. The clients speak a line protocol over TCP, every
+ game lives in memory on a BitboardGameField validating its moves, and the finished games are written by one writer
+ task in batches, one transaction per batch, on a thread of the database, so a move is answered without waiting for
+ the database.
+
+Protocol, one command per line, every command but QUIT is answered by one line:
+    NEW <first user id> <second user id>   GAME <game> <field size> <win length>
+    QUEUE <user id>                         QUEUED <queue depth> or MATCH <game> <field size> <win length> <symbol>
+                                             <opponent user id>
+    LEAVE <user id>                         LEFT <user id>
+    MOVE <game> <x> <y>                     OK <game> or END <game> <winner user id or "draw">
+    STATS                                   STATS <games> <queue depth> <average wait> <matches> <average match wait>
+    QUIT
+A wrong command is answered by ERROR and its reason. The first user plays "x" and moves first. The connection
+ starting a game by NEW makes the moves of both players like the keyboard of a game session, and its unfinished games
+ are abandoned and not written when it is closed. The users queued by QUEUE are paired by the matchmaking queue, the
+ connection waiting for an opponent gets the MATCH line when they are paired, every connection makes the moves of its
+ user and gets the moves of the opponent as MOVED <game> <x> <y> lines and the end of the game as an END line, with
+ the coordinates of the move of the opponent if it ended the game. A player of a matched game whose connection is
+ closed forfeits it. A player making MAX_WRONG_CHOICES wrong moves in a row forfeits the game too. The numbers of the
+ games are the numbers of the server, the games get their ids in the database when they are written.
+
+Usage:
+    python -m src.components.game.server --port 8765
+    python -m src.components.game.load --port 8765 --connections 1000 --games 10
+    python -m src.components.game.load --port 8765 --connections 1000 --games 10 --matchmaking
+"""
+import asyncio
+import contextlib
+import itertools
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import click
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import scoped_session
+
+from src.components.game.batch import SYMBOLS
+from src.components.game.matchmaking import Match, MatchmakingQueue
+from src.components.game.model import BitboardGameField
+from src.components.game.service import MAX_WRONG_CHOICES, REQUIRED_PLAYERS_NUMBER
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import Game, GameResult, LeagueSeason, LeagueStanding
+from src.database.model.user import User
+from src.database.rating import INITIAL_RATING
+from src.database.repository import FinishedGame, GameMetadata, SqlAlchemyRepository
+from src.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+PORT = 8765
+# Number of the finished games written by one transaction
+BATCH_SIZE = 500
+# Time in seconds the writer waits for more finished games before writing a batch
+FLUSH_INTERVAL = 0.1
+# Number of the connections waiting to be accepted
+BACKLOG = 4096
+# Time in seconds between the sweeps pairing the players waiting in the matchmaking queue
+SWEEP_INTERVAL = 1.0
+# Number of the attempts to write a batch of the finished games, e.g. while the database is locked by another writer
+WRITE_ATTEMPTS = 5
+# Time in seconds before the second attempt to write a batch, doubled before every next one
+RETRY_DELAY = 0.1
+
+
+@dataclass
+class ServerGame:
+    """
+    Game hosted by the server, kept in memory until it is finished.
+    """
+
+    number: int
+    connection_ids: Tuple[int, int]
+    user_ids: Tuple[int, int]
+    game_field: BitboardGameField
+    cells: List[int] = field(default_factory=list)
+    wrong_choices: int = 0
+    winner_id: Optional[int] = None
+
+
+@dataclass
+class ServerReport:
+    """
+    Counters of the server.
+    """
+
+    connections: int = 0
+    games: int = 0
+    finished_games: int = 0
+    abandoned_games: int = 0
+    moves: int = 0
+    written_games: int = 0
+    transactions: int = 0
+    writing_elapsed: float = 0.0
+
+
+def parse_numbers(args: List[str], count: int, usage: str) -> List[int]:
+    """
+    Parses the numeric arguments of a command.
+
+    Args:
+        args (List[str]): Arguments of the command.
+        count (int): Expected number of the arguments.
+        usage (str): Arguments of the command shown in the error.
+
+    Returns:
+        List[int]: Parsed arguments.
+    """
+    try:
+        if len(args) != count:
+            raise ValueError
+        return [int(i) for i in args]
+    except ValueError as error:
+        raise ValueError(f"Expected {usage}") from error
+
+
+def load_league(db_session: scoped_session, league_id: Optional[int]) -> LeagueSeason:
+    """
+    Loads the league the games are played in.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_id (Optional[int]): LeagueSeason object identifier, the latest league by default.
+
+    Returns:
+        LeagueSeason: LeagueSeason object.
+    """
+    query = db_session.query(LeagueSeason)  # pylint: disable=no-member
+    result: Optional[LeagueSeason]
+    if league_id is None:
+        result = query.order_by(LeagueSeason.id.desc()).limit(1).one_or_none()
+    else:
+        result = query.filter(LeagueSeason.id == league_id).one_or_none()
+    if result is None:
+        raise ValueError("There is no league season to play in, create one in the management menu")
+    return result
+
+
+def load_user_ids(db_session: scoped_session, user_ids: List[int]) -> Set[int]:
+    """
+    Loads the identifiers of the existing users.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        user_ids (List[int]): Identifiers of the users to check.
+
+    Returns:
+        Set[int]: Identifiers of the existing users among them.
+    """
+    result = {i for i, in db_session.query(User.id).filter(User.id.in_(user_ids))}  # pylint: disable=no-member
+    db_session.rollback()
+    return result
+
+
+def load_rating(db_session: scoped_session, league_season_id: int, user_id: int) -> Optional[float]:
+    """
+    Loads the rating of the user in the league season.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (int): LeagueSeason object identifier.
+        user_id (int): User object identifier.
+
+    Returns:
+        Optional[float]: Rating of the user, INITIAL_RATING before the first game, None if there is no user.
+    """
+    row = (
+        db_session.query(User.id, LeagueStanding.rating)  # pylint: disable=no-member
+        .outerjoin(
+            LeagueStanding,
+            (LeagueStanding.user_id == User.id) & (LeagueStanding.league_season_id == league_season_id),
+        )
+        .filter(User.id == user_id)
+        .one_or_none()
+    )
+    db_session.rollback()
+    if row is None:
+        return None
+    return INITIAL_RATING if row.rating is None else row.rating
+
+
+def write_games(repository: SqlAlchemyRepository, league: LeagueSeason, games: List[ServerGame]) -> int:
+    """
+    Writes the finished games with their moves, results, standings and ratings by one transaction.
+
+    Args:
+        repository (SqlAlchemyRepository): Storage of the games.
+        league (LeagueSeason): League the games are played in.
+        games (List[ServerGame]): Finished games.
+
+    Returns:
+        int: Number of the written moves.
+    """
+    repository.add_finished_games(league, [FinishedGame(list(i.user_ids), i.cells, i.winner_id) for i in games])
+    repository.commit()
+    return sum(len(i.cells) for i in games)
+
+
+class GameServer:  # pylint: disable=too-many-instance-attributes
+    """
+    Server hosting the games of the network clients in one league.
+
+    Attributes:
+        db_session: Session of connection to the database, used by the thread of the database only.
+        repository (SqlAlchemyRepository): Storage of the finished games.
+        league_id (Optional[int]): League the games are played in, the latest league by default.
+        batch_size (int): Number of the finished games written by one transaction.
+        flush_interval (float): Time in seconds the writer waits for more finished games before writing a batch.
+        games (Dict[int, ServerGame]): Unfinished games by their numbers.
+        connections (Dict[int, Set[int]]): Numbers of the unfinished games by the connections playing them.
+        writers (Dict[int, asyncio.StreamWriter]): Streams of the connections the lines are pushed to.
+        user_ids (Set[int]): Identifiers of the users known to exist.
+        matchmaking (MatchmakingQueue): Queue of the users waiting for an opponent.
+        queued (Dict[int, int]): Connections of the users waiting in the queue by the ids of the users.
+        report (ServerReport): Counters of the server.
+
+    Methods:
+        __init__(self, db_session, league_id=None, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+         compact_moves=False):
+            Initializes a GameServer instance.
+        start(self, host=HOST, port=PORT) -> asyncio.Server:
+            Loads the league and starts to accept the connections and to write the finished games.
+        close(self):
+            Stops to accept the connections and writes the finished games left.
+        handle_connection(self, reader, writer):
+            Serves the commands of a connection until it is closed.
+        execute(self, connection_id, line) -> str:
+            Executes a command of the connection.
+        __new_game(self, connection_id, args) -> str:
+            Starts a new game of the users of the connection.
+        __queue(self, connection_id, args) -> str:
+            Adds the user to the matchmaking queue.
+        __leave(self, connection_id, args) -> str:
+            Removes the user from the matchmaking queue.
+        __get_stats(self) -> str:
+            Gets the numbers of the games and the metrics of the matchmaking queue.
+        __start_game(self, user_ids, connection_ids) -> ServerGame:
+            Starts a game.
+        __start_match(self, match, connection_id=None) -> Optional[str]:
+            Starts the game of the players paired by the queue.
+        __move(self, connection_id, args) -> str:
+            Makes a move in a game.
+        __finish(self, game, winner_id, connection_id, last_move="") -> str:
+            Finishes the game and queues it for the writer.
+        __disconnect(self, connection_id):
+            Abandons or forfeits the games of the closed connection and removes its users from the queue.
+        __push(self, connection_id, line):
+            Sends the line to the connection.
+        __match_waiting(self):
+            Pairs the players waiting in the queue periodically.
+        __write_games(self):
+            Writes the finished games in batches.
+        __write_batch(self, batch):
+            Writes the batch of the finished games, retrying the failed transactions.
+        __run_in_database(self, function, *args):
+            Runs the function on the thread of the database.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        db_session: scoped_session,
+        league_id: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        compact_moves: bool = False,
+    ) -> None:
+        """
+        Initializes a GameServer instance.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database, it is used by the thread of the
+             database only.
+            league_id (Optional[int]): League the games are played in, the latest league by default.
+            batch_size (int): Number of the finished games written by one transaction.
+            flush_interval (float): Time in seconds the writer waits for more finished games before writing a batch.
+            compact_moves (bool): Store the moves encoded on the game rows.
+        """
+        self.db_session = db_session
+        self.repository = SqlAlchemyRepository(db_session, compact_moves)
+        self.league_id = league_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.games: Dict[int, ServerGame] = {}
+        self.connections: Dict[int, Set[int]] = {}
+        self.writers: Dict[int, asyncio.StreamWriter] = {}
+        self.user_ids: Set[int] = set()
+        self.matchmaking = MatchmakingQueue()
+        self.queued: Dict[int, int] = {}
+        self.report = ServerReport()
+        self.league: Optional[LeagueSeason] = None
+        self.field_size = 0
+        self.win_length = 0
+        self.game_numbers: Iterator[int] = itertools.count(1)
+        self.connection_numbers: Iterator[int] = itertools.count(1)
+        # All queries run on one thread, so the scoped session of the server is the session of this thread
+        self.executor = ThreadPoolExecutor(1, "database")
+        self.finished_games: Optional[asyncio.Queue] = None
+        self.writer: Optional[asyncio.Task] = None
+        self.matcher: Optional[asyncio.Task] = None
+        self.server: Optional[asyncio.Server] = None
+
+    async def start(self, host: str = HOST, port: int = PORT) -> asyncio.Server:
+        """
+        Loads the league and starts to accept the connections, to pair the queued players and to write the finished
+         games.
+
+        Args:
+            host (str): Address to listen on.
+            port (int): Port to listen on, 0 chooses a free port.
+
+        Returns:
+            asyncio.Server: Listening server.
+        """
+        league = await self.__run_in_database(load_league, self.db_session, self.league_id)
+        self.league = league
+        self.field_size, self.win_length = league.field_size, league.win_length
+        self.finished_games = asyncio.Queue()
+        self.writer = asyncio.create_task(self.__write_games())
+        self.matcher = asyncio.create_task(self.__match_waiting())
+        self.server = await asyncio.start_server(self.handle_connection, host, port, backlog=BACKLOG)
+        return self.server
+
+    async def close(self) -> None:
+        """
+        Stops to accept the connections and writes the finished games left.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.matcher is not None:
+            self.matcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.matcher
+        if self.finished_games is not None:
+            await self.finished_games.join()
+        if self.writer is not None:
+            self.writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.writer
+        await self.__run_in_database(delete_session, self.db_session)
+        self.executor.shutdown()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the commands of a connection until it is closed.
+
+        Args:
+            reader (asyncio.StreamReader): Stream of the commands.
+            writer (asyncio.StreamWriter): Stream of the answers.
+        """
+        connection_id = next(self.connection_numbers)
+        self.connections[connection_id] = set()
+        self.writers[connection_id] = writer
+        self.report.connections += 1
+        try:
+            while line := await reader.readline():
+                command = line.decode("utf-8", "replace").strip()
+                if command == "QUIT":
+                    break
+                writer.write(f"{await self.execute(connection_id, command)}\n".encode())
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # The connection is reset or a line is longer than the limit of the stream
+            pass
+        finally:
+            self.__disconnect(connection_id)
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def execute(self, connection_id: int, line: str) -> str:
+        """
+        Executes a command of the connection.
+
+        Args:
+            connection_id (int): Number of the connection.
+            line (str): Command and its arguments separated by spaces.
+
+        Returns:
+            str: Answer to the command.
+        """
+        command, *args = line.split() or [""]
+        try:
+            if command == "NEW":
+                return await self.__new_game(connection_id, args)
+            if command == "MOVE":
+                return self.__move(connection_id, args)
+            if command == "QUEUE":
+                return await self.__queue(connection_id, args)
+            if command == "LEAVE":
+                return self.__leave(connection_id, args)
+            if command == "STATS":
+                return self.__get_stats()
+            raise ValueError(f"Unknown command {command}, expected NEW, QUEUE, LEAVE, MOVE, STATS or QUIT")
+        except ValueError as error:
+            return f"ERROR {error}"
+
+    async def __new_game(self, connection_id: int, args: List[str]) -> str:
+        """
+        Starts a new game of the users of the connection, the first user moves first.
+
+        Args:
+            connection_id (int): Number of the connection playing the game.
+            args (List[str]): Identifiers of the users.
+
+        Returns:
+            str: Number of the game and the size of its field.
+        """
+        user_ids = parse_numbers(args, REQUIRED_PLAYERS_NUMBER, "NEW <first user id> <second user id>")
+        if user_ids[0] == user_ids[1]:
+            raise ValueError("The players should be different users")
+        missing = [i for i in user_ids if i not in self.user_ids]
+        if missing:
+            self.user_ids |= await self.__run_in_database(load_user_ids, self.db_session, missing)
+            missing = [i for i in user_ids if i not in self.user_ids]
+            if missing:
+                raise ValueError(f"There is no user {missing[0]}")
+        game = self.__start_game((user_ids[0], user_ids[1]), (connection_id, connection_id))
+        return f"GAME {game.number} {self.field_size} {self.win_length}"
+
+    async def __queue(self, connection_id: int, args: List[str]) -> str:
+        """
+        Adds the user to the matchmaking queue by the rating of the user in the league.
+
+        Args:
+            connection_id (int): Number of the connection of the user.
+            args (List[str]): Identifier of the user.
+
+        Returns:
+            str: Game of the user if the user is paired at once, otherwise the depth of the queue.
+        """
+        (user_id,) = parse_numbers(args, 1, "QUEUE <user id>")
+        if user_id in self.queued:
+            raise ValueError(f"User {user_id} is already in the queue")
+        rating = await self.__run_in_database(load_rating, self.db_session, self.league.id, user_id)  # type: ignore
+        if rating is None:
+            raise ValueError(f"There is no user {user_id}")
+        if user_id in self.queued:
+            # The user was queued by another connection while the rating was loaded
+            raise ValueError(f"User {user_id} is already in the queue")
+        self.user_ids.add(user_id)
+        match = self.matchmaking.join(user_id, rating)
+        if match is None:
+            self.queued[user_id] = connection_id
+            return f"QUEUED {len(self.queued)}"
+        self.queued[user_id] = connection_id
+        return self.__start_match(match, connection_id)  # type: ignore [return-value]
+
+    def __leave(self, connection_id: int, args: List[str]) -> str:
+        """
+        Removes the user queued by the connection from the matchmaking queue.
+
+        Args:
+            connection_id (int): Number of the connection of the user.
+            args (List[str]): Identifier of the user.
+
+        Returns:
+            str: Confirmation of the removal.
+        """
+        (user_id,) = parse_numbers(args, 1, "LEAVE <user id>")
+        if self.queued.get(user_id) != connection_id:
+            raise ValueError(f"User {user_id} is not in the queue")
+        self.matchmaking.leave(user_id)
+        del self.queued[user_id]
+        return f"LEFT {user_id}"
+
+    def __get_stats(self) -> str:
+        """
+        Gets the numbers of the games and the metrics of the matchmaking queue.
+
+        Returns:
+            str: Number of the unfinished games, depth of the queue, average waiting time of the queued users, number
+             of the pairs and average waiting time of the paired users in seconds.
+        """
+        metrics = self.matchmaking.get_metrics()
+        return (
+            f"STATS {len(self.games)} {metrics.depth} {metrics.average_wait:.3f} {metrics.matches} "
+            f"{metrics.average_match_wait:.3f}"
+        )
+
+    def __start_game(self, user_ids: Tuple[int, int], connection_ids: Tuple[int, int]) -> ServerGame:
+        """
+        Starts a game, the first user plays "x" and moves first.
+
+        Args:
+            user_ids (Tuple[int, int]): Identifiers of the users.
+            connection_ids (Tuple[int, int]): Connections making the moves of the users.
+
+        Returns:
+            ServerGame: Started game.
+        """
+        game_metadata = [
+            GameMetadata(
+                Game(), GameResult(user_id=user_id, symbol=symbol), User(id=user_id), self.league  # type: ignore
+            )
+            for user_id, symbol in zip(user_ids, SYMBOLS)
+        ]
+        game = ServerGame(
+            next(self.game_numbers),
+            connection_ids,
+            user_ids,
+            BitboardGameField(game_metadata, self.field_size, self.win_length),
+        )
+        self.games[game.number] = game
+        for connection_id in connection_ids:
+            self.connections[connection_id].add(game.number)
+        self.report.games += 1
+        return game
+
+    def __start_match(self, match: Match, connection_id: Optional[int] = None) -> Optional[str]:
+        """
+        Starts the game of the players paired by the queue, the one who waited longer moves first. The connections
+         get the MATCH lines with the symbols of their users.
+
+        Args:
+            match (Match): Paired players.
+            connection_id (Optional[int]): Connection the line of its user is returned to instead of being pushed.
+
+        Returns:
+            Optional[str]: Line of the user of the connection.
+        """
+        user_ids = (match.first.user_id, match.second.user_id)
+        connection_ids = (self.queued.pop(user_ids[0]), self.queued.pop(user_ids[1]))
+        game = self.__start_game(user_ids, connection_ids)
+        result = None
+        for i, (user_connection_id, symbol) in enumerate(zip(connection_ids, SYMBOLS)):
+            line = f"MATCH {game.number} {self.field_size} {self.win_length} {symbol} {user_ids[1 - i]}"
+            if user_connection_id == connection_id and result is None:
+                result = line
+            else:
+                self.__push(user_connection_id, line)
+        return result
+
+    def __move(self, connection_id: int, args: List[str]) -> str:
+        """
+        Makes a move in a game for the player whose turn it is.
+
+        Args:
+            connection_id (int): Number of the connection playing the game.
+            args (List[str]): Number of the game and the coordinates of the cell.
+
+        Returns:
+            str: Acknowledgement of the move or the result of the game ended by it.
+        """
+        game_id, x_coordinate, y_coordinate = parse_numbers(args, 3, "MOVE <game> <x> <y>")
+        game = self.games.get(game_id)
+        if game is None or connection_id not in game.connection_ids:
+            raise ValueError(f"There is no game {game_id}")
+        ply = len(game.cells)
+        if game.connection_ids[ply % 2] != connection_id:
+            raise ValueError(f"It is not your turn in the game {game_id}")
+        try:
+            game_state = game.game_field.set_cell_value(x_coordinate, y_coordinate, SYMBOLS[ply % 2])
+        except ValueError:
+            game.wrong_choices += 1
+            if game.wrong_choices < MAX_WRONG_CHOICES:
+                raise
+            return self.__finish(game, game.user_ids[1 - ply % 2], connection_id)
+        game.wrong_choices = 0
+        game.cells.append(x_coordinate * self.field_size + y_coordinate)
+        self.report.moves += 1
+        if game_state.is_end:
+            return self.__finish(
+                game,
+                game_state.winner.id if game_state.winner is not None else None,
+                connection_id,
+                f" {x_coordinate} {y_coordinate}",
+            )
+        opponent_connection_id = game.connection_ids[1 - ply % 2]
+        if opponent_connection_id != connection_id:
+            self.__push(opponent_connection_id, f"MOVED {game.number} {x_coordinate} {y_coordinate}")
+        return f"OK {game.number}"
+
+    def __finish(self, game: ServerGame, winner_id: Optional[int], connection_id: int, last_move: str = "") -> str:
+        """
+        Finishes the game and queues it for the writer, the result is pushed to the other connection of the game.
+
+        Args:
+            game (ServerGame): Finished game.
+            winner_id (Optional[int]): Identifier of the winner or None for a draw.
+            connection_id (int): Connection the result is returned to.
+            last_move (str): Coordinates of the move ending the game pushed with the result.
+
+        Returns:
+            str: Result of the game.
+        """
+        game.winner_id = winner_id
+        del self.games[game.number]
+        result = f"END {game.number} {'draw' if winner_id is None else winner_id}"
+        for i in set(game.connection_ids):
+            self.connections.get(i, set()).discard(game.number)
+            if i != connection_id:
+                self.__push(i, result + last_move)
+        self.finished_games.put_nowait(game)  # type: ignore [union-attr]
+        self.report.finished_games += 1
+        return result
+
+    def __disconnect(self, connection_id: int) -> None:
+        """
+        Abandons the games of the closed connection played by it alone, forfeits its games against other
+         connections and removes its users from the matchmaking queue.
+
+        Args:
+            connection_id (int): Number of the closed connection.
+        """
+        del self.writers[connection_id]
+        for game_number in list(self.connections[connection_id]):
+            game = self.games[game_number]
+            if game.connection_ids[0] == game.connection_ids[1]:
+                del self.games[game_number]
+                self.report.abandoned_games += 1
+            else:
+                self.__finish(game, game.user_ids[1 - game.connection_ids.index(connection_id)], connection_id)
+        del self.connections[connection_id]
+        for user_id in [i for i, queued_connection_id in self.queued.items() if queued_connection_id == connection_id]:
+            self.matchmaking.leave(user_id)
+            del self.queued[user_id]
+
+    def __push(self, connection_id: int, line: str) -> None:
+        """
+        Sends the line to the connection without waiting for it to be sent.
+
+        Args:
+            connection_id (int): Number of the connection.
+            line (str): Line to send.
+        """
+        writer = self.writers.get(connection_id)
+        if writer is not None and not writer.is_closing():
+            writer.write(f"{line}\n".encode())
+
+    async def __match_waiting(self) -> None:
+        """
+        Pairs the players waiting in the queue every SWEEP_INTERVAL seconds, as their tolerance to the difference of
+         the ratings grows with the waiting time.
+        """
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            for match in self.matchmaking.match_waiting():
+                self.__start_match(match)
+
+    async def __write_games(self) -> None:
+        """
+        Writes the finished games in batches. A batch is written when it has batch_size games or flush_interval
+         seconds after its first game, so a batch of a busy server is full and a game of an idle one is not delayed.
+        """
+        queue: asyncio.Queue = self.finished_games  # type: ignore [assignment]
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size and (timeout := deadline - loop.time()) > 0:
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            started_at = time.perf_counter()
+            try:
+                await self.__write_batch(batch)
+            finally:
+                self.report.writing_elapsed += time.perf_counter() - started_at
+                for _ in batch:
+                    queue.task_done()
+
+    async def __write_batch(self, batch: List[ServerGame]) -> None:
+        """
+        Writes the batch of the finished games. A failed transaction is rolled back and the batch is written again
+         after RETRY_DELAY seconds, doubled after every attempt, e.g. while the database is locked by another writer.
+         The batch failing WRITE_ATTEMPTS times is logged and dropped, so the writer does not stop.
+
+        Args:
+            batch (List[ServerGame]): Finished games.
+        """
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                await self.__run_in_database(write_games, self.repository, self.league, batch)
+            except Exception as error:  # pylint: disable=broad-except
+                with contextlib.suppress(SQLAlchemyError):
+                    await self.__run_in_database(self.db_session.rollback)
+                if attempt == WRITE_ATTEMPTS:
+                    logger.exception("%s games were not written after %s attempts", len(batch), attempt)
+                    click.echo(f"{len(batch)} games were not written: {error!r}", err=True)
+                    return
+                delay = RETRY_DELAY * 2 ** (attempt - 1)
+                logger.warning("%s games were not written, retrying in %.1f s", len(batch), delay, exc_info=True)
+                await asyncio.sleep(delay)
+            else:
+                self.report.written_games += len(batch)
+                self.report.transactions += 1
+                return
+
+    async def __run_in_database(self, function, *args):  # type: ignore [no-untyped-def]
+        """
+        Runs the function on the thread of the database, so the event loop is not blocked by the queries.
+
+        Args:
+            function: Function to run.
+            args: Arguments of the function.
+
+        Returns:
+            Result of the function.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+
+async def serve(game_server: GameServer, host: str, port: int) -> None:
+    """
+    Serves the clients until the server is interrupted or terminated, then writes the finished games left.
+
+    Args:
+        game_server (GameServer): Server of the games.
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+    """
+    server = await game_server.start(host, port)
+    serving = asyncio.create_task(server.serve_forever())
+    with contextlib.suppress(NotImplementedError):
+        # The signal handlers of the event loop are not supported on Windows
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+    click.echo(f"Serving the games on {', '.join(str(i.getsockname()) for i in server.sockets)}")
+    try:
+        with contextlib.suppress(asyncio.CancelledError):
+            await serving
+    finally:
+        await game_server.close()
+
+
+@click.command()
+@click.option("--host", default=HOST, show_default=True, help="Address to listen on.")
+@click.option("--port", default=PORT, show_default=True, help="Port to listen on.")
+@click.option("--league-id", default=None, type=int, help="League to play in, the latest league by default.")
+@click.option("--db-url", default=None, help="Database to persist the games to, the game database by default.")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True, help="Number of the games per transaction.")
+@click.option(
+    "--flush-interval",
+    default=FLUSH_INTERVAL,
+    show_default=True,
+    help="Time in seconds the writer waits for more finished games before writing a batch.",
+)
+def main(  # pylint: disable=too-many-arguments
+    host: str, port: int, league_id: Optional[int], db_url: Optional[str], batch_size: int, flush_interval: float
+) -> None:
+    settings = get_settings()
+    db_engine = make_engine({**settings, "db_url": db_url or settings["db_url"]})
+    # The users and the league change through this session only, so they are not reloaded after every commit
+    db_session = make_session(db_engine, expire_on_commit=False)
+    game_server = GameServer(db_session, league_id, batch_size, flush_interval, settings["db_compact_moves"])
+    try:
+        asyncio.run(serve(game_server, host, port))
+    except KeyboardInterrupt:
+        pass
+    except ValueError as error:
+        raise click.UsageError(str(error)) from error
+    finally:
+        db_engine.dispose()
+    report = game_server.report
+    click.echo(
+        f"Connections: {report.connections}, games: {report.games}, finished: {report.finished_games}, "
+        f"abandoned: {report.abandoned_games}, moves: {report.moves}"
+    )
+    metrics = game_server.matchmaking.get_metrics()
+    click.echo(f"Matches: {metrics.matches}, average wait {metrics.average_match_wait:.3f} s")
+    click.echo(
+        f"Written games: {report.written_games} by {report.transactions} transactions in "
+        f"{report.writing_elapsed:.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -1,63 +1,107 @@
-import re
 from random import randint
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import click
 from sqlalchemy.orm import scoped_session
 
-from src.components.game.model import GameField, GameState
+from src.components.game.book import get_opening_book
+from src.components.game.mcts import WORKERS, MonteCarloTreeSearch
+from src.components.game.model import (
+    GameField,
+    GameState,
+    UserSummaryType,
+    get_move_time_limit,
+)
+from src.components.game.player import ComputerPlayer, HumanPlayer, MctsPlayer, Player
+from src.components.game.solver import MAX_SOLVED_FIELD_SIZE, Solver
+from src.components.main_menu.service import PAGE_SIZE
 from src.components.management.service import ManagementService
-from src.database.model.game import Game, GameResult, GameUserDecision, LeagueSeason
+from src.database.journal import MoveJournal
+from src.database.model.game import GameResult, GameUserDecision, LeagueSeason
 from src.database.model.user import User
+from src.database.repository import Repository, SqlAlchemyRepository
 
 REQUIRED_PLAYERS_NUMBER = 2
+MAX_WRONG_CHOICES = 10
 
 
 class GameSession:
     """
     The main class of the gaming session. This is where the entire gameplay is controlled, and it also contains all
      the metadata about the game.
+    The game is driven by a loop requesting the moves from the players, so a player can be a user at the keyboard,
+     the computer or any other source of moves, and the memory used by the session does not grow with the game.
 
     Attributes:
         db_session: Session of connection to the database, through this object all interactions with the database occur
+        repository (Repository): Storage of the games, the database by default.
         symbols (List[str]): List of game symbols for players.
         chosen_players (List[Player]): List of chosen players for the current game.
         league (LeagueSeason): Current league.
         game_field (Optional[GameField]): GameField instance representing the game board.
         winner (Optional[User]): The winner of the game.
         game_metadata (Optional[List]): List of named tuples with Game, GameResult, User, and LeagueSeason objects.
+        players (Dict[int, Player]): Sources of the moves by the ids of the users they play for.
+        notice (Optional[str]): Message about the last decision shown on the next turn.
+        write_behind (bool): Buffer the decisions in memory instead of committing every one of them.
+        flush_every (Optional[int]): Number of the buffered decisions committed together in the write-behind mode,
+         None means the decisions are committed once at the end of the game.
+        journal (Optional[MoveJournal]): Journal the buffered decisions are appended to before being committed.
+        pending_decisions (List[GameUserDecision]): Decisions buffered in the write-behind mode.
+        ply (int): Number of the decisions made in the game.
+        render (bool): Render the turns and the result of the game.
 
     Methods:
-        __init__(self, db_session, league):
+        __init__(self, db_session, league, write_behind=False, flush_every=None, journal=None, repository=None,
+         render=True):
             Initializes a GameSession instance.
+        start_game(self, players=None) -> GameState:
+            Start the game session.
         __choose_players(self):
             Selects players for the game.
+        __make_computer_player(self):
+            Makes the computer player of the league.
+        __close_players(self):
+            Stops the search processes of the computer players chosen for the game.
         __create_game_session(self):
             Creates the game session including game records and field.
-        __create_game(self):
-            Creates a game record in the database.
-        __create_game_result(self, game_id):
-            Creates game results in the database.
-        __get_game_metadata(self, game_id):
-            Retrieves game metadata.
         __get_symbol(self):
             Gets a random symbol for a player.
         __game_session(self, next_player, wrong_choise=False):
             Manages the main game session.
+        __show_turn(self, user, wrong_choice):
+            Renders the turn of the player.
+        __report_decision(self, user, player, cell_item):
+            Prepares the report of the computer decision.
+        __show_result(self):
+            Renders the result of the finished game.
+        __forfeit(self, player_id):
+            Ends the game by the forfeit of the player.
         __save_user_decision(self, user, cell_item):
             Saves a user's game decision to the database.
+        __flush_decisions(self):
+            Adds the buffered decisions to the repository.
         __summarise(self):
             Summarises the results of the game session.
     """
 
-    symbols: List[str] = ["x", "o"]
-    chosen_players: List[User] = []
+    symbols: List[str]
+    chosen_players: List[User]
     league: LeagueSeason
-    game_field: Optional[GameField] = None
-    game_state: GameState = GameState()
-    game_metadata: List = []
-
-    def __init__(self, db_session: scoped_session, league: LeagueSeason) -> None:
+    game_field: Optional[GameField]
+    game_state: GameState
+    game_metadata: List
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        db_session: scoped_session,
+        league: LeagueSeason,
+        write_behind: bool = False,
+        flush_every: Optional[int] = None,
+        journal: Optional[MoveJournal] = None,
+        repository: Optional[Repository] = None,
+        render: bool = True,
+    ) -> None:
         """
         Initializes a GameSession instance.
 
@@ -65,96 +109,152 @@ class GameSession:
             db_session (scoped_session): Session of connection to the database, through this object all interactions
              with the database occur.
             league (LeagueSeason): Current league.
+            write_behind (bool): Buffer the decisions in memory and commit them in batches. Defaults to False, every
+             decision is committed immediately.
+            flush_every (Optional[int]): Number of the buffered decisions committed together, None means once at the
+             end of the game.
+            journal (Optional[MoveJournal]): Journal protecting the buffered decisions from a crash.
+            repository (Optional[Repository]): Storage of the games, the database of the session by default.
+            render (bool): Render the turns and the result of the game. Defaults to True, the games played without
+             a user at the keyboard may be played silently.
         """
         self.db_session = db_session
+        self.repository = repository if repository is not None else SqlAlchemyRepository(db_session)
         self.league = league
-
-    def start_game(self) -> None:
+        self.symbols = ["x", "o"]
+        self.chosen_players = []
+        self.game_field = None
+        self.game_state = GameState()
+        self.game_metadata = []
+        self.players: Dict[int, Player] = {}
+        self.notice: Optional[str] = None
+        self.human_player = HumanPlayer()
+        self.write_behind = write_behind
+        self.flush_every = flush_every
+        self.journal = journal
+        self.pending_decisions: List[GameUserDecision] = []
+        self.ply = 0
+        self.render = render
+
+    def start_game(self, players: Optional[List[Tuple[User, Player]]] = None) -> GameState:
         """
         Start the game session.
+
+        Args:
+            players (Optional[List[Tuple[User, Player]]]): Users and the sources of their moves. If they are not
+             passed, the players are chosen interactively.
+
+        Returns:
+            GameState: Final state of the game.
         """
-        self.__choose_players()
-        self.__create_game_session()
-        self.__game_session(randint(0, 1))
+        if players is None:
+            self.__choose_players()
+        else:
+            for user, player in players:
+                self.chosen_players.append(user)
+                self.players[user.id] = player
+        try:
+            self.__create_game_session()
+            self.__game_session(randint(0, 1))
+        finally:
+            if players is None:
+                self.__close_players()
         self.__summarise()
+        return self.game_state
 
     def __choose_players(self) -> None:
         """
-        Selects players for the game.
+        Selects players for the game. The users are listed by pages following each other by the id of the last user
+         and can be searched by the beginning of the nickname, only the chosen users are loaded.
         """
-        print(
-            f"""
+        wrong_choices = 0
+        after_id = 0
+        nickname_prefix = ""
+        while len(self.chosen_players) < REQUIRED_PLAYERS_NUMBER:
+            print(
+                f"""
         Choose the players. {REQUIRED_PLAYERS_NUMBER - len(self.chosen_players)} left:
         """
-        )
-        user_list = self.db_session.query(User).filter(User.id.notin_([i.id for i in self.chosen_players])).all()
-        for i, player in enumerate(user_list):
-            print(i, player.nickname)
-        player_choice = input("Enter user id: ")
-        if player_choice.isdigit():
-            user_id = int(player_choice)
-            self.chosen_players.append(user_list[user_id])
-            if len(self.chosen_players) < REQUIRED_PLAYERS_NUMBER:
-                self.__choose_players()
-        else:
+            )
+            user_list = self.repository.get_user_page(
+                after_id, PAGE_SIZE + 1, nickname_prefix, [i.id for i in self.chosen_players]
+            )
+            for i, player in enumerate(user_list[:PAGE_SIZE]):
+                print(i, player.nickname)
             print(
                 """
-        Wrong choice. Try again, please: """
+        Add "c" before the id to let the computer play for the user, e.g. c0
+        Enter "n" for the next page or "/" with the beginning of the nickname to search, e.g. /Al"""
             )
-            self.__choose_players()
-
-    def __create_game_session(self) -> None:
-        """
-        Creates the game session including game records and field.
-        """
-        game = self.__create_game()
-        self.__create_game_result(game.id)
-        self.__get_game_metadata(game.id)
-        self.game_field = GameField(self.game_metadata)
+            player_choice = input("Enter user id: ")
+            if player_choice == "n":
+                # The last page is followed by the first one
+                after_id = user_list[PAGE_SIZE - 1].id if len(user_list) > PAGE_SIZE else 0
+                continue
+            if player_choice.startswith("/"):
+                after_id, nickname_prefix = 0, player_choice[1:].strip()
+                continue
+            is_computer = player_choice.startswith("c")
+            if is_computer:
+                player_choice = player_choice[1:]
+            user = None
+            if player_choice.isdigit() and int(player_choice) < min(len(user_list), PAGE_SIZE):
+                user = self.repository.get_user(user_list[int(player_choice)].id)
+            if user is not None:
+                self.chosen_players.append(user)
+                if is_computer:
+                    self.players[user.id] = self.__make_computer_player()
+                wrong_choices = 0
+            else:
+                wrong_choices += 1
+                if wrong_choices >= MAX_WRONG_CHOICES:
+                    raise ValueError(f"{MAX_WRONG_CHOICES} wrong choices in a row, the game is cancelled")
+                print(
+                    """
+        Wrong choice. Try again, please: """
+                )
 
-    def __create_game(self) -> Game:
+    def __make_computer_player(self) -> Player:
         """
-        Creates a game record in the database.
+        Makes the computer player of the league: the solver plays on the small fields and the Monte Carlo Tree Search
+         on all cores plays on the larger ones. Both search a move for the time set by the league, so the game does
+         not freeze on a long search.
 
         Returns:
-            Game: Game object.
+            Player: Source of the computer moves.
         """
-        game = Game(league_season_id=self.league.id)  # type: ignore [call-arg]
-        self.db_session.add(game)
-        self.db_session.flush()
-        self.db_session.refresh(game)
-        return game
+        time_limit = get_move_time_limit(self.league)
+        if self.league.field_size <= MAX_SOLVED_FIELD_SIZE:
+            return ComputerPlayer(
+                Solver(self.league.field_size, self.league.win_length), get_opening_book(), time_limit
+            )
+        return MctsPlayer(
+            MonteCarloTreeSearch(self.league.field_size, self.league.win_length, workers=WORKERS),
+            time_limit=time_limit,
+        )
 
-    def __create_game_result(self, game_id: int) -> None:
+    def __close_players(self) -> None:
+        """
+        Stops the search processes of the computer players chosen for the game, the players passed to the session
+         are closed by their owner.
         """
-        Creates game results in the database.
+        for player in self.players.values():
+            if isinstance(player, MctsPlayer):
+                player.close()
 
-        Args:
-            game_id (int): Game object identifier.
+    def __create_game_session(self) -> None:
         """
-        self.db_session.add_all(
+        Creates the game session including game records and field.
+        """
+        self.game_metadata = self.repository.create_game(
+            self.league,
+            self.chosen_players,
             [
-                GameResult(game_id=game_id, user_id=user.id, symbol=self.__get_symbol())  # type: ignore [call-arg]
+                GameResult(user_id=user.id, symbol=self.__get_symbol())  # type: ignore [call-arg]
                 for user in self.chosen_players
-            ]
-        )
-        self.db_session.commit()
-
-    def __get_game_metadata(self, game_id: int) -> None:
-        """
-        Retrieves game metadata.
-
-        Args:
-            game_id (int): Game object identifier.
-        """
-        self.game_metadata = (
-            self.db_session.query(Game, GameResult, User, LeagueSeason)
-            .outerjoin(GameResult, GameResult.game_id == Game.id)
-            .outerjoin(User, User.id == GameResult.user_id)
-            .outerjoin(LeagueSeason, LeagueSeason.id == Game.league_season_id)
-            .filter(Game.id == game_id)
-            .all()
+            ],
         )
+        self.game_field = GameField(self.game_metadata, size=self.league.field_size, win_length=self.league.win_length)
 
     def __get_symbol(self) -> str:
         """
@@ -172,20 +272,64 @@ class GameSession:
 
     def __game_session(self, next_player_id: int, wrong_choice: bool = False) -> GameState:
         """
-        Manages the main game session.
+        Manages the main game session. The players are asked for their moves in turn until the game ends, a player
+         who makes MAX_WRONG_CHOICES wrong choices in a row forfeits the game.
 
         Args:
             next_player_id(int): ID of the user participating in the session, which will play next time.
-            wrong_choice (bool): A specific parameter required to pass the state of an invalid choice in
-             the last call to this method. Defaults to False.
+            wrong_choice (bool): The state of an invalid choice made before the first move. Defaults to False.
 
         Returns:
             GameState: Final state of the game
 
         """
-        user = self.chosen_players[next_player_id]
+        wrong_choices = 0
+        while True:
+            user = self.chosen_players[next_player_id]
+            player = self.players.get(user.id, self.human_player)
+            symbol = next(i.GameResult.symbol for i in self.game_metadata if i.User.id == user.id)
+            self.__show_turn(user, wrong_choice)
+            cell_item = player.choose_move(self.game_field, symbol)  # type: ignore [arg-type]
+            wrong_choice = cell_item is None
+            if cell_item is not None:
+                try:
+                    self.game_state = self.game_field.set_cell_value(  # type: ignore [union-attr]
+                        x_coordinate=cell_item[0],
+                        y_coordinate=cell_item[1],
+                        value=symbol,
+                    )
+                    self.__save_user_decision(user, cell_item)
+                except ValueError as error:
+                    self.notice = f"""
+        {error}"""
+                    wrong_choice = True
+            if wrong_choice:
+                wrong_choices += 1
+                if wrong_choices >= MAX_WRONG_CHOICES:
+                    return self.__forfeit(next_player_id)
+                continue
+            wrong_choices = 0
+            self.__report_decision(user, player, cell_item)  # type: ignore [arg-type]
+            if self.game_state.is_end is True:
+                self.__show_result()
+                return self.game_state
+            next_player_id = 1 - next_player_id
+
+    def __show_turn(self, user: User, wrong_choice: bool) -> None:
+        """
+        Renders the turn of the player.
+
+        Args:
+            user: User object of the player to move.
+            wrong_choice: The state of an invalid choice made by the player on the previous attempt.
+        """
+        if not self.render:
+            return
         click.clear()
-        if wrong_choice is not None:
+        if self.notice is not None:
+            print(self.notice)
+            self.notice = None
+        if wrong_choice:
             print(
                 """
         Wrong choice. Try again, please: """
@@ -196,52 +340,120 @@ class GameSession:
         )
         if self.game_field is not None:
             self.game_field.show_field()
-        player_choice = input("Select field with two digits and comma between: ")
-        if re.search(r"[0-2],[0-2]", player_choice):
-            coordinates = player_choice.split(",")
-            x_coordinate = int(coordinates.pop(0))
-            y_coordinate = int(coordinates.pop(0))
-            try:
-                self.game_state = self.game_field.set_cell_value(  # type: ignore [union-attr]
-                    x_coordinate=x_coordinate,
-                    y_coordinate=y_coordinate,
-                    value=next(i.GameResult.symbol for i in self.game_metadata if i.User.id == user.id),
-                )
-                self.__save_user_decision(user, (x_coordinate, y_coordinate))
-            except ValueError as error:
-                print(error)
-                return self.__game_session(next_player_id)
-            if self.game_state.is_end is True:
-                return self.game_state
-            next_player_id = 0 if next_player_id == 1 else 1
-            return self.__game_session(next_player_id)
-        return self.__game_session(next_player_id, wrong_choice=True)
+
+    def __report_decision(self, user: User, player: Player, cell_item: Tuple[int, int]) -> None:
+        """
+        Prepares the report of the computer decision with the statistics of its search to show it on the next turn.
+
+        Args:
+            user: User object the player plays for.
+            player: Source of the moves.
+            cell_item: Coordinates of the chosen cell.
+        """
+        if isinstance(player, ComputerPlayer) and player.last_result is not None:
+            self.notice = f"""
+        {user.nickname} (computer) chose {cell_item[0]},{cell_item[1]}. \
+Nodes searched: {player.last_result.nodes}, cache hits: {player.last_result.cache_hits}, \
+depth: {player.last_result.depth}{"" if player.last_result.exact else " (not proven)"}"""
+        elif isinstance(player, MctsPlayer) and player.last_result is not None:
+            self.notice = f"""
+        {user.nickname} (computer) chose {cell_item[0]},{cell_item[1]}. \
+Iterations: {player.last_result.iterations} ({player.last_result.iterations_per_second:,.0f}/s), \
+tree size: {player.last_result.tree_size}, depth: {player.last_result.depth}, \
+win rate: {player.last_result.value:.0%}"""
+
+    def __show_result(self) -> None:
+        """
+        Renders the result of the finished game.
+        """
+        if not self.render:
+            return
+        if self.game_state.winner is not None:
+            print(
+                f"""
+        {self.game_state.winner.nickname} wins!"""
+            )
+        else:
+            print(
+                """
+        Played a draw!"""
+            )
+
+    def __forfeit(self, player_id: int) -> GameState:
+        """
+        Ends the game by the forfeit of the player, the opponent wins.
+
+        Args:
+            player_id (int): ID of the user participating in the session, who forfeits.
+
+        Returns:
+            GameState: Final state of the game
+        """
+        user = self.chosen_players[player_id]
+        self.game_state = GameState()
+        self.game_state.is_end = True
+        self.game_state.winner = self.chosen_players[1 - player_id]
+        if self.render:
+            print(
+                f"""
+        {user.nickname} made {MAX_WRONG_CHOICES} wrong choices in a row and forfeits the game.
+        {self.game_state.winner.nickname} wins!"""
+            )
+        return self.game_state
 
     def __save_user_decision(self, user: User, cell_item: Tuple[int, int]) -> None:
         """
-        Saves a user's game decision to the database.
+        Saves a user's game decision to the database. In the write-behind mode the decision is journaled and buffered
+         until the next flush.
 
         Args:
             user: User object.
             cell_item: Current field coordinates.
         """
+        game_id = next(i.Game.id for i in self.game_metadata)
         game_user_decision = GameUserDecision(  # type: ignore [call-arg]
-            game_id=next(i.Game.id for i in self.game_metadata),
+            game_id=game_id,
             user_id=user.id,
             coordinate_x=cell_item[0],
             coordinate_y=cell_item[1],
         )
-        self.db_session.add(game_user_decision)
-        self.db_session.commit()
+        ply = self.ply
+        self.ply += 1
+        if not self.write_behind:
+            self.repository.add_decisions([game_user_decision])
+            self.repository.commit()
+            return
+        if self.journal is not None:
+            self.journal.append(game_id, user.id, cell_item[0], cell_item[1], ply)
+        self.pending_decisions.append(game_user_decision)
+        if self.flush_every and len(self.pending_decisions) >= self.flush_every:
+            self.__flush_decisions()
+            self.repository.commit()
+            if self.journal is not None:
+                self.journal.truncate()
+
+    def __flush_decisions(self) -> None:
+        """
+        Adds the buffered decisions to the repository, they are saved by the next commit.
+        """
+        self.repository.add_decisions(self.pending_decisions)
+        self.pending_decisions = []
 
     def __summarise(self) -> None:
         """
-        Summarizes the results of the game session.
+        Summarizes the results of the game session. The buffered decisions and the league standings of the players
+         are committed in the same transaction.
         """
+        if self.pending_decisions:
+            self.__flush_decisions()
         for i in self.game_metadata:
             i.GameResult.is_winner = i.User == self.game_state.winner
-            self.db_session.add(i.GameResult)
-        self.db_session.commit()
+        self.repository.finish_game(
+            self.game_metadata, self.game_state.winner.id if self.game_state.winner is not None else None
+        )
+        self.repository.commit()
+        if self.journal is not None:
+            self.journal.truncate()
 
 
 class GameService:
@@ -250,10 +462,14 @@ class GameService:
 
     Attributes:
         db_session: Session of connection to the database, through this object all interactions with the database occur.
+        repository (Repository): Storage of the users, the league seasons and the games, the database by default.
         management_service: ManagementService instance for handling game management actions.
+        write_behind (bool): Buffer the decisions of the games and commit them in batches.
+        flush_every (Optional[int]): Number of the buffered decisions committed together.
+        journal (Optional[MoveJournal]): Journal protecting the buffered decisions from a crash.
 
     Methods:
-        __init__(self, db_session):
+        __init__(self, db_session, write_behind=False, flush_every=None, journal=None, repository=None):
             Initializes a GameService instance.
         start_game(self):
             Launches the flow to prepare the application for the game and launch the game after this preparation.
@@ -264,16 +480,33 @@ class GameService:
 
     """
 
-    def __init__(self, db_session: scoped_session) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        db_session: scoped_session,
+        write_behind: bool = False,
+        flush_every: Optional[int] = None,
+        journal: Optional[MoveJournal] = None,
+        repository: Optional[Repository] = None,
+    ) -> None:
         """
         Initializes a GameService instance.
 
         Args:
             db_session(scoped_session): Session of connection to the database, through this object all interactions
              with the database occur.
+            write_behind (bool): Buffer the decisions of the games and commit them in batches.
+            flush_every (Optional[int]): Number of the buffered decisions committed together, None means once at
+             the end of the game.
+            journal (Optional[MoveJournal]): Journal protecting the buffered decisions from a crash.
+            repository (Optional[Repository]): Storage of the users, the league seasons and the games, the database of
+             the session by default.
         """
         self.db_session = db_session
-        self.management_service = ManagementService(self.db_session)
+        self.repository = repository if repository is not None else SqlAlchemyRepository(db_session)
+        self.management_service = ManagementService(self.db_session, self.repository)
+        self.write_behind = write_behind
+        self.flush_every = flush_every
+        self.journal = journal
 
     def start_game(self) -> None:
         """
@@ -281,8 +514,21 @@ class GameService:
         """
         league = self.__check_exists_league()
         self.__check_players_number()
-        game_session = GameSession(self.db_session, league)
-        game_session.start_game()
+        game_session = GameSession(
+            self.db_session,
+            league,
+            write_behind=self.write_behind,
+            flush_every=self.flush_every,
+            journal=self.journal,
+            repository=self.repository,
+        )
+        try:
+            game_session.start_game()
+        except ValueError as error:
+            print(
+                f"""
+        {error}"""
+            )
 
     def __check_exists_league(self) -> LeagueSeason:
         """
@@ -291,9 +537,7 @@ class GameService:
         Returns:
             LeagueSeason: LeagueSeason object.
         """
-        result: LeagueSeason = (
-            self.db_session.query(LeagueSeason).order_by(LeagueSeason.id.desc()).limit(1).one_or_none()
-        )
+        result = self.repository.get_last_league_season()
 
         if result:
             return result
@@ -304,14 +548,15 @@ class GameService:
         self.management_service.create_new_league_season()
         return self.__check_exists_league()
 
-    def __check_players_number(self) -> List[User]:
+    def __check_players_number(self) -> List[UserSummaryType]:
         """
-        Checks the number of players and creates the required number of players if needed.
+        Checks the number of players and creates the required number of players if needed. Only the required number
+         of users is read.
 
         Returns:
-            List[User]: List of User objects corresponding to users registered in the system.
+            List[UserSummaryType]: Ids and nicknames of the first users registered in the system.
         """
-        result: List[User] = self.db_session.query(User).all()
+        result = self.repository.get_user_page(limit=REQUIRED_PLAYERS_NUMBER)
 
         if len(result) >= REQUIRED_PLAYERS_NUMBER:
             return result
@@ -0,0 +1,560 @@
+"""
+Headless simulator of the games.
+
+Plays the games between the computer strategies without any input, persisting them through the same Game, GameResult
+ and GameUserDecision models as the interactive games, so realistic volumes of data are generated for the load
+ testing and the capacity planning. The games are shared between the processes of a multiprocessing pool, every
+ worker owns its own database engine and session. With the memory storage the workers play the games in memory
+ repositories and the snapshots of all of them are written to the database once, in one transaction.
+
+Usage:
+    python simulate.py --games 1000 --workers 4 --first solver --second random
+    python simulate.py --games 1000000 --workers 4 --storage memory --compact-moves
+    python simulate.py --games 1000000 --workers 4 --storage memory --engine batch
+    python simulate.py --games 10 --first mcts --second random --mcts-iterations 500
+"""
+import contextlib
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import click
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session
+
+from src.components.game.batch import FIRST_WINS, SECOND_WINS, play_random_games
+from src.components.game.book import get_opening_book
+from src.components.game.mcts import MonteCarloTreeSearch
+from src.components.game.model import get_move_time_limit
+from src.components.game.player import (
+    ComputerPlayer,
+    MctsPlayer,
+    Player,
+    RandomPlayer,
+    ScriptedPlayer,
+)
+from src.components.game.service import REQUIRED_PLAYERS_NUMBER, GameSession
+from src.components.game.solver import MAX_SOLVED_FIELD_SIZE, Solver
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import LeagueSeason
+from src.database.model.user import User
+from src.database.rating import rebuild_league_ratings
+from src.database.repository import (
+    FinishedGame,
+    MemoryRepository,
+    Repository,
+    Snapshot,
+    SqlAlchemyRepository,
+    write_snapshot,
+)
+from src.settings import get_settings
+
+STRATEGIES = ("random", "solver", "scripted", "mcts")
+STORAGES = ("database", "memory")
+ENGINES = ("session", "batch")
+# Number of the games played together by the batch engine
+BATCH_SIZE = 10000
+# Number of the iterations of the search of a move by the mcts strategy
+MCTS_ITERATIONS = 200
+SIMULATOR_NICKNAME = "Simulator{}"
+
+
+@dataclass
+class SimulationTask:
+    """
+    Part of the simulation played by one worker.
+    """
+
+    db_url: str
+    league_id: int
+    user_ids: Tuple[int, int]
+    strategies: Tuple[str, str]
+    games: int
+    seed: Optional[int] = None
+    script: Optional[List[Tuple[int, int]]] = None
+    write_behind: bool = False
+    flush_every: Optional[int] = None
+    storage: str = "database"
+    compact_moves: bool = False
+    engine: str = "session"
+    mcts_iterations: int = MCTS_ITERATIONS
+
+
+@dataclass
+class SimulationReport:
+    """
+    Results of the simulation.
+    """
+
+    games: int = 0
+    moves: int = 0
+    first_wins: int = 0
+    second_wins: int = 0
+    draws: int = 0
+    write_latencies: List[float] = field(default_factory=list)
+    snapshots: List[Snapshot] = field(default_factory=list)
+
+    def merge(self, other: "SimulationReport") -> None:
+        """
+        Adds the results of another part of the simulation.
+
+        Args:
+            other (SimulationReport): Results of another worker.
+        """
+        self.games += other.games
+        self.moves += other.moves
+        self.first_wins += other.first_wins
+        self.second_wins += other.second_wins
+        self.draws += other.draws
+        self.write_latencies.extend(other.write_latencies)
+        self.snapshots.extend(other.snapshots)
+
+
+def parse_script(script: str, size: int) -> List[Tuple[int, int]]:
+    """
+    Parses the moves of the scripted players.
+
+    Args:
+        script (str): Coordinates of the cells separated by spaces, e.g. "1,1 0,0 2,2". The cells of the whole
+         game field row by row are used if the script is empty.
+        size (int): Length of the side of the game field.
+
+    Returns:
+        List[Tuple[int, int]]: Coordinates of the moves.
+    """
+    if not script.strip():
+        return [(x, y) for x in range(size) for y in range(size)]
+    result = []
+    for item in script.split():
+        x_coordinate, _, y_coordinate = item.partition(",")
+        if not (x_coordinate.isdigit() and y_coordinate.isdigit()):
+            raise ValueError(f"Move {item} should be two digits and comma between")
+        result.append((int(x_coordinate), int(y_coordinate)))
+    return result
+
+
+def make_player(
+    strategy: str,
+    league: LeagueSeason,
+    seed: Optional[int],
+    script: Optional[List[Tuple[int, int]]],
+    mcts_iterations: int = MCTS_ITERATIONS,
+) -> Player:
+    """
+    Makes the player of the strategy.
+
+    Args:
+        strategy (str): One of STRATEGIES.
+        league (LeagueSeason): League defining the variant of the game.
+        seed (Optional[int]): Seed of the random and the mcts players.
+        script (Optional[List[Tuple[int, int]]]): Moves of the scripted player.
+        mcts_iterations (int): Number of the iterations of the search of a move by the mcts player, it searches in
+         the process of the simulation.
+
+    Returns:
+        Player: Source of the moves.
+    """
+    if strategy == "random":
+        return RandomPlayer(seed)
+    if strategy == "solver":
+        if league.field_size > MAX_SOLVED_FIELD_SIZE:
+            raise ValueError(f"The solver plays on the fields up to {MAX_SOLVED_FIELD_SIZE}x{MAX_SOLVED_FIELD_SIZE}")
+        return ComputerPlayer(
+            Solver(league.field_size, league.win_length), get_opening_book(), get_move_time_limit(league)
+        )
+    if strategy == "scripted":
+        return ScriptedPlayer(script if script is not None else parse_script("", league.field_size))
+    if strategy == "mcts":
+        return MctsPlayer(MonteCarloTreeSearch(league.field_size, league.win_length, seed=seed), mcts_iterations)
+    raise ValueError(f"Unknown strategy {strategy}, choose one of {', '.join(STRATEGIES)}")
+
+
+def listen_write_latency(db_session: scoped_session, latencies: List[float]) -> None:
+    """
+    Collects the duration of every commit of the session, including the flush of the pending objects.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        latencies (List[float]): List the durations in seconds are appended to.
+    """
+    started_at: List[float] = []
+
+    def before_commit(_: scoped_session) -> None:
+        started_at.append(time.perf_counter())
+
+    def after_commit(_: scoped_session) -> None:
+        if started_at:
+            latencies.append(time.perf_counter() - started_at.pop())
+
+    event.listen(db_session, "before_commit", before_commit)
+    event.listen(db_session, "after_commit", after_commit)
+
+
+def run_simulation(task: SimulationTask) -> SimulationReport:
+    """
+    Plays the games of the task on its own database engine and session. With the memory storage the games are
+     played in a memory repository loaded from the database and its snapshot is returned in the report.
+
+    Args:
+        task (SimulationTask): Part of the simulation.
+
+    Returns:
+        SimulationReport: Results of the played games.
+    """
+    report = SimulationReport()
+    db_engine = make_engine({**get_settings(), "db_url": task.db_url})
+    # The users and the league change through this session only, so they are not reloaded after every commit
+    db_session = make_session(db_engine, expire_on_commit=False)
+    listen_write_latency(db_session, report.write_latencies)
+    repository: Repository
+    memory_repository = None
+    if task.storage == "memory":
+        memory_repository = MemoryRepository.load(db_session, with_games=False, compact_moves=task.compact_moves)
+        repository = memory_repository
+        league = memory_repository.league_seasons[task.league_id]
+        users = memory_repository.users
+    else:
+        repository = SqlAlchemyRepository(db_session, compact_moves=task.compact_moves)
+        league = (
+            db_session.query(LeagueSeason).filter(LeagueSeason.id == task.league_id).one()  # pylint: disable=no-member
+        )
+        users = {
+            i.id: i
+            for i in db_session.query(User).filter(User.id.in_(task.user_ids)).all()  # pylint: disable=no-member
+        }
+    if task.engine == "batch":
+        play_batch(task, repository, league, [users[i] for i in task.user_ids], report)
+    else:
+        for game_number in range(task.games):
+            seed = None if task.seed is None else task.seed * task.games + game_number
+            players = [
+                (users[user_id], make_player(strategy, league, seed, task.script, task.mcts_iterations))
+                for user_id, strategy in zip(task.user_ids, task.strategies)
+            ]
+            game_session = GameSession(
+                db_session,
+                league,
+                write_behind=task.write_behind,
+                flush_every=task.flush_every,
+                repository=repository,
+                render=False,
+            )
+            game_state = game_session.start_game(players)
+            report.games += 1
+            report.moves += game_session.ply
+            if game_state.winner is None:
+                report.draws += 1
+            elif game_state.winner.id == task.user_ids[0]:
+                report.first_wins += 1
+            else:
+                report.second_wins += 1
+    if memory_repository is not None:
+        report.snapshots.append(memory_repository.snapshot())
+    delete_session(db_session)
+    db_engine.dispose()
+    return report
+
+
+def play_batch(  # pylint: disable=too-many-locals
+    task: SimulationTask, repository: Repository, league: LeagueSeason, users: List[User], report: SimulationReport
+) -> None:
+    """
+    Plays the games of the task on the batch engine, BATCH_SIZE games in lockstep. The first player of every game is
+     random and takes the first symbol. The games of a batch are saved by one commit, so the write-behind options do
+     not apply.
+
+    Args:
+        task (SimulationTask): Part of the simulation.
+        repository (Repository): Storage of the games.
+        league (LeagueSeason): League to play in.
+        users (List[User]): Users of the task in the order of its strategies.
+        report (SimulationReport): Results of the played games to update.
+    """
+    if task.strategies != ("random", "random"):
+        raise ValueError("The batch engine plays the random strategies only")
+    generator = np.random.default_rng(task.seed)
+    for batch_start in range(0, task.games, BATCH_SIZE):
+        games = min(BATCH_SIZE, task.games - batch_start)
+        moves, lengths, outcomes = play_random_games(
+            games, league.field_size, league.win_length, int(generator.integers(2**32))
+        )
+        players = [[users[i], users[1 - i]] for i in generator.integers(0, 2, games).tolist()]
+        finished_games = []
+        for game_players, game_moves, length, outcome in zip(
+            players, moves.tolist(), lengths.tolist(), outcomes.tolist()
+        ):
+            winner = {FIRST_WINS: game_players[0], SECOND_WINS: game_players[1]}.get(outcome)
+            finished_games.append(
+                FinishedGame(
+                    [i.id for i in game_players], game_moves[:length], winner.id if winner is not None else None
+                )
+            )
+            report.games += 1
+            report.moves += length
+            if winner is None:
+                report.draws += 1
+            elif winner.id == task.user_ids[0]:
+                report.first_wins += 1
+            else:
+                report.second_wins += 1
+        repository.add_finished_games(league, finished_games)
+        repository.commit()
+
+
+def find_league_season(db_session: scoped_session, league_id: Optional[int]) -> LeagueSeason:
+    """
+    Finds the league season to play in.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_id (Optional[int]): Identifier of the league, the latest league is used if it is not passed.
+
+    Returns:
+        LeagueSeason: League season to play in.
+    """
+    query = db_session.query(LeagueSeason)
+    league: Optional[LeagueSeason]
+    if league_id is None:
+        league = query.order_by(LeagueSeason.id.desc()).limit(1).one_or_none()
+    else:
+        league = query.filter(LeagueSeason.id == league_id).one_or_none()
+    if league is None:
+        raise ValueError("There is no league season to play in, create one in the management menu")
+    return league
+
+
+def prepare_simulation(db_session: scoped_session, league_id: Optional[int]) -> Tuple[int, Tuple[int, int]]:
+    """
+    Finds the league and the users for the simulation, the missing users are created.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_id (Optional[int]): Identifier of the league, the latest league is used if it is not passed.
+
+    Returns:
+        Tuple[int, Tuple[int, int]]: Identifiers of the league and of the two users.
+    """
+    league = find_league_season(db_session, league_id)
+    users = db_session.query(User).order_by(User.id).limit(REQUIRED_PLAYERS_NUMBER).all()
+    if len(users) < REQUIRED_PLAYERS_NUMBER:
+        new_users = [
+            User(nickname=SIMULATOR_NICKNAME.format(i + 1))  # type: ignore [call-arg]
+            for i in range(len(users), REQUIRED_PLAYERS_NUMBER)
+        ]
+        db_session.add_all(new_users)
+        db_session.commit()
+        users.extend(new_users)
+    return league.id, (users[0].id, users[1].id)
+
+
+def persist_snapshots(db_session: scoped_session, snapshots: List[Snapshot]) -> Dict[str, int]:
+    """
+    Writes the snapshots of the memory repositories of the workers to the database in one transaction. The workers
+     rated their games from the same starting ratings, so the ratings of several snapshots are rebuilt by replaying
+     the games of the league season in the order they were written instead of adding the changes of every worker.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        snapshots (List[Snapshot]): Changes of the memory repositories.
+
+    Returns:
+        Dict[str, int]: Number of the written rows by the names of the tables.
+    """
+    result: Dict[str, int] = {}
+    for snapshot in snapshots:
+        for name, count in write_snapshot(db_session, snapshot).items():
+            result[name] = result.get(name, 0) + count
+    if len(snapshots) > 1:
+        league_season_ids = {row["league_season_id"] for i in snapshots for row in i.rows.get("game", [])}
+        # The ratings are rebuilt in the same transaction, rebuild_league_ratings commits it
+        rebuild_league_ratings(db_session, league_season_ids.pop() if len(league_season_ids) == 1 else None)
+    else:
+        db_session.commit()
+    return result
+
+
+def split_games(games: int, workers: int) -> List[int]:
+    """
+    Splits the games between the workers as evenly as possible.
+
+    Args:
+        games (int): Number of the games.
+        workers (int): Number of the workers.
+
+    Returns:
+        List[int]: Number of the games of every worker, the workers without games are omitted.
+    """
+    return [number for i in range(workers) if (number := games // workers + (i < games % workers))]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Calculates the percentile by the nearest rank method.
+
+    Args:
+        values (List[float]): Measured values.
+        fraction (float): Rank of the percentile from 0 to 1, e.g. 0.99.
+
+    Returns:
+        float: Value of the percentile, 0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+@contextlib.contextmanager
+def open_command_session(settings: Dict[str, Any], **session_options: Any) -> Iterator[scoped_session]:
+    """
+    Opens the session of a command line tool, the errors of its arguments are reported as the usage errors.
+
+    Args:
+        settings (Dict[str, Any]): Settings of the database.
+        session_options (Any): Options of the session, e.g. expire_on_commit.
+
+    Yields:
+        scoped_session: Session of connection to the database, closed with its engine at the exit.
+    """
+    db_engine = make_engine(settings)
+    db_session = make_session(db_engine, **session_options)
+    try:
+        yield db_session
+    except ValueError as error:
+        raise click.UsageError(str(error)) from error
+    finally:
+        delete_session(db_session)
+        db_engine.dispose()
+
+
+def echo_throughput(games: int, moves: int, elapsed: float) -> None:
+    """
+    Prints the number of the played games and moves per second.
+
+    Args:
+        games (int): Number of the games.
+        moves (int): Number of the moves.
+        elapsed (float): Time of the run in seconds.
+    """
+    rate_elapsed = max(elapsed, 1e-9)
+    click.echo(f"Games: {games} in {elapsed:.3f} s, {games / rate_elapsed:,.1f} games/s")
+    click.echo(f"Moves: {moves}, {moves / rate_elapsed:,.1f} moves/s")
+
+
+@click.command()
+@click.option("--games", default=100, show_default=True, help="Number of the games to play.")
+@click.option("--workers", default=1, show_default=True, help="Number of the worker processes.")
+@click.option("--first", type=click.Choice(STRATEGIES), default="random", show_default=True, help="First player.")
+@click.option("--second", type=click.Choice(STRATEGIES), default="random", show_default=True, help="Second player.")
+@click.option("--script", default="", help='Moves of the scripted players, e.g. "1,1 0,0 2,2".')
+@click.option("--league-id", default=None, type=int, help="League to play in, the latest league by default.")
+@click.option("--db-url", default=None, help="Database to persist the games to, the game database by default.")
+@click.option("--seed", default=None, type=int, help="Seed of the random players.")
+@click.option("--write-behind", is_flag=True, help="Buffer the decisions and commit them with the game results.")
+@click.option("--flush-every", default=None, type=int, help="Commit the buffered decisions every N moves.")
+@click.option(
+    "--storage",
+    type=click.Choice(STORAGES),
+    default="database",
+    show_default=True,
+    help="Store the games in the database as they are played or in memory and write them once at the end.",
+)
+@click.option(
+    "--compact-moves/--no-compact-moves",
+    default=None,
+    help="Store the moves encoded on the game rows, the db_compact_moves setting by default.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(ENGINES),
+    default="session",
+    show_default=True,
+    help="Play every game in a game session or many random games at once on the batch engine.",
+)
+@click.option(
+    "--mcts-iterations",
+    default=MCTS_ITERATIONS,
+    show_default=True,
+    help="Number of the iterations of the search of a move by the mcts strategy.",
+)
+def main(  # pylint: disable=too-many-arguments,too-many-locals
+    games: int,
+    workers: int,
+    first: str,
+    second: str,
+    script: str,
+    league_id: Optional[int],
+    db_url: Optional[str],
+    seed: Optional[int],
+    write_behind: bool,
+    flush_every: Optional[int],
+    storage: str,
+    compact_moves: Optional[bool],
+    engine: str,
+    mcts_iterations: int,
+) -> None:
+    if engine == "batch" and (first, second) != ("random", "random"):
+        raise click.UsageError("The batch engine plays the random strategies only")
+    settings = get_settings()
+    db_url = db_url or settings["db_url"]
+    with open_command_session({**settings, "db_url": db_url}) as db_session:
+        league_id, user_ids = prepare_simulation(db_session, league_id)
+        field_size = (
+            db_session.query(LeagueSeason.field_size)  # pylint: disable=no-member
+            .filter(LeagueSeason.id == league_id)
+            .scalar()
+        )
+        moves = parse_script(script, field_size)
+
+    tasks = [
+        SimulationTask(
+            db_url=db_url,
+            league_id=league_id,
+            user_ids=user_ids,
+            strategies=(first, second),
+            games=number,
+            seed=None if seed is None else seed + i,
+            script=moves,
+            write_behind=write_behind,
+            flush_every=flush_every,
+            storage=storage,
+            compact_moves=settings["db_compact_moves"] if compact_moves is None else compact_moves,
+            engine=engine,
+            mcts_iterations=mcts_iterations,
+        )
+        for i, number in enumerate(split_games(games, workers))
+    ]
+    report = SimulationReport()
+    started_at = time.perf_counter()
+    if len(tasks) > 1:
+        with multiprocessing.Pool(len(tasks)) as pool:
+            for worker_report in pool.map(run_simulation, tasks):
+                report.merge(worker_report)
+    else:
+        for task in tasks:
+            report.merge(run_simulation(task))
+    elapsed = time.perf_counter() - started_at
+    if report.snapshots:
+        with open_command_session({**settings, "db_url": db_url}) as db_session:
+            snapshot_started_at = time.perf_counter()
+            counts = persist_snapshots(db_session, report.snapshots)
+            snapshot_elapsed = time.perf_counter() - snapshot_started_at
+        click.echo(
+            f"Snapshot: {counts['game']} games, {counts['game_user_decision']} decisions written in "
+            f"{snapshot_elapsed:.3f} s"
+        )
+        elapsed += snapshot_elapsed
+
+    echo_throughput(report.games, report.moves, elapsed)
+    click.echo(
+        f"First player wins: {report.first_wins}, second player wins: {report.second_wins}, draws: {report.draws}"
+    )
+    click.echo(
+        f"Commits: {len(report.write_latencies)}, latency "
+        + ", ".join(
+            f"p{round(fraction * 100)} {percentile(report.write_latencies, fraction) * 1000:.2f} ms"
+            for fraction in (0.5, 0.95, 0.99)
+        )
+    )
@@ -0,0 +1,373 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.components.game.model import FIELD_SIZE, WIN_LENGTH, build_win_masks
+
+# The full game tree of the larger fields is too big to be solved in a reasonable time
+MAX_SOLVED_FIELD_SIZE = 4
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+# Number of the searched positions between the checks of the deadline and the cancellation, a power of two
+CHECK_INTERVAL = 1024
+
+
+class SearchInterrupted(Exception):
+    """
+    Raised inside the search when its deadline expires or it is cancelled.
+    """
+
+
+def build_symmetries(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Builds the 8 dihedral symmetries of the square game field as permutations of the cell indexes.
+
+    Args:
+        size (int): Length of the side of the game field.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: For every symmetry, the index of the cell each cell is moved to.
+    """
+    last = size - 1
+    transformations = (
+        lambda x, y: (x, y),
+        lambda x, y: (y, last - x),
+        lambda x, y: (last - x, last - y),
+        lambda x, y: (last - y, x),
+        lambda x, y: (x, last - y),
+        lambda x, y: (last - x, y),
+        lambda x, y: (y, x),
+        lambda x, y: (last - y, last - x),
+    )
+    result = []
+    for transformation in transformations:
+        permutation = []
+        for cell in range(size * size):
+            x_coordinate, y_coordinate = transformation(cell // size, cell % size)
+            permutation.append(x_coordinate * size + y_coordinate)
+        result.append(tuple(permutation))
+    return tuple(result)
+
+
+@dataclass
+class SolverResult:
+    """
+    Data model of the system entity - SolverResult.
+
+    Attributes:
+        value (int): Game-theoretic value of the position for the player to move: 1 win, 0 draw, -1 loss.
+        score (int): Raw negamax score, the sooner the win the greater the score.
+        move (Optional[Tuple[int, int]]): Coordinates of the best move or None if the game is over.
+        nodes (int): Number of positions searched.
+        cache_hits (int): Number of positions found in the transposition table.
+        depth (int): Depth in moves of the last completed iteration of the search.
+        exact (bool): The value is proven, otherwise the positions beyond the depth are assumed to be draws.
+        elapsed (float): Time of the search in seconds.
+    """
+
+    value: int = field()
+    score: int = field()
+    move: Optional[Tuple[int, int]] = field()
+    nodes: int = field(default=0)
+    cache_hits: int = field(default=0)
+    depth: int = field(default=0)
+    exact: bool = field(default=True)
+    elapsed: float = field(default=0.0)
+
+
+class Solver:
+    """
+    Perfect play solver of the game.
+
+    Computes the game-theoretic value and the best move of a position by negamax with alpha-beta pruning.
+     Positions are stored in a transposition table keyed by a canonical hash, the minimal code of the position among
+     its 8 dihedral symmetries, so the symmetric positions are searched once.
+    A position is a pair of bitmasks of the player to move and of the opponent, where cell (x, y) is the bit number
+     x * size + y, the same layout as BitboardGameField uses.
+    With a time limit the search deepens iteratively, one move deeper on every iteration, and the best move of the
+     last completed iteration is returned when the deadline expires or the search is cancelled. The positions
+     beyond the depth are scored as draws, and only the scores not depending on them are stored in the table.
+
+    Attributes:
+        size (int): Length of the side of the game field.
+        win_length (int): Number of marks in a row required to win.
+        transposition_table (Dict[int, Tuple[int, int]]): Score and bound flag of the searched positions.
+        nodes (int): Number of positions searched by the last call.
+        cache_hits (int): Number of transposition table hits of the last call.
+
+    Methods:
+        __init__(self, size, win_length):
+            Initializes a Solver instance.
+        solve(self, own, opponent, time_limit=None) -> SolverResult:
+            Computes the value and the best move of the position.
+        cancel(self):
+            Stops the running search.
+        __search_root(self, own, opponent, depth, move_order):
+            Computes the best move of the position searched to the depth.
+        __negamax(self, own, opponent, alpha, beta, depth):
+            Computes the score of the position within the window.
+        __store(self, key, score, alpha, beta):
+            Stores the score of the position in the transposition table.
+        __get_canonical_key(self, own, opponent):
+            Computes the canonical hash of the position.
+        __is_win(self, marks, cell):
+            Checks if the marks contain a winning line passing through the cell.
+    """
+
+    def __init__(self, size: int = FIELD_SIZE, win_length: int = WIN_LENGTH) -> None:
+        """
+        Initializes a Solver instance.
+
+        Args:
+            size (int): Length of the side of the game field.
+            win_length (int): Number of marks in a row required to win.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.transposition_table: Dict[int, Tuple[int, int]] = {}
+        self.nodes = 0
+        self.cache_hits = 0
+        self._cells_number = size * size
+        self._full_mask = (1 << self._cells_number) - 1
+        self._win_masks = build_win_masks(size, win_length)
+        self._symmetries = build_symmetries(size)
+        # The cells crossed by more winning lines are searched first, it makes the cut-offs happen earlier
+        self._move_order = sorted(range(self._cells_number), key=lambda cell: -len(self._win_masks[cell]))
+        self._deadline: Optional[float] = None
+        self._cancelled = threading.Event()
+        # Set when the score of the searched subtree depends on the positions beyond the depth
+        self._horizon = False
+        self._depth_table: Dict[int, Tuple[int, int, int]] = {}
+
+    def solve(self, own: int, opponent: int, time_limit: Optional[float] = None) -> SolverResult:
+        """
+        Computes the value and the best move of the position.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            time_limit (Optional[float]): Time of the search in seconds, the search is deepened iteratively until
+             the value is proven or the time expires. None searches to the end of the game.
+
+        Returns:
+            SolverResult: Value, best move and search statistics.
+        """
+        started_at = time.perf_counter()
+        self.nodes = 0
+        self.cache_hits = 0
+        self._cancelled.clear()
+        self._depth_table.clear()
+        self._deadline = None if time_limit is None else started_at + time_limit
+        empty_cells = self._cells_number - (own | opponent).bit_count()
+        move_order = list(self._move_order)
+        result = SolverResult(value=0, score=0, move=None, exact=empty_cells == 0)
+        for depth in [None] if time_limit is None else range(1, empty_cells + 1):
+            self._horizon = False
+            try:
+                best_score, best_cell = self.__search_root(own, opponent, depth, move_order)
+            except SearchInterrupted:
+                break
+            if best_cell is None:
+                break
+            result.value = (best_score > 0) - (best_score < 0)
+            result.score = best_score
+            result.move = (best_cell // self.size, best_cell % self.size)
+            result.depth = empty_cells if depth is None else depth
+            result.exact = not self._horizon
+            if result.exact:
+                break
+            # The best move of the last iteration is searched first by the next one
+            move_order.remove(best_cell)
+            move_order.insert(0, best_cell)
+        if result.move is None and empty_cells:
+            cell = next(i for i in move_order if not (own | opponent) >> i & 1)
+            result.move = (cell // self.size, cell % self.size)
+        self._deadline = None
+        result.nodes = self.nodes
+        result.cache_hits = self.cache_hits
+        result.elapsed = time.perf_counter() - started_at
+        return result
+
+    def cancel(self) -> None:
+        """
+        Stops the running search, e.g. from another thread. The search returns the best move of its last completed
+         iteration, a search without a time limit has no such move and returns the first empty cell.
+        """
+        self._cancelled.set()
+
+    def __search_root(
+        self, own: int, opponent: int, depth: Optional[int], move_order: List[int]
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Computes the best move of the position searched to the depth.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            depth (Optional[int]): Number of the moves searched, None searches to the end of the game.
+            move_order (List[int]): Order of the cells the moves are searched in.
+
+        Returns:
+            Tuple[int, Optional[int]]: Score of the position and the cell of the best move, None if the game field
+             is full.
+        """
+        occupied = own | opponent
+        best_score = -self._cells_number - 1
+        best_cell: Optional[int] = None
+        alpha, beta = -self._cells_number - 1, self._cells_number + 1
+        for cell in move_order:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            if self.__is_win(own | bit, cell):
+                score = self._cells_number - (occupied | bit).bit_count() + 1
+            else:
+                score = -self.__negamax(opponent, own | bit, -beta, -alpha, None if depth is None else depth - 1)
+            if score > best_score:
+                best_score, best_cell = score, cell
+            alpha = max(alpha, score)
+        return best_score, best_cell
+
+    def __negamax(  # pylint: disable=too-many-arguments,too-many-locals,too-many-branches
+        self, own: int, opponent: int, alpha: int, beta: int, depth: Optional[int] = None
+    ) -> int:
+        """
+        Computes the score of the position within the window. A win scores the number of the empty cells left
+         after it plus one, so the sooner wins are preferred and the later losses are delayed.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+            alpha (int): Lower bound of the window.
+            beta (int): Upper bound of the window.
+            depth (Optional[int]): Number of the moves searched, the position is scored as a draw at 0. None searches
+             to the end of the game.
+
+        Returns:
+            int: Score of the position for the player to move.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0 and (
+            self._cancelled.is_set() or self._deadline is not None and time.perf_counter() >= self._deadline
+        ):
+            raise SearchInterrupted()
+        occupied = own | opponent
+        if occupied == self._full_mask:
+            return 0
+
+        alpha_original = alpha
+        key = self.__get_canonical_key(own, opponent)
+        entry = self.transposition_table.get(key)
+        # The scores of the earlier iterations searched at least as deep are used but depend on the horizon
+        is_bounded_by_horizon = False
+        if entry is None and depth is not None:
+            depth_entry = self._depth_table.get(key)
+            if depth_entry is not None and depth_entry[2] >= depth:
+                entry = depth_entry[:2]
+                is_bounded_by_horizon = True
+        if entry is not None:
+            self.cache_hits += 1
+            self._horizon = self._horizon or is_bounded_by_horizon
+            score, flag = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+        if depth == 0:
+            self._horizon = True
+            return 0
+
+        horizon = self._horizon
+        self._horizon = is_bounded_by_horizon
+        empty_after_move = self._cells_number - occupied.bit_count() - 1
+        best_score = -self._cells_number - 1
+        for cell in self._move_order:
+            bit = 1 << cell
+            if occupied & bit:
+                continue
+            if self.__is_win(own | bit, cell):
+                best_score = empty_after_move + 1
+                break
+            best_score = max(
+                best_score, -self.__negamax(opponent, own | bit, -beta, -alpha, None if depth is None else depth - 1)
+            )
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+
+        self.__store(key, best_score, alpha_original, beta, depth if self._horizon else None)
+        self._horizon = horizon or self._horizon
+        return best_score
+
+    def __store(  # pylint: disable=too-many-arguments
+        self, key: int, score: int, alpha: int, beta: int, depth: Optional[int] = None
+    ) -> None:
+        """
+        Stores the score of the position in the transposition table. A score outside the search window is only
+         a bound of the real score. A score depending on the positions beyond the depth is kept for the current
+         search only.
+
+        Args:
+            key (int): Canonical hash of the position.
+            score (int): Score of the position.
+            alpha (int): Lower bound of the search window.
+            beta (int): Upper bound of the search window.
+            depth (Optional[int]): Depth the position was searched to if the score depends on the horizon.
+        """
+        if score <= alpha:
+            flag = UPPER_BOUND
+        elif score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if depth is None:
+            self.transposition_table[key] = (score, flag)
+        else:
+            self._depth_table[key] = (score, flag, depth)
+
+    def __get_canonical_key(self, own: int, opponent: int) -> int:
+        """
+        Computes the canonical hash of the position, the minimal code among its 8 dihedral symmetries.
+
+        Args:
+            own (int): Bitmask of the cells of the player to move.
+            opponent (int): Bitmask of the cells of the opponent.
+
+        Returns:
+            int: Canonical hash of the position.
+        """
+        cells: List[Tuple[int, int]] = []
+        for cell in range(self._cells_number):
+            bit = 1 << cell
+            if own & bit:
+                cells.append((cell, 0))
+            elif opponent & bit:
+                cells.append((cell, self._cells_number))
+        result = -1
+        for permutation in self._symmetries:
+            key = 0
+            for cell, shift in cells:
+                key |= 1 << (permutation[cell] + shift)
+            if result < 0 or key < result:
+                result = key
+        return result
+
+    def __is_win(self, marks: int, cell: int) -> bool:
+        """
+        Checks if the marks contain a winning line passing through the cell.
+
+        Args:
+            marks (int): Bitmask of the cells of the player.
+            cell (int): Index of the last filled cell.
+
+        Returns:
+            bool: True if the player wins.
+        """
+        return any(marks & mask == mask for mask in self._win_masks[cell])
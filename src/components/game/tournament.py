@@ -0,0 +1,725 @@
+"""
+Tournaments of the league seasons.
+
+A tournament pairs its players by the round-robin or the Swiss system. The pairings are stored in the database, a
+ game is linked to its pairing when its result is written, so an interrupted tournament is resumed from the pairings
+ left without games, and a Swiss round is paired by the scores of the finished rounds only when they are complete.
+The games between the computer strategies of a round are played at once on a pool of worker processes, while the
+ games of the human players are played at the keyboard, and the results of the workers are written in batches, one
+ transaction per batch.
+
+Usage:
+    python -m src.components.game.tournament --player 1:mcts --player 2:random --player 3:solver --workers 4
+    python -m src.components.game.tournament --system swiss --rounds 3 --player 1:human --player 2:mcts
+    python -m src.components.game.tournament --tournament-id 1
+"""
+import contextlib
+import math
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import click
+from sqlalchemy.orm import scoped_session
+
+from src.components.game.batch import SYMBOLS
+from src.components.game.model import BitboardGameField
+from src.components.game.player import HumanPlayer, Player
+from src.components.game.service import GameSession
+from src.components.game.simulator import (
+    MCTS_ITERATIONS,
+    echo_throughput,
+    find_league_season,
+    make_player,
+    open_command_session,
+)
+from src.database.model.game import Game, GameResult, LeagueSeason
+from src.database.model.tournament import (
+    Tournament,
+    TournamentPairing,
+    TournamentPlayer,
+)
+from src.database.model.user import User
+from src.database.repository import FinishedGame, GameMetadata, SqlAlchemyRepository
+from src.settings import get_settings
+
+SYSTEMS = ("round_robin", "swiss")
+STRATEGIES = ("human", "random", "solver", "mcts")
+# Scores of the tournament standings, a bye scores as a win
+WIN_SCORE = 2
+DRAW_SCORE = 1
+LOSS_SCORE = 0
+# Number of the games of the workers written by one transaction
+BATCH_SIZE = 100
+MIN_PLAYERS_NUMBER = 2
+
+
+class TournamentStanding(NamedTuple):
+    nickname: str
+    games: int
+    wins: int
+    draws: int
+    losses: int
+    score: int
+
+
+@dataclass
+class PairingTask:
+    """
+    Game of a pairing played by a worker.
+    """
+
+    pairing_id: int
+    user_ids: Tuple[int, int]
+    strategies: Tuple[str, str]
+    field_size: int
+    win_length: int
+    move_time_limit: Optional[int] = None
+    seed: Optional[int] = None
+    mcts_iterations: int = MCTS_ITERATIONS
+
+
+@dataclass
+class PairingOutcome:
+    """
+    Moves and the winner of the game of a pairing.
+    """
+
+    pairing_id: int
+    cells: List[int] = field(default_factory=list)
+    winner_id: Optional[int] = None
+
+
+@dataclass
+class TournamentReport:
+    """
+    Results of the run of the tournament.
+    """
+
+    rounds: int = 0
+    pairings: int = 0
+    games: int = 0
+    moves: int = 0
+    transactions: int = 0
+    scheduling_elapsed: float = 0.0
+    writing_elapsed: float = 0.0
+    elapsed: float = 0.0
+
+
+def parse_player(value: str) -> Tuple[int, str]:
+    """
+    Parses the player of the tournament.
+
+    Args:
+        value (str): Identifier of the user and the strategy separated by a colon, e.g. "1:mcts".
+
+    Returns:
+        Tuple[int, str]: Identifier of the user and the strategy.
+    """
+    user_id, _, strategy = value.partition(":")
+    if not user_id.isdigit() or strategy not in STRATEGIES:
+        raise ValueError(f"Player {value} should be a user id and one of {', '.join(STRATEGIES)} after a colon")
+    return int(user_id), strategy
+
+
+def make_round_robin(user_ids: Sequence[int], cycles: int = 1) -> List[List[Tuple[int, Optional[int]]]]:
+    """
+    Pairs every player with every other one by the circle method: the first player stays and the others rotate.
+     The players move first in turn, and the order is swapped in every other cycle. With an odd number of the players
+     one of them has a bye in every round.
+
+    Args:
+        user_ids (Sequence[int]): Identifiers of the users.
+        cycles (int): Number of the games of every two players.
+
+    Returns:
+        List[List[Tuple[int, Optional[int]]]]: Pairings of every round, the first user moves first, None is a bye.
+    """
+    players: List[Optional[int]] = list(user_ids)
+    if len(players) % 2:
+        players.append(None)
+    rounds = []
+    for round_number in range(len(players) - 1):
+        pairings = []
+        for i in range(len(players) // 2):
+            first, second = players[i], players[len(players) - 1 - i]
+            if (round_number + i) % 2:
+                first, second = second, first
+            if first is None:
+                first, second = second, first
+            pairings.append((first, second))
+        rounds.append(pairings)
+        players = players[:1] + players[-1:] + players[1:-1]
+    result = []
+    for cycle in range(cycles):
+        for pairings in rounds:
+            result.append(
+                [
+                    (second, first) if cycle % 2 and second is not None else (first, second)  # type: ignore [misc]
+                    for first, second in pairings
+                ]
+            )
+    return result  # type: ignore [return-value]
+
+
+def make_swiss_round(
+    ranked_ids: Sequence[int], played: Set[FrozenSet[int]], byes: Set[int], first_moves: Dict[int, int]
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Pairs the players of a Swiss round: the players of close scores play each other and no two players play twice
+     while it is possible. With an odd number of the players the lowest ranked player without a bye has it.
+
+    Args:
+        ranked_ids (Sequence[int]): Identifiers of the users from the best score to the worst one.
+        played (Set[FrozenSet[int]]): Pairs of the users who played each other.
+        byes (Set[int]): Users who had a bye.
+        first_moves (Dict[int, int]): Number of the games the users moved first in.
+
+    Returns:
+        List[Tuple[int, Optional[int]]]: Pairings of the round, the user who moved first less often moves first.
+    """
+    ranked = list(ranked_ids)
+    result: List[Tuple[int, Optional[int]]] = []
+    if len(ranked) % 2:
+        bye = next((i for i in reversed(ranked) if i not in byes), ranked[-1])
+        ranked.remove(bye)
+        result.append((bye, None))
+    pairs = pair_players(ranked, played)
+    if pairs is None:
+        pairs = list(zip(ranked[::2], ranked[1::2]))
+    for first, second in pairs:
+        if first_moves.get(second, 0) < first_moves.get(first, 0):
+            first, second = second, first
+        result.insert(len(result) - (1 if result and result[-1][1] is None else 0), (first, second))
+    return result
+
+
+def pair_players(ranked: List[int], played: Set[FrozenSet[int]]) -> Optional[List[Tuple[int, int]]]:
+    """
+    Pairs the best ranked player with the next one not played yet and the rest recursively, backtracking when the
+     rest can not be paired.
+
+    Args:
+        ranked (List[int]): Identifiers of the users from the best score to the worst one, an even number of them.
+        played (Set[FrozenSet[int]]): Pairs of the users who played each other.
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: Pairs of the users or None if every pairing repeats a game.
+    """
+    if not ranked:
+        return []
+    first, rest = ranked[0], ranked[1:]
+    for i, opponent in enumerate(rest):
+        if frozenset((first, opponent)) in played:
+            continue
+        tail = pair_players(rest[:i] + rest[i + 1 :], played)
+        if tail is not None:
+            return [(first, opponent)] + tail
+    return None
+
+
+def create_tournament(  # pylint: disable=too-many-arguments
+    db_session: scoped_session,
+    league: LeagueSeason,
+    players: List[Tuple[int, str]],
+    system: str = "round_robin",
+    rounds: Optional[int] = None,
+    cycles: int = 1,
+    name: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> Tournament:
+    """
+    Creates the tournament with its players and the pairings. All rounds of the round-robin system are paired at
+     once, the Swiss rounds are paired one by one by schedule_round.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league (LeagueSeason): League the games are played in.
+        players (List[Tuple[int, str]]): Identifiers of the users and their strategies.
+        system (str): One of SYSTEMS.
+        rounds (Optional[int]): Number of the Swiss rounds, enough rounds to find the winner by default.
+        cycles (int): Number of the games of every two players of the round-robin system.
+        name (Optional[str]): Name of the tournament.
+        seed (Optional[int]): Seed of the computer players.
+
+    Returns:
+        Tournament: Tournament object.
+    """
+    if system not in SYSTEMS:
+        raise ValueError(f"Unknown system {system}, choose one of {', '.join(SYSTEMS)}")
+    user_ids = [user_id for user_id, _ in players]
+    if len(set(user_ids)) != len(user_ids) or len(user_ids) < MIN_PLAYERS_NUMBER:
+        raise ValueError(f"A tournament needs at least {MIN_PLAYERS_NUMBER} different players")
+    for _, strategy in players:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy}, choose one of {', '.join(STRATEGIES)}")
+    known_ids = {i for (i,) in db_session.query(User.id).filter(User.id.in_(user_ids))}  # pylint: disable=no-member
+    if len(known_ids) != len(user_ids):
+        raise ValueError(f"There are no users {', '.join(str(i) for i in user_ids if i not in known_ids)}")
+    round_robin = make_round_robin(user_ids, cycles) if system == "round_robin" else []
+    if system == "swiss":
+        rounds = rounds or math.ceil(math.log2(len(user_ids)))
+    tournament = Tournament(  # type: ignore [call-arg]
+        league_season_id=league.id, name=name, system=system, rounds=rounds or len(round_robin), seed=seed
+    )
+    db_session.add(tournament)
+    db_session.flush()
+    db_session.add_all(
+        TournamentPlayer(tournament_id=tournament.id, user_id=user_id, strategy=strategy)  # type: ignore [call-arg]
+        for user_id, strategy in players
+    )
+    add_pairings(db_session, tournament, round_robin)
+    db_session.commit()
+    return tournament
+
+
+def add_pairings(
+    db_session: scoped_session,
+    tournament: Tournament,
+    rounds: List[List[Tuple[int, Optional[int]]]],
+    first_round: int = 1,
+) -> None:
+    """
+    Adds the pairings of the rounds to the session.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        tournament (Tournament): Tournament object.
+        rounds (List[List[Tuple[int, Optional[int]]]]): Pairings of every round.
+        first_round (int): Number of the first of the rounds.
+    """
+    db_session.add_all(
+        TournamentPairing(  # type: ignore [call-arg]
+            tournament_id=tournament.id, round=round_number, first_user_id=first, second_user_id=second
+        )
+        for round_number, pairings in enumerate(rounds, first_round)
+        for first, second in pairings
+    )
+
+
+def get_pairing_winners(
+    db_session: scoped_session, tournament_id: int
+) -> List[Tuple[TournamentPairing, Optional[int]]]:
+    """
+    Gets the finished pairings of the tournament with their winners, a bye is won by its player.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        tournament_id (int): Tournament object identifier.
+
+    Returns:
+        List[Tuple[TournamentPairing, Optional[int]]]: Pairings in the order of the rounds and the identifiers of
+         their winners, None for a draw.
+    """
+    pairings = (
+        db_session.query(TournamentPairing)  # pylint: disable=no-member
+        .filter(TournamentPairing.tournament_id == tournament_id)
+        .order_by(TournamentPairing.round, TournamentPairing.id)
+        .all()
+    )
+    game_ids = [i.game_id for i in pairings if i.game_id is not None]
+    winners = dict(
+        db_session.query(GameResult.game_id, GameResult.user_id)  # pylint: disable=no-member
+        .filter(GameResult.game_id.in_(game_ids), GameResult.is_winner.is_(True))
+        .all()
+    )
+    return [
+        (i, i.first_user_id if i.second_user_id is None else winners.get(i.game_id))
+        for i in pairings
+        if i.second_user_id is None or i.game_id is not None
+    ]
+
+
+def get_tournament_standings(db_session: scoped_session, tournament_id: int) -> List[TournamentStanding]:
+    """
+    Gets the standings of the tournament ordered by the score.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        tournament_id (int): Tournament object identifier.
+
+    Returns:
+        List[TournamentStanding]: Nickname, games, wins, draws, losses and score of the players, a bye is a win.
+    """
+    players = (
+        db_session.query(TournamentPlayer.user_id, User.nickname)  # pylint: disable=no-member
+        .join(User, User.id == TournamentPlayer.user_id)
+        .filter(TournamentPlayer.tournament_id == tournament_id)
+        .order_by(TournamentPlayer.id)
+        .all()
+    )
+    values = {user_id: [0, 0, 0, 0] for user_id, _ in players}
+    for pairing, winner_id in get_pairing_winners(db_session, tournament_id):
+        for user_id in (pairing.first_user_id, pairing.second_user_id):
+            if user_id is None:
+                continue
+            user_values = values[user_id]
+            user_values[0] += 1
+            user_values[1 if winner_id == user_id else 2 if winner_id is None else 3] += 1
+    result = []
+    for user_id, nickname in players:
+        games, wins, draws, losses = values[user_id]
+        score = wins * WIN_SCORE + draws * DRAW_SCORE + losses * LOSS_SCORE
+        result.append(TournamentStanding(nickname, games, wins, draws, losses, score))
+    return sorted(result, key=lambda i: -i.score)
+
+
+def schedule_round(db_session: scoped_session, tournament: Tournament) -> Optional[int]:
+    """
+    Finds the first round with the games not played yet. When all paired rounds are played, the next Swiss round is
+     paired by the scores of the players and added.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        tournament (Tournament): Tournament object.
+
+    Returns:
+        Optional[int]: Number of the round to play or None if the tournament is over.
+    """
+    pending_round = (
+        db_session.query(TournamentPairing.round)  # pylint: disable=no-member
+        .filter(
+            TournamentPairing.tournament_id == tournament.id,
+            TournamentPairing.game_id.is_(None),
+            TournamentPairing.second_user_id.isnot(None),
+        )
+        .order_by(TournamentPairing.round)
+        .limit(1)
+        .scalar()
+    )
+    if pending_round is not None:
+        return int(pending_round)
+    last_round = (
+        db_session.query(TournamentPairing.round)  # pylint: disable=no-member
+        .filter(TournamentPairing.tournament_id == tournament.id)
+        .order_by(TournamentPairing.round.desc())
+        .limit(1)
+        .scalar()
+    ) or 0
+    if tournament.system != "swiss" or last_round >= tournament.rounds:
+        return None
+    user_ids = [
+        i
+        for (i,) in db_session.query(TournamentPlayer.user_id)  # pylint: disable=no-member
+        .filter(TournamentPlayer.tournament_id == tournament.id)
+        .order_by(TournamentPlayer.id)
+    ]
+    scores = {i: 0 for i in user_ids}
+    played: Set[FrozenSet[int]] = set()
+    byes: Set[int] = set()
+    first_moves: Dict[int, int] = {}
+    for pairing, winner_id in get_pairing_winners(db_session, tournament.id):
+        if pairing.second_user_id is None:
+            byes.add(pairing.first_user_id)
+        else:
+            played.add(frozenset((pairing.first_user_id, pairing.second_user_id)))
+            first_moves[pairing.first_user_id] = first_moves.get(pairing.first_user_id, 0) + 1
+            if winner_id is None:
+                scores[pairing.first_user_id] += DRAW_SCORE
+                scores[pairing.second_user_id] += DRAW_SCORE
+                continue
+        scores[winner_id] += WIN_SCORE  # type: ignore [index]
+    # The sort is stable, so the players of equal scores keep the order of the registration
+    ranked = sorted(user_ids, key=lambda i: -scores[i])
+    add_pairings(db_session, tournament, [make_swiss_round(ranked, played, byes, first_moves)], last_round + 1)
+    db_session.commit()
+    return last_round + 1
+
+
+def play_pairing(task: PairingTask) -> PairingOutcome:
+    """
+    Plays the game of the pairing between two computer strategies in memory, the first user moves first.
+
+    Args:
+        task (PairingTask): Game of the pairing.
+
+    Returns:
+        PairingOutcome: Moves and the winner of the game, a player failing to choose a move loses.
+    """
+    league = LeagueSeason(  # type: ignore [call-arg]
+        field_size=task.field_size, win_length=task.win_length, move_time_limit=task.move_time_limit
+    )
+    players = [make_player(strategy, league, task.seed, None, task.mcts_iterations) for strategy in task.strategies]
+    game_metadata = [
+        GameMetadata(Game(), GameResult(user_id=user_id, symbol=symbol), User(id=user_id), league)  # type: ignore
+        for user_id, symbol in zip(task.user_ids, SYMBOLS)
+    ]
+    game_field = BitboardGameField(game_metadata, task.field_size, task.win_length)
+    result = PairingOutcome(task.pairing_id)
+    for ply in range(task.field_size * task.field_size):
+        move = players[ply % 2].choose_move(game_field, SYMBOLS[ply % 2])
+        if move is None:
+            result.winner_id = task.user_ids[1 - ply % 2]
+            break
+        game_state = game_field.set_cell_value(move[0], move[1], SYMBOLS[ply % 2])
+        result.cells.append(move[0] * task.field_size + move[1])
+        if game_state.is_end:
+            result.winner_id = game_state.winner.id if game_state.winner is not None else None
+            break
+    return result
+
+
+def write_outcomes(
+    repository: SqlAlchemyRepository,
+    league: LeagueSeason,
+    pairings: Dict[int, TournamentPairing],
+    outcomes: List[PairingOutcome],
+) -> int:
+    """
+    Writes the games of the pairings and links the pairings to them by one transaction, so a pairing is either
+     linked to its whole game or played again by a resumed run.
+
+    Args:
+        repository (SqlAlchemyRepository): Storage of the games.
+        league (LeagueSeason): League the games are played in.
+        pairings (Dict[int, TournamentPairing]): Pairings by their ids.
+        outcomes (List[PairingOutcome]): Played games.
+
+    Returns:
+        int: Number of the written moves.
+    """
+    game_ids = repository.add_finished_games(
+        league,
+        [
+            FinishedGame(
+                [pairings[i.pairing_id].first_user_id, pairings[i.pairing_id].second_user_id], i.cells, i.winner_id
+            )
+            for i in outcomes
+        ],
+    )
+    for outcome, game_id in zip(outcomes, game_ids):
+        pairings[outcome.pairing_id].game_id = game_id
+    repository.commit()
+    return sum(len(i.cells) for i in outcomes)
+
+
+def run_tournament(  # pylint: disable=too-many-arguments,too-many-locals
+    db_session: scoped_session,
+    tournament: Tournament,
+    workers: int = 1,
+    batch_size: int = BATCH_SIZE,
+    mcts_iterations: int = MCTS_ITERATIONS,
+    compact_moves: bool = False,
+) -> TournamentReport:
+    """
+    Plays the rounds of the tournament left. The games of the computer strategies of a round are sent to the pool of
+     the workers at once, and the games of the human players are played at the keyboard meanwhile. The results of
+     the workers are written as they come, batch_size games per transaction.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        tournament (Tournament): Tournament object.
+        workers (int): Number of the worker processes, the games are played in this process if it is 1.
+        batch_size (int): Number of the games written by one transaction.
+        mcts_iterations (int): Number of the iterations of the search of a move by the mcts strategy.
+        compact_moves (bool): Store the moves encoded on the game rows.
+
+    Returns:
+        TournamentReport: Results of the run.
+    """
+    report = TournamentReport()
+    started_at = time.perf_counter()
+    league = (
+        db_session.query(LeagueSeason)  # pylint: disable=no-member
+        .filter(LeagueSeason.id == tournament.league_season_id)
+        .one()
+    )
+    strategies = {
+        i.user_id: i.strategy
+        for i in db_session.query(TournamentPlayer).filter(  # pylint: disable=no-member
+            TournamentPlayer.tournament_id == tournament.id
+        )
+    }
+    users = {
+        i.id: i for i in db_session.query(User).filter(User.id.in_(list(strategies))).all()  # pylint: disable=no-member
+    }
+    repository = SqlAlchemyRepository(db_session, compact_moves)
+    with contextlib.ExitStack() as stack:
+        pool = stack.enter_context(multiprocessing.Pool(workers)) if workers > 1 else None
+        while True:
+            scheduling_started_at = time.perf_counter()
+            round_number = schedule_round(db_session, tournament)
+            if round_number is None:
+                break
+            pairings = {
+                i.id: i
+                for i in db_session.query(TournamentPairing)  # pylint: disable=no-member
+                .filter(
+                    TournamentPairing.tournament_id == tournament.id,
+                    TournamentPairing.round == round_number,
+                    TournamentPairing.game_id.is_(None),
+                    TournamentPairing.second_user_id.isnot(None),
+                )
+                .order_by(TournamentPairing.id)
+            }
+            tasks = [
+                PairingTask(
+                    pairing_id=i.id,
+                    user_ids=(i.first_user_id, i.second_user_id),
+                    strategies=(strategies[i.first_user_id], strategies[i.second_user_id]),
+                    field_size=league.field_size,
+                    win_length=league.win_length,
+                    move_time_limit=league.move_time_limit,
+                    seed=None if tournament.seed is None else tournament.seed * len(STRATEGIES) ** 8 + i.id,
+                    mcts_iterations=mcts_iterations,
+                )
+                for i in pairings.values()
+                if "human" not in (strategies[i.first_user_id], strategies[i.second_user_id])
+            ]
+            report.scheduling_elapsed += time.perf_counter() - scheduling_started_at
+            report.pairings += len(pairings)
+            outcomes: Iterable[PairingOutcome] = (
+                pool.imap_unordered(play_pairing, tasks, max(1, len(tasks) // (workers * 4)))
+                if pool is not None
+                else map(play_pairing, tasks)
+            )
+            computer_ids = {i.pairing_id for i in tasks}
+            for pairing in pairings.values():
+                if pairing.id not in computer_ids:
+                    play_human_pairing(repository, league, pairing, users, strategies, mcts_iterations)
+                    report.games += 1
+            batch: List[PairingOutcome] = []
+            for outcome in outcomes:
+                batch.append(outcome)
+                if len(batch) >= batch_size:
+                    report.moves += write_batch(repository, league, pairings, batch, report)
+                    batch = []
+            if batch:
+                report.moves += write_batch(repository, league, pairings, batch, report)
+            report.rounds += 1
+    report.elapsed = time.perf_counter() - started_at
+    return report
+
+
+def write_batch(
+    repository: SqlAlchemyRepository,
+    league: LeagueSeason,
+    pairings: Dict[int, TournamentPairing],
+    outcomes: List[PairingOutcome],
+    report: TournamentReport,
+) -> int:
+    """
+    Writes the games of the batch and measures the time of the writing.
+
+    Args:
+        repository (SqlAlchemyRepository): Storage of the games.
+        league (LeagueSeason): League the games are played in.
+        pairings (Dict[int, TournamentPairing]): Pairings by their ids.
+        outcomes (List[PairingOutcome]): Played games.
+        report (TournamentReport): Results of the run to update.
+
+    Returns:
+        int: Number of the written moves.
+    """
+    started_at = time.perf_counter()
+    result = write_outcomes(repository, league, pairings, outcomes)
+    report.writing_elapsed += time.perf_counter() - started_at
+    report.transactions += 1
+    report.games += len(outcomes)
+    return result
+
+
+def play_human_pairing(  # pylint: disable=too-many-arguments
+    repository: SqlAlchemyRepository,
+    league: LeagueSeason,
+    pairing: TournamentPairing,
+    users: Dict[int, User],
+    strategies: Dict[int, str],
+    mcts_iterations: int,
+) -> None:
+    """
+    Plays the game of a pairing with a human player at the keyboard in a game session and links it to the pairing.
+
+    Args:
+        repository (SqlAlchemyRepository): Storage of the games.
+        league (LeagueSeason): League the games are played in.
+        pairing (TournamentPairing): Pairing to play.
+        users (Dict[int, User]): Users by their ids.
+        strategies (Dict[int, str]): Strategies of the users by their ids.
+        mcts_iterations (int): Number of the iterations of the search of a move by the mcts strategy.
+    """
+    players: List[Tuple[User, Player]] = []
+    for user_id in (pairing.first_user_id, pairing.second_user_id):
+        strategy = strategies[user_id]
+        player = HumanPlayer() if strategy == "human" else make_player(strategy, league, None, None, mcts_iterations)
+        players.append((users[user_id], player))
+    game_session = GameSession(repository.db_session, league, repository=repository)
+    game_session.start_game(players)
+    pairing.game_id = game_session.game_metadata[0].Game.id
+    repository.commit()
+
+
+@click.command()
+@click.option("--tournament-id", default=None, type=int, help="Tournament to resume instead of creating a new one.")
+@click.option("--league-id", default=None, type=int, help="League to play in, the latest league by default.")
+@click.option("--player", "players", multiple=True, help='User id and strategy, e.g. "1:mcts", once per player.')
+@click.option("--system", type=click.Choice(SYSTEMS), default="round_robin", show_default=True, help="Pairing system.")
+@click.option("--rounds", default=None, type=int, help="Number of the Swiss rounds, log2 of the players by default.")
+@click.option("--cycles", default=1, show_default=True, help="Number of the round-robin games of every two players.")
+@click.option("--name", default=None, help="Name of the tournament.")
+@click.option("--seed", default=None, type=int, help="Seed of the computer players.")
+@click.option("--workers", default=1, show_default=True, help="Number of the worker processes.")
+@click.option("--batch-size", default=BATCH_SIZE, show_default=True, help="Number of the games per transaction.")
+@click.option(
+    "--mcts-iterations",
+    default=MCTS_ITERATIONS,
+    show_default=True,
+    help="Number of the iterations of the search of a move by the mcts strategy.",
+)
+def main(  # pylint: disable=too-many-arguments,too-many-locals
+    tournament_id: Optional[int],
+    league_id: Optional[int],
+    players: Tuple[str, ...],
+    system: str,
+    rounds: Optional[int],
+    cycles: int,
+    name: Optional[str],
+    seed: Optional[int],
+    workers: int,
+    batch_size: int,
+    mcts_iterations: int,
+) -> None:
+    settings = get_settings()
+    # The users and the league change through this session only, so they are not reloaded after every commit
+    with open_command_session(settings, expire_on_commit=False) as db_session:
+        if tournament_id is not None:
+            query = db_session.query(Tournament)  # pylint: disable=no-member
+            tournament = query.filter(Tournament.id == tournament_id).one_or_none()
+            if tournament is None:
+                raise ValueError(f"There is no tournament {tournament_id}")
+        else:
+            league = find_league_season(db_session, league_id)
+            tournament = create_tournament(
+                db_session, league, [parse_player(i) for i in players], system, rounds, cycles, name, seed
+            )
+        click.echo(f"Tournament {tournament.id}, {tournament.system}, {tournament.rounds} rounds")
+        report = run_tournament(
+            db_session, tournament, workers, batch_size, mcts_iterations, settings["db_compact_moves"]
+        )
+        standings = get_tournament_standings(db_session, tournament.id)
+    click.echo(
+        f"Rounds: {report.rounds}, pairings scheduled: {report.pairings} in {report.scheduling_elapsed:.3f} s, "
+        f"{report.pairings / max(report.scheduling_elapsed, 1e-9):,.0f} pairings/s"
+    )
+    echo_throughput(report.games, report.moves, report.elapsed)
+    click.echo(f"Transactions: {report.transactions}, writing {report.writing_elapsed:.3f} s")
+    for i, standing in enumerate(standings, 1):
+        click.echo(
+            f"{i}. {standing.nickname}: {standing.score} points, {standing.games} games, "
+            f"{standing.wins} wins, {standing.draws} draws, {standing.losses} losses"
+        )
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -24,8 +24,8 @@ class MainMenu(BaseController):
             Welcome window, shown when the application is initialized.
         management(self, handler, **kwargs):
             Navigate to the management menu.
-        player_statistic(self, handler, **kwargs):
-            Show statistics of past games.
+        player_statistic(self, handler, page=1, **kwargs):
+            Show a page of statistics of past games.
         ranking_table(self, handler, **kwargs):
             Show the ranking table.
         exit_game(self, handler, **kwargs):
@@ -82,13 +82,14 @@ class MainMenu(BaseController):
         return HandlerResponse()
 
     def player_statistic(
-        self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+        self, handler: Handler, page: int = 1, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
     ) -> HandlerResponse:
         """
-        Show statistics of past games.
+        Show a page of statistics of past games with the menu items to turn the pages.
 
         Args:
             handler: The handler from which this handler was called.
+            page: Number of the page to show.
             kwargs: Specific parameters passed from the previous handler.
 
         Returns:
@@ -99,9 +100,26 @@ class MainMenu(BaseController):
         Past games statistics:
         """
         )
-        self.service.show_past_games_statistic()
-
-        return HandlerResponse()
+        has_next_page = self.service.show_past_games_statistic(page)
+
+        pages = []
+        if has_next_page:
+            pages.append(("Next page", page + 1))
+        if page > 1:
+            pages.append(("Previous page", page - 1))
+        if not pages:
+            return HandlerResponse()
+        result = []
+        for i, (name, page_number) in enumerate(pages):
+            _handler = Handler(
+                id=i, name=name, component=MainMenu, method="player_statistic", kwargs={"page": page_number}
+            )
+            _handler.parent = handler
+            result.append(_handler)
+        main_menu = Handler(id=len(result), name="Main menu", component=MainMenu, method="welcome")
+        main_menu.parent = handler
+        result.append(main_menu)
+        return HandlerResponse(dynamic_menu_items=result)
 
     def ranking_table(
         self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
@@ -1,11 +1,14 @@
-from typing import Dict, List, Optional
+from typing import Optional
 
 from prettytable import PrettyTable
 from sqlalchemy.orm import scoped_session
 
-from src.components.game.model import GameResultType
-from src.database.model.game import Game, GameResult, LeagueSeason
+from src.database.model.game import LeagueSeason
 from src.database.model.user import User
+from src.database.rating import INITIAL_RATING
+from src.database.repository import Repository, SqlAlchemyRepository
+
+PAGE_SIZE = 20
 
 
 class MainMenuService:
@@ -14,73 +17,72 @@ class MainMenuService:
 
     Attributes:
         db_session (Session): The database session.
+        repository (Repository): Storage of the league seasons and the games, the database by default.
 
     Methods:
-        __init__(self, db_session):
+        __init__(self, db_session, repository=None):
             Initializes a MainMenuService instance.
-        show_past_games_statistic(self) -> None:
-            Display statistics for past games in the last league season.
-        show_ranking_table(self, _user=None) -> None:
-            Display a ranking table based on game results in the last league season.
+        show_past_games_statistic(self, page=1, page_size=PAGE_SIZE) -> bool:
+            Display the page of statistics for past games in the last league season.
+        show_ranking_table(self, _user=None, limit=None) -> None:
+            Display a ranking table based on the league standings of the last league season.
         get_last_league_season(self) -> LeagueSeason:
             Get the last league season.
-        __get_game_result_list(self, last_league_season: LeagueSeason):
-            Get the results of games in the last league season.
     """
 
-    def __init__(self, db_session: scoped_session) -> None:
+    def __init__(self, db_session: scoped_session, repository: Optional[Repository] = None) -> None:
         """
         Initializes a MainMenuService instance.
 
         Args:
             db_session (scoped_session): The database session.
+            repository (Optional[Repository]): Storage of the league seasons and the games, the database of the session
+             by default.
         """
         self.db_session = db_session
+        self.repository = repository if repository is not None else SqlAlchemyRepository(db_session)
 
-    def show_past_games_statistic(self) -> None:
+    def show_past_games_statistic(self, page: int = 1, page_size: int = PAGE_SIZE) -> bool:
         """
-        Display statistics for past games in the last league season.
+        Display statistics for past games in the last league season, one page at a time, newest games first.
+
+        Args:
+            page (int): Number of the page starting from 1.
+            page_size (int): Number of the games on the page.
 
         Returns:
-            None
+            bool: True if there are older games on the next page.
         """
         last_league_season = self.get_last_league_season()
         if not last_league_season:
-            return
-        game_result_list = self.__get_game_result_list(last_league_season)
+            return False
+        past_games = self.repository.get_past_games(last_league_season.id, page, page_size)
+        has_next_page = len(past_games) > page_size
 
         print(
             f"""
-        Statistic for the games from league season: {last_league_season.name}"""
+        Statistic for the games from league season: {last_league_season.name}, page {page}"""
         )
-        result: Dict[Game, Dict[str, List[str] | str]] = {
-            i: {"players": [], "result": ""} for i in {i.Game for i in game_result_list}
-        }
-        for game, _game_result in result.items():
-            _game_result_list = [i for i in game_result_list if i.Game.id == game.id]
-            _game_result["players"] = [i.User.nickname for i in _game_result_list]
-            _game_result["result"] = next(
-                (f"{i.User.nickname} is winner" for i in _game_result_list if i.GameResult.is_winner), "Played a draw"
-            )
-
         table = PrettyTable()
         table.field_names = ["Players", "Result"]
-        for game, _game_result in result.items():
+        for past_game in past_games[:page_size]:
             table.add_row(
                 [
-                    " vs ".join(player for player in _game_result["players"] if player is not None),
-                    _game_result["result"],
+                    past_game.players,
+                    f"{past_game.winner} is winner" if past_game.winner is not None else "Played a draw",
                 ]
             )
         print(table)
         print("\n")
+        return has_next_page
 
-    def show_ranking_table(self, _user: Optional[User] = None) -> None:
+    def show_ranking_table(self, _user: Optional[User] = None, limit: Optional[int] = None) -> None:
         """
-        Display a ranking table based on game results in the last league season.
+        Display a ranking table based on the league standings of the last league season.
 
         Args:
             _user (User, optional): User object to display ranking for a specific user.
+            limit (int, optional): Number of the top players by rating to display, all players by default.
 
         Returns:
             None
@@ -88,27 +90,14 @@ class MainMenuService:
         last_league_season = self.get_last_league_season()
         if not last_league_season:
             return
-        game_result_list = self.__get_game_result_list(last_league_season)
-
-        if _user:
-            unique_user_list = {_user}
-        else:
-            unique_user_list = {i.User for i in game_result_list}
-
-        result = {i: {"total_games": 0, "win": 0, "loss": 0, "pts": 0} for i in unique_user_list}
-        for user, user_measures in result.items():
-            for game_result in (i for i in game_result_list if i.User.id == user.id):
-                user_measures["total_games"] += 1
-                user_measures["win"] += 1 if game_result.GameResult.is_winner else 0
-                user_measures["loss"] += 0 if game_result.GameResult.is_winner else 1
-                user_measures["pts"] += 2 if game_result.GameResult.is_winner else 1
+        ranking = self.repository.get_ranking(last_league_season.id, _user.id if _user else None, limit)
 
         table = PrettyTable()
-        table.field_names = ["Nickname", "Total", "Win", "Loss", "Pts"]
-        for user, user_measures in result.items():
-            table.add_row([user.nickname, *user_measures.values()])
-        table.sortby = "Pts"
-        table.reversesort = True
+        table.field_names = ["Nickname", "Total", "Win", "Loss", "Draw", "Pts", "Rating"]
+        for row in ranking:
+            table.add_row([row.nickname, row.total_games, row.win, row.loss, row.draw, row.pts, round(row.rating)])
+        if _user and not ranking:
+            table.add_row([_user.nickname, 0, 0, 0, 0, 0, round(INITIAL_RATING)])
         print(table)
         print("\n")
 
@@ -119,9 +108,7 @@ class MainMenuService:
         Returns:
             LeagueSeason: LeagueSeason object from declarative data model.
         """
-        result: Optional[LeagueSeason] = (
-            self.db_session.query(LeagueSeason).order_by(LeagueSeason.id.desc()).limit(1).one_or_none()
-        )
+        result = self.repository.get_last_league_season()
 
         if result:
             return result
@@ -130,25 +117,3 @@ class MainMenuService:
         You don't have any league season. Create it and play some games before statistic will appear"""
         )
         return None
-
-    def __get_game_result_list(self, last_league_season: LeagueSeason) -> List[GameResultType]:
-        """
-        Get the results of games in the last league season.
-
-        Args:
-            last_league_season (LeagueSeason): Needed to filter game results only for the last season.
-
-        Returns:
-            List: List of named tuples GameResult, User, Game objects from declarative data model.
-        """
-        result: List[GameResultType] = (
-            self.db_session.query(GameResult, User, Game)
-            .join(User, User.id == GameResult.user_id)
-            .join(Game, Game.id == GameResult.game_id)
-            .join(
-                LeagueSeason,
-                LeagueSeason.id == Game.league_season_id,
-            )
-            .filter(LeagueSeason.id == last_league_season.id)
-        )
-        return result
@@ -4,7 +4,6 @@ from sqlalchemy.orm import scoped_session
 
 from src.components.management.service import ManagementService
 from src.components.model import BaseController
-from src.database.model.user import User
 from src.handler.model import Handler, HandlerResponse
 
 
@@ -19,18 +18,22 @@ class Management(BaseController):
     Methods:
         __init__(self, db_session):
             Initializes a Management instance.
-        player_details(self, handler, **kwargs):
+        player_details(self, handler, user_id, **kwargs):
             Display detailed information of one user.
-        player_list(self, handler, **kwargs):
-            Display a list of users with an option to view detailed information.
+        player_replay(self, handler, user_id, **kwargs):
+            Replay the last game of one user.
+        player_list(self, handler, after_id=0, nickname_prefix="", search=False, **kwargs):
+            Display a page of users with an option to view detailed information.
         player_create(self, handler, **kwargs):
             Create a new user.
-        player_delete(self, handler, **kwargs):
-            Display a list of users with an option to delete a user.
-        player_delete_confirmation(self, handler, **kwargs):
+        player_delete(self, handler, after_id=0, nickname_prefix="", search=False, **kwargs):
+            Display a page of users with an option to delete a user.
+        player_delete_confirmation(self, handler, user_id, **kwargs):
             Confirm deletion of a user.
         new_league_season(self, handler, **kwargs):
             Create a new league season.
+        __input_nickname_prefix(nickname_prefix, search) -> str:
+            Request the beginning of the nicknames to search for.
     """
 
     def __init__(self, db_session: scoped_session) -> None:
@@ -45,33 +48,64 @@ class Management(BaseController):
         self.service = ManagementService(self.db_session)
 
     def player_details(
-        self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+        self, handler: Handler, user_id: int, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
     ) -> HandlerResponse:
         """
         Display detailed information of one user.
 
         Args:
             handler (Handler): The handler from which this handler was called.
+            user_id (int): Identifier of the user chosen from the list.
             kwargs (dict): Specific parameters passed from the previous handler.
 
         Returns:
             HandlerResponse: An object containing data to run the next handlers or generated dynamic handlers.
         """
 
-        user: User = kwargs["user"]  # type: ignore [assignment]
+        user = self.service.get_user(user_id)
+        if user is None:
+            return HandlerResponse()
+        result = self.service.show_player_details(handler, Management, user)
+
+        return HandlerResponse(dynamic_menu_items=result)
+
+    def player_replay(
+        self, handler: Handler, user_id: int, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+    ) -> HandlerResponse:
+        """
+        Replay the last game of one user.
+
+        Args:
+            handler (Handler): The handler from which this handler was called.
+            user_id (int): Identifier of the user whose details are shown.
+            kwargs (dict): Specific parameters passed from the previous handler.
+
+        Returns:
+            HandlerResponse: An object containing data to run the next handlers or generated dynamic handlers.
+        """
 
-        self.service.show_player_details(user)
+        user = self.service.get_user(user_id)
+        if user is not None:
+            self.service.replay_last_game(user)
 
         return HandlerResponse()
 
-    def player_list(
-        self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+    def player_list(  # pylint: disable=too-many-arguments,unused-argument
+        self,
+        handler: Handler,
+        after_id: int = 0,
+        nickname_prefix: str = "",
+        search: bool = False,
+        **kwargs: Dict[str, str],
     ) -> HandlerResponse:
         """
-        Display a list of users with an option to view detailed information.
+        Display a page of users with an option to view detailed information.
 
         Args:
             handler (Handler): The handler from which this handler was called.
+            after_id (int): Identifier of the last user of the previous page, 0 for the first page.
+            nickname_prefix (str): Beginning of the nicknames of the users, all users by default.
+            search (bool): Request the beginning of the nicknames from the user.
             kwargs (dict): Specific parameters passed from the previous handler.
 
         Returns:
@@ -84,7 +118,14 @@ class Management(BaseController):
         """
         )
 
-        result = self.service.show_player_list(handler, Management, "player_details")
+        result = self.service.show_player_list(
+            handler,
+            Management,
+            "player_details",
+            "player_list",
+            after_id,
+            self.__input_nickname_prefix(nickname_prefix, search),
+        )
 
         return HandlerResponse(dynamic_menu_items=result)
 
@@ -106,14 +147,22 @@ class Management(BaseController):
 
         return HandlerResponse()
 
-    def player_delete(
-        self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+    def player_delete(  # pylint: disable=too-many-arguments,unused-argument
+        self,
+        handler: Handler,
+        after_id: int = 0,
+        nickname_prefix: str = "",
+        search: bool = False,
+        **kwargs: Dict[str, str],
     ) -> HandlerResponse:
         """
-        Display a list of users with an option to delete a user.
+        Display a page of users with an option to delete a user.
 
         Args:
             handler (Handler): The handler from which this handler was called.
+            after_id (int): Identifier of the last user of the previous page, 0 for the first page.
+            nickname_prefix (str): Beginning of the nicknames of the users, all users by default.
+            search (bool): Request the beginning of the nicknames from the user.
             kwargs (dict): Specific parameters passed from the previous handler.
 
         Returns:
@@ -126,30 +175,36 @@ class Management(BaseController):
         """
         )
 
-        result = self.service.show_player_list(handler, Management, "player_delete_confirmation")
+        result = self.service.show_player_list(
+            handler,
+            Management,
+            "player_delete_confirmation",
+            "player_delete",
+            after_id,
+            self.__input_nickname_prefix(nickname_prefix, search),
+        )
 
         return HandlerResponse(dynamic_menu_items=result)
 
     def player_delete_confirmation(
-        self, handler: Handler, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
+        self, handler: Handler, user_id: int, **kwargs: Dict[str, str]  # pylint: disable=unused-argument
     ) -> HandlerResponse:
         """
         Confirm deletion of a user.
 
         Args:
             handler (Handler): The handler from which this handler was called.
+            user_id (int): Identifier of the user chosen from the list.
             kwargs (dict): Specific parameters passed from the previous handler.
 
         Returns:
             HandlerResponse: An object containing data to run the next handlers or generated dynamic handlers.
         """
-        user: User = kwargs["user"]  # type: ignore [assignment]
-
         decision = input("Are you sure? y/N")
         if decision == "y":
-            self.db_session.delete(user)
-            self.db_session.commit()
-            print(f"User {user.nickname} was deleted")
+            user = self.service.get_user(user_id)
+            if user is not None:
+                self.service.player_delete(user)
         return HandlerResponse()
 
     def new_league_season(
@@ -169,3 +224,19 @@ class Management(BaseController):
         self.service.create_new_league_season()
 
         return HandlerResponse()
+
+    @staticmethod
+    def __input_nickname_prefix(nickname_prefix: str, search: bool) -> str:
+        """
+        Request the beginning of the nicknames to search for.
+
+        Args:
+            nickname_prefix (str): Beginning of the nicknames of the current page.
+            search (bool): Request a new beginning from the user.
+
+        Returns:
+            str: Beginning of the nicknames, empty for all users.
+        """
+        if search:
+            return input("Enter the beginning of the nickname, empty for all players: ").strip()
+        return nickname_prefix
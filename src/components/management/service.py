@@ -1,13 +1,24 @@
-from typing import List, Tuple, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from sqlalchemy.orm import scoped_session
 from terminalplot import plot
 
-from src.components.main_menu.service import MainMenuService
+from src.components.game.model import (
+    FIELD_SIZE,
+    MAX_FIELD_SIZE,
+    MAX_MOVE_TIME_LIMIT,
+    MAX_WIN_LENGTH,
+    MIN_MOVE_TIME_LIMIT,
+    MOVE_TIME_LIMIT,
+    WIN_LENGTH,
+)
+from src.components.game.replay import GameReplay
+from src.components.main_menu.service import PAGE_SIZE, MainMenuService
 from src.components.model import BaseController
 from src.components.utility.controller import Utility
-from src.database.model.game import Game, GameResult, LeagueSeason
+from src.database.model.game import LeagueSeason
 from src.database.model.user import User
+from src.database.repository import Repository, SqlAlchemyRepository
 from src.handler.model import Handler
 
 
@@ -17,77 +28,157 @@ class ManagementService:
 
     Attributes:
         db_session (Any): The database session.
+        repository (Repository): Storage of the users, the league seasons and the games, the database by default.
         main_menu_service (MainMenuService): An instance of the MainMenuService.
 
     Methods:
-        show_player_list(self, handler, destination_component, destination_method):
-            Show a list of users before deletion and requesting detailed information about a user.
-        show_player_details(self, user) -> None:
+        show_player_list(self, handler, destination_component, destination_method, list_method, after_id=0,
+         nickname_prefix="", page_size=PAGE_SIZE):
+            Show a page of users before deletion and requesting detailed information about a user.
+        __make_menu(handler, menu_items) -> List[Handler]:
+            Make the handlers of the menu items.
+        get_user(self, user_id) -> Optional[User]:
+            Load the user chosen from the list.
+        show_player_details(self, handler, destination_component, user) -> List[Handler]:
             Display detailed information about a user and related data.
+        replay_last_game(self, user) -> None:
+            Show the positions of the last game of the user.
+        __replay_game(replay):
+            Show the positions of the game chosen by the user.
         __calculate_point_growing_chart(self, user):
-            Calculate the growth dynamics of a user's points for a chart.
+            Calculate the dynamics of a user's rating for a chart.
         __concat_user_detail(self, user):
             Concatenate user details based on available information.
         player_create(self) -> None:
             Create a new user by obtaining user input.
+        player_delete(self, user) -> None:
+            Delete the user.
         create_new_league_season(self) -> None:
             Create a new league season.
+        __input_number(label, default, minimum, maximum):
+            Request a number within the range from the user.
     """
 
-    def __init__(self, db_session: scoped_session) -> None:
+    def __init__(self, db_session: scoped_session, repository: Optional[Repository] = None) -> None:
         """
         Initializes a ManagementService instance.
 
         Args:
             db_session (Any): The database session.
+            repository (Optional[Repository]): Storage of the users, the league seasons and the games, the database of
+             the session by default.
         """
         self.db_session = db_session
-        self.main_menu_service = MainMenuService(self.db_session)
+        self.repository = repository if repository is not None else SqlAlchemyRepository(db_session)
+        self.main_menu_service = MainMenuService(self.db_session, self.repository)
 
-    def show_player_list(
-        self, handler: Handler, destination_component: Type[BaseController], destination_method: str
+    def show_player_list(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        handler: Handler,
+        destination_component: Type[BaseController],
+        destination_method: str,
+        list_method: str,
+        after_id: int = 0,
+        nickname_prefix: str = "",
+        page_size: int = PAGE_SIZE,
     ) -> List[Handler]:
         """
-        Show a list of users before deletion and requesting detailed information about a user.
+        Show a page of users before deletion and requesting detailed information about a user. The pages follow each
+         other by the id of the last user, and the handlers carry only the ids of the users, so a page reads the ids
+         and nicknames of its users only and the chosen user is loaded by get_user.
 
         Args:
             handler (Handler): The handler from which this handler was called.
             destination_component (ConcreteController): Name of the component to get the route.
             destination_method (str): Name of the component's method to get the route.
+            list_method (str): Name of the component's method showing the pages.
+            after_id (int): Identifier of the last user of the previous page, 0 for the first page.
+            nickname_prefix (str): Beginning of the nicknames of the users, all users by default.
+            page_size (int): Number of the users on the page.
 
         Returns:
-            List[Handler]: List of handlers for displaying users and the "previous" item.
+            List[Handler]: List of handlers for displaying users, turning the pages, searching and the "previous" item.
         """
+        user_list = self.repository.get_user_page(after_id, page_size + 1, nickname_prefix)
+        if nickname_prefix:
+            print(
+                f"""
+        Nicknames starting with {nickname_prefix}:
+        """
+            )
+        menu_items: List[Tuple[str, Type[BaseController], str, Dict[str, Any]]] = [
+            (user.nickname, destination_component, destination_method, {"user_id": user.id})
+            for user in user_list[:page_size]
+        ]
+        if len(user_list) > page_size:
+            menu_items.append(
+                (
+                    "Next page",
+                    destination_component,
+                    list_method,
+                    {"after_id": user_list[page_size - 1].id, "nickname_prefix": nickname_prefix},
+                )
+            )
+        if after_id:
+            menu_items.append(("First page", destination_component, list_method, {"nickname_prefix": nickname_prefix}))
+        menu_items.append(("Search by nickname", destination_component, list_method, {"search": True}))
+        menu_items.append(("Previous", Utility, "previous_menu_item", {}))
+        return self.__make_menu(handler, menu_items)
+
+    @staticmethod
+    def __make_menu(
+        handler: Handler, menu_items: List[Tuple[str, Type[BaseController], str, Dict[str, Any]]]
+    ) -> List[Handler]:
+        """
+        Make the handlers of the menu items.
+
+        Args:
+            handler (Handler): The handler from which this handler was called, the parent of the items.
+            menu_items (List[Tuple[str, Type[BaseController], str, Dict[str, Any]]]): Names, components, methods and
+             arguments of the items.
 
-        user_list = self.db_session.query(User).all()
+        Returns:
+            List[Handler]: List of handlers of the items.
+        """
         result = []
-        last_menu_item = 0
-        for i, user in enumerate(user_list):
-            last_menu_item = i
-            _handler = Handler(
-                id=i,
-                name=user.nickname,
-                component=destination_component,
-                method=destination_method,
-                kwargs={"user": user},
-            )
+        for i, (name, component, method, kwargs) in enumerate(menu_items):
+            _handler = Handler(id=i, name=name, component=component, method=method, kwargs=kwargs)
             _handler.parent = handler
             result.append(_handler)
-        previous = Handler(id=last_menu_item + 1, name="Previous", component=Utility, method="previous_menu_item")
-        previous.parent = handler
-        result.append(previous)
+        return result
 
+    def get_user(self, user_id: int) -> Optional[User]:
+        """
+        Load the user chosen from the list.
+
+        Args:
+            user_id (int): User object identifier.
+
+        Returns:
+            Optional[User]: User object or None if the user was deleted since the list was shown.
+        """
+        result = self.repository.get_user(user_id)
+        if result is None:
+            print(
+                f"""
+        There is no user {user_id}"""
+            )
         return result
 
-    def show_player_details(self, user: User) -> None:
+    def show_player_details(
+        self, handler: Handler, destination_component: Type[BaseController], user: User
+    ) -> List[Handler]:
         """
-        Display detailed information about a user and related data.
+        Display detailed information about a user and related data. The last game of the user is replayed only when
+         it is chosen from the returned menu, so the details are shown without waiting for an input.
 
         Args:
+            handler (Handler): The handler from which this handler was called.
+            destination_component (ConcreteController): Name of the component to get the route of the replay.
             user (User): User object from declarative data model.
 
         Returns:
-            None
+            List[Handler]: List of handlers for replaying the last game of the user and the "previous" item.
         """
         user_detail = self.__concat_user_detail(user)
         growing_chart = self.__calculate_point_growing_chart(user)
@@ -112,15 +203,75 @@ class ManagementService:
             print(
                 f"""
         {'-' * 50}
-        Points growth dynamics:
+        Rating dynamics:
         {'-' * 50}
             """
             )
             plot(*growing_chart)
+        menu_items: List[Tuple[str, Type[BaseController], str, Dict[str, Any]]] = []
+        if self.repository.get_last_game_id(user.id) is not None:
+            menu_items.append(("Replay last game", destination_component, "player_replay", {"user_id": user.id}))
+        menu_items.append(("Previous", Utility, "previous_menu_item", {}))
+        return self.__make_menu(handler, menu_items)
 
-    def __calculate_point_growing_chart(self, user: User) -> Tuple[range, List[int]] | None:
+    def replay_last_game(self, user: User) -> None:
         """
-        Calculate the growth dynamics of a user's points for a chart.
+        Show the positions of the last game of the user.
+
+        Args:
+            user (User): User object from declarative data model.
+
+        Returns:
+            None
+        """
+        last_game_id = self.repository.get_last_game_id(user.id)
+        replay = self.repository.get_replay(last_game_id) if last_game_id is not None else None
+        if replay is None:
+            print(
+                f"""
+        There are no games of {user.nickname}"""
+            )
+            return
+        print(
+            f"""
+        {'-' * 50}
+        Replay of the last game:
+        {'-' * 50}
+        """
+        )
+        self.__replay_game(replay)
+
+    @staticmethod
+    def __replay_game(replay: GameReplay) -> None:
+        """
+        Show the positions of the game chosen by the user, starting from the final one. Every position is taken from
+         the replay as is, so moving to any ply costs the same.
+
+        Args:
+            replay (GameReplay): Replay of the game.
+
+        Returns:
+            None
+        """
+        last_ply = len(replay.moves)
+        ply = last_ply
+        while True:
+            replay.show(ply)
+            raw_value = input(f"Enter the ply to show (0-{last_ply}), empty to finish: ")
+            if not raw_value:
+                return
+            if raw_value.isdigit() and int(raw_value) <= last_ply:
+                ply = int(raw_value)
+            else:
+                print(
+                    f"""
+        Value should be a number from 0 to {last_ply}"""
+                )
+
+    def __calculate_point_growing_chart(self, user: User) -> Tuple[range, List[float]] | None:
+        """
+        Calculate the dynamics of a user's rating for a chart. Every finished game keeps the rating of the user after
+         it, so the chart is read from the results as is.
 
         Args:
             user (User): User object from declarative data model.
@@ -129,24 +280,11 @@ class ManagementService:
             Tuple: Lists of values in x, y_coordinate coordinates.
         """
         current_league = self.main_menu_service.get_last_league_season()
-        game_results = (
-            self.db_session.query(GameResult)
-            .join(Game, Game.id == GameResult.game_id)
-            .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
-            .filter(LeagueSeason.id == current_league.id if current_league else None)
-            .filter(GameResult.user_id == user.id)
-            .order_by(GameResult.game_id.asc())
-            .all()
-        )
+        game_results = self.repository.get_user_game_results(current_league.id, user.id) if current_league else []
+        y_coordinate = [i.rating for i in game_results if i.rating is not None]
         result = None
-        if game_results:
-            x_coordinate = range(len(game_results))
-            y_coordinate = []
-            points = 0
-            for i in game_results:
-                points += 2 if i.is_winner else 1
-                y_coordinate.append(points)
-            result = x_coordinate, y_coordinate
+        if y_coordinate:
+            result = range(len(y_coordinate)), y_coordinate
         return result
 
     def __concat_user_detail(self, user: User) -> str:
@@ -208,8 +346,7 @@ class ManagementService:
                 print(error.args[0])
                 field_name = error.args[1]
             else:
-                self.db_session.add(user)
-                self.db_session.commit()
+                self.repository.add_user(user)
                 is_valid_form = True
 
         print(
@@ -222,6 +359,19 @@ class ManagementService:
         """
         )
 
+    def player_delete(self, user: User) -> None:
+        """
+        Delete the user.
+
+        Args:
+            user (User): User object from declarative data model.
+
+        Returns:
+            None
+        """
+        self.repository.delete_user(user)
+        print(f"User {user.nickname} was deleted")
+
     def create_new_league_season(self) -> None:
         """
         Create a new league season.
@@ -230,10 +380,46 @@ class ManagementService:
             None
         """
         new_league_season_name = input("Enter new league season name: ")
-        league_season = LeagueSeason(name=new_league_season_name)  # type: ignore [call-arg]
-        self.db_session.add(league_season)
-        self.db_session.commit()
+        field_size = self.__input_number("Enter game field size", FIELD_SIZE, FIELD_SIZE, MAX_FIELD_SIZE)
+        win_length = self.__input_number(
+            "Enter number of marks in a row to win", min(field_size, MAX_WIN_LENGTH), WIN_LENGTH, field_size
+        )
+        move_time_limit = self.__input_number(
+            "Enter time of the computer move in milliseconds", MOVE_TIME_LIMIT, MIN_MOVE_TIME_LIMIT, MAX_MOVE_TIME_LIMIT
+        )
+        league_season = LeagueSeason(  # type: ignore [call-arg]
+            name=new_league_season_name,
+            field_size=field_size,
+            win_length=win_length,
+            move_time_limit=move_time_limit,
+        )
+        self.repository.add_league_season(league_season)
         print(
             f"""
         New league season {new_league_season_name} was created."""
         )
+
+    @staticmethod
+    def __input_number(label: str, default: int, minimum: int, maximum: int) -> int:
+        """
+        Request a number within the range from the user. An empty input means the default value.
+
+        Args:
+            label (str): Text of the request.
+            default (int): Value used when the input is empty.
+            minimum (int): Minimum allowed value.
+            maximum (int): Maximum allowed value.
+
+        Returns:
+            int: The number entered by the user.
+        """
+        while True:
+            raw_value = input(f"{label} ({minimum}-{maximum}, {default} by default): ")
+            if not raw_value:
+                return default
+            if raw_value.isdigit() and minimum <= int(raw_value) <= maximum:
+                return int(raw_value)
+            print(
+                f"""
+        Value should be a number from {minimum} to {maximum}"""
+            )
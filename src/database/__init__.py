@@ -1,30 +1,73 @@
-from typing import Dict
+from typing import Any, Dict, Type
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, Pool, QueuePool, StaticPool
 
+from src.settings import DEFAULT_SETTINGS
 
-def make_engine(settings: Dict[str, str]) -> Engine:
+POOL_CLASSES: Dict[str, Type[Pool]] = {"null": NullPool, "queue": QueuePool, "static": StaticPool}
+SQLITE_PRAGMAS = {
+    "journal_mode": "db_journal_mode",
+    "synchronous": "db_synchronous",
+    "cache_size": "db_cache_size",
+    "mmap_size": "db_mmap_size",
+    "busy_timeout": "db_busy_timeout",
+}
+
+
+def make_engine(settings: Dict[str, Any]) -> Engine:
+    settings = {**DEFAULT_SETTINGS, **settings}
     connect_args = {
         # 'connect_timeout': 3
     }
     if "external_host" in settings:
         connect_args["application_name"] = settings["external_host"]
 
-    return create_engine(
+    if settings["db_pool"] not in POOL_CLASSES:
+        raise ValueError(f"Pool {settings['db_pool']} is unknown, choose one of {', '.join(POOL_CLASSES)}")
+    pool_class = POOL_CLASSES[settings["db_pool"]]
+    pool_args = {}
+    is_sqlite = settings["db_url"].startswith("sqlite")
+    if is_sqlite and pool_class is not NullPool:
+        # Pooled connections are returned to the pool by any thread of the scoped sessions
+        connect_args["check_same_thread"] = False
+    if pool_class is QueuePool:
+        pool_args["pool_size"] = settings["db_pool_size"]
+
+    engine = create_engine(
         settings["db_url"],
-        echo=settings.get("db_echo_flag", False),
-        echo_pool=settings.get("db_echo_pool_flag", False),
-        pool_recycle=settings.get("db_pool_recycle", 3600),
-        pool_pre_ping=settings.get("db_pool_pre_ping", True),
+        echo=settings["db_echo_flag"],
+        echo_pool=settings["db_echo_pool_flag"],
+        pool_recycle=settings["db_pool_recycle"],
+        pool_pre_ping=settings["db_pool_pre_ping"],
         connect_args=connect_args,
-        poolclass=NullPool,
+        poolclass=pool_class,
+        **pool_args,
     )
+    if is_sqlite:
+        set_sqlite_pragmas(engine, settings)
+    return engine
+
+
+def set_sqlite_pragmas(engine: Engine, settings: Dict[str, Any]) -> None:
+    pragmas = [
+        f"PRAGMA {pragma} = {settings[name]}"
+        for pragma, name in SQLITE_PRAGMAS.items()
+        if settings.get(name) not in (None, "")
+    ]
+
+    def on_connect(dbapi_connection: Any, _: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    event.listen(engine, "connect", on_connect)
 
 
-def make_session(engine: Engine, **kwargs: Dict[str, str]) -> scoped_session:
+def make_session(engine: Engine, **kwargs: Any) -> scoped_session:
     return scoped_session(sessionmaker(bind=engine, autoflush=False, **kwargs))
 
 
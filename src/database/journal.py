@@ -0,0 +1,211 @@
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import scoped_session
+
+from src.database.model.game import Game, GameUserDecision, LeagueSeason
+from src.database.moves import encode_moves, get_cell_width
+
+JOURNAL_PATH = "src/database/journal"
+
+# game_id, user_id, coordinate_x, coordinate_y, ply
+JournalRecord = Tuple[int, int, int, int, int]
+
+
+class MoveJournal:
+    """
+    Append-only journal of the game decisions that are not committed to the database yet.
+
+    In the write-behind mode the decisions are buffered in memory and committed in batches. Every decision is appended
+     to the journal first, so the decisions of a crashed process are recovered by replaying the journal on the next
+     startup. The journal is truncated as soon as the buffered decisions are committed.
+
+    Attributes:
+        path (str): Path to the journal file.
+        sync (bool): Flush every record to the disk with fsync before the move is accepted.
+
+    Methods:
+        __init__(self, path, sync=True):
+            Initializes a MoveJournal instance.
+        append(self, game_id, user_id, coordinate_x, coordinate_y, ply):
+            Appends the decision to the journal.
+        truncate(self):
+            Removes all records from the journal.
+        read(self) -> List[JournalRecord]:
+            Reads the records of the journal.
+        replay(self, db_session, compact_moves=False) -> int:
+            Saves the journaled decisions missing in the database and truncates the journal.
+        __get_stored_games(db_session, game_ids, compact_moves):
+            Gets the decisions already stored for the journaled games.
+        close(self):
+            Closes the journal file.
+        recover(cls, db_session, path, compact_moves=False) -> int:
+            Replays the journal left by the previous run if it exists.
+    """
+
+    def __init__(self, path: str, sync: bool = True) -> None:
+        """
+        Initializes a MoveJournal instance.
+
+        Args:
+            path (str): Path to the journal file.
+            sync (bool): Flush every record to the disk with fsync before the move is accepted.
+        """
+        self.path = path
+        self.sync = sync
+        self._file = open(path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+
+    def append(  # pylint: disable=too-many-arguments
+        self, game_id: int, user_id: int, coordinate_x: int, coordinate_y: int, ply: int
+    ) -> None:
+        """
+        Appends the decision to the journal.
+
+        Args:
+            game_id (int): Game object identifier.
+            user_id (int): User object identifier.
+            coordinate_x (int): X coordinate.
+            coordinate_y (int): Y coordinate.
+            ply (int): Number of the decision in the game starting from 0.
+        """
+        self._file.write(f"{game_id},{user_id},{coordinate_x},{coordinate_y},{ply}\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())  # pylint: disable=no-member
+
+    def truncate(self) -> None:
+        """
+        Removes all records from the journal.
+        """
+        self._file.truncate(0)
+        self._file.flush()
+
+    def read(self) -> List[JournalRecord]:
+        """
+        Reads the records of the journal. A record torn by a crash in the middle of the writing is skipped.
+
+        Returns:
+            List[JournalRecord]: Records of the journal in the order they were appended.
+        """
+        result: List[JournalRecord] = []
+        with open(self.path, encoding="utf-8") as journal_file:
+            for line in journal_file:
+                values = line.strip().split(",")
+                if len(values) == 5 and all(value.isdigit() for value in values):
+                    game_id, user_id, coordinate_x, coordinate_y, ply = map(int, values)
+                    result.append((game_id, user_id, coordinate_x, coordinate_y, ply))
+        return result
+
+    def replay(self, db_session: scoped_session, compact_moves: bool = False) -> int:
+        """
+        Saves the journaled decisions missing in the database in one transaction and truncates the journal.
+        The decisions of a game are committed in order, so the ones with a ply below the number of the decisions
+         already stored for the game are skipped. The recovered decisions are stored in the format of their game:
+         appended to the encoded moves of the game row if it has them, otherwise as game_user_decision rows. A game
+         without any stored decision yet is stored in the format of compact_moves.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database.
+            compact_moves (bool): Store the decisions of the games without any stored decision as encoded moves.
+
+        Returns:
+            int: Number of the recovered decisions.
+        """
+        records = self.read()
+        if not records:
+            return 0
+        field_sizes, stored_decisions, moves = self.__get_stored_games(
+            db_session, {record[0] for record in records}, compact_moves
+        )
+        records = [
+            record
+            for record in sorted(records, key=lambda record: record[4])
+            if record[0] in field_sizes and record[4] >= stored_decisions.get(record[0], 0)
+        ]
+        decisions = []
+        for game_id, user_id, coordinate_x, coordinate_y, ply in records:
+            if game_id not in moves:
+                decisions.append(
+                    GameUserDecision(  # type: ignore [call-arg]
+                        game_id=game_id, user_id=user_id, coordinate_x=coordinate_x, coordinate_y=coordinate_y
+                    )
+                )
+                continue
+            first_user_id, game_moves = moves[game_id]
+            if first_user_id is None and ply % 2 == 0:
+                moves[game_id] = (user_id, game_moves)
+            game_moves += encode_moves([(coordinate_x, coordinate_y)], field_sizes[game_id])
+        db_session.add_all(decisions)
+        for game_id, (first_user_id, game_moves) in moves.items():
+            db_session.query(Game).filter(Game.id == game_id).update(
+                {Game.moves: bytes(game_moves), Game.first_user_id: first_user_id}, synchronize_session=False
+            )
+        db_session.commit()
+        self.truncate()
+        return len(records)
+
+    @staticmethod
+    def __get_stored_games(
+        db_session: scoped_session, game_ids: Set[int], compact_moves: bool
+    ) -> Tuple[Dict[int, int], Dict[int, int], Dict[int, Tuple[Optional[int], bytearray]]]:
+        """
+        Gets the decisions already stored for the journaled games.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database.
+            game_ids (Set[int]): Identifiers of the journaled games.
+            compact_moves (bool): Store the decisions of the games without any stored decision as encoded moves.
+
+        Returns:
+            Tuple[Dict[int, int], Dict[int, int], Dict[int, Tuple[Optional[int], bytearray]]]: Field sizes of the
+             existing games, numbers of their stored decisions and the first user and encoded moves of the games
+             stored in the compact format by their ids.
+        """
+        stored_decisions: Dict[int, int] = dict(
+            db_session.query(GameUserDecision.game_id, func.count(GameUserDecision.id))
+            .filter(GameUserDecision.game_id.in_(game_ids))
+            .group_by(GameUserDecision.game_id)
+            .all()
+        )
+        field_sizes = {}
+        moves: Dict[int, Tuple[Optional[int], bytearray]] = {}
+        for game in (
+            db_session.query(Game.id, Game.moves, Game.first_user_id, LeagueSeason.field_size)
+            .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+            .filter(Game.id.in_(game_ids))
+        ):
+            field_sizes[game.id] = game.field_size
+            if game.moves is not None:
+                moves[game.id] = (game.first_user_id, bytearray(game.moves))
+                stored_decisions[game.id] = len(game.moves) // get_cell_width(game.field_size)
+            elif compact_moves and game.id not in stored_decisions:
+                moves[game.id] = (None, bytearray())
+        return field_sizes, stored_decisions, moves
+
+    def close(self) -> None:
+        """
+        Closes the journal file.
+        """
+        self._file.close()
+
+    @classmethod
+    def recover(cls, db_session: scoped_session, path: str = JOURNAL_PATH, compact_moves: bool = False) -> int:
+        """
+        Replays the journal left by the previous run if it exists.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database.
+            path (str): Path to the journal file.
+            compact_moves (bool): Store the decisions of the games without any stored decision as encoded moves.
+
+        Returns:
+            int: Number of the recovered decisions.
+        """
+        if not os.path.exists(path):  # pylint: disable=no-member
+            return 0
+        journal = cls(path)
+        try:
+            return journal.replay(db_session, compact_moves)
+        finally:
+            journal.close()
@@ -4,13 +4,17 @@ import sys
 from logging.config import fileConfig
 
 from alembic import context
-from model import Base
 from sqlalchemy import engine_from_config, pool
 
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))  # pylint: disable=no-member
 parentdir = os.path.dirname(currentdir)  # pylint: disable=no-member
 sys.path.insert(0, parentdir)  # pylint: disable=no-member
 
+# The models are imported to register their tables in the metadata
+import model.game  # noqa: E402,F401 # pylint: disable=wrong-import-position,unused-import
+import model.tournament  # noqa: E402,F401 # pylint: disable=wrong-import-position,unused-import
+import model.user  # noqa: E402,F401 # pylint: disable=wrong-import-position,unused-import
+from model.base import Base  # noqa: E402 # pylint: disable=wrong-import-position
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,26 @@
+"""Field size and win length were added to the table league_season
+
+Revision ID: 3f2b9c41d7e5
+Revises: d561ac117620
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f2b9c41d7e5"
+down_revision = "d561ac117620"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("league_season", sa.Column("field_size", sa.Integer(), server_default="3", nullable=False))
+    op.add_column("league_season", sa.Column("win_length", sa.Integer(), server_default="3", nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table("league_season") as batch_op:
+        batch_op.drop_column("win_length")
+        batch_op.drop_column("field_size")
@@ -0,0 +1,22 @@
+"""Index was added for user nicknames
+
+Revision ID: 5d9a3e7c1b84
+Revises: b4d8e2f61a37
+Create Date: 2026-10-17 23:48:15.240917
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d9a3e7c1b84"
+down_revision = "b4d8e2f61a37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f("ix_user_nickname"), "user", ["nickname"], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f("ix_user_nickname"), table_name="user")
@@ -0,0 +1,66 @@
+"""Table league_standing was added
+
+Revision ID: 6b0e5d7a92c4
+Revises: 3f2b9c41d7e5
+Create Date: 2026-10-17 14:05:12.381907
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6b0e5d7a92c4"
+down_revision = "3f2b9c41d7e5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "league_standing",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("league_season_id", sa.Integer(), nullable=False),
+        sa.Column("games", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("wins", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("losses", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("draws", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("points", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["league_season_id"],
+            ["league_season.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "league_season_id"),
+    )
+    # The standings of the finished games are aggregated like src.database.standing.select_league_standings does
+    op.execute(
+        """
+        INSERT INTO league_standing (user_id, league_season_id, games, wins, losses, draws, points)
+        SELECT
+            game_result.user_id,
+            game.league_season_id,
+            COUNT(game_result.id),
+            SUM(CASE WHEN game_result.is_winner THEN 1 ELSE 0 END),
+            SUM(CASE WHEN game_result.is_winner THEN 0 WHEN game_winner.has_winner = 0 THEN 0 ELSE 1 END),
+            SUM(CASE WHEN game_winner.has_winner = 0 THEN 1 ELSE 0 END),
+            SUM(CASE WHEN game_result.is_winner THEN 2 ELSE 1 END)
+        FROM game_result
+        JOIN game ON game.id = game_result.game_id
+        JOIN (
+            SELECT game_id, MAX(CASE WHEN is_winner THEN 1 ELSE 0 END) AS has_winner
+            FROM game_result
+            GROUP BY game_id
+        ) AS game_winner ON game_winner.game_id = game_result.game_id
+        WHERE game_result.is_winner IS NOT NULL AND game.league_season_id IS NOT NULL
+        GROUP BY game_result.user_id, game.league_season_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("league_standing")
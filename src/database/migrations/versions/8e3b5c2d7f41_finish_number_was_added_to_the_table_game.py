@@ -0,0 +1,34 @@
+"""Finish number was added to the table game
+
+Revision ID: 8e3b5c2d7f41
+Revises: 5d9a3e7c1b84
+Create Date: 2026-10-18 10:12:36.507214
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e3b5c2d7f41"
+down_revision = "5d9a3e7c1b84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("game", sa.Column("finish_number", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_game_finish_number"), "game", ["finish_number"], unique=False)
+    # The finish order of the existing games is unknown, they are numbered in the order of their ids, which the
+    #  ratings were replayed in
+    op.execute(
+        """
+        UPDATE game SET finish_number = id
+        WHERE id IN (SELECT game_id FROM game_result WHERE is_winner IS NOT NULL)
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_game_finish_number"), table_name="game")
+    with op.batch_alter_table("game") as batch_op:
+        batch_op.drop_column("finish_number")
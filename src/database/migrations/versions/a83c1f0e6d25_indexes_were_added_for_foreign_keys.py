@@ -0,0 +1,36 @@
+"""Indexes were added for foreign keys
+
+Revision ID: a83c1f0e6d25
+Revises: 6b0e5d7a92c4
+Create Date: 2026-10-17 15:21:47.902164
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a83c1f0e6d25"
+down_revision = "6b0e5d7a92c4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f("ix_game_league_season_id"), "game", ["league_season_id"], unique=False)
+    op.create_index(
+        "ix_game_result_game_id_user_id_is_winner", "game_result", ["game_id", "user_id", "is_winner"], unique=False
+    )
+    op.create_index(
+        "ix_game_result_user_id_game_id_is_winner", "game_result", ["user_id", "game_id", "is_winner"], unique=False
+    )
+    op.create_index(op.f("ix_game_user_decision_game_id"), "game_user_decision", ["game_id"], unique=False)
+    op.create_index(
+        "ix_league_standing_league_season_id_points", "league_standing", ["league_season_id", "points"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_league_standing_league_season_id_points", table_name="league_standing")
+    op.drop_index(op.f("ix_game_user_decision_game_id"), table_name="game_user_decision")
+    op.drop_index("ix_game_result_user_id_game_id_is_winner", table_name="game_result")
+    op.drop_index("ix_game_result_game_id_user_id_is_winner", table_name="game_result")
+    op.drop_index(op.f("ix_game_league_season_id"), table_name="game")
@@ -0,0 +1,77 @@
+"""Ratings were added
+
+Revision ID: b4d8e2f61a37
+Revises: f7c3a1d95e20
+Create Date: 2026-10-17 23:12:40.518263
+
+"""
+import itertools
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4d8e2f61a37"
+down_revision = "f7c3a1d95e20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("game_result") as batch_op:
+        batch_op.add_column(sa.Column("rating", sa.Float(), nullable=True))
+    with op.batch_alter_table("league_standing") as batch_op:
+        batch_op.add_column(sa.Column("rating", sa.Float(), server_default="1500", nullable=False))
+        batch_op.create_index("ix_league_standing_league_season_id_rating", ["league_season_id", "rating"])
+    # The finished games are replayed like src.database.rating.replay_league_ratings does, the Elo rating of a player
+    #  changes by 32 * (score - expected score) in every game
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text(
+            """
+            SELECT game_result.id, game_result.game_id, game_result.user_id, game_result.is_winner,
+                game.league_season_id
+            FROM game_result
+            JOIN game ON game.id = game_result.game_id
+            WHERE game_result.is_winner IS NOT NULL AND game.league_season_id IS NOT NULL
+            ORDER BY game_result.game_id, game_result.id
+            """
+        )
+    ).fetchall()
+    ratings = {}
+    game_results = []
+    for _, game_rows in itertools.groupby(rows, key=lambda i: i.game_id):
+        game_rows = list(game_rows)
+        has_winner = any(i.is_winner for i in game_rows)
+        before = [ratings.get((i.user_id, i.league_season_id), 1500.0) for i in game_rows]
+        for i, row in enumerate(game_rows):
+            score = 1.0 if row.is_winner else 0.0 if has_winner else 0.5
+            change = 0.0
+            for j, opponent in enumerate(game_rows):
+                if i != j:
+                    opponent_score = 1.0 if opponent.is_winner else 0.0 if has_winner else 0.5
+                    actual = 0.5 if score == opponent_score else float(score > opponent_score)
+                    change += actual - 1 / (1 + 10 ** ((before[j] - before[i]) / 400))
+            rating = before[i] + 32 * change / max(1, len(game_rows) - 1)
+            ratings[row.user_id, row.league_season_id] = rating
+            game_results.append({"_id": row.id, "rating": rating})
+    if game_results:
+        connection.execute(sa.text("UPDATE game_result SET rating = :rating WHERE id = :_id"), game_results)
+        connection.execute(
+            sa.text(
+                "UPDATE league_standing SET rating = :rating "
+                "WHERE user_id = :user_id AND league_season_id = :league_season_id"
+            ),
+            [
+                {"user_id": user_id, "league_season_id": league_season_id, "rating": rating}
+                for (user_id, league_season_id), rating in ratings.items()
+            ],
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("league_standing") as batch_op:
+        batch_op.drop_index("ix_league_standing_league_season_id_rating")
+        batch_op.drop_column("rating")
+    with op.batch_alter_table("game_result") as batch_op:
+        batch_op.drop_column("rating")
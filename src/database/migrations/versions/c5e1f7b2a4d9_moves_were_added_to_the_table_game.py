@@ -0,0 +1,57 @@
+"""Moves were added to the table game
+
+Revision ID: c5e1f7b2a4d9
+Revises: a83c1f0e6d25
+Create Date: 2026-10-17 18:21:47.615203
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c5e1f7b2a4d9"
+down_revision = "a83c1f0e6d25"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite does not add a foreign key to an existing table, so the table is recreated by the batch
+    with op.batch_alter_table("game") as batch_op:
+        batch_op.add_column(sa.Column("moves", sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column("first_user_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("fk_game_first_user_id_user", "user", ["first_user_id"], ["id"])
+    # The decisions are encoded like src.database.moves.encode_moves does, the rows of game_user_decision are kept
+    connection = op.get_bind()
+    games = {}
+    for game_id, user_id, coordinate_x, coordinate_y, field_size in connection.execute(
+        sa.text(
+            """
+            SELECT
+                game_user_decision.game_id,
+                game_user_decision.user_id,
+                game_user_decision.coordinate_x,
+                game_user_decision.coordinate_y,
+                league_season.field_size
+            FROM game_user_decision
+            JOIN game ON game.id = game_user_decision.game_id
+            JOIN league_season ON league_season.id = game.league_season_id
+            ORDER BY game_user_decision.game_id, game_user_decision.id
+            """
+        )
+    ):
+        width = 1 if field_size * field_size <= 256 else 2
+        moves = games.setdefault(game_id, {"_id": game_id, "first_user_id": user_id, "moves": b""})
+        moves["moves"] += (coordinate_x * field_size + coordinate_y).to_bytes(width, "big")
+    if games:
+        connection.execute(
+            sa.text("UPDATE game SET moves = :moves, first_user_id = :first_user_id WHERE id = :_id"),
+            list(games.values()),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("game") as batch_op:
+        batch_op.drop_constraint("fk_game_first_user_id_user", type_="foreignkey")
+        batch_op.drop_column("first_user_id")
+        batch_op.drop_column("moves")
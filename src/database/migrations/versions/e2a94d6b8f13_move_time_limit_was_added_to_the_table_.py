@@ -0,0 +1,24 @@
+"""Move time limit was added to the table league_season
+
+Revision ID: e2a94d6b8f13
+Revises: c5e1f7b2a4d9
+Create Date: 2026-10-17 20:04:12.380917
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e2a94d6b8f13"
+down_revision = "c5e1f7b2a4d9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("league_season", sa.Column("move_time_limit", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("league_season") as batch_op:
+        batch_op.drop_column("move_time_limit")
@@ -0,0 +1,90 @@
+"""Tables of the tournaments were added
+
+Revision ID: f7c3a1d95e20
+Revises: e2a94d6b8f13
+Create Date: 2026-10-17 21:37:45.129604
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f7c3a1d95e20"
+down_revision = "e2a94d6b8f13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tournament",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("league_season_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("system", sa.String(length=20), nullable=False),
+        sa.Column("rounds", sa.Integer(), nullable=False),
+        sa.Column("seed", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["league_season_id"],
+            ["league_season.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_tournament_league_season_id"), "tournament", ["league_season_id"], unique=False)
+    op.create_table(
+        "tournament_player",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tournament_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("strategy", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["tournament_id"],
+            ["tournament.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("tournament_id", "user_id"),
+    )
+    op.create_table(
+        "tournament_pairing",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("tournament_id", sa.Integer(), nullable=False),
+        sa.Column("round", sa.Integer(), nullable=False),
+        sa.Column("first_user_id", sa.Integer(), nullable=False),
+        sa.Column("second_user_id", sa.Integer(), nullable=True),
+        sa.Column("game_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["first_user_id"],
+            ["user.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["game_id"],
+            ["game.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["second_user_id"],
+            ["user.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["tournament_id"],
+            ["tournament.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tournament_pairing_tournament_id_round",
+        "tournament_pairing",
+        ["tournament_id", "round", "game_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_tournament_pairing_tournament_id_round", table_name="tournament_pairing")
+    op.drop_table("tournament_pairing")
+    op.drop_table("tournament_player")
+    op.drop_index(op.f("ix_tournament_league_season_id"), table_name="tournament")
+    op.drop_table("tournament")
@@ -1,4 +1,14 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
 
 from .base import Base
 
@@ -7,19 +17,28 @@ metadata = Base.metadata  # type: ignore [attr-defined] # pylint: disable=no-mem
 
 class GameResult(Base):
     __tablename__ = "game_result"
+    # The results of a game for its metadata and the standings, and the results of a user in the order of the games
+    #  for the rating chart, both are covering the is_winner column
+    __table_args__ = (
+        Index("ix_game_result_game_id_user_id_is_winner", "game_id", "user_id", "is_winner"),
+        Index("ix_game_result_user_id_game_id_is_winner", "user_id", "game_id", "is_winner"),
+    )
 
     id = Column(Integer, primary_key=True)
     game_id = Column(ForeignKey("game.id"))
     user_id = Column(ForeignKey("user.id"))
     is_winner = Column(Boolean)
     symbol = Column(String(1))
+    # Rating of the user after the game, None until the game is finished
+    rating = Column(Float, nullable=True)
 
 
 class GameUserDecision(Base):
     __tablename__ = "game_user_decision"
 
     id = Column(Integer, primary_key=True)
-    game_id = Column(ForeignKey("game.id"))
+    # SQLite appends the rowid to the index, so the decisions of a game are read in the order they were made
+    game_id = Column(ForeignKey("game.id"), index=True)
     user_id = Column(ForeignKey("user.id"))
     coordinate_x = Column(Integer)
     coordinate_y = Column(Integer)
@@ -30,10 +49,42 @@ class LeagueSeason(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(50), nullable=True)
+    field_size = Column(Integer, nullable=False, default=3, server_default="3")
+    win_length = Column(Integer, nullable=False, default=3, server_default="3")
+    # Time of the search of a computer move in milliseconds, None for the default of the game
+    move_time_limit = Column(Integer, nullable=True)
 
 
 class Game(Base):
     __tablename__ = "game"
 
     id = Column(Integer, primary_key=True)
-    league_season_id = Column(ForeignKey("league_season.id"))
+    # SQLite appends the rowid to the index, so the games of a season are read newest first without sorting
+    league_season_id = Column(ForeignKey("league_season.id"), index=True)
+    # Moves encoded by src.database.moves, the even plies are made by the first user, None for the games stored as
+    #  game_user_decision rows
+    moves = Column(LargeBinary, nullable=True)
+    first_user_id = Column(ForeignKey("user.id"), nullable=True)
+    # Number of the game in the order the games were finished, the ratings are replayed in this order, None for the
+    #  unfinished games
+    finish_number = Column(Integer, nullable=True, index=True)
+
+
+class LeagueStanding(Base):
+    __tablename__ = "league_standing"
+    __table_args__ = (
+        UniqueConstraint("user_id", "league_season_id"),
+        Index("ix_league_standing_league_season_id_points", "league_season_id", "points"),
+        Index("ix_league_standing_league_season_id_rating", "league_season_id", "rating"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(ForeignKey("user.id"), nullable=False)
+    league_season_id = Column(ForeignKey("league_season.id"), nullable=False)
+    games = Column(Integer, nullable=False, default=0, server_default="0")
+    wins = Column(Integer, nullable=False, default=0, server_default="0")
+    losses = Column(Integer, nullable=False, default=0, server_default="0")
+    draws = Column(Integer, nullable=False, default=0, server_default="0")
+    points = Column(Integer, nullable=False, default=0, server_default="0")
+    # Elo rating maintained by src.database.rating
+    rating = Column(Float, nullable=False, default=1500.0, server_default="1500")
@@ -0,0 +1,42 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, UniqueConstraint
+
+from .base import Base
+
+metadata = Base.metadata  # type: ignore [attr-defined] # pylint: disable=no-member
+
+
+class Tournament(Base):
+    __tablename__ = "tournament"
+
+    id = Column(Integer, primary_key=True)
+    league_season_id = Column(ForeignKey("league_season.id"), nullable=False, index=True)
+    name = Column(String(50), nullable=True)
+    # One of "round_robin" or "swiss", see src.components.game.tournament.SYSTEMS
+    system = Column(String(20), nullable=False)
+    rounds = Column(Integer, nullable=False)
+    seed = Column(Integer, nullable=True)
+
+
+class TournamentPlayer(Base):
+    __tablename__ = "tournament_player"
+    __table_args__ = (UniqueConstraint("tournament_id", "user_id"),)
+
+    id = Column(Integer, primary_key=True)
+    tournament_id = Column(ForeignKey("tournament.id"), nullable=False)
+    user_id = Column(ForeignKey("user.id"), nullable=False)
+    # One of src.components.game.tournament.STRATEGIES, "human" games are played at the keyboard
+    strategy = Column(String(20), nullable=False)
+
+
+class TournamentPairing(Base):
+    __tablename__ = "tournament_pairing"
+    # The pending pairings of a round are found by the game_id being NULL
+    __table_args__ = (Index("ix_tournament_pairing_tournament_id_round", "tournament_id", "round", "game_id"),)
+
+    id = Column(Integer, primary_key=True)
+    tournament_id = Column(ForeignKey("tournament.id"), nullable=False)
+    round = Column(Integer, nullable=False)
+    # The first user takes the first symbol and moves first, a pairing without the second user is a bye
+    first_user_id = Column(ForeignKey("user.id"), nullable=False)
+    second_user_id = Column(ForeignKey("user.id"), nullable=True)
+    game_id = Column(ForeignKey("game.id"), nullable=True)
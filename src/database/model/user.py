@@ -18,7 +18,7 @@ class User(Base):
     first_name = Column(String(50), nullable=True)
     last_name = Column(String(50), nullable=True)
     email = Column(String(50), nullable=True)
-    nickname = Column(String(50), nullable=False)
+    nickname = Column(String(50), nullable=False, index=True)
     age = Column(Integer, nullable=True)
 
     @validates("first_name")
@@ -0,0 +1,221 @@
+"""
+Compact encoding of the moves of the games.
+
+The moves of a game are stored on its row as a byte string, one cell index x * size + y per move in the order of
+ the moves, one byte for the fields up to 16x16 and two bytes (big-endian) for the larger ones. The player of a move
+ is implied by the parity of its ply: the even plies are made by the first_user_id of the game, the odd ones by
+ the opponent. A game of 3x3 takes up to 9 bytes instead of up to 9 rows of game_user_decision.
+
+The moves are decoded in bulk with numpy, vectorized over many games, e.g. the heatmap of the moves per cell in
+ the league season is printed by the command:
+    python -m src.database.moves --league-season-id 1
+The games stored as game_user_decision rows are encoded by the command:
+    python -m src.database.moves --backfill
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import click
+import numpy as np
+from sqlalchemy import bindparam
+from sqlalchemy.orm import scoped_session
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import Game, GameUserDecision, LeagueSeason
+from src.settings import get_settings
+
+# Number of the cells encoded by one byte
+BYTE_CELLS = 256
+CHUNK_SIZE = 10000
+
+
+@dataclass
+class MoveArrays:
+    """
+    Moves of many games decoded in bulk, one element of every array per move.
+
+    Attributes:
+        game_index (np.ndarray): Index of the game in the decoded sequence.
+        ply (np.ndarray): Number of the move in its game starting from 0, the first player moves on the even plies.
+        x_coordinate (np.ndarray): X coordinate of the cell.
+        y_coordinate (np.ndarray): Y coordinate of the cell.
+    """
+
+    game_index: np.ndarray
+    ply: np.ndarray
+    x_coordinate: np.ndarray
+    y_coordinate: np.ndarray
+
+
+def get_cell_width(size: int) -> int:
+    """
+    Gets the number of the bytes encoding one move.
+
+    Args:
+        size (int): Length of the side of the game field.
+
+    Returns:
+        int: 1 for the fields up to 16x16, 2 for the larger ones.
+    """
+    return 1 if size * size <= BYTE_CELLS else 2
+
+
+def encode_moves(moves: Iterable[Tuple[int, int]], size: int) -> bytes:
+    """
+    Encodes the moves of the game.
+
+    Args:
+        moves (Iterable[Tuple[int, int]]): Coordinates of the cells in the order of the moves.
+        size (int): Length of the side of the game field.
+
+    Returns:
+        bytes: Encoded moves.
+    """
+    width = get_cell_width(size)
+    return b"".join((x_coordinate * size + y_coordinate).to_bytes(width, "big") for x_coordinate, y_coordinate in moves)
+
+
+def decode_moves(data: bytes, size: int) -> List[Tuple[int, int]]:
+    """
+    Decodes the moves of the game.
+
+    Args:
+        data (bytes): Encoded moves.
+        size (int): Length of the side of the game field.
+
+    Returns:
+        List[Tuple[int, int]]: Coordinates of the cells in the order of the moves.
+    """
+    width = get_cell_width(size)
+    return [divmod(int.from_bytes(data[i : i + width], "big"), size) for i in range(0, len(data), width)]
+
+
+def decode_moves_bulk(games: Sequence[bytes], size: int) -> MoveArrays:
+    """
+    Decodes the moves of many games of the same field size at once. The encoded moves are joined into one buffer
+     viewed as an array, so the decoding costs a few numpy operations instead of a Python loop per move.
+
+    Args:
+        games (Sequence[bytes]): Encoded moves of every game.
+        size (int): Length of the side of the game field.
+
+    Returns:
+        MoveArrays: Moves of all games.
+    """
+    width = get_cell_width(size)
+    lengths = np.fromiter((len(i) // width for i in games), dtype=np.int64, count=len(games))
+    cells = np.frombuffer(b"".join(games), dtype=np.uint8 if width == 1 else np.dtype(">u2")).astype(np.int64)
+    starts = np.cumsum(lengths) - lengths
+    x_coordinate, y_coordinate = np.divmod(cells, size)
+    return MoveArrays(
+        game_index=np.repeat(np.arange(len(games)), lengths),
+        ply=np.arange(len(cells)) - np.repeat(starts, lengths),
+        x_coordinate=x_coordinate,
+        y_coordinate=y_coordinate,
+    )
+
+
+def get_move_heatmaps(db_session: scoped_session, league_season_id: Optional[int] = None) -> Dict[int, np.ndarray]:
+    """
+    Counts the moves of the first and the second players per cell. The games are streamed in chunks and every chunk
+     is decoded in bulk.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        Dict[int, np.ndarray]: Arrays of the shape (2, size, size) with the numbers of the moves of the first and
+         the second players by the field sizes.
+    """
+    query = (
+        db_session.query(LeagueSeason.field_size, Game.moves)
+        .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+        .filter(Game.moves.isnot(None))
+        .order_by(LeagueSeason.field_size)
+        .execution_options(yield_per=CHUNK_SIZE)
+    )
+    if league_season_id is not None:
+        query = query.filter(Game.league_season_id == league_season_id)
+    result: Dict[int, np.ndarray] = {}
+    chunks: Dict[int, List[bytes]] = {}
+
+    def count(size: int) -> None:
+        moves = decode_moves_bulk(chunks.pop(size), size)
+        heatmap = result.setdefault(size, np.zeros((2, size, size), dtype=np.int64))
+        np.add.at(heatmap, (moves.ply % 2, moves.x_coordinate, moves.y_coordinate), 1)
+
+    for size, data in query:
+        chunk = chunks.setdefault(size, [])
+        chunk.append(data)
+        if len(chunk) >= CHUNK_SIZE:
+            count(size)
+    for size in list(chunks):
+        count(size)
+    return result
+
+
+def backfill_moves(db_session: scoped_session) -> int:
+    """
+    Encodes the moves of the games stored as game_user_decision rows only on their game rows in one transaction.
+     The rows are kept.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+
+    Returns:
+        int: Number of the encoded games.
+    """
+    decisions = (
+        db_session.query(
+            GameUserDecision.game_id,
+            GameUserDecision.user_id,
+            GameUserDecision.coordinate_x,
+            GameUserDecision.coordinate_y,
+            LeagueSeason.field_size,
+        )
+        .join(Game, Game.id == GameUserDecision.game_id)
+        .join(LeagueSeason, LeagueSeason.id == Game.league_season_id)
+        .filter(Game.moves.is_(None))
+        .order_by(GameUserDecision.game_id, GameUserDecision.id)
+        .execution_options(yield_per=CHUNK_SIZE)
+    )
+    games: Dict[int, Tuple[int, int, List[Tuple[int, int]]]] = {}
+    for game_id, user_id, coordinate_x, coordinate_y, field_size in decisions:
+        games.setdefault(game_id, (user_id, field_size, []))[2].append((coordinate_x, coordinate_y))
+    if games:
+        game_table = Game.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+        db_session.execute(
+            game_table.update()
+            .where(game_table.c.id == bindparam("_id"))
+            .values(moves=bindparam("moves"), first_user_id=bindparam("first_user_id")),
+            [
+                {"_id": game_id, "moves": encode_moves(moves, field_size), "first_user_id": user_id}
+                for game_id, (user_id, field_size, moves) in games.items()
+            ],
+        )
+    db_session.commit()
+    return len(games)
+
+
+@click.command()
+@click.option("--db-url", default=None, help="Database to process, the game database by default.")
+@click.option("--league-season-id", default=None, type=int, help="League season to process, all by default.")
+@click.option("--backfill", is_flag=True, help="Encode the moves of the games stored as game_user_decision rows.")
+def main(db_url: Optional[str], league_season_id: Optional[int], backfill: bool) -> None:
+    settings = get_settings()
+    db_engine = make_engine({**settings, "db_url": db_url or settings["db_url"]})
+    db_session = make_session(db_engine)
+    if backfill:
+        click.echo(f"{backfill_moves(db_session)} games were encoded")
+    for size, heatmap in get_move_heatmaps(db_session, league_season_id).items():
+        for player, name in enumerate(("first", "second")):
+            click.echo(f"\nMoves of the {name} player on the {size}x{size} field:")
+            for row in heatmap[player]:
+                click.echo(" ".join(f"{value:>7}" for value in row))
+    delete_session(db_session)
+    db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,280 @@
+"""
+Elo ratings of the players in the league seasons.
+
+The rating of every user in every league season is kept on its league_standing row and updated in the transaction
+ summarising the game, like the totals of the standing. Every game result keeps the rating of its player after the
+ game, so the history of the rating is read with the results instead of being replayed. The finished games are
+ numbered in the transaction updating their ratings, so the ratings can be rebuilt by replaying the games in the
+ order they were finished, also by concurrent processes, streamed from the database in one pass.
+
+The ratings are checked and rebuilt by the command:
+    python -m src.database.rating --check
+    python -m src.database.rating
+"""
+import itertools
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import click
+from sqlalchemy import bindparam, func
+from sqlalchemy.orm import scoped_session
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import Game, GameResult, LeagueStanding
+from src.settings import get_settings
+
+INITIAL_RATING = 1500.0
+# Maximal change of the rating by one game
+K_FACTOR = 32.0
+# Difference of the ratings at which the stronger player is expected to score ten times more
+RATING_SCALE = 400.0
+CHUNK_SIZE = 1000
+# Difference of the stored and the replayed ratings caused by the rounding of the floats
+TOLERANCE = 1e-6
+
+# user_id, league_season_id
+RatingKey = Tuple[int, int]
+
+
+def get_expected_score(rating: float, opponent_rating: float) -> float:
+    """
+    Gets the expected score of the player against the opponent.
+
+    Args:
+        rating (float): Rating of the player.
+        opponent_rating (float): Rating of the opponent.
+
+    Returns:
+        float: Expected score from 0 to 1.
+    """
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / RATING_SCALE))
+
+
+def get_rating_changes(ratings: Sequence[float], user_ids: Sequence[int], winner_id: Optional[int]) -> List[float]:
+    """
+    Gets the changes of the ratings of the players by the result of the game. Every player is scored against every
+     opponent: 1 for a win, 0.5 for a draw and 0 for a loss.
+
+    Args:
+        ratings (Sequence[float]): Ratings of the players before the game.
+        user_ids (Sequence[int]): Identifiers of the users in the order of the ratings.
+        winner_id (Optional[int]): Identifier of the winner or None for a draw.
+
+    Returns:
+        List[float]: Changes of the ratings in the order of the players.
+    """
+    scores = [0.5 if winner_id is None else float(user_id == winner_id) for user_id in user_ids]
+    result = []
+    for i, (rating, score) in enumerate(zip(ratings, scores)):
+        change = 0.0
+        for j, (opponent_rating, opponent_score) in enumerate(zip(ratings, scores)):
+            if i != j:
+                actual = 0.5 if score == opponent_score else float(score > opponent_score)
+                change += actual - get_expected_score(rating, opponent_rating)
+        result.append(K_FACTOR * change / max(1, len(ratings) - 1))
+    return result
+
+
+def update_league_ratings(
+    db_session: scoped_session, league_season_id: int, user_ids: Sequence[int], winner_id: Optional[int]
+) -> Dict[int, float]:
+    """
+    Updates the ratings of the players by the result of the game. The standings of the players are expected to
+     exist, the changes are committed by the caller together with the results of the game.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (int): LeagueSeason object identifier.
+        user_ids (Sequence[int]): Identifiers of the users who played the game.
+        winner_id (Optional[int]): Identifier of the winner or None for a draw.
+
+    Returns:
+        Dict[int, float]: Ratings of the players after the game by the ids of the users.
+    """
+    stored = dict(
+        db_session.query(LeagueStanding.user_id, LeagueStanding.rating)  # pylint: disable=no-member
+        .filter(LeagueStanding.league_season_id == league_season_id, LeagueStanding.user_id.in_(list(user_ids)))
+        .all()
+    )
+    ratings = [stored.get(user_id, INITIAL_RATING) for user_id in user_ids]
+    result = {
+        user_id: rating + change
+        for user_id, rating, change in zip(user_ids, ratings, get_rating_changes(ratings, user_ids, winner_id))
+    }
+    write_league_ratings(db_session, {(user_id, league_season_id): rating for user_id, rating in result.items()})
+    return result
+
+
+def number_finished_games(db_session: scoped_session, game_ids: Sequence[int]) -> None:
+    """
+    Numbers the finished games in the order of their ids following the last finish number in the database. The games
+     are numbered after the standings of their players are updated, which locks the database against the concurrent
+     writers, so the numbers follow the order the ratings are updated in. The changes are committed by the caller
+     together with the ratings.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        game_ids (Sequence[int]): Identifiers of the games in the order they were finished.
+    """
+    if not game_ids:
+        return
+    last_number = db_session.query(func.max(Game.finish_number)).scalar() or 0  # pylint: disable=no-member
+    game_table = Game.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+    db_session.execute(
+        game_table.update().where(game_table.c.id == bindparam("_id")).values(finish_number=bindparam("finish_number")),
+        [{"_id": game_id, "finish_number": last_number + i} for i, game_id in enumerate(game_ids, 1)],
+    )
+
+
+def write_league_ratings(db_session: scoped_session, ratings: Mapping[RatingKey, float], add: bool = False) -> None:
+    """
+    Writes the ratings to the standings in one executemany statement.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        ratings (Mapping[RatingKey, float]): Ratings by the user and the league season.
+        add (bool): Add the values to the stored ratings instead of replacing them, e.g. the changes of a snapshot.
+    """
+    if not ratings:
+        return
+    standing_table = LeagueStanding.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+    db_session.execute(
+        standing_table.update()
+        .where(
+            standing_table.c.user_id == bindparam("_user_id"),
+            standing_table.c.league_season_id == bindparam("_league_season_id"),
+        )
+        .values(rating=standing_table.c.rating + bindparam("rating") if add else bindparam("rating")),
+        [
+            {"_user_id": user_id, "_league_season_id": league_season_id, "rating": rating}
+            for (user_id, league_season_id), rating in ratings.items()
+        ],
+    )
+
+
+def replay_league_ratings(  # pylint: disable=too-many-locals
+    db_session: scoped_session, league_season_id: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, RatingKey, float]]:
+    """
+    Replays the ratings from the results of the finished games in the order they were finished. The results are
+     streamed in chunks by the server-side cursor, so only the current ratings of the players are kept in memory.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+        chunk_size (int): Number of the results fetched at once.
+
+    Returns:
+        Iterator[Tuple[int, RatingKey, float]]: Identifier of the game result, its user and league season and the
+         rating of the user after the game.
+    """
+    query = (
+        db_session.query(  # pylint: disable=no-member
+            GameResult.id, GameResult.game_id, GameResult.user_id, GameResult.is_winner, Game.league_season_id
+        )
+        .join(Game, Game.id == GameResult.game_id)
+        .filter(GameResult.is_winner.isnot(None), Game.league_season_id.isnot(None))
+    )
+    if league_season_id is not None:
+        query = query.filter(Game.league_season_id == league_season_id)
+    ratings: Dict[RatingKey, float] = {}
+    rows = query.order_by(Game.finish_number, GameResult.game_id, GameResult.id).execution_options(yield_per=chunk_size)
+    for _, game_rows in itertools.groupby(rows, key=lambda i: i.game_id):
+        game_results = list(game_rows)
+        user_ids = [i.user_id for i in game_results]
+        winner_id = next((i.user_id for i in game_results if i.is_winner), None)
+        keys = [(i.user_id, i.league_season_id) for i in game_results]
+        before = [ratings.get(key, INITIAL_RATING) for key in keys]
+        for game_result, key, rating, change in zip(
+            game_results, keys, before, get_rating_changes(before, user_ids, winner_id)
+        ):
+            ratings[key] = rating + change
+            yield game_result.id, key, ratings[key]
+
+
+def check_league_ratings(
+    db_session: scoped_session, league_season_id: Optional[int] = None
+) -> List[Tuple[RatingKey, Optional[float], Optional[float]]]:
+    """
+    Compares the stored ratings with the ones replayed from the game results.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        List: Keys of the inconsistent ratings with the stored and the replayed values, None for a missing standing.
+    """
+    query = db_session.query(  # pylint: disable=no-member
+        LeagueStanding.user_id, LeagueStanding.league_season_id, LeagueStanding.rating
+    )
+    if league_season_id is not None:
+        query = query.filter(LeagueStanding.league_season_id == league_season_id)
+    stored: Dict[RatingKey, float] = {(i.user_id, i.league_season_id): i.rating for i in query}
+    replayed = {key: rating for _, key, rating in replay_league_ratings(db_session, league_season_id)}
+    return [
+        (key, stored.get(key), replayed.get(key, INITIAL_RATING if key in stored else None))
+        for key in sorted(stored.keys() | replayed.keys())
+        if key not in stored or abs(stored[key] - replayed.get(key, INITIAL_RATING)) > TOLERANCE
+    ]
+
+
+def rebuild_league_ratings(
+    db_session: scoped_session, league_season_id: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+) -> int:
+    """
+    Recomputes the ratings from the game results in one transaction. The ratings of the results are written in
+     chunks while the results are replayed, and the final ratings of the players once at the end.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+        chunk_size (int): Number of the results fetched and written at once.
+
+    Returns:
+        int: Number of the rated game results.
+    """
+    game_result_table = GameResult.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+    statement = game_result_table.update().where(game_result_table.c.id == bindparam("_id"))
+    statement = statement.values(rating=bindparam("rating"))
+    ratings: Dict[RatingKey, float] = {}
+    chunk = []
+    result = 0
+    for game_result_id, key, rating in replay_league_ratings(db_session, league_season_id, chunk_size):
+        ratings[key] = rating
+        chunk.append({"_id": game_result_id, "rating": rating})
+        if len(chunk) >= chunk_size:
+            db_session.execute(statement, chunk)
+            result += len(chunk)
+            chunk = []
+    if chunk:
+        db_session.execute(statement, chunk)
+        result += len(chunk)
+    reset_query = db_session.query(LeagueStanding)  # pylint: disable=no-member
+    if league_season_id is not None:
+        reset_query = reset_query.filter(LeagueStanding.league_season_id == league_season_id)
+    reset_query.update({LeagueStanding.rating: INITIAL_RATING}, synchronize_session=False)
+    write_league_ratings(db_session, ratings)
+    db_session.commit()
+    return result
+
+
+@click.command()
+@click.option("--db-url", default=None, help="Database to process, the game database by default.")
+@click.option("--league-season-id", default=None, type=int, help="League season to process, all by default.")
+@click.option("--check", is_flag=True, help="Only report the inconsistent ratings.")
+def main(db_url: Optional[str], league_season_id: Optional[int], check: bool) -> None:
+    settings = get_settings()
+    db_engine = make_engine({**settings, "db_url": db_url or settings["db_url"]})
+    db_session = make_session(db_engine)
+    inconsistencies = check_league_ratings(db_session, league_season_id)
+    for (user_id, _league_season_id), stored, replayed in inconsistencies:
+        click.echo(f"User {user_id} in league season {_league_season_id}: stored {stored}, replayed {replayed}")
+    click.echo(f"{len(inconsistencies)} inconsistent ratings were found")
+    if not check:
+        click.echo(f"{rebuild_league_ratings(db_session, league_season_id)} game results were rated")
+    delete_session(db_session)
+    db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,13 @@
+from src.database.repository.base import FinishedGame, GameMetadata, Repository
+from src.database.repository.memory import MemoryRepository, Snapshot, write_snapshot
+from src.database.repository.sql import SqlAlchemyRepository
+
+__all__ = [
+    "FinishedGame",
+    "GameMetadata",
+    "MemoryRepository",
+    "Repository",
+    "Snapshot",
+    "SqlAlchemyRepository",
+    "write_snapshot",
+]
@@ -0,0 +1,227 @@
+from typing import Iterable, List, NamedTuple, Optional, Protocol, Tuple
+
+from src.components.game.model import PastGameType, RankingType, UserSummaryType
+from src.components.game.replay import GameReplay
+from src.database.model.game import Game, GameResult, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+
+
+class GameMetadata(NamedTuple):
+    """
+    Objects of a game player, the names of the attributes follow the names of the models like the rows of the joined
+     models returned by the queries.
+    """
+
+    Game: Game  # pylint: disable=invalid-name
+    GameResult: GameResult  # pylint: disable=invalid-name
+    User: User  # pylint: disable=invalid-name
+    LeagueSeason: LeagueSeason  # pylint: disable=invalid-name
+
+
+class FinishedGame(NamedTuple):
+    """
+    Game played to the end outside of a game session, e.g. on the game server or in a tournament. The first user
+     plays "x" and moves first.
+    """
+
+    user_ids: List[int]
+    # Cell indexes x * size + y of the moves in their order
+    cells: List[int]
+    winner_id: Optional[int]
+
+
+class Repository(Protocol):
+    """
+    Storage of the users, the league seasons and the games used by the services.
+
+    The changes of the games are collected by the repository and saved by commit, so a caller decides how many of
+     them are saved together. The changes of the users and the league seasons are saved immediately.
+    """
+
+    def get_user_page(
+        self, after_id: int = 0, limit: Optional[int] = None, nickname_prefix: str = "", exclude_ids: Iterable[int] = ()
+    ) -> List[UserSummaryType]:
+        """
+        Gets the page of the users ordered by id, starting after the last user of the previous page.
+
+        Args:
+            after_id (int): Identifier of the last user of the previous page, 0 for the first page.
+            limit (Optional[int]): Number of the users on the page, all following users by default.
+            nickname_prefix (str): Beginning of the nicknames of the users, all users by default.
+            exclude_ids (Iterable[int]): Identifiers of the users to skip.
+
+        Returns:
+            List[UserSummaryType]: Ids and nicknames of the users.
+        """
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        """
+        Gets the user.
+
+        Args:
+            user_id (int): User object identifier.
+
+        Returns:
+            Optional[User]: User object or None if there is no such user.
+        """
+
+    def add_user(self, user: User) -> None:
+        """
+        Saves the new user.
+
+        Args:
+            user (User): User object.
+        """
+
+    def delete_user(self, user: User) -> None:
+        """
+        Deletes the user.
+
+        Args:
+            user (User): User object.
+        """
+
+    def get_last_league_season(self) -> Optional[LeagueSeason]:
+        """
+        Gets the last league season.
+
+        Returns:
+            Optional[LeagueSeason]: LeagueSeason object or None if there are no league seasons.
+        """
+
+    def add_league_season(self, league_season: LeagueSeason) -> None:
+        """
+        Saves the new league season.
+
+        Args:
+            league_season (LeagueSeason): LeagueSeason object.
+        """
+
+    def create_game(
+        self, league_season: LeagueSeason, users: List[User], game_results: List[GameResult]
+    ) -> List[GameMetadata]:
+        """
+        Saves the new game with the results of its players.
+
+        Args:
+            league_season (LeagueSeason): League season of the game.
+            users (List[User]): Players of the game.
+            game_results (List[GameResult]): Results of the players in the same order, the game is assigned to them.
+
+        Returns:
+            List[GameMetadata]: Objects of the game players.
+        """
+
+    def create_games(
+        self, league_season: LeagueSeason, games: List[Tuple[List[User], List[GameResult]]]
+    ) -> List[List[GameMetadata]]:
+        """
+        Saves the new games with the results of their players together, e.g. the games of a tournament round.
+
+        Args:
+            league_season (LeagueSeason): League season of the games.
+            games (List[Tuple[List[User], List[GameResult]]]): Players of every game and their results in the same
+             order, the game is assigned to the results.
+
+        Returns:
+            List[List[GameMetadata]]: Objects of the players of every game.
+        """
+
+    def add_decisions(self, decisions: List[GameUserDecision]) -> None:
+        """
+        Adds the decisions of the game to be saved by the next commit.
+
+        Args:
+            decisions (List[GameUserDecision]): GameUserDecision objects.
+        """
+
+    def finish_game(self, game_metadata: List[GameMetadata], winner_id: Optional[int]) -> None:
+        """
+        Adds the results of the finished game, the standings and the ratings of its players to be saved by the next
+         commit. The result of every player gets the rating of the player after the game.
+
+        Args:
+            game_metadata (List[GameMetadata]): Objects of the game players.
+            winner_id (Optional[int]): Identifier of the winner or None for a draw.
+        """
+
+    def add_finished_games(self, league_season: LeagueSeason, games: List[FinishedGame]) -> List[int]:
+        """
+        Adds the finished games with their moves, the results, the standings and the ratings of their players to be
+         saved by the next commit, so a batch of the games is saved by one transaction.
+
+        Args:
+            league_season (LeagueSeason): League season of the games.
+            games (List[FinishedGame]): Finished games.
+
+        Returns:
+            List[int]: Identifiers of the games in the same order.
+        """
+
+    def commit(self) -> None:
+        """
+        Saves the collected changes of the games.
+        """
+
+    def get_ranking(
+        self, league_season_id: int, user_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[RankingType]:
+        """
+        Gets the ranking of the players in the league season ordered by rating.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+            user_id (Optional[int]): User object identifier to get the ranking for a specific user.
+            limit (Optional[int]): Number of the top players by rating, all players by default.
+
+        Returns:
+            List[RankingType]: Nickname, total games, wins, losses, draws, points and rating of the users.
+        """
+
+    def get_past_games(self, league_season_id: int, page: int, page_size: int) -> List[PastGameType]:
+        """
+        Gets the page of the games in the league season, newest games first.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+            page (int): Number of the page starting from 1.
+            page_size (int): Number of the games on the page, one more game is returned to detect the next page.
+
+        Returns:
+            List[PastGameType]: Id, nicknames of the players and nickname of the winner of the games.
+        """
+
+    def get_user_game_results(self, league_season_id: int, user_id: int) -> List[GameResult]:
+        """
+        Gets the results of the user in the league season in the order of the games.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+            user_id (int): User object identifier.
+
+        Returns:
+            List[GameResult]: GameResult objects.
+        """
+
+    def get_last_game_id(self, user_id: int, league_season_id: Optional[int] = None) -> Optional[int]:
+        """
+        Gets the last game of the user.
+
+        Args:
+            user_id (int): User object identifier.
+            league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+        Returns:
+            Optional[int]: Game object identifier or None if the user has not played.
+        """
+
+    def get_replay(self, game_id: int) -> Optional[GameReplay]:
+        """
+        Replays the game from its stored moves.
+
+        Args:
+            game_id (int): Game object identifier.
+
+        Returns:
+            Optional[GameReplay]: Replay of the game or None if there is no such game.
+        """
@@ -0,0 +1,505 @@
+"""
+In-memory storage of the games.
+
+The objects are kept in dicts and lists indexed by their ids, so the games are played at the speed of the memory
+ without a round trip to the database per game. The repository is loaded from the database in bulk, and the objects
+ created after the load are written back in bulk by one snapshot, e.g.:
+    repository = MemoryRepository.load(db_session)
+    ...  # play the games
+    write_snapshot(db_session, repository.snapshot())
+    db_session.commit()
+"""
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import scoped_session
+
+from src.components.game.batch import SYMBOLS
+from src.components.game.model import PastGameType, RankingType, UserSummaryType
+from src.components.game.replay import GameReplay, decode_replay_moves
+from src.database.model.game import LeagueStanding
+from src.database.moves import encode_moves
+from src.database.rating import INITIAL_RATING, get_rating_changes, write_league_ratings
+from src.database.repository.base import (
+    FinishedGame,
+    Game,
+    GameMetadata,
+    GameResult,
+    GameUserDecision,
+    LeagueSeason,
+    User,
+)
+from src.database.standing import (
+    COLUMNS,
+    StandingKey,
+    StandingValues,
+    add_league_standings,
+    get_standing_values,
+)
+
+# Models of the snapshot in the order of their foreign keys
+MODELS: List[Any] = [User, LeagueSeason, Game, GameResult, GameUserDecision]
+# Foreign key columns by the names of the tables they refer to
+FOREIGN_KEYS = {"user_id": "user", "first_user_id": "user", "league_season_id": "league_season", "game_id": "game"}
+
+
+@dataclass
+class Snapshot:
+    """
+    Changes of the memory repository since its load. The ids of the new rows are local to the repository, they are
+     remapped to the ids following the last ones in the database when the snapshot is written, so the snapshots of
+     several repositories loaded from the same database do not collide.
+
+    Attributes:
+        rows (Dict[str, List[Dict[str, Any]]]): New rows by the names of the tables.
+        standings (Dict[StandingKey, StandingValues]): Values to add to the league standings.
+        ratings (Dict[StandingKey, float]): Changes to add to the ratings of the league standings.
+        deleted_user_ids (List[int]): Identifiers of the deleted users which were loaded from the database.
+    """
+
+    rows: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    standings: Dict[StandingKey, StandingValues] = field(default_factory=dict)
+    ratings: Dict[StandingKey, float] = field(default_factory=dict)
+    deleted_user_ids: List[int] = field(default_factory=list)
+
+
+class MemoryRepository:  # pylint: disable=too-many-instance-attributes
+    """
+    Repository storing the objects in memory. The changes are visible immediately, so commit does nothing, and they
+     are kept until the snapshot is written to the database.
+
+    Attributes:
+        users (Dict[int, User]): Users by their ids.
+        league_seasons (Dict[int, LeagueSeason]): League seasons by their ids.
+        games (Dict[int, Game]): Games by their ids.
+        game_results (Dict[int, List[GameResult]]): Results of the games by the ids of the games.
+        user_game_results (Dict[int, List[GameResult]]): Results of the users in the order of the games by the ids of
+         the users.
+        league_game_ids (Dict[int, List[int]]): Ascending ids of the games by the ids of the league seasons.
+        decisions (List[GameUserDecision]): Decisions made after the load.
+        game_decisions (Dict[int, List[GameUserDecision]]): Decisions in the order of the moves by the ids of the
+         games.
+        standings (Dict[StandingKey, List[int]]): Games, wins, losses, draws and points of the users in the league
+         seasons.
+        standing_changes (Dict[StandingKey, List[int]]): Values added to the standings after the load.
+        ratings (Dict[StandingKey, float]): Ratings of the users in the league seasons.
+        rating_changes (Dict[StandingKey, float]): Changes of the ratings after the load.
+        deleted_user_ids (List[int]): Identifiers of the loaded users which were deleted.
+        loaded_ids (Dict[str, int]): The last ids of the tables at the load, the greater ids belong to the new rows.
+        last_ids (Dict[str, int]): The last ids of the tables.
+        last_finish_number (int): Finish number of the last finished game.
+        compact_moves (bool): Store the decisions of the games in memory as the moves encoded on the games instead of
+         the game_user_decision rows.
+
+    Methods:
+        __init__(self, compact_moves=False):
+            Initializes an empty MemoryRepository instance.
+        load(cls, db_session, with_games=True, compact_moves=False) -> MemoryRepository:
+            Loads the repository from the database in bulk.
+        snapshot(self) -> Snapshot:
+            Collects the changes since the load.
+        __next_id(self, table_name) -> int:
+            Gets the id of the new row of the table.
+        __add_game(self, game):
+            Indexes the game.
+        __add_game_result(self, game_result):
+            Indexes the result of the game.
+        __add_standing(self, key, values):
+            Adds the values to the standing.
+    """
+
+    def __init__(self, compact_moves: bool = False) -> None:
+        """
+        Initializes an empty MemoryRepository instance.
+
+        Args:
+            compact_moves (bool): Store the decisions as the moves encoded on the games.
+        """
+        self.users: Dict[int, User] = {}
+        self.league_seasons: Dict[int, LeagueSeason] = {}
+        self.games: Dict[int, Game] = {}
+        self.game_results: Dict[int, List[GameResult]] = {}
+        self.user_game_results: Dict[int, List[GameResult]] = {}
+        self.league_game_ids: Dict[int, List[int]] = {}
+        self.decisions: List[GameUserDecision] = []
+        self.game_decisions: Dict[int, List[GameUserDecision]] = {}
+        self.standings: Dict[StandingKey, List[int]] = {}
+        self.standing_changes: Dict[StandingKey, List[int]] = {}
+        self.ratings: Dict[StandingKey, float] = {}
+        self.rating_changes: Dict[StandingKey, float] = {}
+        self.deleted_user_ids: List[int] = []
+        self.loaded_ids: Dict[str, int] = {i.__tablename__: 0 for i in MODELS}
+        self.last_ids: Dict[str, int] = dict(self.loaded_ids)
+        self.last_finish_number = 0
+        self.compact_moves = compact_moves
+
+    @classmethod
+    def load(
+        cls, db_session: scoped_session, with_games: bool = True, compact_moves: bool = False
+    ) -> "MemoryRepository":
+        """
+        Loads the repository from the database in bulk, one query per table. The loaded objects are detached from
+         the session, so the changes made in memory are not written by its commits. The decisions of the loaded games
+         are loaded with the games for their replays.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database.
+            with_games (bool): Load the games and their results, otherwise only the users, the league seasons and
+             the standings are loaded, which is enough to play the games.
+            compact_moves (bool): Store the decisions as the moves encoded on the games.
+
+        Returns:
+            MemoryRepository: Repository with the objects of the database.
+        """
+        result = cls(compact_moves)
+        for model in MODELS:
+            result.loaded_ids[model.__tablename__] = db_session.query(func.max(model.id)).scalar() or 0
+        result.last_ids = dict(result.loaded_ids)
+        result.last_finish_number = db_session.query(func.max(Game.finish_number)).scalar() or 0
+        loaded: List[Any] = []
+        for user in db_session.query(User).order_by(User.id).all():
+            result.users[user.id] = user
+            loaded.append(user)
+        for league_season in db_session.query(LeagueSeason).order_by(LeagueSeason.id).all():
+            result.league_seasons[league_season.id] = league_season
+            loaded.append(league_season)
+        for standing in db_session.query(LeagueStanding).all():
+            result.standings[standing.user_id, standing.league_season_id] = [getattr(standing, i) for i in COLUMNS]
+            result.ratings[standing.user_id, standing.league_season_id] = standing.rating
+            loaded.append(standing)
+        if with_games:
+            for game in db_session.query(Game).order_by(Game.id).all():
+                result.__add_game(game)
+                loaded.append(game)
+            for game_result in db_session.query(GameResult).order_by(GameResult.game_id, GameResult.id).all():
+                result.__add_game_result(game_result)
+                loaded.append(game_result)
+            for decision in db_session.query(GameUserDecision).order_by(GameUserDecision.id).all():
+                result.game_decisions.setdefault(decision.game_id, []).append(decision)
+                loaded.append(decision)
+        for i in loaded:
+            db_session.expunge(i)
+        return result
+
+    def snapshot(self) -> Snapshot:
+        """
+        Collects the changes since the load. The repository is snapshotted once, load a new one from the database
+         after the snapshot is written to continue.
+
+        Returns:
+            Snapshot: New rows, changes of the standings and deleted users.
+        """
+        new_games = [i for i in self.games.values() if i.id > self.loaded_ids["game"]]
+        objects: Dict[str, Iterable[Any]] = {
+            "user": (i for i in self.users.values() if i.id > self.loaded_ids["user"]),
+            "league_season": (i for i in self.league_seasons.values() if i.id > self.loaded_ids["league_season"]),
+            "game": new_games,
+            "game_result": (j for i in new_games for j in self.game_results[i.id]),
+            "game_user_decision": self.decisions,
+        }
+        return Snapshot(
+            rows={
+                name: [{column.key: getattr(i, column.key) for column in i.__table__.columns} for i in items]
+                for name, items in objects.items()
+            },
+            standings={key: tuple(values) for key, values in self.standing_changes.items()},  # type: ignore [misc]
+            ratings=dict(self.rating_changes),
+            deleted_user_ids=list(self.deleted_user_ids),
+        )
+
+    def get_user_page(
+        self, after_id: int = 0, limit: Optional[int] = None, nickname_prefix: str = "", exclude_ids: Iterable[int] = ()
+    ) -> List[UserSummaryType]:
+        excluded = set(exclude_ids)
+        # The users are kept in the order of their ids
+        users = (
+            UserSummaryType(i.id, i.nickname)
+            for i in self.users.values()
+            if i.id > after_id and i.id not in excluded and i.nickname.startswith(nickname_prefix)
+        )
+        return list(islice(users, limit))
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        return self.users.get(user_id)
+
+    def add_user(self, user: User) -> None:
+        user.id = self.__next_id("user")
+        self.users[user.id] = user
+
+    def delete_user(self, user: User) -> None:
+        del self.users[user.id]
+        if user.id <= self.loaded_ids["user"]:
+            self.deleted_user_ids.append(user.id)
+
+    def get_last_league_season(self) -> Optional[LeagueSeason]:
+        return next(reversed(self.league_seasons.values()), None)
+
+    def add_league_season(self, league_season: LeagueSeason) -> None:
+        league_season.id = self.__next_id("league_season")
+        self.league_seasons[league_season.id] = league_season
+
+    def create_game(
+        self, league_season: LeagueSeason, users: List[User], game_results: List[GameResult]
+    ) -> List[GameMetadata]:
+        game = Game(id=self.__next_id("game"), league_season_id=league_season.id)  # type: ignore [call-arg]
+        self.__add_game(game)
+        for game_result in game_results:
+            game_result.id = self.__next_id("game_result")
+            game_result.game_id = game.id
+            self.__add_game_result(game_result)
+        return [GameMetadata(game, game_result, user, league_season) for user, game_result in zip(users, game_results)]
+
+    def create_games(
+        self, league_season: LeagueSeason, games: List[Tuple[List[User], List[GameResult]]]
+    ) -> List[List[GameMetadata]]:
+        return [self.create_game(league_season, users, game_results) for users, game_results in games]
+
+    def add_decisions(self, decisions: List[GameUserDecision]) -> None:
+        for decision in decisions:
+            game = self.games.get(decision.game_id) if self.compact_moves else None
+            if game is None:
+                decision.id = self.__next_id("game_user_decision")
+                self.decisions.append(decision)
+                self.game_decisions.setdefault(decision.game_id, []).append(decision)
+                continue
+            if game.moves is None:
+                game.moves, game.first_user_id = b"", decision.user_id
+            game.moves += encode_moves(
+                [(decision.coordinate_x, decision.coordinate_y)], self.league_seasons[game.league_season_id].field_size
+            )
+
+    def finish_game(self, game_metadata: List[GameMetadata], winner_id: Optional[int]) -> None:
+        keys = [(i.User.id, i.Game.league_season_id) for i in game_metadata]
+        ratings = [self.ratings.get(key, INITIAL_RATING) for key in keys]
+        changes = get_rating_changes(ratings, [i.User.id for i in game_metadata], winner_id)
+        for i, key, rating, change in zip(game_metadata, keys, ratings, changes):
+            self.__add_standing(key, get_standing_values(i.User.id, winner_id))
+            self.ratings[key] = i.GameResult.rating = rating + change
+            self.rating_changes[key] = self.rating_changes.get(key, 0.0) + change
+        self.last_finish_number += 1
+        game_metadata[0].Game.finish_number = self.last_finish_number
+
+    def add_finished_games(self, league_season: LeagueSeason, games: List[FinishedGame]) -> List[int]:
+        result = []
+        for game in games:
+            game_metadata = self.create_game(
+                league_season,
+                [self.users[i] for i in game.user_ids],
+                [
+                    GameResult(  # type: ignore [call-arg]
+                        user_id=user_id, symbol=symbol, is_winner=user_id == game.winner_id
+                    )
+                    for user_id, symbol in zip(game.user_ids, SYMBOLS)
+                ],
+            )
+            game_id = game_metadata[0].Game.id
+            self.add_decisions(
+                [
+                    GameUserDecision(  # type: ignore [call-arg]
+                        game_id=game_id,
+                        user_id=game.user_ids[ply % 2],
+                        coordinate_x=cell // league_season.field_size,
+                        coordinate_y=cell % league_season.field_size,
+                    )
+                    for ply, cell in enumerate(game.cells)
+                ]
+            )
+            self.finish_game(game_metadata, game.winner_id)
+            result.append(game_id)
+        return result
+
+    def commit(self) -> None:
+        pass
+
+    def get_ranking(
+        self, league_season_id: int, user_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[RankingType]:
+        result = [
+            RankingType._make(
+                (
+                    self.users[_user_id].nickname,
+                    *values,
+                    self.ratings.get((_user_id, _league_season_id), INITIAL_RATING),
+                )
+            )
+            for (_user_id, _league_season_id), values in self.standings.items()
+            if _league_season_id == league_season_id
+            and _user_id in self.users
+            and (user_id is None or _user_id == user_id)
+        ]
+        result.sort(key=lambda i: (-i.rating, -i.pts, i.nickname))
+        return result[:limit] if limit else result
+
+    def get_past_games(self, league_season_id: int, page: int, page_size: int) -> List[PastGameType]:
+        game_ids = self.league_game_ids.get(league_season_id, [])
+        end = max(0, len(game_ids) - (page - 1) * page_size)
+        result = []
+        for game_id in reversed(game_ids[max(0, end - page_size - 1) : end]):
+            game_results = [i for i in self.game_results[game_id] if i.user_id in self.users]
+            winner = next((self.users[i.user_id].nickname for i in game_results if i.is_winner), None)
+            players = " vs ".join(self.users[i.user_id].nickname for i in game_results)
+            result.append(PastGameType(game_id, players, winner))
+        return result
+
+    def get_user_game_results(self, league_season_id: int, user_id: int) -> List[GameResult]:
+        return [
+            i
+            for i in self.user_game_results.get(user_id, [])
+            if self.games[i.game_id].league_season_id == league_season_id
+        ]
+
+    def get_last_game_id(self, user_id: int, league_season_id: Optional[int] = None) -> Optional[int]:
+        return next(
+            (
+                i.game_id
+                for i in reversed(self.user_game_results.get(user_id, []))
+                if league_season_id is None or self.games[i.game_id].league_season_id == league_season_id
+            ),
+            None,
+        )
+
+    def get_replay(self, game_id: int) -> Optional[GameReplay]:
+        game = self.games.get(game_id)
+        if game is None:
+            return None
+        league_season = self.league_seasons[game.league_season_id]
+        symbols = {i.user_id: i.symbol for i in self.game_results[game_id]}
+        if game.moves is not None:
+            moves = decode_replay_moves(game.moves, league_season.field_size, symbols[game.first_user_id])
+        else:
+            moves = [(symbols[i.user_id], i.coordinate_x, i.coordinate_y) for i in self.game_decisions.get(game_id, [])]
+        return GameReplay(game_id, league_season.field_size, league_season.win_length, moves)
+
+    def __next_id(self, table_name: str) -> int:
+        """
+        Gets the id of the new row of the table.
+
+        Args:
+            table_name (str): Name of the table.
+
+        Returns:
+            int: Identifier following the last one.
+        """
+        self.last_ids[table_name] += 1
+        return self.last_ids[table_name]
+
+    def __add_game(self, game: Game) -> None:
+        """
+        Indexes the game by its id and by its league season.
+
+        Args:
+            game (Game): Game object.
+        """
+        self.games[game.id] = game
+        self.game_results[game.id] = []
+        self.league_game_ids.setdefault(game.league_season_id, []).append(game.id)
+
+    def __add_game_result(self, game_result: GameResult) -> None:
+        """
+        Indexes the result of the game by its game and by its user.
+
+        Args:
+            game_result (GameResult): GameResult object.
+        """
+        self.game_results[game_result.game_id].append(game_result)
+        self.user_game_results.setdefault(game_result.user_id, []).append(game_result)
+
+    def __add_standing(self, key: StandingKey, values: StandingValues) -> None:
+        """
+        Adds the values to the standing and to its changes since the load.
+
+        Args:
+            key (StandingKey): Identifiers of the user and the league season.
+            values (StandingValues): Games, wins, losses, draws and points to add.
+        """
+        for standings in (self.standings, self.standing_changes):
+            totals = standings.setdefault(key, [0] * len(COLUMNS))
+            for i, value in enumerate(values):
+                totals[i] += value
+
+
+def write_snapshot(db_session: scoped_session, snapshot: Snapshot) -> Dict[str, int]:
+    """
+    Writes the snapshot of the memory repository to the database in bulk, one statement per table. The ids of the new
+     rows follow the last ones in the database and the foreign keys of the new rows are remapped to them, and so do
+     the finish numbers of the new games. The changes are committed by the caller, so several snapshots can be
+     written in one transaction. The rating changes of every snapshot are computed from the ratings at its load,
+     so the ratings are rebuilt by rebuild_league_ratings after writing several snapshots.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        snapshot (Snapshot): Changes of the memory repository.
+
+    Returns:
+        Dict[str, int]: Number of the written rows by the names of the tables.
+    """
+    id_maps: Dict[str, Dict[int, int]] = {}
+    result: Dict[str, int] = {}
+    for model in MODELS:
+        name = model.__tablename__
+        rows = snapshot.rows.get(name, [])
+        last_id = db_session.query(func.max(model.id)).scalar() or 0
+        id_maps[name] = {row["id"]: last_id + i for i, row in enumerate(rows, 1)}
+        rows = [
+            {
+                **row,
+                "id": id_maps[name][row["id"]],
+                **{
+                    column: id_maps[table].get(row[column], row[column])
+                    for column, table in FOREIGN_KEYS.items()
+                    if column in row
+                },
+            }
+            for row in rows
+        ]
+        if name == "game":
+            rows = renumber_finished_games(db_session, rows)
+        if rows:
+            db_session.execute(model.__table__.insert(), rows)  # pylint: disable=no-member
+        result[name] = len(rows)
+    add_league_standings(
+        db_session,
+        {
+            (id_maps["user"].get(user_id, user_id), id_maps["league_season"].get(league_season_id, league_season_id)): (
+                values
+            )
+            for (user_id, league_season_id), values in snapshot.standings.items()
+        },
+    )
+    # The changes of the ratings are added to the ratings of the database, which were the starting ones of the
+    #  repository unless another one was written since its load
+    write_league_ratings(
+        db_session,
+        {
+            (id_maps["user"].get(user_id, user_id), id_maps["league_season"].get(league_season_id, league_season_id)): (
+                change
+            )
+            for (user_id, league_season_id), change in snapshot.ratings.items()
+        },
+        add=True,
+    )
+    result["league_standing"] = len(snapshot.standings)
+    if snapshot.deleted_user_ids:
+        db_session.query(User).filter(User.id.in_(snapshot.deleted_user_ids)).delete(synchronize_session=False)
+    result["deleted_user"] = len(snapshot.deleted_user_ids)
+    return result
+
+
+def renumber_finished_games(db_session: scoped_session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Renumbers the finished games of the snapshot following the last finish number in the database, keeping the
+     order they were finished in the repository.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        rows (List[Dict[str, Any]]): New rows of the games.
+
+    Returns:
+        List[Dict[str, Any]]: Rows of the games with the new finish numbers.
+    """
+    last_number = db_session.query(func.max(Game.finish_number)).scalar() or 0
+    numbers = sorted(row["finish_number"] for row in rows if row["finish_number"] is not None)
+    number_map = {number: last_number + i for i, number in enumerate(numbers, 1)}
+    return [{**row, "finish_number": number_map.get(row["finish_number"])} for row in rows]
@@ -0,0 +1,479 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, case, func
+from sqlalchemy.orm import Query, scoped_session
+
+from src.components.game.batch import SYMBOLS
+from src.components.game.model import PastGameType, RankingType, UserSummaryType
+from src.components.game.replay import GameReplay, get_last_game_id, get_replay
+from src.database.model.game import (
+    Game,
+    GameResult,
+    GameUserDecision,
+    LeagueSeason,
+    LeagueStanding,
+)
+from src.database.model.user import User
+from src.database.moves import encode_moves
+from src.database.rating import number_finished_games, update_league_ratings
+from src.database.repository.base import FinishedGame, GameMetadata
+from src.database.standing import update_league_standings
+
+
+class SqlAlchemyRepository:
+    """
+    Repository storing the objects in the database through the SQLAlchemy session.
+
+    Attributes:
+        db_session (scoped_session): Session of connection to the database, through this object all interactions with
+         the database occur.
+        compact_moves (bool): Store the decisions of the games created by the repository as the moves encoded on
+         their game rows instead of the game_user_decision rows.
+        field_sizes (Dict[int, int]): Field sizes of the games created by the repository in the compact mode by their
+         ids.
+        moves (Dict[int, Tuple[int, bytearray]]): First user and encoded moves of the unfinished games in the compact
+         mode by their ids.
+        changed_game_ids (Set[int]): Identifiers of the games whose moves are written by the next commit.
+        finished_game_ids (Set[int]): Identifiers of the finished games dropped from the moves after the next commit.
+
+    Methods:
+        __init__(self, db_session, compact_moves=False):
+            Initializes a SqlAlchemyRepository instance.
+        get_user_page(self, after_id=0, limit=None, nickname_prefix="", exclude_ids=()) -> List[UserSummaryType]:
+            Gets the page of the users ordered by id, starting after the last user of the previous page.
+        get_user(self, user_id) -> Optional[User]:
+            Gets the user.
+        add_user(self, user) -> None:
+            Saves the new user.
+        delete_user(self, user) -> None:
+            Deletes the user.
+        get_last_league_season(self) -> Optional[LeagueSeason]:
+            Gets the last league season.
+        add_league_season(self, league_season) -> None:
+            Saves the new league season.
+        create_game(self, league_season, users, game_results) -> List[GameMetadata]:
+            Saves the new game with the results of its players.
+        create_games(self, league_season, games) -> List[List[GameMetadata]]:
+            Saves the new games with the results of their players together.
+        add_decisions(self, decisions) -> None:
+            Adds the decisions of the game to be saved by the next commit.
+        finish_game(self, game_metadata, winner_id) -> None:
+            Adds the results of the finished game, the standings and the ratings of its players to be saved by the next
+             commit.
+        add_finished_games(self, league_season, games) -> List[int]:
+            Adds the finished games with their moves, results, standings and ratings to be saved by the next commit.
+        commit(self) -> None:
+            Saves the collected changes of the games.
+        get_ranking(self, league_season_id, user_id=None, limit=None) -> List[RankingType]:
+            Gets the ranking of the players in the league season ordered by rating.
+        query_past_games(self, league_season_id) -> Query:
+            Builds the query of the games in the league season, newest games first.
+        get_past_games(self, league_season_id, page, page_size) -> List[PastGameType]:
+            Gets the page of the games in the league season, newest games first.
+        get_user_game_results(self, league_season_id, user_id) -> List[GameResult]:
+            Gets the results of the user in the league season in the order of the games.
+        get_last_game_id(self, user_id, league_season_id=None) -> Optional[int]:
+            Gets the last game of the user.
+        get_replay(self, game_id) -> Optional[GameReplay]:
+            Replays the game from its stored moves.
+        __get_prefix_end(prefix) -> str:
+            Gets the first string after all strings starting with the prefix.
+        __insert_games(self, league_season, count) -> List[int]:
+            Inserts the rows of the new games.
+        __supports_returning(self) -> bool:
+            Checks whether the dialect of the database returns the ids of the inserted rows.
+        __write_moves(self) -> None:
+            Writes the changed moves of the games.
+    """
+
+    def __init__(self, db_session: scoped_session, compact_moves: bool = False) -> None:
+        """
+        Initializes a SqlAlchemyRepository instance.
+
+        Args:
+            db_session (scoped_session): Session of connection to the database.
+            compact_moves (bool): Store the decisions as the moves encoded on the game rows.
+        """
+        self.db_session = db_session
+        self.compact_moves = compact_moves
+        self.field_sizes: Dict[int, int] = {}
+        self.moves: Dict[int, Tuple[int, bytearray]] = {}
+        self.changed_game_ids: Set[int] = set()
+        self.finished_game_ids: Set[int] = set()
+
+    def get_user_page(
+        self, after_id: int = 0, limit: Optional[int] = None, nickname_prefix: str = "", exclude_ids: Iterable[int] = ()
+    ) -> List[UserSummaryType]:
+        """
+        Gets the page of the users ordered by id, starting after the last user of the previous page. The page is
+         found by the primary key instead of an offset, so the later pages are read as fast as the first one, and the
+         nickname prefix is a range of the index of the nicknames. Only the ids and the nicknames are read, the users
+         are loaded by get_user when they are chosen.
+
+        Args:
+            after_id (int): Identifier of the last user of the previous page, 0 for the first page.
+            limit (Optional[int]): Number of the users on the page, all following users by default.
+            nickname_prefix (str): Beginning of the nicknames of the users, all users by default.
+            exclude_ids (Iterable[int]): Identifiers of the users to skip.
+
+        Returns:
+            List[UserSummaryType]: Ids and nicknames of the users.
+        """
+        query = self.db_session.query(User.id, User.nickname).filter(User.id > after_id)
+        if nickname_prefix:
+            query = query.filter(
+                User.nickname >= nickname_prefix, User.nickname < self.__get_prefix_end(nickname_prefix)
+            )
+        exclude_ids = list(exclude_ids)
+        if exclude_ids:
+            query = query.filter(User.id.notin_(exclude_ids))
+        result: List[UserSummaryType] = query.order_by(User.id).limit(limit).all()
+        return result
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        result: Optional[User] = self.db_session.get(User, user_id)
+        return result
+
+    def add_user(self, user: User) -> None:
+        self.db_session.add(user)
+        self.db_session.commit()
+
+    def delete_user(self, user: User) -> None:
+        self.db_session.delete(user)
+        self.db_session.commit()
+
+    def get_last_league_season(self) -> Optional[LeagueSeason]:
+        result: Optional[LeagueSeason] = (
+            self.db_session.query(LeagueSeason).order_by(LeagueSeason.id.desc()).limit(1).one_or_none()
+        )
+        return result
+
+    def add_league_season(self, league_season: LeagueSeason) -> None:
+        self.db_session.add(league_season)
+        self.db_session.commit()
+
+    def create_game(
+        self, league_season: LeagueSeason, users: List[User], game_results: List[GameResult]
+    ) -> List[GameMetadata]:
+        return self.create_games(league_season, [(users, game_results)])[0]
+
+    def create_games(
+        self, league_season: LeagueSeason, games: List[Tuple[List[User], List[GameResult]]]
+    ) -> List[List[GameMetadata]]:
+        """
+        Saves the new games with the results of their players in one transaction through the Core statements, so no
+         object is flushed, refreshed or read back. The games are inserted by one statement returning their ids if
+         the dialect supports RETURNING, otherwise one by one, and the results of all games are inserted by one
+         executemany statement. The metadata is built from the objects in hand, the results stay out of the session
+         and are updated by finish_game.
+
+        Args:
+            league_season (LeagueSeason): League season of the games.
+            games (List[Tuple[List[User], List[GameResult]]]): Players of every game and their results in the same
+             order, the game is assigned to the results.
+
+        Returns:
+            List[List[GameMetadata]]: Objects of the players of every game.
+        """
+        game_ids = self.__insert_games(league_season, len(games))
+        result = []
+        for game_id, (users, game_results) in zip(game_ids, games):
+            if self.compact_moves:
+                self.field_sizes[game_id] = league_season.field_size
+            game = Game(id=game_id, league_season_id=league_season.id)  # type: ignore [call-arg]
+            for game_result in game_results:
+                game_result.game_id = game_id
+            result.append(
+                [GameMetadata(game, game_result, user, league_season) for user, game_result in zip(users, game_results)]
+            )
+        self.db_session.execute(
+            GameResult.__table__.insert(),  # type: ignore [attr-defined] # pylint: disable=no-member
+            [
+                {"game_id": i.GameResult.game_id, "user_id": i.GameResult.user_id, "symbol": i.GameResult.symbol}
+                for game_metadata in result
+                for i in game_metadata
+            ],
+        )
+        self.db_session.commit()
+        return result
+
+    def add_decisions(self, decisions: List[GameUserDecision]) -> None:
+        """
+        Adds the decisions of the game to be saved by the next commit. In the compact mode the decisions of the games
+         created by the repository are appended to their encoded moves, the other decisions are added as rows.
+
+        Args:
+            decisions (List[GameUserDecision]): GameUserDecision objects.
+        """
+        rows = []
+        for decision in decisions:
+            field_size = self.field_sizes.get(decision.game_id)
+            if field_size is None:
+                rows.append(decision)
+                continue
+            _, moves = self.moves.setdefault(decision.game_id, (decision.user_id, bytearray()))
+            moves += encode_moves([(decision.coordinate_x, decision.coordinate_y)], field_size)
+            self.changed_game_ids.add(decision.game_id)
+        self.db_session.add_all(rows)
+
+    def finish_game(self, game_metadata: List[GameMetadata], winner_id: Optional[int]) -> None:
+        """
+        Adds the results of the finished game, the standings of its players and their ratings to be saved by the
+         next commit. The ratings of the players after the game are written on their results too, and the game gets
+         the next finish number.
+
+        Args:
+            game_metadata (List[GameMetadata]): Objects of the players of the game.
+            winner_id (Optional[int]): Identifier of the winner or None for a draw.
+        """
+        league_season_id = game_metadata[0].Game.league_season_id
+        user_ids = [i.User.id for i in game_metadata]
+        update_league_standings(self.db_session, league_season_id, user_ids, winner_id)
+        ratings = update_league_ratings(self.db_session, league_season_id, user_ids, winner_id)
+        number_finished_games(self.db_session, [game_metadata[0].Game.id])
+        game_result_table = GameResult.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+        for i in game_metadata:
+            i.GameResult.rating = ratings[i.User.id]
+        self.db_session.execute(
+            game_result_table.update()
+            .where(
+                game_result_table.c.game_id == bindparam("_game_id"),
+                game_result_table.c.user_id == bindparam("_user_id"),
+            )
+            .values(is_winner=bindparam("is_winner"), rating=bindparam("rating")),
+            [
+                {
+                    "_game_id": i.GameResult.game_id,
+                    "_user_id": i.GameResult.user_id,
+                    "is_winner": i.GameResult.is_winner,
+                    "rating": i.GameResult.rating,
+                }
+                for i in game_metadata
+            ],
+        )
+        self.finished_game_ids.add(game_metadata[0].Game.id)
+
+    def add_finished_games(self, league_season: LeagueSeason, games: List[FinishedGame]) -> List[int]:
+        """
+        Adds the finished games to be saved by the next commit through the Core statements: the games are inserted
+         like by create_games, the results with their ratings by one executemany statement and the moves by another
+         one, as game_user_decision rows or encoded on the game rows in the compact mode. The standings and the
+         ratings are updated in the order of the games.
+
+        Args:
+            league_season (LeagueSeason): League season of the games.
+            games (List[FinishedGame]): Finished games.
+
+        Returns:
+            List[int]: Identifiers of the games in the same order.
+        """
+        game_ids = self.__insert_games(league_season, len(games))
+        field_size = league_season.field_size
+        game_results: List[Dict[str, Any]] = []
+        decisions: List[Dict[str, Any]] = []
+        for game_id, game in zip(game_ids, games):
+            update_league_standings(self.db_session, league_season.id, game.user_ids, game.winner_id)
+            ratings = update_league_ratings(self.db_session, league_season.id, game.user_ids, game.winner_id)
+            game_results.extend(
+                {
+                    "game_id": game_id,
+                    "user_id": user_id,
+                    "symbol": symbol,
+                    "is_winner": user_id == game.winner_id,
+                    "rating": ratings[user_id],
+                }
+                for user_id, symbol in zip(game.user_ids, SYMBOLS)
+            )
+            moves = [divmod(cell, field_size) for cell in game.cells]
+            if self.compact_moves:
+                self.moves[game_id] = (game.user_ids[0], bytearray(encode_moves(moves, field_size)))
+                self.changed_game_ids.add(game_id)
+                self.finished_game_ids.add(game_id)
+                continue
+            decisions.extend(
+                {
+                    "game_id": game_id,
+                    "user_id": game.user_ids[ply % 2],
+                    "coordinate_x": coordinate_x,
+                    "coordinate_y": coordinate_y,
+                }
+                for ply, (coordinate_x, coordinate_y) in enumerate(moves)
+            )
+        number_finished_games(self.db_session, game_ids)
+        self.db_session.execute(
+            GameResult.__table__.insert(), game_results  # type: ignore [attr-defined] # pylint: disable=no-member
+        )
+        if decisions:
+            self.db_session.execute(
+                GameUserDecision.__table__.insert(),  # type: ignore [attr-defined] # pylint: disable=no-member
+                decisions,
+            )
+        return game_ids
+
+    def commit(self) -> None:
+        self.__write_moves()
+        self.db_session.commit()
+        for game_id in self.finished_game_ids:
+            self.field_sizes.pop(game_id, None)
+            self.moves.pop(game_id, None)
+        self.finished_game_ids.clear()
+
+    def get_last_game_id(self, user_id: int, league_season_id: Optional[int] = None) -> Optional[int]:
+        return get_last_game_id(self.db_session, user_id, league_season_id)
+
+    def get_replay(self, game_id: int) -> Optional[GameReplay]:
+        return get_replay(self.db_session, game_id)
+
+    @staticmethod
+    def __get_prefix_end(prefix: str) -> str:
+        """
+        Gets the first string after all strings starting with the prefix, so the prefix is searched by a range of the
+         index instead of LIKE, which SQLite does not match against an index of a case-sensitive column.
+
+        Args:
+            prefix (str): Non-empty beginning of the strings.
+
+        Returns:
+            str: The prefix with the last character incremented.
+        """
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def __supports_returning(self) -> bool:
+        """
+        Checks whether the dialect of the database returns the ids of the rows inserted by one statement, e.g.
+         PostgreSQL. The dialect of SQLite supports RETURNING since SQLAlchemy 2.0.
+
+        Returns:
+            bool: True if the inserts with RETURNING are supported.
+        """
+        dialect = self.db_session.bind.dialect  # type: ignore [union-attr]
+        return bool(getattr(dialect, "insert_returning", False) or getattr(dialect, "full_returning", False))
+
+    def __insert_games(self, league_season: LeagueSeason, count: int) -> List[int]:
+        """
+        Inserts the rows of the new games by one statement returning their ids if the dialect supports RETURNING,
+         otherwise one by one.
+
+        Args:
+            league_season (LeagueSeason): League season of the games.
+            count (int): Number of the games.
+
+        Returns:
+            List[int]: Identifiers of the games.
+        """
+        game_table = Game.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+        game_rows = [{"league_season_id": league_season.id} for _ in range(count)]
+        if self.__supports_returning():
+            # The rows of the games are equal, so the order of the returned ids does not matter
+            return list(
+                self.db_session.execute(game_table.insert().values(game_rows).returning(game_table.c.id)).scalars()
+            )
+        return [self.db_session.execute(game_table.insert(), row).inserted_primary_key[0] for row in game_rows]
+
+    def __write_moves(self) -> None:
+        """
+        Writes the moves of the games changed since the last commit by one executemany statement. The whole moves of
+         a game are written every time, the concatenation of the blobs by SQLite returns a text.
+        """
+        if not self.changed_game_ids:
+            return
+        game_table = Game.__table__  # type: ignore [attr-defined] # pylint: disable=no-member
+        self.db_session.execute(
+            game_table.update()
+            .where(game_table.c.id == bindparam("_id"))
+            .values(moves=bindparam("moves"), first_user_id=bindparam("first_user_id")),
+            [
+                {"_id": game_id, "moves": bytes(self.moves[game_id][1]), "first_user_id": self.moves[game_id][0]}
+                for game_id in sorted(self.changed_game_ids)
+            ],
+        )
+        self.changed_game_ids.clear()
+
+    def get_ranking(
+        self, league_season_id: int, user_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[RankingType]:
+        """
+        Gets the ranking of the players in the league season. The ranking is read from the league standings
+         maintained with every finished game, one row per user ordered by rating, so only the rows displayed
+         are transferred.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+            user_id (Optional[int]): User object identifier to get the ranking for a specific user.
+            limit (Optional[int]): Number of the top players by rating, all players by default.
+
+        Returns:
+            List[RankingType]: Nickname, total games, wins, losses, draws, points and rating of the users.
+        """
+        query = (
+            self.db_session.query(
+                User.nickname,
+                LeagueStanding.games.label("total_games"),
+                LeagueStanding.wins.label("win"),
+                LeagueStanding.losses.label("loss"),
+                LeagueStanding.draws.label("draw"),
+                LeagueStanding.points.label("pts"),
+                LeagueStanding.rating,
+            )
+            .join(LeagueStanding, LeagueStanding.user_id == User.id)
+            .filter(LeagueStanding.league_season_id == league_season_id)
+            .order_by(LeagueStanding.rating.desc(), LeagueStanding.points.desc(), User.nickname.asc())
+        )
+        if user_id is not None:
+            query = query.filter(User.id == user_id)
+        if limit:
+            query = query.limit(limit)
+        result: List[RankingType] = query.all()
+        return result
+
+    def query_past_games(self, league_season_id: int) -> Query:
+        """
+        Builds the query of the games in the league season, newest games first. The players and the winner of every
+         game are grouped by the database in the same query, so only the rows of the page are transferred.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+
+        Returns:
+            Query: Id, nicknames of the players and nickname of the winner of the games.
+        """
+        return (
+            self.db_session.query(
+                Game.id,
+                func.group_concat(User.nickname, " vs ").label("players"),
+                func.max(case((GameResult.is_winner.is_(True), User.nickname))).label("winner"),
+            )
+            .join(GameResult, GameResult.game_id == Game.id)
+            .join(User, User.id == GameResult.user_id)
+            .filter(Game.league_season_id == league_season_id)
+            .group_by(Game.id)
+            .order_by(Game.id.desc())
+        )
+
+    def get_past_games(self, league_season_id: int, page: int, page_size: int) -> List[PastGameType]:
+        """
+        Gets the page of the games in the league season, newest games first, see query_past_games.
+
+        Args:
+            league_season_id (int): LeagueSeason object identifier.
+            page (int): Number of the page starting from 1.
+            page_size (int): Number of the games on the page, one more game is fetched to detect the next page.
+
+        Returns:
+            List[PastGameType]: Id, nicknames of the players and nickname of the winner of the games.
+        """
+        result: List[PastGameType] = (
+            self.query_past_games(league_season_id).limit(page_size + 1).offset((page - 1) * page_size).all()
+        )
+        return result
+
+    def get_user_game_results(self, league_season_id: int, user_id: int) -> List[GameResult]:
+        result: List[GameResult] = (
+            self.db_session.query(GameResult)
+            .join(Game, Game.id == GameResult.game_id)
+            .filter(Game.league_season_id == league_season_id)
+            .filter(GameResult.user_id == user_id)
+            .order_by(GameResult.game_id.asc())
+            .all()
+        )
+        return result
@@ -0,0 +1,215 @@
+"""
+Standings of the players in the league seasons.
+
+The league_standing table keeps the totals of every user in every league season. It is updated incrementally in
+ the transaction summarising the game, so the ranking is read in O(users) instead of aggregating all results of
+ the season. The table can be rebuilt from the game results, e.g. to check its consistency.
+
+The standings are checked and rebuilt by the command:
+    python -m src.database.standing --check
+    python -m src.database.standing
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import click
+from sqlalchemy import case, delete, exists, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased, scoped_session
+from sqlalchemy.sql import Select
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.game import Game, GameResult, LeagueStanding
+from src.database.rating import rebuild_league_ratings
+from src.settings import get_settings
+
+WIN_POINTS = 2
+LOSS_POINTS = 1
+DRAW_POINTS = 1
+COLUMNS = ("games", "wins", "losses", "draws", "points")
+
+# user_id, league_season_id
+StandingKey = Tuple[int, int]
+# games, wins, losses, draws, points
+StandingValues = Tuple[int, int, int, int, int]
+
+
+def get_standing_values(user_id: int, winner_id: Optional[int]) -> StandingValues:
+    """
+    Gets the change of the standing of the player by the result of the game.
+
+    Args:
+        user_id (int): Identifier of the user who played the game.
+        winner_id (Optional[int]): Identifier of the winner or None for a draw.
+
+    Returns:
+        StandingValues: Games, wins, losses, draws and points to add to the standing.
+    """
+    is_winner = user_id == winner_id
+    is_draw = winner_id is None
+    return (
+        1,
+        int(is_winner),
+        int(not is_winner and not is_draw),
+        int(is_draw),
+        WIN_POINTS if is_winner else DRAW_POINTS if is_draw else LOSS_POINTS,
+    )
+
+
+def update_league_standings(
+    db_session: scoped_session, league_season_id: int, user_ids: Iterable[int], winner_id: Optional[int]
+) -> None:
+    """
+    Adds the result of the game to the standings of its players. The changes are committed by the caller together
+     with the results of the game.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (int): LeagueSeason object identifier.
+        user_ids (Iterable[int]): Identifiers of the users who played the game.
+        winner_id (Optional[int]): Identifier of the winner or None for a draw.
+    """
+    add_league_standings(
+        db_session, {(user_id, league_season_id): get_standing_values(user_id, winner_id) for user_id in user_ids}
+    )
+
+
+def add_league_standings(db_session: scoped_session, standings: Mapping[StandingKey, StandingValues]) -> None:
+    """
+    Adds the values to the standings in one statement. The rows are upserted by the database, so the concurrent
+     games of the same players do not overwrite each other.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        standings (Mapping[StandingKey, StandingValues]): Values to add by the user and the league season.
+    """
+    if not standings:
+        return
+    statement = sqlite_insert(LeagueStanding)
+    statement = statement.on_conflict_do_update(
+        index_elements=[LeagueStanding.user_id, LeagueStanding.league_season_id],
+        set_={name: getattr(LeagueStanding, name) + getattr(statement.excluded, name) for name in COLUMNS},
+    )
+    db_session.execute(
+        statement,
+        [
+            {"user_id": user_id, "league_season_id": league_season_id, **dict(zip(COLUMNS, values))}
+            for (user_id, league_season_id), values in standings.items()
+        ],
+    )
+
+
+def select_league_standings(league_season_id: Optional[int] = None) -> Select:
+    """
+    Builds the query aggregating the standings from the results of the finished games.
+
+    Args:
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        Select: Query of the user_id, league_season_id, games, wins, losses, draws and points columns.
+    """
+    is_winner = GameResult.is_winner.is_(True)
+    winner_result = aliased(GameResult)
+    is_draw = ~exists().where(winner_result.game_id == GameResult.game_id, winner_result.is_winner.is_(True))
+    query = (
+        select(
+            GameResult.user_id,
+            Game.league_season_id,
+            func.count(GameResult.id).label("games"),
+            func.sum(case((is_winner, 1), else_=0)).label("wins"),
+            func.sum(case((is_winner, 0), (is_draw, 0), else_=1)).label("losses"),
+            func.sum(case((is_draw, 1), else_=0)).label("draws"),
+            func.sum(case((is_winner, WIN_POINTS), (is_draw, DRAW_POINTS), else_=LOSS_POINTS)).label("points"),
+        )
+        .select_from(GameResult)
+        .join(Game, Game.id == GameResult.game_id)
+        .where(GameResult.is_winner.isnot(None), Game.league_season_id.isnot(None))
+        .group_by(GameResult.user_id, Game.league_season_id)
+    )
+    if league_season_id is not None:
+        query = query.where(Game.league_season_id == league_season_id)
+    return query
+
+
+def check_league_standings(
+    db_session: scoped_session, league_season_id: Optional[int] = None
+) -> List[Tuple[StandingKey, Optional[StandingValues], Optional[StandingValues]]]:
+    """
+    Compares the stored standings with the ones aggregated from the game results.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        List: Keys of the inconsistent standings with the stored and the aggregated values, None for a missing row.
+    """
+    stored_query = select(
+        LeagueStanding.user_id,
+        LeagueStanding.league_season_id,
+        *(getattr(LeagueStanding, name) for name in COLUMNS),
+    )
+    if league_season_id is not None:
+        stored_query = stored_query.where(LeagueStanding.league_season_id == league_season_id)
+    stored: Dict[StandingKey, StandingValues] = {
+        (row[0], row[1]): tuple(row[2:]) for row in db_session.execute(stored_query)  # type: ignore [misc]
+    }
+    aggregated: Dict[StandingKey, StandingValues] = {
+        (row[0], row[1]): tuple(row[2:])  # type: ignore [misc]
+        for row in db_session.execute(select_league_standings(league_season_id))
+    }
+    return [
+        (key, stored.get(key), aggregated.get(key))
+        for key in sorted(stored.keys() | aggregated.keys())
+        if stored.get(key) != aggregated.get(key)
+    ]
+
+
+def rebuild_league_standings(db_session: scoped_session, league_season_id: Optional[int] = None) -> int:
+    """
+    Recomputes the standings from the game results in one transaction, the ratings of the new standings are replayed
+     from the same results.
+
+    Args:
+        db_session (scoped_session): Session of connection to the database.
+        league_season_id (Optional[int]): LeagueSeason object identifier, all league seasons by default.
+
+    Returns:
+        int: Number of the stored standings.
+    """
+    delete_statement = delete(LeagueStanding)
+    if league_season_id is not None:
+        delete_statement = delete_statement.where(LeagueStanding.league_season_id == league_season_id)
+    db_session.execute(delete_statement)
+    result = db_session.execute(
+        insert(LeagueStanding).from_select(
+            ["user_id", "league_season_id", *COLUMNS], select_league_standings(league_season_id)
+        )
+    )
+    rebuild_league_ratings(db_session, league_season_id)
+    return int(result.rowcount)
+
+
+@click.command()
+@click.option("--db-url", default=None, help="Database to process, the game database by default.")
+@click.option("--league-season-id", default=None, type=int, help="League season to process, all by default.")
+@click.option("--check", is_flag=True, help="Only report the inconsistent standings.")
+def main(db_url: Optional[str], league_season_id: Optional[int], check: bool) -> None:
+    settings = get_settings()
+    db_engine = make_engine({**settings, "db_url": db_url or settings["db_url"]})
+    db_session = make_session(db_engine)
+    inconsistencies = check_league_standings(db_session, league_season_id)
+    for (user_id, _league_season_id), stored, aggregated in inconsistencies:
+        click.echo(
+            f"User {user_id} in league season {_league_season_id}: stored {stored}, aggregated {aggregated} "
+            f"({', '.join(COLUMNS)})"
+        )
+    click.echo(f"{len(inconsistencies)} inconsistent standings were found")
+    if not check:
+        click.echo(f"{rebuild_league_standings(db_session, league_season_id)} standings were rebuilt")
+    delete_session(db_session)
+    db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Protocol
+from typing import Dict, List, Optional, Protocol, Tuple, Type
 
 import click
 
@@ -18,16 +18,22 @@ class BaseHandler:
     Attributes:
         current_handler (Handler): The current handler associated with the application menu.
         routes (Handler): Hierarchical structure of handlers corresponding to the structure of the application menu.
+        executors (Dict[Tuple[Type[BaseController], str], Executor]): Bound public methods of the controllers by their
+         components and names.
 
     Methods:
         __init__(self, controllers_registry, routes):
             Initializes a BaseHandler instance.
         run(self, handler_list=None) -> None:
             Initializes the application menu and handles transitions between screens.
+        __build_executors(self) -> Dict[Tuple[Type[BaseController], str], Executor]:
+            Builds the dispatch table of the methods of the controllers.
+        __check_routes(self) -> None:
+            Checks that every handler of the routes has a method in the dispatch table.
         __get_handler_index(self) -> int:
             Gets the ordinal number of the menu item selected by the user.
-        __get_executor(self) -> Callable:
-            Gets the handler method based on the current handler's component and method.
+        __get_executor(self, handler) -> Callable:
+            Gets the handler method based on the handler's component and method.
         __show_menu_labels_or_define_handler(self, handler_list: List[Handler]) -> None:
             Displays menu labels or defines the handler based on the provided list of handlers.
         __choose_menu_rendering_method(self) -> None:
@@ -37,18 +43,25 @@ class BaseHandler:
 
     current_handler: Handler
     routes: Handler
+    executors: Dict[Tuple[Type[BaseController], str], Executor]
 
     def __init__(self, controllers_registry: List[BaseController], routes: Handler) -> None:
         """
-        Initializes a BaseHandler instance.
+        Initializes a BaseHandler instance. The methods of the controllers are looked up once, so a handler whose
+         component or method does not exist fails here instead of when its menu item is chosen.
 
         Args:
             controllers_registry (List[ConcreteController]): Business Objects controller application entities.
             routes (Handler): Hierarchical structure of handlers corresponding to the structure of the application menu.
+
+        Raises:
+            AttributeError: A handler of the routes refers to a component or a method which does not exist.
         """
         self.controllers_registry = controllers_registry
         self.routes = routes
         self.current_handler = self.routes
+        self.executors = self.__build_executors()
+        self.__check_routes()
 
     def run(self, handler_list: Optional[List[Handler]] = None) -> None:
         """
@@ -75,6 +88,35 @@ class BaseHandler:
             else:
                 self.run(self.current_handler.parent.children)
 
+    def __build_executors(self) -> Dict[Tuple[Type[BaseController], str], Executor]:
+        """
+        Builds the dispatch table of the public methods of the controllers, the dynamic handlers created by the
+         controllers are dispatched by the same table.
+
+        Returns:
+            Dict[Tuple[Type[BaseController], str], Executor]: Bound methods by the components and the method names.
+        """
+        result = {}
+        for controller in self.controllers_registry:
+            for name in dir(controller.__class__):
+                # The properties are skipped without being evaluated
+                if not name.startswith("_") and callable(getattr(controller.__class__, name)):
+                    result[controller.__class__, name] = getattr(controller, name)
+        return result
+
+    def __check_routes(self) -> None:
+        """
+        Checks that every handler of the routes has a method in the dispatch table.
+
+        Raises:
+            AttributeError: A handler refers to a component or a method which does not exist.
+        """
+        handlers = [self.routes]
+        while handlers:
+            handler = handlers.pop()
+            self.__get_executor(handler)
+            handlers.extend(handler.children)
+
     @staticmethod
     def __get_handler_index() -> Optional[int]:
         """
@@ -89,30 +131,21 @@ class BaseHandler:
             result = int(raw_menu_item)
         return result
 
-    def __get_executor(self) -> Executor:
+    def __get_executor(self, handler: Handler) -> Executor:
         """
-        This method is required to get a handler. In the first step, we get
-         the controller from the registry, initialized controller objects,
-         then we get a method of this object and return it to be called
+        This method is required to get a handler. The bound method of the
+         controller is taken from the dispatch table built at the start,
+         so it costs one lookup whatever the number of the controllers
 
+        :param handler: Handler whose method is called
         :return: Method object
         """
-        result = next(
-            (
-                controller
-                for controller in self.controllers_registry
-                if controller.__class__.__name__ == self.current_handler.component.__name__
-            ),
-            None,
-        )
-        if result:
-            executor: Optional[Executor] = getattr(result, self.current_handler.method)
-            if executor is not None:
-                return executor
-            raise AttributeError(
-                f"Method {self.current_handler.method}  in Component {self.current_handler.component} does not exist"
-            )
-        raise AttributeError(f"Component {self.current_handler.component} does not exist")
+        executor = self.executors.get((handler.component, handler.method))
+        if executor is not None:
+            return executor
+        if not any(i.__class__ is handler.component for i in self.controllers_registry):
+            raise AttributeError(f"Component {handler.component} does not exist")
+        raise AttributeError(f"Method {handler.method}  in Component {handler.component} does not exist")
 
     def __show_menu_labels_or_define_handler(self, handler_list: Optional[List[Handler]]) -> None:
         """
@@ -144,7 +177,7 @@ class BaseHandler:
         The basis of all this is the choice of the request method for the next
          handler.
         """
-        response = self.__get_executor()(self.current_handler.parent, **self.current_handler.kwargs)
+        response = self.__get_executor(self.current_handler)(self.current_handler.parent, **self.current_handler.kwargs)
         if response.dynamic_menu_items:
             self.run(response.dynamic_menu_items)
         elif response.parent:
@@ -0,0 +1,91 @@
+"""
+Settings of the application.
+
+The default settings are overridden by the [database] section of the config file settings.ini in the working
+ directory and then by the environment variables named as the settings in upper case with the TIC_TAC_TOE_ prefix,
+ e.g.:
+    TIC_TAC_TOE_DB_URL=sqlite:////tmp/db python run.py
+"""
+import configparser
+import os
+from typing import Any, Dict, Mapping, Optional
+
+CONFIG_PATH = "settings.ini"
+CONFIG_SECTION = "database"
+ENVIRONMENT_PREFIX = "TIC_TAC_TOE_"
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "db_url": "sqlite:///src/database/db",
+    "db_echo_flag": False,
+    "db_echo_pool_flag": False,
+    "db_pool_recycle": 3600,
+    "db_pool_pre_ping": True,
+    # One of "null", "queue" or "static", see src.database.POOL_CLASSES
+    "db_pool": "queue",
+    "db_pool_size": 5,
+    # SQLite pragmas applied to every new connection, an empty value keeps the default of SQLite
+    "db_journal_mode": "WAL",
+    "db_synchronous": "NORMAL",
+    # Negative value is the size in KiB, i.e. 64 MiB of the page cache per connection
+    "db_cache_size": -65536,
+    "db_mmap_size": 268435456,
+    "db_busy_timeout": 5000,
+    # Store the moves of the new games encoded on their game rows instead of the game_user_decision rows
+    "db_compact_moves": False,
+    # Buffer the decisions of the games in memory and journal them instead of committing every one of them
+    "db_write_behind": False,
+    # Number of the buffered decisions committed together in the write-behind mode, 0 commits them once at the end of
+    #  the game
+    "db_flush_every": 0,
+    # File the log of the application is appended to, e.g. the search statistics of the computer moves, an empty value
+    #  disables the log
+    "log_path": "",
+}
+
+
+def parse_setting(name: str, raw_value: str) -> Any:
+    """
+    Converts the raw value of the setting to the type of its default value.
+
+    Args:
+        name (str): Name of the setting.
+        raw_value (str): Value from the config file or the environment.
+
+    Returns:
+        Any: Value of the setting.
+    """
+    default = DEFAULT_SETTINGS.get(name)
+    if isinstance(default, bool):
+        return raw_value.strip().lower() in TRUE_VALUES
+    if isinstance(default, int) and raw_value.strip():
+        try:
+            return int(raw_value)
+        except ValueError as error:
+            raise ValueError(f"Setting {name} should be an integer, got {raw_value}") from error
+    return raw_value.strip()
+
+
+def get_settings(path: str = CONFIG_PATH, environment: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """
+    Gets the settings of the application.
+
+    Args:
+        path (str): Path to the config file, a missing file is skipped.
+        environment (Optional[Mapping[str, str]]): Environment variables, os.environ by default.
+
+    Returns:
+        Dict[str, Any]: Settings by their names.
+    """
+    result = dict(DEFAULT_SETTINGS)
+    config = configparser.ConfigParser()
+    config.read(path, encoding="utf-8")
+    if config.has_section(CONFIG_SECTION):
+        for name, raw_value in config.items(CONFIG_SECTION):
+            result[name] = parse_setting(name, raw_value)
+    environment = os.environ if environment is None else environment  # pylint: disable=no-member
+    for key, raw_value in environment.items():
+        if key.startswith(ENVIRONMENT_PREFIX):
+            name = key[len(ENVIRONMENT_PREFIX) :].lower()
+            result[name] = parse_setting(name, raw_value)
+    return result
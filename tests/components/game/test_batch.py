@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+
+from src.components.game.batch import (
+    DRAW,
+    FIRST,
+    FIRST_WINS,
+    ONGOING,
+    SECOND,
+    SECOND_WINS,
+    BatchGameField,
+    build_cell_lines,
+    build_line_indexes,
+    play_random_games,
+)
+from src.components.game.replay import GameReplay
+
+
+class TestBatchGameField(unittest.TestCase):
+    def test_build_line_indexes(self):
+        self.assertEqual(build_line_indexes(3, 3).shape, (8, 3))
+        self.assertEqual(build_line_indexes(4, 3).shape, (24, 3))
+        cell_lines, padding = build_cell_lines(3, 3)
+        self.assertEqual(cell_lines.shape, (9, 4, 3))
+        self.assertEqual((~padding).sum(axis=1).tolist(), [3, 2, 3, 2, 4, 2, 3, 2, 3])
+
+    def test_get_outcomes(self):
+        game_field = BatchGameField(5)
+        boards = [
+            [[1, 1, 1], [-1, -1, 0], [0, 0, 0]],
+            [[-1, 1, 1], [1, -1, 0], [0, 1, -1]],
+            [[1, -1, 1], [1, -1, -1], [-1, 1, 1]],
+            [[1, 0, 0], [0, -1, 0], [0, 0, 0]],
+            [[0, 0, 1], [0, 1, -1], [1, -1, -1]],
+        ]
+        for i, board in enumerate(boards):
+            for x_coordinate, row in enumerate(board):
+                for y_coordinate, value in enumerate(row):
+                    if value:
+                        game_field.set_cells(np.array([i]), np.array([x_coordinate]), np.array([y_coordinate]), value)
+        expected = [FIRST_WINS, SECOND_WINS, DRAW, ONGOING, FIRST_WINS]
+        self.assertEqual(game_field.get_outcomes().tolist(), expected)
+        self.assertEqual(game_field.get_outcomes(np.array([4, 1])).tolist(), [FIRST_WINS, SECOND_WINS])
+        self.assertEqual(
+            game_field.get_outcomes(np.arange(5), np.array([1, 8, 0, 4, 4])).tolist(),
+            [FIRST_WINS, SECOND_WINS, DRAW, ONGOING, FIRST_WINS],
+        )
+        # Only the lines through the last cells are checked
+        self.assertEqual(game_field.get_outcomes(np.array([0]), np.array([3])).tolist(), [ONGOING])
+
+    def test_set_cells(self):
+        game_field = BatchGameField(2, 4, 3)
+        game_field.set_cells(np.array([0, 1]), np.array([1, 3]), np.array([2, 0]), np.array([FIRST, SECOND]))
+        self.assertEqual(game_field.boards[0, 1, 2], FIRST)
+        self.assertEqual(game_field.boards[1, 3, 0], SECOND)
+        self.assertEqual(game_field.filled.tolist(), [1, 1])
+        with self.assertRaises(ValueError):
+            game_field.set_cells(np.array([0]), np.array([1]), np.array([2]), SECOND)
+        with self.assertRaises(ValueError):
+            game_field.set_cells(np.array([0]), np.array([4]), np.array([0]), SECOND)
+        with self.assertRaises(ValueError):
+            BatchGameField(1, 3, 4)
+
+    def test_from_marks(self):
+        game_field = BatchGameField.from_marks([(0b000000111, 0b000011000), (1 << 99, 1)], 10, 3)
+        self.assertEqual(game_field.boards[0, 0, :3].tolist(), [FIRST] * 3)
+        self.assertEqual(game_field.boards[0, 0, 3:5].tolist(), [SECOND] * 2)
+        self.assertEqual((game_field.boards[1, 9, 9], game_field.boards[1, 0, 0]), (FIRST, SECOND))
+        self.assertEqual(game_field.filled.tolist(), [5, 2])
+        self.assertEqual(game_field.get_outcomes().tolist(), [FIRST_WINS, ONGOING])
+
+    def test_play_random_games(self):
+        for size, win_length in ((3, 3), (6, 4)):
+            moves, lengths, outcomes = play_random_games(200, size, win_length, 0)
+            for game_moves, length, outcome in zip(moves.tolist(), lengths.tolist(), outcomes.tolist()):
+                self.assertEqual(game_moves[length:], [-1] * (size * size - length))
+                replay = GameReplay(
+                    0,
+                    size,
+                    win_length,
+                    [("xo"[ply % 2], *divmod(cell, size)) for ply, cell in enumerate(game_moves[:length])],
+                )
+                winner = {FIRST_WINS: "x", SECOND_WINS: "o", DRAW: None}[outcome]
+                self.assertEqual(replay.positions[-1].winner, winner)
+                self.assertTrue(all(i.winner is None for i in replay.positions[:-1]))
+            self.assertEqual(
+                play_random_games(10, size, win_length, 1)[0].tolist(),
+                play_random_games(10, size, win_length, 1)[0].tolist(),
+            )
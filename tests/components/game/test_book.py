@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from src.components.game.book import OpeningBook, build_opening_book, get_opening_book
+from src.components.game.player import ComputerPlayer
+from src.components.game.solver import Solver
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "opening_book.bin")
+        cls.positions_number = build_opening_book(cls.path)
+        cls.book = OpeningBook(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.book.close()
+        cls.directory.cleanup()
+
+    def test_reachable_positions(self):
+        self.assertEqual(self.positions_number, 4520)
+        self.assertTrue(self.book.covers(3, 3))
+        self.assertFalse(self.book.covers(4, 3))
+
+    def test_lookup_matches_solver(self):
+        solver = Solver()
+        for own, opponent in [(0, 0), (0b000000001, 0b000000010), (0b000010000, 0b000000011), (0b011, 0b011000)]:
+            expected = solver.solve(own, opponent)
+            result = self.book.lookup(own, opponent)
+            self.assertEqual(result.value, expected.value)
+            self.assertEqual(result.score, expected.score)
+
+    def test_lookup_of_unreachable_position(self):
+        self.assertIsNone(self.book.lookup(0b000000111, 0))
+
+    def test_computer_player_falls_back_to_solver(self):
+        self.assertIs(ComputerPlayer(Solver(), self.book).opening_book, self.book)
+        self.assertIsNone(ComputerPlayer(Solver(4, 3), self.book).opening_book)
+
+    def test_not_a_book(self):
+        path = os.path.join(self.directory.name, "not_a_book.bin")
+        with open(path, "wb") as not_a_book:
+            not_a_book.write(b"0" * 64)
+        with self.assertRaises(ValueError):
+            OpeningBook(path)
+
+    def test_missing_book(self):
+        self.assertIsNone(get_opening_book(os.path.join(self.directory.name, "missing.bin")))
@@ -0,0 +1,61 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.components.game.controller import Game
+from src.database.journal import MoveJournal
+from src.database.model.game import GameResult, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.settings import get_settings
+from tests.database import DatabaseTestMixin
+
+
+class TestGame(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.db_session.add(LeagueSeason(name="League", field_size=3, win_length=3))
+        self.db_session.add_all(User(nickname=f"User{i}") for i in range(2))
+        self.db_session.commit()
+        self.journal_path = os.path.join(self.directory.name, "journal")
+
+    def make_game(self, environment):
+        settings = get_settings(os.path.join(self.directory.name, "settings.ini"), environment)
+        with patch("src.components.game.controller.get_settings", return_value=settings), patch(
+            "src.components.game.controller.JOURNAL_PATH", self.journal_path
+        ):
+            return Game(self.db_session)
+
+    def test_init(self):
+        game = self.make_game({})
+        self.assertIsNone(game.journal)
+        self.assertFalse(game.service.write_behind)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_start_game_write_behind(self):
+        game = self.make_game({"TIC_TAC_TOE_DB_WRITE_BEHIND": "true", "TIC_TAC_TOE_DB_FLUSH_EVERY": "2"})
+        self.assertIsInstance(game.journal, MoveJournal)
+        self.assertTrue(game.service.write_behind)
+        self.assertEqual(game.service.flush_every, 2)
+        with patch("src.components.game.service.input", side_effect=["0", "0"]), patch(
+            "src.components.game.player.input", side_effect=["0,0", "1,0", "0,1", "1,1", "0,2"]
+        ), patch("src.components.game.service.randint", return_value=0), patch(
+            "src.components.game.service.click"
+        ), patch(
+            "src.components.game.service.print"
+        ), patch(
+            "src.components.game.model.print"
+        ), patch.object(
+            MoveJournal, "append", autospec=True, side_effect=MoveJournal.append
+        ) as mock_append:
+            game.start_game(handler=MagicMock())
+        game.journal.close()
+        self.assertEqual(
+            [i.args[1:] for i in mock_append.call_args_list],
+            [
+                (1, user_id, x, y, ply)
+                for ply, (user_id, x, y) in enumerate([(1, 0, 0), (2, 1, 0), (1, 0, 1), (2, 1, 1), (1, 0, 2)])
+            ],
+        )
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), 5)
+        self.assertEqual(self.db_session.query(GameResult).filter(GameResult.is_winner).one().user_id, 1)
+        self.assertEqual(MoveJournal(self.journal_path, sync=False).read(), [])
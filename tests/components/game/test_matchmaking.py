@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from src.components.game.matchmaking import (
+    BASE_TOLERANCE,
+    MAX_TOLERANCE,
+    TOLERANCE_GROWTH,
+    MatchmakingQueue,
+    get_tolerance,
+)
+
+
+class TestMatchmakingQueue(unittest.TestCase):
+    def test_get_tolerance(self):
+        self.assertEqual(get_tolerance(0), BASE_TOLERANCE)
+        self.assertEqual(get_tolerance(2), BASE_TOLERANCE + 2 * TOLERANCE_GROWTH)
+        self.assertEqual(get_tolerance(3600), MAX_TOLERANCE)
+
+    def test_join(self):
+        queue = MatchmakingQueue()
+        self.assertIsNone(queue.join(1, 1500, now=0))
+        self.assertIsNone(queue.join(2, 1700, now=0))
+        self.assertIsNone(queue.join(3, 1430, now=1))
+        with self.assertRaises(ValueError):
+            queue.join(1, 1500, now=1)
+        # The closest opponent is chosen, the one who waited longer goes first
+        match = queue.join(4, 1510, now=2)
+        self.assertEqual((match.first.user_id, match.second.user_id), (1, 4))
+        self.assertEqual(sorted(queue.tickets), [2, 3])
+        self.assertEqual(queue.get_metrics(now=2), (2, 1.5, 1, 1.0))
+
+    def test_match_waiting(self):
+        queue = MatchmakingQueue()
+        queue.join(1, 1500, now=0)
+        queue.join(2, 1620, now=0)
+        queue.join(3, 2500, now=0)
+        self.assertEqual(queue.match_waiting(now=5), [])
+        # The tolerance of 1500 and 1620 reaches 120 after 7 seconds of waiting
+        matches = queue.match_waiting(now=7)
+        self.assertEqual([(i.first.user_id, i.second.user_id) for i in matches], [(1, 2)])
+        self.assertEqual(queue.match_waiting(now=3600), [])
+        self.assertTrue(queue.leave(3))
+        self.assertFalse(queue.leave(3))
+        self.assertEqual(queue.get_metrics(now=3600), (0, 0.0, 1, 7.0))
+        self.assertEqual((queue.buckets, queue.bucket_keys, queue.by_key), ({}, [], {}))
+
+    def test_closest_opponent(self):
+        generator = random.Random(0)
+        queue = MatchmakingQueue()
+        for user_id in range(5000):
+            now = user_id * 0.01
+            rating = generator.gauss(1500, 400)
+            waiting = list(queue.tickets.values())
+            acceptable = [
+                abs(i.rating - rating) for i in waiting if abs(i.rating - rating) <= get_tolerance(now - i.joined_at)
+            ]
+            match = queue.join(user_id, rating, now=now)
+            if not acceptable:
+                self.assertIsNone(match)
+                continue
+            self.assertEqual(match.second.user_id, user_id)
+            self.assertEqual(abs(match.first.rating - rating), min(acceptable))
+            if user_id % 100 == 0:
+                queue.match_waiting(now=now)
+        self.assertEqual(len(queue.by_key), len(queue.tickets))
+        self.assertEqual(sum(len(i) for i in queue.buckets.values()), len(queue.tickets))
@@ -0,0 +1,119 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from src.components.game.mcts import (
+    MonteCarloTreeSearch,
+    build_neighbour_masks,
+    search_position,
+)
+from src.components.game.model import BitboardGameField
+from src.components.game.player import MctsPlayer
+
+
+class TestMonteCarloTreeSearch(unittest.TestCase):
+    def test_build_neighbour_masks(self):
+        masks = build_neighbour_masks(5, 1)
+        self.assertEqual(masks[0], 0b11 | 0b11 << 5)
+        self.assertEqual(bin(masks[12]).count("1"), 9)
+
+    def test_takes_win(self):
+        tree_search = MonteCarloTreeSearch(3, 3, seed=0)
+        result = tree_search.search(0b000000011, 0b000011000, iterations=300)
+        self.assertEqual(result.move, (0, 2))
+        self.assertEqual(result.value, 1.0)
+        self.assertEqual(result.iterations, 300)
+        self.assertEqual(result.tree_size, tree_search.tree_size)
+
+    def test_blocks_loss(self):
+        result = MonteCarloTreeSearch(3, 3, seed=0).search(0b000010000, 0b000000011, iterations=2000)
+        self.assertEqual(result.move, (0, 2))
+
+    def test_large_field(self):
+        result = MonteCarloTreeSearch(15, 5, seed=0).search(1 << 112, 1 << 113, iterations=100)
+        # Only the cells near the filled ones are searched
+        self.assertLessEqual(max(abs(result.move[0] - 7), abs(result.move[1] - 7)), 3)
+        self.assertIsNone(MonteCarloTreeSearch(1, 1).search(1, 0, iterations=10).move)
+
+    def test_reuses_tree(self):
+        tree_search = MonteCarloTreeSearch(4, 3, seed=0)
+        result = tree_search.search(0, 0, iterations=2000)
+        cell = result.move[0] * 4 + result.move[1]
+        reply = next(i for i in range(16) if i != cell)
+        reused = tree_search.root.children[0]
+        for child in tree_search.root.children:
+            if child.cell == cell:
+                reused = next(i for i in child.children if i.cell == reply)
+        visits = reused.visits
+        result = tree_search.search(1 << cell, 1 << reply, iterations=10)
+        self.assertIs(tree_search.root, reused)
+        self.assertIsNone(reused.parent)
+        self.assertEqual(reused.visits, visits + 10)
+        self.assertEqual(result.tree_size, tree_search.tree_size)
+        tree_search.search(0b111, 0b111000, iterations=10)
+        self.assertEqual(tree_search.root.visits, 10)
+
+    def test_workers(self):
+        statistics, iterations, tree_size, depth = search_position((3, 3, 1.4, 0, 0b000000011, 0b000011000, 100, None))
+        self.assertEqual(iterations, 100)
+        self.assertEqual(sum(i for i, _ in statistics.values()), 100)
+        self.assertGreater(tree_size, len(statistics))
+        self.assertGreater(depth, 1)
+        tree_search = MonteCarloTreeSearch(3, 3, workers=2, seed=0)
+        result = tree_search.search(0b000000011, 0b000011000, iterations=100)
+        tree_search.close()
+        self.assertEqual((result.move, result.iterations), ((0, 2), 200))
+        with self.assertRaises(ValueError):
+            MonteCarloTreeSearch(3, 3, workers=0)
+
+    def test_reuses_pool(self):
+        tree_search = MonteCarloTreeSearch(3, 3, workers=2, seed=0)
+        self.assertIsNone(tree_search.pool)
+        tree_search.search(0b000000011, 0b000011000, iterations=10)
+        pool = tree_search.pool
+        self.assertIsNotNone(pool)
+        result = tree_search.search(0b000000011, 0b000011000, iterations=10)
+        self.assertIs(tree_search.pool, pool)
+        self.assertEqual(result.iterations, 20)
+        tree_search.close()
+        self.assertIsNone(tree_search.pool)
+        with self.assertRaises(ValueError):
+            pool.map(search_position, [])
+        self.assertEqual(tree_search.search(0b000000011, 0b000011000, iterations=10).iterations, 20)
+        tree_search.close()
+
+    def test_cancel(self):
+        tree_search = MonteCarloTreeSearch(15, 5, seed=0)
+        timer = threading.Timer(0.05, tree_search.cancel)
+        timer.start()
+        result = tree_search.search(1 << 112, 0, time_limit=60)
+        timer.join()
+        self.assertLess(result.elapsed, 5)
+        self.assertIsNotNone(result.move)
+        self.assertGreater(result.depth, 0)
+
+    def test_cancel_workers(self):
+        tree_search = MonteCarloTreeSearch(15, 5, workers=2, seed=0)
+        timer = threading.Timer(0.05, tree_search.cancel)
+        timer.start()
+        result = tree_search.search(1 << 112, 0, time_limit=60)
+        timer.join()
+        tree_search.close()
+        # The worker stops with the search instead of spending the time limit
+        self.assertLess(result.elapsed, 5)
+        self.assertIsNotNone(result.move)
+        self.assertEqual(tree_search.search(1 << 112, 0, iterations=10).iterations, 20)
+        tree_search.close()
+
+
+class TestMctsPlayer(unittest.TestCase):
+    def test_choose_move(self):
+        game_field = BitboardGameField([MagicMock(GameResult=MagicMock(symbol="x"))], 5, 4)
+        for x_coordinate, y_coordinate, value in [(1, 1, "x"), (0, 0, "o"), (1, 2, "x"), (0, 4, "o"), (1, 3, "x")]:
+            game_field.set_cell_value(x_coordinate, y_coordinate, value)
+        player = MctsPlayer(MonteCarloTreeSearch(5, 4, seed=0), iterations=3000)
+        with self.assertLogs("src.components.game.player", "INFO") as logs:
+            self.assertIn(player.choose_move(game_field, "o"), [(1, 0), (1, 4)])
+        self.assertIn("iterations/s", logs.output[0])
+        self.assertGreater(player.last_result.iterations_per_second, 0)
+        self.assertEqual(player.last_result.iterations, 3000)
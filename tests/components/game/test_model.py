@@ -0,0 +1,126 @@
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.components.game.model import (
+    MOVE_TIME_LIMIT,
+    BitboardGameField,
+    GameField,
+    get_move_time_limit,
+)
+
+
+class TestBitboardGameField(unittest.TestCase):
+    def setUp(self):
+        self.game_metadata = [
+            MagicMock(User=MagicMock(nickname="User1"), GameResult=MagicMock(symbol="x")),
+            MagicMock(User=MagicMock(nickname="User2"), GameResult=MagicMock(symbol="o")),
+        ]
+        self.game_field = BitboardGameField(self.game_metadata)
+
+    def play(self, moves):
+        result = None
+        with patch("src.components.game.model.print") as mock_print:
+            for i, (x_coordinate, y_coordinate) in enumerate(moves):
+                result = self.game_field.set_cell_value(x_coordinate, y_coordinate, "xo"[i % 2])
+        # The end of the game is rendered by the game session, the engine does not print
+        mock_print.assert_not_called()
+        return result
+
+    def test_win_by_row(self):
+        result = self.play([(1, 0), (0, 0), (1, 1), (0, 1), (1, 2)])
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, self.game_metadata[0].User)
+
+    def test_win_by_column(self):
+        result = self.play([(0, 0), (0, 2), (1, 1), (1, 2), (2, 0), (2, 2)])
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, self.game_metadata[1].User)
+
+    def test_win_by_anti_diagonal(self):
+        result = self.play([(2, 0), (0, 0), (1, 1), (0, 1), (0, 2)])
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, self.game_metadata[0].User)
+
+    def test_draw(self):
+        result = self.play([(0, 0), (0, 1), (0, 2), (1, 1), (1, 0), (1, 2), (2, 1), (2, 0), (2, 2)])
+        self.assertTrue(result.is_end)
+        self.assertIsNone(result.winner)
+
+    def test_game_is_not_over(self):
+        result = self.play([(0, 0), (1, 1)])
+        self.assertFalse(result.is_end)
+
+    def test_filled_cell(self):
+        self.play([(0, 0)])
+        with self.assertRaises(ValueError):
+            self.game_field.set_cell_value(0, 0, "o")
+
+    def test_same_results_as_cell_based_engine(self):
+        generator = random.Random(0)
+        cells = [(x, y) for x in range(3) for y in range(3)]
+        for _ in range(200):
+            generator.shuffle(cells)
+            bitboard_game_field = BitboardGameField(self.game_metadata)
+            cell_game_field = GameField(self.game_metadata)
+            for i, (x_coordinate, y_coordinate) in enumerate(cells):
+                expected = cell_game_field.set_cell_value(x_coordinate, y_coordinate, "xo"[i % 2])
+                result = bitboard_game_field.set_cell_value(x_coordinate, y_coordinate, "xo"[i % 2])
+                self.assertEqual(result.is_end, expected.is_end)
+                if expected.is_end:
+                    break
+
+
+class TestGameField(unittest.TestCase):
+    def setUp(self):
+        self.game_metadata = [
+            MagicMock(User=MagicMock(nickname="User1"), GameResult=MagicMock(symbol="x")),
+            MagicMock(User=MagicMock(nickname="User2"), GameResult=MagicMock(symbol="o")),
+        ]
+
+    def test_win_on_large_field(self):
+        game_field = GameField(self.game_metadata, size=15, win_length=5)
+        for i in range(4):
+            self.assertFalse(game_field.set_cell_value(10 - i, 4 + i, "x").is_end)
+            self.assertFalse(game_field.set_cell_value(0, i, "o").is_end)
+        result = game_field.set_cell_value(6, 8, "x")
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, self.game_metadata[0].User)
+
+    def test_draw_by_filled_cell_counter(self):
+        game_field = GameField(self.game_metadata, size=4, win_length=4)
+        moves = [(x, y) for x in range(4) for y in range(4)]
+        results = [game_field.set_cell_value(x, y, "xo"[(x // 2 + y) % 2]) for x, y in moves]
+        self.assertFalse(any(result.is_end for result in results[:-1]))
+        self.assertTrue(results[-1].is_end)
+        self.assertIsNone(results[-1].winner)
+
+    def test_cell_out_of_field(self):
+        game_field = GameField(self.game_metadata, size=4, win_length=3)
+        with self.assertRaises(ValueError):
+            game_field.set_cell_value(4, 0, "x")
+
+    def test_wrong_win_length(self):
+        with self.assertRaises(ValueError):
+            GameField(self.game_metadata, size=3, win_length=4)
+
+    def test_same_results_as_bitboard_engine(self):
+        generator = random.Random(0)
+        cells = [(x, y) for x in range(6) for y in range(6)]
+        for _ in range(100):
+            generator.shuffle(cells)
+            bitboard_game_field = BitboardGameField(self.game_metadata, size=6, win_length=4)
+            cell_game_field = GameField(self.game_metadata, size=6, win_length=4)
+            for i, (x_coordinate, y_coordinate) in enumerate(cells):
+                expected = bitboard_game_field.set_cell_value(x_coordinate, y_coordinate, "xo"[i % 2])
+                result = cell_game_field.set_cell_value(x_coordinate, y_coordinate, "xo"[i % 2])
+                self.assertEqual(result.is_end, expected.is_end)
+                self.assertEqual(result.winner, expected.winner)
+                if expected.is_end:
+                    break
+
+
+class TestGetMoveTimeLimit(unittest.TestCase):
+    def test_get_move_time_limit(self):
+        self.assertEqual(get_move_time_limit(MagicMock(move_time_limit=250)), 0.25)
+        self.assertEqual(get_move_time_limit(MagicMock(move_time_limit=None)), MOVE_TIME_LIMIT / 1000)
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+from src.components.game.replay import (
+    GameReplay,
+    count_outcomes,
+    get_last_game_id,
+    get_replay,
+    iter_replays,
+)
+from src.components.management.service import ManagementService
+from src.database.model.game import GameResult, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.database.repository import SqlAlchemyRepository
+from tests.database import DatabaseTestMixin
+
+
+class TestGameReplay(unittest.TestCase):
+    def test_seek(self):
+        replay = GameReplay(1, 3, 3, [("x", 1, 1), ("o", 0, 0), ("x", 0, 1), ("o", 2, 2), ("x", 2, 1)])
+        self.assertEqual(len(replay.positions), 6)
+        self.assertEqual(replay.seek(0), (0, 0, 0, None, None))
+        self.assertEqual(replay.seek(2), (2, 0b000010000, 0b000000001, (0, 0), None))
+        self.assertEqual(replay.seek(5).winner, "x")
+        self.assertEqual(replay.seek(5).x_marks, 0b010010010)
+        with self.assertRaises(ValueError):
+            replay.seek(6)
+
+    def test_draw(self):
+        moves = [(1, 1), (0, 0), (0, 1), (2, 1), (0, 2), (2, 0), (1, 0), (1, 2), (2, 2)]
+        replay = GameReplay(1, 3, 3, [("xo"[i % 2], *move) for i, move in enumerate(moves)])
+        self.assertEqual([i.winner for i in replay.positions], [None] * 10)
+        self.assertEqual(replay.seek(9).x_marks | replay.seek(9).o_marks, 0b111111111)
+
+
+class TestReplayStorage(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.users = [User(nickname=f"User{i}") for i in range(2)]
+        self.leagues = [LeagueSeason(name="League"), LeagueSeason(name="Large", field_size=5, win_length=4)]
+        self.db_session.add_all([*self.users, *self.leagues])
+        self.db_session.commit()
+        for league, compact_moves, moves in [
+            (self.leagues[0], False, [(1, 1), (0, 0), (0, 1), (2, 2), (2, 1)]),
+            (self.leagues[1], True, [(4, 4), (0, 0)]),
+            (self.leagues[0], True, [(0, 0), (1, 1)]),
+        ]:
+            self.play(league, compact_moves, moves)
+
+    def play(self, league, compact_moves, moves):
+        repository = SqlAlchemyRepository(self.db_session, compact_moves)
+        game_metadata = repository.create_game(
+            league, self.users, [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(self.users, "ox")]
+        )
+        repository.add_decisions(
+            [
+                GameUserDecision(
+                    game_id=game_metadata[0].Game.id,
+                    user_id=self.users[i % 2 - 1].id,
+                    coordinate_x=x_coordinate,
+                    coordinate_y=y_coordinate,
+                )
+                for i, (x_coordinate, y_coordinate) in enumerate(moves)
+            ]
+        )
+        repository.commit()
+
+    def test_iter_replays(self):
+        replays = list(iter_replays(self.db_session, chunk_size=1))
+        self.assertEqual([(i.game_id, i.size, len(i.moves)) for i in replays], [(1, 3, 5), (2, 5, 2), (3, 3, 2)])
+        self.assertEqual(replays[0].moves[:2], [("x", 1, 1), ("o", 0, 0)])
+        self.assertEqual(replays[0].seek(5).winner, "x")
+        self.assertEqual(replays[1].moves, [("x", 4, 4), ("o", 0, 0)])
+        self.assertEqual(replays[1].seek(1).x_marks, 1 << 24)
+        self.assertEqual(
+            [i.game_id for i in iter_replays(self.db_session, league_season_id=self.leagues[0].id)], [1, 3]
+        )
+        self.assertEqual([i.game_id for i in iter_replays(self.db_session, iter([3, 1, 7]), chunk_size=2)], [1, 3])
+
+    def test_count_outcomes(self):
+        self.assertEqual(
+            count_outcomes(iter_replays(self.db_session), chunk_size=1),
+            {"x wins": 1, "o wins": 0, "draw": 0, "unfinished": 2},
+        )
+
+    def test_get_replay(self):
+        self.assertEqual(get_replay(self.db_session, 3).moves, [("x", 0, 0), ("o", 1, 1)])
+        self.assertIsNone(get_replay(self.db_session, 7))
+
+    def test_get_last_game_id(self):
+        self.assertEqual(get_last_game_id(self.db_session, self.users[0].id), 3)
+        self.assertEqual(get_last_game_id(self.db_session, self.users[0].id, self.leagues[1].id), 2)
+        self.assertIsNone(get_last_game_id(self.db_session, 7))
+
+    def test_replay_last_game(self):
+        with patch("builtins.input", side_effect=["1", "9", ""]) as mock_input, patch("builtins.print") as mock_print:
+            ManagementService(self.db_session).replay_last_game(self.users[0])
+        self.assertEqual(mock_input.call_count, 3)
+        printed = [str(i.args[0]) for i in mock_print.call_args_list if i.args]
+        self.assertTrue(any("Game 3, ply 2 of 2" in i for i in printed))
+        self.assertTrue(any("Game 3, ply 1 of 2" in i for i in printed))
+        self.assertTrue(any("Value should be a number from 0 to 2" in i for i in printed))
@@ -0,0 +1,205 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy.exc import OperationalError
+
+from src.components.game.load import run_load
+from src.components.game.server import WRITE_ATTEMPTS, GameServer
+from src.components.game.service import MAX_WRONG_CHOICES
+from src.database.model.game import Game, GameResult, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.database.rating import check_league_ratings
+from src.database.standing import check_league_standings
+from tests.database import DatabaseTestMixin
+
+
+class TestGameServer(DatabaseTestMixin, unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.db_session.add(LeagueSeason(name="League", field_size=3, win_length=3))
+        self.db_session.add_all(User(nickname=f"User{i}") for i in range(4))
+        self.db_session.commit()
+        self.user_ids = [i.id for i in self.db_session.query(User).order_by(User.id)]
+        self.game_server = GameServer(self.db_session, batch_size=2, flush_interval=0.01)
+
+    async def test_execute(self):
+        await self.game_server.start(port=0)
+        first, second = self.user_ids[:2]
+        self.assertEqual(
+            await self.game_server.execute(1, "NEW 1"), "ERROR Expected NEW <first user id> <second user id>"
+        )
+        self.assertEqual(await self.game_server.execute(1, f"NEW {first} 100"), "ERROR There is no user 100")
+        self.assertEqual(
+            await self.game_server.execute(1, "JOIN"),
+            "ERROR Unknown command JOIN, expected NEW, QUEUE, LEAVE, MOVE, STATS or QUIT",
+        )
+        self.game_server.connections[1] = set()
+        self.assertEqual(await self.game_server.execute(1, f"NEW {first} {second}"), "GAME 1 3 3")
+        self.assertEqual(await self.game_server.execute(2, "MOVE 1 0 0"), "ERROR There is no game 1")
+        self.assertEqual(await self.game_server.execute(1, "MOVE 1 0 0"), "OK 1")
+        self.assertEqual(
+            await self.game_server.execute(1, "MOVE 1 0 0"), "ERROR This cell is filled, please, choose another"
+        )
+        for move in ("1 0", "0 1", "1 1"):
+            self.assertEqual(await self.game_server.execute(1, f"MOVE 1 {move}"), "OK 1")
+        self.assertEqual(await self.game_server.execute(1, "MOVE 1 0 2"), f"END 1 {first}")
+        self.assertEqual(self.game_server.games, {})
+        await self.game_server.close()
+
+        game = self.db_session.query(Game).one()
+        self.assertEqual(
+            [(i.user_id, i.coordinate_x, i.coordinate_y) for i in self.db_session.query(GameUserDecision)],
+            [(first, 0, 0), (second, 1, 0), (first, 0, 1), (second, 1, 1), (first, 0, 2)],
+        )
+        self.assertEqual(
+            {i.user_id: i.is_winner for i in self.db_session.query(GameResult).filter(GameResult.game_id == game.id)},
+            {first: True, second: False},
+        )
+        self.assertEqual(check_league_standings(self.db_session), [])
+        self.assertEqual(check_league_ratings(self.db_session), [])
+
+    async def test_forfeit(self):
+        await self.game_server.start(port=0)
+        self.game_server.connections[1] = set()
+        await self.game_server.execute(1, f"NEW {self.user_ids[0]} {self.user_ids[1]}")
+        for _ in range(MAX_WRONG_CHOICES - 1):
+            self.assertTrue((await self.game_server.execute(1, "MOVE 1 3 3")).startswith("ERROR"))
+        self.assertEqual(await self.game_server.execute(1, "MOVE 1 3 3"), f"END 1 {self.user_ids[1]}")
+        await self.game_server.close()
+        self.assertEqual(self.db_session.query(GameResult).filter(GameResult.is_winner.is_(True)).count(), 1)
+
+    async def test_writer_error(self):
+        await self.game_server.start(port=0)
+        self.game_server.connections[1] = set()
+        add_finished_games = self.game_server.repository.add_finished_games
+        errors = [OperationalError("INSERT", {}, Exception("database is locked"))]
+
+        def add_finished_games_once_locked(*args):
+            if errors:
+                raise errors.pop()
+            return add_finished_games(*args)
+
+        async def play(game_number, user_ids):
+            await self.game_server.execute(1, f"NEW {user_ids[0]} {user_ids[1]}")
+            for move in ("0 0", "1 0", "0 1", "1 1", "0 2"):
+                await self.game_server.execute(1, f"MOVE {game_number} {move}")
+            await self.game_server.finished_games.join()
+
+        # The first attempt fails like a locked database, the batch is written by the next one
+        with patch.object(
+            self.game_server.repository,
+            "add_finished_games",
+            side_effect=add_finished_games_once_locked,
+        ), patch("src.components.game.server.RETRY_DELAY", 0.01), self.assertLogs("src.components.game.server") as logs:
+            await play(1, self.user_ids[:2])
+        self.assertIn("1 games were not written, retrying in 0.0 s", logs.output[0])
+        self.assertEqual(self.game_server.report.written_games, 1)
+        # The batch failing every attempt is dropped, the next one is written
+        with patch.object(
+            self.game_server.repository, "add_finished_games", side_effect=KeyError(self.user_ids[1])
+        ), patch("src.components.game.server.RETRY_DELAY", 0.01), patch(
+            "src.components.game.server.click"
+        ), self.assertLogs(
+            "src.components.game.server"
+        ) as logs:
+            await play(2, self.user_ids[:2])
+        self.assertIn(f"1 games were not written after {WRITE_ATTEMPTS} attempts", logs.output[-1])
+        await play(3, self.user_ids[2:])
+        await asyncio.wait_for(self.game_server.close(), 5)
+        self.assertEqual(self.game_server.report.written_games, 2)
+        self.assertEqual(self.game_server.report.transactions, 2)
+        self.assertEqual(self.db_session.query(Game).count(), 2)
+        self.assertEqual(check_league_standings(self.db_session), [])
+
+    async def test_load(self):
+        server = await self.game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        report = await run_load("127.0.0.1", port, 20, 3, self.user_ids[:2], seed=0)
+        # An unfinished game of a closed connection is not written
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"NEW {self.user_ids[0]} {self.user_ids[1]}\n".encode())
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+        await self.game_server.close()
+
+        self.assertEqual((report.connections, report.games), (20, 60))
+        self.assertEqual(len(report.latencies), report.moves)
+        self.assertEqual(self.game_server.report.moves, report.moves)
+        self.assertEqual(self.game_server.report.written_games, 60)
+        self.assertEqual(self.game_server.report.connections, 21)
+        self.assertLess(self.game_server.report.transactions, 60)
+        self.assertEqual(self.db_session.query(Game).count(), 60)
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), report.moves)
+        self.assertEqual(check_league_standings(self.db_session), [])
+
+    async def test_matchmaking(self):
+        server = await self.game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        first, second, third = self.user_ids[:3]
+        first_reader, first_writer = await asyncio.open_connection("127.0.0.1", port)
+        second_reader, second_writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(writer, reader, command):
+            writer.write(f"{command}\n".encode())
+            await writer.drain()
+            return await receive(reader)
+
+        async def receive(reader):
+            return (await reader.readline()).decode().strip()
+
+        self.assertEqual(await send(first_writer, first_reader, f"QUEUE {first}"), "QUEUED 1")
+        self.assertEqual(
+            await send(second_writer, second_reader, f"QUEUE {first}"), f"ERROR User {first} is already in the queue"
+        )
+        self.assertEqual(await send(second_writer, second_reader, "QUEUE 100"), "ERROR There is no user 100")
+        self.assertEqual(await send(second_writer, second_reader, f"QUEUE {second}"), f"MATCH 1 3 3 o {first}")
+        self.assertEqual(await receive(first_reader), f"MATCH 1 3 3 x {second}")
+        self.assertEqual(
+            await send(second_writer, second_reader, "MOVE 1 0 0"), "ERROR It is not your turn in the game 1"
+        )
+        for first_move, second_move in (("0 0", "1 0"), ("0 1", "1 1")):
+            self.assertEqual(await send(first_writer, first_reader, f"MOVE 1 {first_move}"), "OK 1")
+            self.assertEqual(await receive(second_reader), f"MOVED 1 {first_move}")
+            self.assertEqual(await send(second_writer, second_reader, f"MOVE 1 {second_move}"), "OK 1")
+            self.assertEqual(await receive(first_reader), f"MOVED 1 {second_move}")
+        self.assertEqual(await send(first_writer, first_reader, "MOVE 1 0 2"), f"END 1 {first}")
+        self.assertEqual(await receive(second_reader), f"END 1 {first} 0 2")
+
+        # The player of a matched game whose connection is closed forfeits it
+        self.assertEqual(await send(first_writer, first_reader, f"QUEUE {first}"), "QUEUED 1")
+        self.assertEqual(await send(second_writer, second_reader, f"QUEUE {third}"), f"MATCH 2 3 3 o {first}")
+        self.assertEqual(await receive(first_reader), f"MATCH 2 3 3 x {third}")
+        stats = (await send(second_writer, second_reader, "STATS")).split()
+        self.assertEqual([stats[i] for i in (0, 1, 2, 4)], ["STATS", "1", "0", "2"])
+        second_writer.close()
+        await second_writer.wait_closed()
+        self.assertEqual(await receive(first_reader), f"END 2 {first}")
+        self.assertEqual(await send(first_writer, first_reader, f"QUEUE {first}"), "QUEUED 1")
+        self.assertEqual(await send(first_writer, first_reader, f"LEAVE {first}"), f"LEFT {first}")
+        first_writer.close()
+        await first_writer.wait_closed()
+        await self.game_server.close()
+
+        self.assertEqual(self.game_server.report.written_games, 2)
+        self.assertEqual(
+            [
+                (i.game_id, i.user_id, i.is_winner)
+                for i in self.db_session.query(GameResult).order_by(GameResult.game_id, GameResult.id)
+            ],
+            [(1, first, True), (1, second, False), (2, first, True), (2, third, False)],
+        )
+        self.assertEqual(check_league_ratings(self.db_session), [])
+
+    async def test_matchmaking_load(self):
+        server = await self.game_server.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        report = await run_load("127.0.0.1", port, 4, 3, self.user_ids, seed=0, matchmaking=True)
+        await self.game_server.close()
+
+        self.assertEqual((report.connections, report.games), (4, 6))
+        self.assertEqual(self.game_server.report.moves, report.moves)
+        self.assertEqual(self.db_session.query(Game).count(), 6)
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), report.moves)
+        self.assertEqual(self.game_server.matchmaking.get_metrics().matches, 6)
@@ -1,8 +1,10 @@
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
-from src.components.game.model import GameField
-from src.components.game.service import GameService, GameSession
+from src.components.game.model import GameField, GameState, UserSummaryType
+from src.components.game.player import ComputerPlayer, MctsPlayer, ScriptedPlayer
+from src.components.game.service import MAX_WRONG_CHOICES, GameService, GameSession
+from src.components.main_menu.service import PAGE_SIZE
 from src.database.model.game import GameUserDecision
 
 REQUIRED_PLAYERS_NUMBER = 2
@@ -11,9 +13,14 @@ REQUIRED_PLAYERS_NUMBER = 2
 class TestGameSession(unittest.TestCase):
     def setUp(self):
         self.db_session = MagicMock()
-        self.league = MagicMock()
+        self.league = MagicMock(field_size=3, win_length=3)
         self.game_session = GameSession(self.db_session, self.league)
 
+    def mock_users(self, users, pages):
+        self.game_session.repository = MagicMock()
+        self.game_session.repository.get_user_page.side_effect = pages
+        self.game_session.repository.get_user.side_effect = {i.id: i for i in users}.get
+
     @patch("src.components.game.service.input", side_effect=["0", "0"])
     def test_choose_players(self, mock_input):
         expected_chosen_players_count = 2
@@ -23,55 +30,84 @@ class TestGameSession(unittest.TestCase):
         user2 = MagicMock()
         user2.id = 2
         user2.nickname = "User2"
-        self.db_session.query.return_value.filter.return_value.all.return_value = [user1, user2]
+        self.mock_users([user1, user2], [[user1, user2], [user2]])
         self.game_session._GameSession__choose_players()
         self.assertEqual(len(self.game_session.chosen_players), expected_chosen_players_count)
+        self.assertEqual(
+            [i.args for i in self.game_session.repository.get_user_page.call_args_list],
+            [(0, PAGE_SIZE + 1, "", []), (0, PAGE_SIZE + 1, "", [1])],
+        )
+
+    @patch("src.components.game.service.input", side_effect=["c0", "0"])
+    def test_choose_computer_player(self, _):
+        user1 = MagicMock(id=1, nickname="User1")
+        user2 = MagicMock(id=2, nickname="User2")
+        self.game_session.chosen_players = []
+        self.mock_users([user1, user2], [[user1, user2], [user2]])
+        self.game_session._GameSession__choose_players()
+        self.assertEqual(self.game_session.chosen_players, [user1, user2])
+        self.assertIsInstance(self.game_session.players[user1.id], ComputerPlayer)
+        self.assertNotIn(user2.id, self.game_session.players)
+
+    @patch("src.components.game.service.input", side_effect=["c0", "c0"])
+    def test_choose_mcts_player(self, _):
+        user1 = MagicMock(id=1, nickname="User1")
+        user2 = MagicMock(id=2, nickname="User2")
+        self.game_session.league = MagicMock(field_size=15, win_length=5)
+        self.mock_users([user1, user2], [[user1, user2], [user2]])
+        self.game_session._GameSession__choose_players()
+        self.assertIsInstance(self.game_session.players[user1.id], MctsPlayer)
+        self.assertIsInstance(self.game_session.players[user2.id], MctsPlayer)
+
+    def test_close_players(self):
+        mcts_player = MagicMock(spec=MctsPlayer)
+        self.game_session.players = {1: mcts_player, 2: MagicMock(spec=ScriptedPlayer)}
+        self.game_session._GameSession__close_players()
+        mcts_player.close.assert_called_once_with()
+
+    def test_choose_players_wrong_choices(self):
+        user1 = MagicMock(id=1, nickname="User1")
+        user2 = MagicMock(id=2, nickname="User2")
+        self.mock_users([user1, user2], [[user1, user2]] * MAX_WRONG_CHOICES + [[user2]] * MAX_WRONG_CHOICES)
+        # The wrong choices made for the first player do not count against the second one
+        choices = ["x"] * (MAX_WRONG_CHOICES - 1) + ["0"] + ["x"] * (MAX_WRONG_CHOICES - 1) + ["0"]
+        with patch("src.components.game.service.input", side_effect=choices), patch(
+            "src.components.game.service.print"
+        ):
+            self.game_session._GameSession__choose_players()
+        self.assertEqual(self.game_session.chosen_players, [user1, user2])
 
-    def test_create_game_session(self):
-        game_id = 123
-        expected_game_field = GameField()
-        self.game_session._GameSession__create_game = MagicMock(return_value=MagicMock(id=game_id))
-        self.game_session._GameSession__create_game_result = MagicMock()
-        self.game_session._GameSession__get_game_metadata = MagicMock(return_value=[])
-        self.game_session._GameSession__game_metadata = MagicMock()
+    @patch("src.components.game.service.input", side_effect=["n", "0", "n", "/Al", "0"])
+    def test_choose_players_pages(self, _):
+        users = [UserSummaryType(i, f"User{i}") for i in range(1, PAGE_SIZE + 3)]
+        alice = MagicMock(id=PAGE_SIZE + 2, nickname="Alice")
+        chosen = MagicMock(id=PAGE_SIZE + 1)
+        self.mock_users([chosen, alice], [users[: PAGE_SIZE + 1], users[PAGE_SIZE:], users[:PAGE_SIZE], [], [alice]])
+        with patch("src.components.game.service.print"):
+            self.game_session._GameSession__choose_players()
+        self.assertEqual(self.game_session.chosen_players, [chosen, alice])
+        # The last page is followed by the first one, the search starts from the first page
+        self.assertEqual(
+            [i.args[:3] for i in self.game_session.repository.get_user_page.call_args_list],
+            [(0, PAGE_SIZE + 1, ""), (PAGE_SIZE, PAGE_SIZE + 1, ""), (PAGE_SIZE, PAGE_SIZE + 1, "")]
+            + [(0, PAGE_SIZE + 1, ""), (0, PAGE_SIZE + 1, "Al")],
+        )
+
+    @patch("src.components.game.service.randint", return_value=1)
+    def test_create_game_session(self, _):
+        users = self.game_session.chosen_players = [MagicMock(id=12), MagicMock(id=23)]
+        game_metadata = [MagicMock(), MagicMock()]
+        self.game_session.repository = MagicMock()
+        self.game_session.repository.create_game.return_value = game_metadata
         self.game_session._GameSession__create_game_session()
-        self.game_session._GameSession__create_game.assert_called_once()
-        self.game_session._GameSession__create_game_result.assert_called_once_with(game_id)
-        self.game_session._GameSession__get_game_metadata.assert_called_once_with(game_id)
-        self.assertEqual(self.game_session.game_field, expected_game_field)
-
-    def test_create_game(self):
-        league_id = 123
-        expected_game = MagicMock()
-
-        with patch("src.components.game.service.Game", return_value=expected_game) as mock_game:
-            mock_game.return_value.league_season_id = league_id
-            result = self.game_session._GameSession__create_game()
-            mock_game.assert_called_once()
-            self.db_session.add.assert_called_once_with(expected_game)
-            self.db_session.flush.assert_called_once()
-            self.db_session.refresh.assert_called_once_with(expected_game)
-            self.assertEqual(result, expected_game)
-
-    @patch("src.components.game.service.randint", return_value=0)
-    def test_create_game_result(self, _):
-        game_id = 123
-        user_ids = [12, 23]
-        expected_game_results = self.game_session.chosen_players = [MagicMock(id=user_id) for user_id in user_ids]
-
-        with patch("src.components.game.service.GameResult", side_effect=expected_game_results) as mock_game_result:
-            symbols = self.game_session.symbols[:]
-            self.game_session._GameSession__create_game_result(game_id)
-            self.game_session.symbols = symbols
-            calls = [
-                call(game_id=game_id, user_id=user_id, symbol=self.game_session._GameSession__get_symbol())
-                for user_id in user_ids
-            ]
-            mock_game_result.assert_has_calls(calls)
-            self.db_session.add_all.assert_called_once_with(expected_game_results)
-            self.db_session.commit.assert_called_once()
-
-    @patch("src.components.game.service.input", side_effect=["0,0"])  # Simulate user input
+        league, chosen_players, game_results = self.game_session.repository.create_game.call_args.args
+        self.assertEqual(league, self.league)
+        self.assertEqual(chosen_players, users)
+        self.assertEqual([(i.user_id, i.symbol) for i in game_results], [(12, "o"), (23, "x")])
+        self.assertEqual(self.game_session.game_metadata, game_metadata)
+        self.assertEqual(self.game_session.game_field, GameField(game_metadata))
+
+    @patch("src.components.game.player.input", side_effect=["0,0"])  # Simulate user input
     @patch("src.components.game.service.GameField.set_cell_value", return_value=MagicMock(is_end=True))
     def test_game_session(self, mock_set_cell_value, _):
         next_player = 0
@@ -94,6 +130,61 @@ class TestGameSession(unittest.TestCase):
         mock_set_cell_value.assert_called_once_with(x_coordinate=0, y_coordinate=0, value="x")
         result.assert_not_called()
 
+    def test_game_session_with_scripted_players(self):
+        users = [MagicMock(id=12, nickname="User1"), MagicMock(id=23, nickname="User2")]
+        self.game_session.game_metadata = [
+            MagicMock(User=user, GameResult=MagicMock(symbol=symbol)) for user, symbol in zip(users, "xo")
+        ]
+        self.game_session.game_field = GameField(game_metadata=self.game_session.game_metadata)
+        self.game_session.chosen_players = users
+        self.game_session.players = {
+            users[0].id: ScriptedPlayer([(0, 0), None, (1, 1), (2, 2)]),
+            users[1].id: ScriptedPlayer([(0, 0), (0, 1), (0, 2)]),
+        }
+        with patch("src.components.game.service.print") as mock_print, patch("src.components.game.model.print"):
+            result = self.game_session._GameSession__game_session(0)
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, users[0])
+        self.assertEqual(self.db_session.add_all.call_count, 5)
+        mock_print.assert_called_with("\n        User1 wins!")
+
+    def test_game_session_without_rendering(self):
+        users = [MagicMock(id=12, nickname="User1"), MagicMock(id=23, nickname="User2")]
+        self.game_session = GameSession(self.db_session, self.league, render=False)
+        self.game_session.game_metadata = [
+            MagicMock(User=user, GameResult=MagicMock(symbol=symbol)) for user, symbol in zip(users, "xo")
+        ]
+        self.game_session.game_field = GameField(game_metadata=self.game_session.game_metadata)
+        self.game_session.chosen_players = users
+        self.game_session.players = {
+            users[0].id: ScriptedPlayer([(0, 0), (1, 1), (0, 1), (2, 0), (1, 2)]),
+            users[1].id: ScriptedPlayer([(0, 2), (2, 2), (1, 0), (2, 1)]),
+        }
+        with patch("src.components.game.service.print") as mock_print, patch(
+            "src.components.game.service.click"
+        ) as mock_click, patch("src.components.game.model.print") as mock_model_print:
+            result = self.game_session._GameSession__game_session(0)
+        self.assertTrue(result.is_end)
+        self.assertIsNone(result.winner)
+        mock_print.assert_not_called()
+        mock_click.clear.assert_not_called()
+        mock_model_print.assert_not_called()
+
+    def test_game_session_forfeit_after_wrong_choices(self):
+        users = [MagicMock(id=12, nickname="User1"), MagicMock(id=23, nickname="User2")]
+        self.game_session.game_metadata = [
+            MagicMock(User=user, GameResult=MagicMock(symbol=symbol)) for user, symbol in zip(users, "xo")
+        ]
+        self.game_session.game_field = GameField(game_metadata=self.game_session.game_metadata)
+        self.game_session.chosen_players = users
+        self.game_session.players = {users[0].id: ScriptedPlayer([]), users[1].id: ScriptedPlayer([])}
+        with patch("src.components.game.service.print"):
+            result = self.game_session._GameSession__game_session(0)
+        self.assertIsInstance(result, GameState)
+        self.assertTrue(result.is_end)
+        self.assertEqual(result.winner, users[1])
+        self.db_session.add.assert_not_called()
+
     def test_save_user_decision(self):
         user = MagicMock()
         user.id = 123
@@ -112,31 +203,58 @@ class TestGameSession(unittest.TestCase):
         expected_game_user_decision = GameUserDecision(
             game_id=game_id, user_id=user.id, coordinate_x=cell_item[0], coordinate_y=cell_item[1]
         )
-        self.db_session.add.assert_called_once()
+        self.db_session.add_all.assert_called_once()
         self.db_session.commit.assert_called_once()
-        game_user_decision = self.db_session.add.mock_calls[0].args[0]
+        (game_user_decision,) = self.db_session.add_all.mock_calls[0].args[0]
         self.assertIsInstance(game_user_decision, expected_game_user_decision.__class__)
         game_user_decision_attributes = game_user_decision.__dict__
         game_user_decision_attributes.pop("_sa_instance_state")
         for key, value in game_user_decision_attributes.items():
             self.assertEqual(getattr(expected_game_user_decision, key), value)
 
+    def test_save_user_decision_write_behind(self):
+        user = MagicMock(id=123)
+        journal = MagicMock()
+        self.game_session = GameSession(self.db_session, self.league, write_behind=True, journal=journal)
+        self.game_session.game_metadata = [MagicMock(User=user, Game=MagicMock(id=456), GameResult=MagicMock())]
+        for cell_item in [(0, 0), (1, 1)]:
+            self.game_session._GameSession__save_user_decision(user, cell_item)
+        self.db_session.add_all.assert_not_called()
+        self.db_session.commit.assert_not_called()
+        self.assertEqual(journal.append.call_count, 2)
+        self.game_session._GameSession__summarise()
+        self.assertEqual(len(self.db_session.add_all.call_args.args[0]), 2)
+        self.db_session.commit.assert_called_once()
+        journal.truncate.assert_called_once()
+
+    def test_save_user_decision_write_behind_flush_every(self):
+        user = MagicMock(id=123)
+        self.game_session = GameSession(self.db_session, self.league, write_behind=True, flush_every=2)
+        self.game_session.game_metadata = [MagicMock(User=user, Game=MagicMock(id=456))]
+        for cell_item in [(0, 0), (1, 1), (2, 2)]:
+            self.game_session._GameSession__save_user_decision(user, cell_item)
+        self.db_session.add_all.assert_called_once()
+        self.db_session.commit.assert_called_once()
+        self.assertEqual(len(self.game_session.pending_decisions), 1)
+
     def test_summarise(self):
         user1 = MagicMock()
         user2 = MagicMock()
+        game = MagicMock(league_season_id=self.league.id)
         game_metadata = [
-            MagicMock(User=user1, GameResult=MagicMock(is_winner=False)),
-            MagicMock(User=user2, GameResult=MagicMock(is_winner=True)),
+            MagicMock(Game=game, User=user1, GameResult=MagicMock(is_winner=False)),
+            MagicMock(Game=game, User=user2, GameResult=MagicMock(is_winner=True)),
         ]
 
         self.game_session.game_metadata = game_metadata
+        self.game_session.chosen_players = [user1, user2]
         self.game_session.game_state.winner = user2
-        self.game_session._GameSession__summarise()
-        expected_calls = [call(MagicMock(name="mock.GameResult", is_winner=is_winner)) for is_winner in [False, True]]
-        self.assertEqual(
-            list(map(lambda x: x.args[0].is_winner, self.db_session.add.call_args_list)),
-            list(map(lambda x: x.args[0].is_winner, expected_calls)),
+        with patch("src.database.repository.sql.update_league_standings") as mock_update_league_standings:
+            self.game_session._GameSession__summarise()
+        mock_update_league_standings.assert_called_once_with(
+            self.db_session, self.league.id, [user1.id, user2.id], user2.id
         )
+        self.assertEqual([i["is_winner"] for i in self.db_session.execute.call_args.args[1]], [False, True])
         self.db_session.commit.assert_called_once()
 
 
@@ -155,7 +273,7 @@ class TestGameService(unittest.TestCase):
 
         self.assertEqual(result, existing_league)
 
-    @patch("src.components.management.service.input", side_effect=["Test League"])
+    @patch("src.components.management.service.input", side_effect=["Test League", "", "", ""])
     def test_check_exists_league_not_existing(self, _):
         mock_query = MagicMock(side_effect=[None, MagicMock()])
         self.db_session.query.return_value.order_by.return_value.limit.return_value.one_or_none = mock_query
@@ -173,7 +291,9 @@ class TestGameService(unittest.TestCase):
 
     def test_check_players_number_enough(self):
         enough_players = [MagicMock() for _ in range(REQUIRED_PLAYERS_NUMBER)]
-        self.db_session.query.return_value.all.return_value = enough_players
+        self.db_session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = (
+            enough_players
+        )
         result = self.game_service._GameService__check_players_number()
         self.assertEqual(result, enough_players)
 
@@ -185,7 +305,7 @@ class TestGameService(unittest.TestCase):
         not_enough_players = [MagicMock()]
         enough_players = [MagicMock(), MagicMock()]
         mock_query = MagicMock(side_effect=[not_enough_players, enough_players])
-        self.db_session.query.return_value.all = mock_query
+        self.db_session.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all = mock_query
 
         with patch("src.components.game.service.print") as mock_print:
             self.game_service._GameService__check_players_number()
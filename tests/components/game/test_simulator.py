@@ -0,0 +1,222 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import click
+
+from src.components.game.model import MOVE_TIME_LIMIT
+from src.components.game.player import (
+    ComputerPlayer,
+    MctsPlayer,
+    RandomPlayer,
+    ScriptedPlayer,
+)
+from src.components.game.replay import iter_replays
+from src.components.game.simulator import (
+    SimulationTask,
+    find_league_season,
+    make_player,
+    open_command_session,
+    parse_script,
+    percentile,
+    persist_snapshots,
+    prepare_simulation,
+    run_simulation,
+    split_games,
+)
+from src.database import delete_session, make_engine, make_session
+from src.database.model.base import Base
+from src.database.model.game import Game, GameResult, GameUserDecision, LeagueSeason
+from src.database.rating import check_league_ratings
+from src.database.standing import check_league_standings
+
+
+class TestRandomPlayer(unittest.TestCase):
+    def test_choose_empty_cell(self):
+        game_field = MagicMock(size=3)
+        game_field.get_marks.return_value = (0b101010101, 0b010101010)
+        self.assertIsNone(RandomPlayer(0).choose_move(game_field, "x"))
+        game_field.get_marks.return_value = (0b101010101, 0b000101010)
+        self.assertEqual(RandomPlayer(0).choose_move(game_field, "x"), (2, 1))
+
+
+class TestSimulator(unittest.TestCase):
+    def test_parse_script(self):
+        self.assertEqual(parse_script("1,1 0,2", 3), [(1, 1), (0, 2)])
+        self.assertEqual(len(parse_script("", 4)), 16)
+        with self.assertRaises(ValueError):
+            parse_script("1;1", 3)
+
+    def test_make_player(self):
+        league = MagicMock(field_size=3, win_length=3, move_time_limit=None)
+        self.assertIsInstance(make_player("random", league, 0, None), RandomPlayer)
+        player = make_player("solver", league, 0, None)
+        self.assertIsInstance(player, ComputerPlayer)
+        # The league without the time limit gets the default one like the games of the menu
+        self.assertEqual(player.time_limit, MOVE_TIME_LIMIT / 1000)
+        self.assertIsInstance(make_player("scripted", league, 0, None), ScriptedPlayer)
+        player = make_player("mcts", MagicMock(field_size=15, win_length=5), 0, None, 50)
+        self.assertIsInstance(player, MctsPlayer)
+        self.assertEqual((player.tree_search.size, player.iterations), (15, 50))
+        with self.assertRaises(ValueError):
+            make_player("solver", MagicMock(field_size=15, win_length=5), 0, None)
+
+    def test_split_games(self):
+        self.assertEqual(split_games(10, 4), [3, 3, 2, 2])
+        self.assertEqual(split_games(2, 4), [1, 1])
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 0.5), 50.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_find_league_season(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_url = f"sqlite:///{os.path.join(directory, 'db')}"
+            with open_command_session({"db_url": db_url}) as db_session:
+                Base.metadata.create_all(db_session.get_bind())
+                with self.assertRaises(ValueError):
+                    find_league_season(db_session, None)
+                db_session.add_all(LeagueSeason(name=f"League{i}", field_size=3, win_length=3) for i in range(2))
+                db_session.commit()
+                self.assertEqual(find_league_season(db_session, None).name, "League1")
+                self.assertEqual(find_league_season(db_session, 1).name, "League0")
+                with self.assertRaises(ValueError):
+                    find_league_season(db_session, 3)
+            # The errors of the arguments are reported as the usage errors of the command
+            with self.assertRaises(click.UsageError):
+                with open_command_session({"db_url": db_url}) as db_session:
+                    find_league_season(db_session, 3)
+
+    def test_run_simulation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_url = f"sqlite:///{os.path.join(directory, 'db')}"
+            db_engine = make_engine({"db_url": db_url})
+            Base.metadata.create_all(db_engine)
+            db_session = make_session(db_engine)
+            db_session.add(LeagueSeason(name="Simulation", field_size=3, win_length=3))
+            db_session.commit()
+            league_id, user_ids = prepare_simulation(db_session, None)
+
+            report = run_simulation(
+                SimulationTask(
+                    db_url=db_url, league_id=league_id, user_ids=user_ids, strategies=("solver", "random"), games=5
+                )
+            )
+
+            self.assertEqual(report.games, 5)
+            self.assertEqual(report.first_wins + report.second_wins + report.draws, 5)
+            self.assertEqual(report.second_wins, 0)
+            self.assertEqual(db_session.query(Game).count(), 5)
+            self.assertEqual(db_session.query(GameUserDecision).count(), report.moves)
+            self.assertEqual(len(report.write_latencies), report.moves + 10)
+            delete_session(db_session)
+            db_engine.dispose()
+
+    def test_run_simulation_parallel(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_url = f"sqlite:///{os.path.join(directory, 'db')}"
+            db_engine = make_engine({"db_url": db_url})
+            Base.metadata.create_all(db_engine)
+            db_session = make_session(db_engine)
+            db_session.add(LeagueSeason(name="Simulation", field_size=3, win_length=3))
+            db_session.commit()
+            league_id, user_ids = prepare_simulation(db_session, None)
+            tasks = [
+                SimulationTask(
+                    db_url=db_url,
+                    league_id=league_id,
+                    user_ids=user_ids,
+                    strategies=("random", "random"),
+                    games=20,
+                    seed=seed,
+                )
+                for seed in range(2)
+            ]
+
+            with multiprocessing.Pool(len(tasks)) as pool:
+                reports = pool.map(run_simulation, tasks)
+
+            self.assertEqual(db_session.query(Game).count(), sum(i.games for i in reports))
+            self.assertEqual(check_league_standings(db_session), [])
+            # The games of the workers are replayed in the order they were finished
+            self.assertEqual(check_league_ratings(db_session), [])
+            delete_session(db_session)
+            db_engine.dispose()
+
+    def test_run_simulation_in_memory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_url = f"sqlite:///{os.path.join(directory, 'db')}"
+            db_engine = make_engine({"db_url": db_url})
+            Base.metadata.create_all(db_engine)
+            db_session = make_session(db_engine)
+            db_session.add(LeagueSeason(name="Simulation", field_size=3, win_length=3))
+            db_session.commit()
+            league_id, user_ids = prepare_simulation(db_session, None)
+            tasks = [
+                SimulationTask(
+                    db_url=db_url,
+                    league_id=league_id,
+                    user_ids=user_ids,
+                    strategies=("random", "random"),
+                    games=3,
+                    seed=seed,
+                    storage="memory",
+                )
+                for seed in range(2)
+            ]
+
+            reports = [run_simulation(task) for task in tasks]
+            self.assertEqual(db_session.query(Game).count(), 0)
+            counts = persist_snapshots(db_session, [j for i in reports for j in i.snapshots])
+
+            self.assertEqual(counts["game"], 6)
+            self.assertEqual(db_session.query(Game).count(), 6)
+            self.assertEqual(db_session.query(GameUserDecision).count(), sum(i.moves for i in reports))
+            self.assertEqual(check_league_standings(db_session), [])
+            # The workers rated their games from the same ratings, so the ratings are rebuilt
+            self.assertEqual(check_league_ratings(db_session), [])
+            delete_session(db_session)
+            db_engine.dispose()
+
+    def test_run_simulation_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            db_url = f"sqlite:///{os.path.join(directory, 'db')}"
+            db_engine = make_engine({"db_url": db_url})
+            Base.metadata.create_all(db_engine)
+            db_session = make_session(db_engine)
+            db_session.add(LeagueSeason(name="Simulation", field_size=4, win_length=3))
+            db_session.commit()
+            league_id, user_ids = prepare_simulation(db_session, None)
+            task = SimulationTask(
+                db_url=db_url,
+                league_id=league_id,
+                user_ids=user_ids,
+                strategies=("random", "random"),
+                games=30,
+                seed=0,
+                engine="batch",
+            )
+
+            with patch("src.components.game.simulator.BATCH_SIZE", 7):
+                report = run_simulation(task)
+
+            self.assertEqual(report.games, 30)
+            self.assertEqual(report.first_wins + report.second_wins + report.draws, 30)
+            self.assertEqual(db_session.query(Game).count(), 30)
+            self.assertEqual(db_session.query(GameUserDecision).count(), report.moves)
+            # One commit per batch of 7 games
+            self.assertEqual(len(report.write_latencies), 5)
+            self.assertEqual(check_league_standings(db_session), [])
+            replays = list(iter_replays(db_session))
+            winners = {i.game_id: i.positions[-1].winner for i in replays}
+            for game_result in db_session.query(GameResult).filter(GameResult.is_winner.is_(True)):
+                self.assertEqual(winners[game_result.game_id], game_result.symbol)
+            self.assertEqual(sum(i is None for i in winners.values()), report.draws)
+            with self.assertRaises(ValueError):
+                run_simulation(SimulationTask(**{**task.__dict__, "strategies": ("solver", "random")}))
+            delete_session(db_session)
+            db_engine.dispose()
@@ -0,0 +1,128 @@
+import random
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.components.game.model import BitboardGameField, build_win_masks
+from src.components.game.player import ComputerPlayer
+from src.components.game.solver import Solver
+
+
+def minimax(own, opponent, win_masks, full_mask):
+    """Plain minimax without pruning and caching, returns 1 win, 0 draw, -1 loss for the player to move."""
+    occupied = own | opponent
+    if occupied == full_mask:
+        return 0
+    best = -1
+    for cell in range(len(win_masks)):
+        bit = 1 << cell
+        if occupied & bit:
+            continue
+        if any((own | bit) & mask == mask for mask in win_masks[cell]):
+            return 1
+        best = max(best, -minimax(opponent, own | bit, win_masks, full_mask))
+    return best
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver()
+
+    def test_empty_field_is_draw(self):
+        started_at = time.perf_counter()
+        result = self.solver.solve(0, 0)
+        self.assertLess(time.perf_counter() - started_at, 1)
+        self.assertEqual(result.value, 0)
+        self.assertIsNotNone(result.move)
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(result.cache_hits, 0)
+
+    def test_takes_immediate_win(self):
+        result = self.solver.solve(0b000000011, 0b000011000)
+        self.assertEqual(result.value, 1)
+        self.assertEqual(result.move, (0, 2))
+
+    def test_blocks_opponent_win(self):
+        result = self.solver.solve(0b000010000, 0b000000011)
+        self.assertEqual(result.move, (0, 2))
+
+    def test_same_values_as_plain_minimax(self):
+        win_masks = build_win_masks(3, 3)
+        generator = random.Random(0)
+        cells = list(range(9))
+        for _ in range(100):
+            generator.shuffle(cells)
+            marks = [0, 0]
+            for ply, cell in enumerate(cells[: generator.randint(3, 6)]):
+                marks[ply % 2] |= 1 << cell
+            if any(m & mask == mask for m in marks for cell_masks in win_masks for mask in cell_masks):
+                continue
+            own, opponent = (
+                (marks[0], marks[1]) if bin(marks[0]).count("1") == bin(marks[1]).count("1") else marks[::-1]
+            )
+            self.assertEqual(self.solver.solve(own, opponent).value, minimax(own, opponent, win_masks, 0b111111111))
+
+    def test_symmetric_positions_share_transposition_table(self):
+        self.solver.solve(1 << 0, 0)
+        table_size = len(self.solver.transposition_table)
+        self.solver.solve(1 << 8, 0)
+        self.assertEqual(len(self.solver.transposition_table), table_size)
+
+    def test_iterative_deepening(self):
+        result = self.solver.solve(0b000010000, 0b000000011, time_limit=5)
+        self.assertEqual((result.move, result.value, result.exact), ((0, 2), 0, True))
+        self.assertLessEqual(result.depth, 7)
+        result = Solver(4, 4).solve(0, 0, time_limit=0.05)
+        self.assertFalse(result.exact)
+        self.assertLess(result.elapsed, 1)
+        self.assertIsNotNone(result.move)
+        self.assertGreater(result.depth, 0)
+        self.assertEqual(Solver(3, 3).solve(0b101011010, 0b010100101, time_limit=1).move, None)
+
+    def test_same_values_with_time_limit(self):
+        win_masks = build_win_masks(3, 3)
+        generator = random.Random(1)
+        cells = list(range(9))
+        for _ in range(50):
+            generator.shuffle(cells)
+            marks = [0, 0]
+            for ply, cell in enumerate(cells[: generator.randint(2, 6)]):
+                marks[ply % 2] |= 1 << cell
+            if any(m & mask == mask for m in marks for cell_masks in win_masks for mask in cell_masks):
+                continue
+            own, opponent = (
+                (marks[0], marks[1]) if bin(marks[0]).count("1") == bin(marks[1]).count("1") else marks[::-1]
+            )
+            result = Solver().solve(own, opponent, time_limit=5)
+            self.assertTrue(result.exact)
+            self.assertEqual(result.value, minimax(own, opponent, win_masks, 0b111111111))
+
+    def test_cancel(self):
+        solver = Solver(4, 4)
+        timer = threading.Timer(0.05, solver.cancel)
+        timer.start()
+        result = solver.solve(0, 0, time_limit=60)
+        timer.join()
+        self.assertLess(result.elapsed, 5)
+        self.assertFalse(result.exact)
+        self.assertIsNotNone(result.move)
+
+
+class TestComputerPlayer(unittest.TestCase):
+    def test_choose_move(self):
+        game_metadata = [
+            MagicMock(User=MagicMock(nickname="User1"), GameResult=MagicMock(symbol="x")),
+            MagicMock(User=MagicMock(nickname="User2"), GameResult=MagicMock(symbol="o")),
+        ]
+        game_field = BitboardGameField(game_metadata)
+        for x_coordinate, y_coordinate, value in [(0, 0, "x"), (1, 1, "o"), (0, 1, "x")]:
+            game_field.set_cell_value(x_coordinate, y_coordinate, value)
+        player = ComputerPlayer(Solver())
+        self.assertEqual(player.choose_move(game_field, "o"), (0, 2))
+        self.assertEqual(player.last_result.value, 0)
+        player = ComputerPlayer(Solver(), time_limit=1)
+        with self.assertLogs("src.components.game.player", "INFO") as logs:
+            self.assertEqual(player.choose_move(game_field, "o"), (0, 2))
+        self.assertIn("depth", logs.output[0])
+        self.assertIn("nodes/s", logs.output[0])
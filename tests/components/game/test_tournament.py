@@ -0,0 +1,133 @@
+import unittest
+from itertools import combinations
+from unittest.mock import patch
+
+from src.components.game.tournament import (
+    PairingTask,
+    create_tournament,
+    get_tournament_standings,
+    make_round_robin,
+    make_swiss_round,
+    pair_players,
+    parse_player,
+    play_pairing,
+    run_tournament,
+    schedule_round,
+    write_outcomes,
+)
+from src.database.model.game import Game, GameUserDecision, LeagueSeason
+from src.database.model.tournament import TournamentPairing
+from src.database.model.user import User
+from src.database.standing import check_league_standings
+from tests.database import DatabaseTestMixin
+
+
+class TestPairings(unittest.TestCase):
+    def test_parse_player(self):
+        self.assertEqual(parse_player("12:mcts"), (12, "mcts"))
+        with self.assertRaises(ValueError):
+            parse_player("12:scripted")
+        with self.assertRaises(ValueError):
+            parse_player("mcts")
+
+    def test_make_round_robin(self):
+        rounds = make_round_robin([1, 2, 3, 4, 5], cycles=2)
+        self.assertEqual(len(rounds), 10)
+        games = [(first, second) for pairings in rounds for first, second in pairings if second is not None]
+        self.assertEqual(len(games), 20)
+        self.assertEqual({frozenset(i) for i in games[:10]}, {frozenset(i) for i in combinations(range(1, 6), 2)})
+        # The second cycle swaps the first moves
+        self.assertEqual(sorted(games[10:]), sorted((second, first) for first, second in games[:10]))
+        for pairings in rounds[:5]:
+            players = [j for i in pairings for j in i if j is not None]
+            self.assertEqual(sorted(players), [1, 2, 3, 4, 5])
+            self.assertEqual(sum(second is None for _, second in pairings), 1)
+        self.assertEqual({j for i in rounds[:5] for j, second in i if second is None}, {1, 2, 3, 4, 5})
+
+    def test_make_swiss_round(self):
+        pairings = make_swiss_round([1, 2, 3, 4, 5], {frozenset((1, 2))}, {5}, {1: 1, 3: 1})
+        self.assertEqual(pairings[-1], (4, None))
+        self.assertEqual(pairings[:-1], [(1, 3), (2, 5)])
+        self.assertIsNone(pair_players([1, 2], {frozenset((1, 2))}))
+        # The pairs are repeated only if there are no other ones
+        self.assertEqual(make_swiss_round([1, 2], {frozenset((1, 2))}, set(), {1: 1}), [(2, 1)])
+
+    def test_play_pairing(self):
+        outcome = play_pairing(PairingTask(7, (1, 2), ("solver", "random"), 3, 3, seed=0))
+        self.assertEqual(outcome.pairing_id, 7)
+        self.assertIn(outcome.winner_id, (1, None))
+        self.assertEqual(len(set(outcome.cells)), len(outcome.cells))
+        outcome = play_pairing(PairingTask(7, (1, 2), ("random", "solver"), 3, 3, seed=0))
+        self.assertIn(outcome.winner_id, (2, None))
+
+
+class TestTournament(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.league = LeagueSeason(name="Tournament", field_size=3, win_length=3)
+        self.db_session.add(self.league)
+        self.db_session.add_all(User(nickname=f"Player{i}") for i in range(5))
+        self.db_session.commit()
+        self.user_ids = [i.id for i in self.db_session.query(User).order_by(User.id)]
+
+    def test_create_tournament(self):
+        with self.assertRaises(ValueError):
+            create_tournament(self.db_session, self.league, [(self.user_ids[0], "random")])
+        with self.assertRaises(ValueError):
+            create_tournament(self.db_session, self.league, [(self.user_ids[0], "random"), (100, "random")])
+        with self.assertRaises(ValueError):
+            create_tournament(self.db_session, self.league, [(i, "random") for i in self.user_ids], "knockout")
+        tournament = create_tournament(self.db_session, self.league, [(i, "random") for i in self.user_ids], "swiss")
+        self.assertEqual(tournament.rounds, 3)
+        self.assertEqual(self.db_session.query(TournamentPairing).count(), 0)
+
+    def test_run_round_robin(self):
+        players = [(i, "solver" if i == self.user_ids[0] else "random") for i in self.user_ids]
+        tournament = create_tournament(self.db_session, self.league, players, seed=0)
+        self.assertEqual(tournament.rounds, 5)
+
+        report = run_tournament(self.db_session, tournament, batch_size=3)
+
+        self.assertEqual((report.rounds, report.pairings, report.games), (5, 10, 10))
+        self.assertEqual(report.transactions, 5)
+        self.assertEqual(self.db_session.query(Game).count(), 10)
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), report.moves)
+        self.assertEqual(check_league_standings(self.db_session), [])
+        self.assertIsNone(schedule_round(self.db_session, tournament))
+        standings = get_tournament_standings(self.db_session, tournament.id)
+        self.assertEqual(standings[0].nickname, "Player0")
+        self.assertEqual(standings[0].losses, 0)
+        # Every player has four games and a bye
+        self.assertEqual({i.games for i in standings}, {5})
+        self.assertEqual(sum(i.score for i in standings), (10 + 5) * 2)
+
+    def test_resume_swiss(self):
+        tournament = create_tournament(
+            self.db_session, self.league, [(i, "random") for i in self.user_ids], "swiss", rounds=2, seed=0
+        )
+        self.assertEqual(schedule_round(self.db_session, tournament), 1)
+        self.assertEqual(schedule_round(self.db_session, tournament), 1)
+
+        written = []
+
+        def write_once(*args):
+            if written:
+                raise KeyboardInterrupt
+            written.append(args)
+            return write_outcomes(*args)
+
+        with patch("src.components.game.tournament.write_outcomes", side_effect=write_once):
+            with self.assertRaises(KeyboardInterrupt):
+                run_tournament(self.db_session, tournament, batch_size=1)
+        self.db_session.rollback()
+        self.assertEqual(self.db_session.query(Game).count(), 1)
+
+        report = run_tournament(self.db_session, tournament, batch_size=1)
+
+        self.assertEqual((report.rounds, report.pairings, report.games, report.transactions), (2, 3, 3, 3))
+        pairings = self.db_session.query(TournamentPairing).all()
+        self.assertEqual(len(pairings), 6)
+        self.assertEqual(len({frozenset((i.first_user_id, i.second_user_id)) for i in pairings}), 6)
+        self.assertEqual(len({i.first_user_id for i in pairings if i.second_user_id is None}), 2)
+        self.assertEqual(self.db_session.query(Game).count(), 4)
+        self.assertEqual(sum(i.games for i in get_tournament_standings(self.db_session, tournament.id)), 10)
@@ -15,23 +15,53 @@ class TestMainMenuService(unittest.TestCase):
         last_league_season = MagicMock()
         last_league_season.name = "Test League Season"
         self.menu_service.get_last_league_season = MagicMock(return_value=last_league_season)
+        past_games = [
+            MagicMock(players="User1 vs User2", winner="User1"),
+            MagicMock(players="User2 vs User1", winner=None),
+            MagicMock(players="User1 vs User2", winner="User2"),
+        ]
+        self.menu_service.repository = MagicMock()
+        self.menu_service.repository.get_past_games.return_value = past_games
         with patch("src.components.main_menu.service.print") as mock_print:
-            self.menu_service.show_past_games_statistic()
+            has_next_page = self.menu_service.show_past_games_statistic(page=2, page_size=2)
+        self.assertTrue(has_next_page)
+        self.menu_service.repository.get_past_games.assert_called_once_with(last_league_season.id, 2, 2)
         table = PrettyTable()
         table.field_names = ["Players", "Result"]
+        table.add_rows([["User1 vs User2", "User1 is winner"], ["User2 vs User1", "Played a draw"]])
         self.assertEqual(
             list(map(lambda x: str(x.args[0]), mock_print.call_args_list)),
-            [f"\n        Statistic for the games from league season: {last_league_season.name}", str(table), "\n"],
+            [
+                f"\n        Statistic for the games from league season: {last_league_season.name}, page 2",
+                str(table),
+                "\n",
+            ],
         )
 
     def test_show_ranking_table(self):
         last_league_season = MagicMock()
         self.menu_service.get_last_league_season = MagicMock(return_value=last_league_season)
-        game_result_list = [MagicMock(), MagicMock()]
-        self.menu_service._MainMenuService__get_game_result_list = MagicMock(return_value=game_result_list)
+        ranking = [
+            MagicMock(nickname="User1", total_games=3, win=2, loss=1, draw=0, pts=5, rating=1516.4),
+            MagicMock(nickname="User2", total_games=3, win=1, loss=1, draw=1, pts=4, rating=1499.6),
+        ]
+        self.menu_service.repository = MagicMock()
+        self.menu_service.repository.get_ranking.return_value = ranking
         with patch("src.components.main_menu.service.print") as mock_print:
-            self.menu_service.show_ranking_table()
-        mock_print.assert_called()
+            self.menu_service.show_ranking_table(limit=2)
+        self.menu_service.repository.get_ranking.assert_called_once_with(last_league_season.id, None, 2)
+        table = PrettyTable()
+        table.field_names = ["Nickname", "Total", "Win", "Loss", "Draw", "Pts", "Rating"]
+        table.add_rows([["User1", 3, 2, 1, 0, 5, 1516], ["User2", 3, 1, 1, 1, 4, 1500]])
+        self.assertEqual(str(mock_print.call_args_list[0].args[0]), str(table))
+
+    def test_show_ranking_table_user_without_games(self):
+        self.menu_service.get_last_league_season = MagicMock(return_value=MagicMock())
+        self.menu_service.repository = MagicMock()
+        self.menu_service.repository.get_ranking.return_value = []
+        with patch("src.components.main_menu.service.print") as mock_print:
+            self.menu_service.show_ranking_table(MagicMock(nickname="User1"))
+        self.assertIn("User1", str(mock_print.call_args_list[0].args[0]))
 
     def test_get_last_league_season_existing(self):
         existing_league_season = MagicMock()
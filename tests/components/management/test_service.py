@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.components.game.model import UserSummaryType
+from src.components.management.controller import Management
+from src.components.management.service import ManagementService
+from src.components.utility.controller import Utility
+from src.database.model.game import GameResult, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.database.repository import MemoryRepository
+
+
+class TestManagementService(unittest.TestCase):
+    def setUp(self):
+        self.db_session = MagicMock()
+        self.management_service = ManagementService(self.db_session)
+        self.management_service.repository = MagicMock()
+        self.handler = MagicMock()
+
+    def test_show_player_list(self):
+        self.management_service.repository.get_user_page.return_value = [
+            UserSummaryType(i, f"User{i}") for i in (3, 5, 8)
+        ]
+        result = self.management_service.show_player_list(
+            self.handler, Management, "player_details", "player_list", 1, page_size=2
+        )
+        self.management_service.repository.get_user_page.assert_called_once_with(1, 3, "")
+        self.assertEqual(
+            [(i.id, i.name, i.component, i.method, i.kwargs) for i in result],
+            [
+                (0, "User3", Management, "player_details", {"user_id": 3}),
+                (1, "User5", Management, "player_details", {"user_id": 5}),
+                (2, "Next page", Management, "player_list", {"after_id": 5, "nickname_prefix": ""}),
+                (3, "First page", Management, "player_list", {"nickname_prefix": ""}),
+                (4, "Search by nickname", Management, "player_list", {"search": True}),
+                (5, "Previous", Utility, "previous_menu_item", {}),
+            ],
+        )
+        self.assertTrue(all(i.parent is self.handler for i in result))
+
+    def test_show_player_list_search(self):
+        self.management_service.repository.get_user_page.return_value = [UserSummaryType(4, "Alice")]
+        with patch("src.components.management.service.print"):
+            result = self.management_service.show_player_list(
+                self.handler, Management, "player_delete_confirmation", "player_delete", nickname_prefix="Al"
+            )
+        self.assertEqual(
+            [i.name for i in result],
+            ["Alice", "Search by nickname", "Previous"],
+        )
+
+    def test_show_player_details_replay(self):
+        repository = MemoryRepository()
+        league = LeagueSeason(name="League", field_size=3, win_length=3)
+        repository.add_league_season(league)
+        users = [User(nickname=f"User{i}") for i in range(2)]
+        for user in users:
+            repository.add_user(user)
+        game_metadata = repository.create_game(
+            league, users, [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(users, "xo")]
+        )
+        repository.add_decisions(
+            [GameUserDecision(game_id=game_metadata[0].Game.id, user_id=users[1].id, coordinate_x=1, coordinate_y=1)]
+        )
+        repository.finish_game(game_metadata, None)
+        management_service = ManagementService(self.db_session, repository)
+        with patch("src.components.management.service.input") as mock_input, patch(
+            "src.components.management.service.print"
+        ), patch("src.components.main_menu.service.print"), patch("src.components.management.service.plot"):
+            result = management_service.show_player_details(self.handler, Management, users[0])
+        # The details are shown without waiting for an input, the replay is a menu item
+        mock_input.assert_not_called()
+        self.assertEqual(
+            [(i.name, i.component, i.method, i.kwargs) for i in result],
+            [
+                ("Replay last game", Management, "player_replay", {"user_id": users[0].id}),
+                ("Previous", Utility, "previous_menu_item", {}),
+            ],
+        )
+        with patch("src.components.management.service.input", return_value="") as mock_input, patch(
+            "src.components.management.service.print"
+        ), patch("src.components.game.replay.print"):
+            management_service.replay_last_game(users[0])
+        # The last game is replayed from the repository, not from the database of the session
+        mock_input.assert_called_once_with("Enter the ply to show (0-1), empty to finish: ")
+        self.db_session.query.assert_not_called()
+        with patch("src.components.management.service.print"), patch("src.components.main_menu.service.print"), patch(
+            "src.components.management.service.plot"
+        ):
+            result = management_service.show_player_details(self.handler, Management, User(id=9, nickname="User9"))
+        self.assertEqual([i.name for i in result], ["Previous"])
+        with patch("src.components.management.service.print") as mock_print:
+            management_service.replay_last_game(User(id=9, nickname="User9"))
+        mock_print.assert_called_once_with("\n        There are no games of User9")
+
+    def test_get_user(self):
+        user = MagicMock()
+        self.management_service.repository.get_user.side_effect = {1: user}.get
+        self.assertEqual(self.management_service.get_user(1), user)
+        with patch("src.components.management.service.print") as mock_print:
+            self.assertIsNone(self.management_service.get_user(2))
+        mock_print.assert_called_once_with("\n        There is no user 2")
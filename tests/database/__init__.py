@@ -0,0 +1,25 @@
+import os
+import tempfile
+from typing import Any, Dict
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.base import Base
+
+
+class DatabaseTestMixin:
+    """
+    Creates the tables in a SQLite database of a temporary directory and a session of it before every test, they are
+     removed after the test. The options of the session are taken from session_options.
+    """
+
+    session_options: Dict[str, Any] = {}
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+        self.db_engine = make_engine({"db_url": f"sqlite:///{os.path.join(self.directory.name, 'db')}"})
+        self.addCleanup(self.db_engine.dispose)
+        Base.metadata.create_all(self.db_engine)
+        self.db_session = make_session(self.db_engine, **self.session_options)
+        self.addCleanup(delete_session, self.db_session)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import update
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
+
+from src.database import delete_session, make_engine, make_session
+from src.database.model.base import Base
+from src.database.model.user import User
+
+
+class TestMakeEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_url = f"sqlite:///{os.path.join(self.directory.name, 'db')}"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_pragmas(self, db_engine):
+        with db_engine.connect() as connection:
+            result = {
+                pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                for pragma in ("journal_mode", "synchronous", "cache_size", "busy_timeout")
+            }
+        db_engine.dispose()
+        return result
+
+    def test_performance_profile(self):
+        db_engine = make_engine({"db_url": self.db_url})
+        self.assertIsInstance(db_engine.pool, QueuePool)
+        self.assertEqual(
+            self.get_pragmas(db_engine),
+            {"journal_mode": "wal", "synchronous": 1, "cache_size": -65536, "busy_timeout": 5000},
+        )
+
+    def test_sqlite_defaults(self):
+        db_engine = make_engine(
+            {"db_url": self.db_url, "db_pool": "null", "db_journal_mode": "", "db_synchronous": "", "db_cache_size": ""}
+        )
+        self.assertIsInstance(db_engine.pool, NullPool)
+        pragmas = self.get_pragmas(db_engine)
+        self.assertEqual(pragmas["journal_mode"], "delete")
+        self.assertEqual(pragmas["synchronous"], 2)
+
+    def test_static_pool(self):
+        db_engine = make_engine({"db_url": "sqlite://", "db_pool": "static"})
+        self.assertIsInstance(db_engine.pool, StaticPool)
+        with db_engine.connect() as connection:
+            connection.exec_driver_sql("CREATE TABLE item (id INTEGER)")
+        with db_engine.connect() as connection:
+            self.assertEqual(connection.exec_driver_sql("SELECT COUNT(*) FROM item").scalar(), 0)
+        db_engine.dispose()
+
+    def test_unknown_pool(self):
+        with self.assertRaises(ValueError):
+            make_engine({"db_url": self.db_url, "db_pool": "other"})
+
+
+class TestMakeSession(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_engine = make_engine({"db_url": f"sqlite:///{os.path.join(self.directory.name, 'db')}"})
+        Base.metadata.create_all(self.db_engine)
+
+    def tearDown(self):
+        self.db_engine.dispose()
+        self.directory.cleanup()
+
+    def update_nickname(self, **kwargs):
+        db_session = make_session(self.db_engine, **kwargs)
+        user = User(nickname="User")
+        db_session.add(user)
+        db_session.commit()
+        # The standings and the ratings are updated by the Core statements in the same way
+        db_session.execute(update(User.__table__).where(User.id == user.id).values(nickname="Renamed"))
+        db_session.commit()
+        result = user.nickname
+        delete_session(db_session)
+        return result
+
+    def test_expire_on_commit(self):
+        # The menus read the rows changed by the Core statements after the commit
+        self.assertEqual(self.update_nickname(), "Renamed")
+        # The sessions of the games keep the objects in hand
+        self.assertEqual(self.update_nickname(expire_on_commit=False), "User")
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.database import delete_session, make_engine, make_session
+from src.database.journal import MoveJournal
+from src.database.model.base import Base
+from src.database.model.game import Game, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.database.moves import decode_moves, encode_moves
+
+
+class TestMoveJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "journal")
+        self.journal = MoveJournal(self.path, sync=False)
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def test_append_and_read(self):
+        self.journal.append(1, 2, 0, 1, 0)
+        self.journal.append(1, 3, 1, 1, 1)
+        self.assertEqual(self.journal.read(), [(1, 2, 0, 1, 0), (1, 3, 1, 1, 1)])
+
+    def test_torn_record_is_skipped(self):
+        self.journal.append(1, 2, 0, 1, 0)
+        with open(self.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write("1,3,1")
+        self.assertEqual(self.journal.read(), [(1, 2, 0, 1, 0)])
+
+    def test_truncate(self):
+        self.journal.append(1, 2, 0, 1, 0)
+        self.journal.truncate()
+        self.journal.append(5, 2, 2, 2, 0)
+        self.assertEqual(self.journal.read(), [(5, 2, 2, 2, 0)])
+
+    def make_db_session(self):
+        db_engine = make_engine({"db_url": f"sqlite:///{os.path.join(self.directory.name, 'db')}"})
+        Base.metadata.create_all(db_engine)
+        db_session = make_session(db_engine)
+        self.addCleanup(db_engine.dispose)
+        self.addCleanup(delete_session, db_session)
+        db_session.add(LeagueSeason(id=1, name="League", field_size=3, win_length=3))
+        db_session.add_all(User(id=i, nickname=f"User{i}") for i in (2, 3))
+        db_session.add_all(
+            [
+                Game(id=1, league_season_id=1),
+                Game(id=7, league_season_id=1, moves=encode_moves([(0, 0)], 3), first_user_id=2),
+                Game(id=8, league_season_id=1),
+            ]
+        )
+        db_session.add(GameUserDecision(game_id=1, user_id=2, coordinate_x=0, coordinate_y=0))
+        db_session.commit()
+        return db_session
+
+    def test_replay_skips_stored_decisions(self):
+        db_session = self.make_db_session()
+        for record in [(1, 2, 0, 0, 0), (1, 3, 1, 1, 1), (7, 2, 0, 0, 0), (7, 3, 1, 1, 1), (1, 2, 2, 2, 2)]:
+            self.journal.append(*record)
+        self.assertEqual(self.journal.replay(db_session), 3)
+        self.assertEqual(
+            [(i.game_id, i.coordinate_x, i.coordinate_y) for i in db_session.query(GameUserDecision)],
+            [(1, 0, 0), (1, 1, 1), (1, 2, 2)],
+        )
+        # The moves of the compact game are appended to its encoded moves
+        game = db_session.get(Game, 7)
+        self.assertEqual((decode_moves(game.moves, 3), game.first_user_id), ([(0, 0), (1, 1)], 2))
+        self.assertEqual(self.journal.read(), [])
+
+    def test_replay_compact_moves(self):
+        db_session = self.make_db_session()
+        for record in [(8, 3, 1, 1, 0), (8, 2, 0, 0, 1), (1, 3, 1, 1, 1)]:
+            self.journal.append(*record)
+        self.assertEqual(self.journal.replay(db_session, compact_moves=True), 3)
+        game = db_session.get(Game, 8)
+        self.assertEqual((decode_moves(game.moves, 3), game.first_user_id), ([(1, 1), (0, 0)], 3))
+        # The game stored as rows stays so
+        self.assertIsNone(db_session.get(Game, 1).moves)
+        self.assertEqual(db_session.query(GameUserDecision).filter(GameUserDecision.game_id == 1).count(), 2)
+
+    def test_recover_without_journal(self):
+        db_session = MagicMock()
+        self.assertEqual(MoveJournal.recover(db_session, os.path.join(self.directory.name, "missing")), 0)
+        db_session.commit.assert_not_called()
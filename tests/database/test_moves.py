@@ -0,0 +1,78 @@
+import unittest
+
+from src.database.model.game import Game, GameUserDecision, LeagueSeason
+from src.database.model.user import User
+from src.database.moves import (
+    backfill_moves,
+    decode_moves,
+    decode_moves_bulk,
+    encode_moves,
+    get_cell_width,
+    get_move_heatmaps,
+)
+from tests.database import DatabaseTestMixin
+
+
+class TestMoves(unittest.TestCase):
+    def test_encode_moves(self):
+        self.assertEqual(encode_moves([(1, 1), (0, 2), (2, 0)], 3), bytes([4, 2, 6]))
+        self.assertEqual(encode_moves([(18, 18), (0, 1)], 19), bytes([1, 104, 0, 1]))
+        self.assertEqual(encode_moves([], 3), b"")
+
+    def test_decode_moves(self):
+        for size, moves in [(3, [(1, 1), (0, 2), (2, 0)]), (16, [(15, 15), (0, 0)]), (19, [(18, 18), (7, 3)])]:
+            self.assertEqual(decode_moves(encode_moves(moves, size), size), moves)
+
+    def test_get_cell_width(self):
+        self.assertEqual([get_cell_width(i) for i in (3, 16, 17, 19)], [1, 1, 2, 2])
+
+    def test_decode_moves_bulk(self):
+        for size in (3, 19):
+            games = [[(1, 1), (0, 0), (2, 2)], [], [(0, 1), (size - 1, 2)]]
+            moves = decode_moves_bulk([encode_moves(i, size) for i in games], size)
+            self.assertEqual(moves.game_index.tolist(), [0, 0, 0, 2, 2])
+            self.assertEqual(moves.ply.tolist(), [0, 1, 2, 0, 1])
+            self.assertEqual(moves.x_coordinate.tolist(), [1, 0, 2, 0, size - 1])
+            self.assertEqual(moves.y_coordinate.tolist(), [1, 0, 2, 1, 2])
+
+
+class TestMoveStorage(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        users = [User(nickname=f"User{i}") for i in range(2)]
+        leagues = [LeagueSeason(name="Small"), LeagueSeason(name="Large", field_size=19, win_length=5)]
+        self.db_session.add_all([*users, *leagues])
+        self.db_session.flush()
+        for league, moves in [(leagues[0], [(1, 1), (0, 0), (2, 2)]), (leagues[1], [(9, 9), (18, 0)])]:
+            game = Game(league_season_id=league.id)
+            self.db_session.add(game)
+            self.db_session.flush()
+            self.db_session.add_all(
+                GameUserDecision(game_id=game.id, user_id=users[i % 2].id, coordinate_x=x, coordinate_y=y)
+                for i, (x, y) in enumerate(moves)
+            )
+        self.db_session.add(Game(league_season_id=leagues[0].id))
+        self.db_session.commit()
+        self.users, self.leagues = users, leagues
+
+    def test_backfill_moves(self):
+        self.assertEqual(backfill_moves(self.db_session), 2)
+        games = self.db_session.query(Game).order_by(Game.id).all()
+        self.assertEqual(
+            [(i.moves, i.first_user_id) for i in games],
+            [
+                (bytes([4, 0, 8]), self.users[0].id),
+                (encode_moves([(9, 9), (18, 0)], 19), self.users[0].id),
+                (None, None),
+            ],
+        )
+        self.assertEqual(backfill_moves(self.db_session), 0)
+
+    def test_get_move_heatmaps(self):
+        backfill_moves(self.db_session)
+        heatmaps = get_move_heatmaps(self.db_session)
+        self.assertEqual(sorted(heatmaps), [3, 19])
+        self.assertEqual(heatmaps[3][0].tolist(), [[0, 0, 0], [0, 1, 0], [0, 0, 1]])
+        self.assertEqual(heatmaps[3][1].tolist(), [[1, 0, 0], [0, 0, 0], [0, 0, 0]])
+        self.assertEqual((heatmaps[19][0][9][9], heatmaps[19][1][18][0], heatmaps[19].sum()), (1, 1, 2))
+        self.assertEqual(list(get_move_heatmaps(self.db_session, self.leagues[1].id)), [19])
@@ -0,0 +1,110 @@
+import unittest
+
+from src.database.model.game import Game, GameResult, LeagueSeason, LeagueStanding
+from src.database.model.user import User
+from src.database.rating import (
+    INITIAL_RATING,
+    K_FACTOR,
+    check_league_ratings,
+    get_expected_score,
+    get_rating_changes,
+    rebuild_league_ratings,
+    update_league_ratings,
+)
+from src.database.standing import rebuild_league_standings, update_league_standings
+from tests.database import DatabaseTestMixin
+
+
+class TestRatingChanges(unittest.TestCase):
+    def test_get_expected_score(self):
+        self.assertEqual(get_expected_score(1500, 1500), 0.5)
+        self.assertAlmostEqual(get_expected_score(1900, 1500), 10 / 11)
+        self.assertAlmostEqual(get_expected_score(1500, 1900) + get_expected_score(1900, 1500), 1)
+
+    def test_get_rating_changes(self):
+        self.assertEqual(get_rating_changes([1500, 1500], [1, 2], 1), [K_FACTOR / 2, -K_FACTOR / 2])
+        self.assertEqual(get_rating_changes([1500, 1500], [1, 2], None), [0, 0])
+        # The win of the stronger player changes the ratings less than the win of the weaker one
+        strong_wins = get_rating_changes([1900, 1500], [1, 2], 1)
+        weak_wins = get_rating_changes([1900, 1500], [1, 2], 2)
+        self.assertAlmostEqual(strong_wins[0], K_FACTOR / 11)
+        self.assertAlmostEqual(weak_wins[1], K_FACTOR * 10 / 11)
+        self.assertAlmostEqual(sum(strong_wins), 0)
+        self.assertLess(get_rating_changes([1900, 1500], [1, 2], None)[0], 0)
+
+
+class TestLeagueRating(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.leagues = [LeagueSeason(name="League"), LeagueSeason(name="Other")]
+        self.users = [User(nickname=f"User{i}") for i in range(3)]
+        self.db_session.add_all([*self.leagues, *self.users])
+        self.db_session.flush()
+
+    def play(self, league, players, winner):
+        game = Game(league_season_id=league.id)
+        self.db_session.add(game)
+        self.db_session.flush()
+        game_results = [
+            GameResult(game_id=game.id, user_id=user.id, is_winner=winner is not None and user.id == winner.id)
+            for user in players
+        ]
+        self.db_session.add_all(game_results)
+        update_league_standings(self.db_session, league.id, [i.id for i in players], winner and winner.id)
+        ratings = update_league_ratings(self.db_session, league.id, [i.id for i in players], winner and winner.id)
+        for i in game_results:
+            i.rating = ratings[i.user_id]
+        self.db_session.commit()
+
+    def play_games(self):
+        user0, user1, user2 = self.users
+        self.play(self.leagues[0], [user0, user1], user0)
+        self.play(self.leagues[0], [user0, user1], None)
+        self.play(self.leagues[1], [user1, user2], user2)
+        self.play(self.leagues[0], [user2, user1], user1)
+
+    def get_ratings(self):
+        return {
+            (i.user_id, i.league_season_id): round(i.rating, 6) for i in self.db_session.query(LeagueStanding).all()
+        }
+
+    def test_update_league_ratings(self):
+        self.play_games()
+        user0, user1, user2 = self.users
+        ratings = self.get_ratings()
+        self.assertGreater(ratings[user0.id, self.leagues[0].id], INITIAL_RATING)
+        self.assertEqual(ratings[user2.id, self.leagues[1].id], INITIAL_RATING + K_FACTOR / 2)
+        self.assertEqual(ratings[user1.id, self.leagues[1].id], INITIAL_RATING - K_FACTOR / 2)
+        self.assertAlmostEqual(sum(v for (_, league_id), v in ratings.items() if league_id == self.leagues[0].id), 4500)
+        history = (
+            self.db_session.query(GameResult.rating)
+            .filter(GameResult.user_id == user1.id)
+            .order_by(GameResult.game_id)
+            .all()
+        )
+        self.assertEqual(round(history[0].rating, 6), INITIAL_RATING - K_FACTOR / 2)
+        self.assertEqual(check_league_ratings(self.db_session), [])
+
+    def test_rebuild_league_ratings(self):
+        self.play_games()
+        expected = self.get_ratings()
+        history = [i.rating for i in self.db_session.query(GameResult).order_by(GameResult.id)]
+        self.db_session.query(LeagueStanding).update({LeagueStanding.rating: 1000.0})
+        self.db_session.query(GameResult).filter(GameResult.game_id == 1).update({GameResult.rating: None})
+        self.db_session.commit()
+        self.assertEqual(len(check_league_ratings(self.db_session)), 5)
+        self.assertEqual(len(check_league_ratings(self.db_session, self.leagues[1].id)), 2)
+
+        self.assertEqual(rebuild_league_ratings(self.db_session, self.leagues[1].id, chunk_size=1), 2)
+        self.assertEqual(len(check_league_ratings(self.db_session)), 3)
+        self.assertEqual(rebuild_league_ratings(self.db_session, chunk_size=3), 8)
+
+        self.assertEqual(check_league_ratings(self.db_session), [])
+        self.assertEqual(self.get_ratings(), expected)
+        self.assertEqual([i.rating for i in self.db_session.query(GameResult).order_by(GameResult.id)], history)
+
+    def test_rebuild_league_standings(self):
+        self.play_games()
+        expected = self.get_ratings()
+        rebuild_league_standings(self.db_session)
+        self.assertEqual(self.get_ratings(), expected)
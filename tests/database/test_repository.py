@@ -0,0 +1,350 @@
+import unittest
+from unittest.mock import MagicMock
+
+from sqlalchemy import event
+
+from src.database import delete_session, make_session
+from src.database.model.game import (
+    Game,
+    GameResult,
+    GameUserDecision,
+    LeagueSeason,
+    LeagueStanding,
+)
+from src.database.model.user import User
+from src.database.rating import check_league_ratings
+from src.database.repository import (
+    FinishedGame,
+    MemoryRepository,
+    SqlAlchemyRepository,
+    write_snapshot,
+)
+from src.database.standing import check_league_standings
+from tests.database import DatabaseTestMixin
+
+
+class RepositoryTestMixin(DatabaseTestMixin):
+    # The sessions of the games keep the objects after the commits
+    session_options = {"expire_on_commit": False}
+
+    def setUp(self):
+        super().setUp()
+        self.db_session.add_all(
+            [LeagueSeason(name="Other"), LeagueSeason(name="League"), *(User(nickname=f"User{i}") for i in range(3))]
+        )
+        self.db_session.commit()
+        self.repository = self.make_repository()
+        self.users = self.get_users(self.repository)
+        self.league = self.repository.get_last_league_season()
+
+    @staticmethod
+    def get_users(repository):
+        return [repository.get_user(i.id) for i in repository.get_user_page()]
+
+    def make_repository(self, compact_moves=False):
+        raise NotImplementedError
+
+    def get_other_league(self):
+        raise NotImplementedError
+
+    def play(self, league, players, winner):
+        game_metadata = self.repository.create_game(
+            league, players, [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(players, "xo")]
+        )
+        self.repository.add_decisions(
+            [GameUserDecision(game_id=game_metadata[0].Game.id, user_id=players[0].id, coordinate_x=0, coordinate_y=0)]
+        )
+        for i in game_metadata:
+            i.GameResult.is_winner = i.User == winner
+        self.repository.finish_game(game_metadata, winner.id if winner is not None else None)
+        self.repository.commit()
+        return game_metadata
+
+    def play_games(self):
+        users, other_league = self.users, self.get_other_league()
+        for league, players, winner in [
+            (self.league, [users[0], users[1]], users[0]),
+            (self.league, [users[0], users[1]], users[0]),
+            (other_league, [users[2], users[0]], users[2]),
+            (self.league, [users[1], users[2]], users[1]),
+            (self.league, [users[1], users[2]], None),
+        ]:
+            self.play(league, players, winner)
+
+    def test_add_user(self):
+        self.assertEqual([i.nickname for i in self.users], ["User0", "User1", "User2"])
+        self.repository.delete_user(self.users[1])
+        self.repository.add_user(User(nickname="User3"))
+        self.assertEqual([i.nickname for i in self.repository.get_user_page()], ["User0", "User2", "User3"])
+        self.assertIsNone(self.repository.get_user(self.users[1].id))
+
+    def test_get_user_page(self):
+        self.repository.add_user(User(nickname="Alice"))
+        ids = [i.id for i in self.users]
+        self.assertEqual(self.repository.get_user_page(limit=2), [(ids[0], "User0"), (ids[1], "User1")])
+        self.assertEqual(self.repository.get_user_page(ids[1], 2), [(ids[2], "User2"), (ids[2] + 1, "Alice")])
+        self.assertEqual(
+            self.repository.get_user_page(nickname_prefix="User", exclude_ids=[ids[1]]),
+            [
+                (ids[0], "User0"),
+                (ids[2], "User2"),
+            ],
+        )
+        self.assertEqual(self.repository.get_user_page(ids[0], nickname_prefix="User1"), [(ids[1], "User1")])
+        self.assertEqual(self.repository.get_user_page(nickname_prefix="user"), [])
+        self.assertEqual(self.repository.get_user(ids[2]), self.users[2])
+        self.assertIsNone(self.repository.get_user(100))
+
+    def test_create_game(self):
+        game_metadata = self.play(self.league, self.users[:2], None)
+        self.assertEqual([i.User for i in game_metadata], self.users[:2])
+        self.assertEqual({i.Game.id for i in game_metadata}, {1})
+        self.assertEqual({i.LeagueSeason.name for i in game_metadata}, {"League"})
+        self.assertEqual([i.GameResult.symbol for i in game_metadata], ["x", "o"])
+
+    def test_get_ranking(self):
+        self.play_games()
+        league_id = self.league.id
+        # The players are ordered by rating: User0 beat User1 twice, who won and drew against User2
+        self.assertEqual(
+            [(*i[:6], round(i.rating)) for i in self.repository.get_ranking(league_id)],
+            [("User0", 2, 2, 0, 0, 4, 1531), ("User1", 4, 1, 2, 1, 5, 1487), ("User2", 2, 0, 1, 1, 2, 1483)],
+        )
+        self.assertEqual([i.nickname for i in self.repository.get_ranking(league_id, limit=1)], ["User0"])
+        self.assertEqual(
+            [tuple(i[:6]) for i in self.repository.get_ranking(league_id, self.users[2].id)],
+            [("User2", 2, 0, 1, 1, 2)],
+        )
+
+    def test_get_past_games(self):
+        self.play_games()
+        first_page = self.repository.get_past_games(self.league.id, 1, 2)
+        self.assertEqual([(i.id, i.winner) for i in first_page], [(5, None), (4, "User1"), (2, "User0")])
+        self.assertEqual(sorted(first_page[0].players.split(" vs ")), ["User1", "User2"])
+        second_page = self.repository.get_past_games(self.league.id, 2, 2)
+        self.assertEqual([(i.id, i.winner) for i in second_page], [(2, "User0"), (1, "User0")])
+        self.assertEqual(self.repository.get_past_games(self.league.id, 3, 2), [])
+
+    def test_get_user_game_results(self):
+        self.play_games()
+        game_results = self.repository.get_user_game_results(self.league.id, self.users[0].id)
+        self.assertEqual([(i.game_id, i.is_winner) for i in game_results], [(1, True), (2, True)])
+        self.assertEqual([round(i.rating) for i in game_results], [1516, 1531])
+
+    def test_get_replay(self):
+        self.play_games()
+        users = self.users
+        self.assertEqual(self.repository.get_last_game_id(users[0].id), 3)
+        self.assertEqual(self.repository.get_last_game_id(users[0].id, self.league.id), 2)
+        self.assertIsNone(self.repository.get_last_game_id(100))
+        replay = self.repository.get_replay(3)
+        self.assertEqual((replay.size, replay.moves), (3, [("x", 0, 0)]))
+        self.assertIsNone(self.repository.get_replay(100))
+
+    def test_get_compact_replay(self):
+        self.play_compact()
+        self.assertEqual(self.repository.get_replay(1).moves, [("x", 1, 1), ("o", 0, 2), ("x", 2, 0)])
+
+    def add_finished_games(self):
+        user_ids = [i.id for i in self.get_users(self.repository)]
+        game_ids = self.repository.add_finished_games(
+            self.repository.get_last_league_season(),
+            [
+                FinishedGame([user_ids[0], user_ids[1]], [0, 4, 1, 5, 2], user_ids[0]),
+                FinishedGame([user_ids[2], user_ids[0]], [4], None),
+            ],
+        )
+        self.repository.commit()
+        return user_ids, game_ids
+
+    def test_add_finished_games(self):
+        user_ids, game_ids = self.add_finished_games()
+        self.assertEqual(game_ids, [1, 2])
+        self.assertEqual(
+            self.repository.get_replay(1).moves, [("x", 0, 0), ("o", 1, 1), ("x", 0, 1), ("o", 1, 2), ("x", 0, 2)]
+        )
+        self.assertEqual(self.repository.get_replay(2).moves, [("x", 1, 1)])
+        game_results = self.repository.get_user_game_results(self.league.id, user_ids[0])
+        self.assertEqual(
+            [(i.game_id, i.symbol, i.is_winner, round(i.rating)) for i in game_results],
+            [(1, "x", True, 1516), (2, "o", False, 1515)],
+        )
+        self.assertEqual(
+            [tuple(i[:6]) for i in self.repository.get_ranking(self.league.id)],
+            [("User0", 2, 1, 0, 1, 3), ("User2", 1, 0, 0, 1, 1), ("User1", 1, 0, 1, 0, 1)],
+        )
+
+    def test_add_finished_compact_games(self):
+        self.repository = self.make_repository(compact_moves=True)
+        self.add_finished_games()
+        self.assertEqual(
+            self.repository.get_replay(1).moves, [("x", 0, 0), ("o", 1, 1), ("x", 0, 1), ("o", 1, 2), ("x", 0, 2)]
+        )
+
+    def play_compact(self):
+        self.repository = self.make_repository(compact_moves=True)
+        players = self.get_users(self.repository)[1:]
+        game_metadata = self.repository.create_game(
+            self.repository.get_last_league_season(),
+            players,
+            [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(players, "xo")],
+        )
+        game_id = game_metadata[0].Game.id
+        for i, (x, y) in enumerate([(1, 1), (0, 2), (2, 0)]):
+            self.repository.add_decisions(
+                [GameUserDecision(game_id=game_id, user_id=players[i % 2].id, coordinate_x=x, coordinate_y=y)]
+            )
+            self.repository.commit()
+        self.repository.finish_game(game_metadata, None)
+        self.repository.commit()
+        return players
+
+
+class TestSqlAlchemyRepository(RepositoryTestMixin, unittest.TestCase):
+    def make_repository(self, compact_moves=False):
+        return SqlAlchemyRepository(self.db_session, compact_moves)
+
+    def get_other_league(self):
+        return self.db_session.query(LeagueSeason).filter(LeagueSeason.name == "Other").one()
+
+    def test_create_game_statements(self):
+        statements = []
+        event.listen(self.db_engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+        games = [
+            (self.users[:2], [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(self.users, "xo")])
+            for _ in range(3)
+        ]
+        self.repository.create_game(self.league, *games[0])
+        self.assertEqual(statements, ["INSERT", "INSERT"])
+        statements.clear()
+        game_metadata = self.repository.create_games(self.league, games[1:])
+        self.assertEqual(statements, ["INSERT", "INSERT", "INSERT"])
+        self.assertEqual([[i.Game.id for i in j] for j in game_metadata], [[2, 2], [3, 3]])
+        self.assertEqual(self.db_session.query(GameResult).filter(GameResult.game_id == 3).count(), 2)
+
+    def test_create_games_returning(self):
+        db_session = MagicMock()
+        db_session.bind.dialect.full_returning = True
+        db_session.execute.return_value.scalars.return_value = [7, 8]
+        games = [([user], [GameResult(user_id=user.id, symbol="x")]) for user in self.users[:2]]
+        game_metadata = SqlAlchemyRepository(db_session).create_games(self.league, games)
+        self.assertEqual([j.GameResult.game_id for i in game_metadata for j in i], [7, 8])
+        self.assertEqual(db_session.execute.call_count, 2)
+        db_session.commit.assert_called_once()
+
+    def test_compact_moves(self):
+        players = self.play_compact()
+        game = self.db_session.query(Game).one()
+        self.assertEqual((game.moves, game.first_user_id), (bytes([4, 2, 6]), players[0].id))
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), 0)
+        self.assertEqual((self.repository.moves, self.repository.field_sizes), ({}, {}))
+
+    def test_add_finished_games_transaction(self):
+        user_ids = [i.id for i in self.users]
+        self.repository.add_finished_games(self.league, [FinishedGame(user_ids[:2], [0, 4], None)])
+        # Nothing is saved until the commit
+        self.db_session.rollback()
+        for model in (Game, GameResult, GameUserDecision, LeagueStanding):
+            self.assertEqual(self.db_session.query(model).count(), 0)
+        self.add_finished_games()
+        self.assertEqual(check_league_standings(self.db_session), [])
+        self.assertEqual(check_league_ratings(self.db_session), [])
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), 6)
+
+    def test_finish_order(self):
+        other_session = make_session(self.db_engine)
+        self.addCleanup(delete_session, other_session)
+        other_repository = SqlAlchemyRepository(other_session)
+        users = self.users
+        first_game = self.repository.create_game(
+            self.league, users[:2], [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(users, "xo")]
+        )
+        second_game = other_repository.create_game(
+            other_session.get(LeagueSeason, self.league.id),
+            [other_session.get(User, i.id) for i in users[1:]],
+            [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(users[1:], "xo")],
+        )
+        for game_metadata, winner_id in ((first_game, users[0].id), (second_game, users[1].id)):
+            for i in game_metadata:
+                i.GameResult.is_winner = i.User.id == winner_id
+        # The later game finishes first like the games of the concurrent workers
+        other_repository.finish_game(second_game, users[1].id)
+        other_repository.commit()
+        self.repository.finish_game(first_game, users[0].id)
+        self.repository.commit()
+        self.assertEqual(
+            [(i.id, i.finish_number) for i in self.db_session.query(Game).order_by(Game.id)], [(1, 2), (2, 1)]
+        )
+        self.assertEqual(check_league_ratings(self.db_session), [])
+
+
+class TestMemoryRepository(RepositoryTestMixin, unittest.TestCase):
+    def make_repository(self, compact_moves=False):
+        return MemoryRepository.load(self.db_session, compact_moves=compact_moves)
+
+    def get_other_league(self):
+        return next(i for i in self.repository.league_seasons.values() if i.name == "Other")
+
+    def test_snapshot(self):
+        self.play_games()
+        self.repository.add_user(User(nickname="User3"))
+        self.repository.delete_user(self.users[1])
+        counts = write_snapshot(self.db_session, self.repository.snapshot())
+        self.db_session.commit()
+
+        self.assertEqual(counts["game"], 5)
+        self.assertEqual(counts["game_result"], 10)
+        self.assertEqual(counts["game_user_decision"], 5)
+        self.assertEqual(counts["user"], 1)
+        self.assertEqual(self.db_session.query(GameUserDecision).count(), 5)
+        self.assertEqual(
+            [i.nickname for i in self.db_session.query(User).order_by(User.id)], ["User0", "User2", "User3"]
+        )
+        self.assertEqual(
+            SqlAlchemyRepository(self.db_session).get_ranking(self.league.id),
+            self.repository.get_ranking(self.league.id),
+        )
+        self.assertEqual(check_league_standings(self.db_session), [])
+        self.assertEqual(check_league_ratings(self.db_session), [])
+        loaded = MemoryRepository.load(self.db_session)
+        self.assertEqual(
+            loaded.get_past_games(self.league.id, 1, 10), self.repository.get_past_games(self.league.id, 1, 10)
+        )
+        self.assertEqual(
+            [loaded.get_replay(i) for i in range(1, 6)], [self.repository.get_replay(i) for i in range(1, 6)]
+        )
+
+    def test_snapshots_of_several_repositories(self):
+        other_repository = MemoryRepository.load(self.db_session, with_games=False)
+        self.play_games()
+        users = self.get_users(other_repository)
+        game_metadata = other_repository.create_game(
+            other_repository.get_last_league_season(),
+            users[:2],
+            [GameResult(user_id=user.id, symbol=symbol) for user, symbol in zip(users, "xo")],
+        )
+        for i in game_metadata:
+            i.GameResult.is_winner = i.User == users[0]
+        other_repository.finish_game(game_metadata, users[0].id)
+        self.assertEqual(game_metadata[0].Game.id, 1)
+
+        write_snapshot(self.db_session, self.repository.snapshot())
+        write_snapshot(self.db_session, other_repository.snapshot())
+        self.db_session.commit()
+
+        self.assertEqual([i.id for i in self.db_session.query(Game).order_by(Game.id)], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            [(i.user_id, i.is_winner) for i in self.db_session.query(GameResult).filter(GameResult.game_id == 6)],
+            [(users[0].id, True), (users[1].id, False)],
+        )
+        self.assertEqual(self.db_session.query(LeagueStanding).count(), 5)
+        self.assertEqual(check_league_standings(self.db_session), [])
+
+    def test_compact_moves(self):
+        players = self.play_compact()
+        counts = write_snapshot(self.db_session, self.repository.snapshot())
+        self.db_session.commit()
+
+        self.assertEqual(counts["game_user_decision"], 0)
+        game = self.db_session.query(Game).one()
+        self.assertEqual((game.moves, game.first_user_id), (bytes([4, 2, 6]), players[0].id))
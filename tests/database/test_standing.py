@@ -0,0 +1,76 @@
+import unittest
+
+from src.database.model.game import Game, GameResult, LeagueSeason, LeagueStanding
+from src.database.model.user import User
+from src.database.standing import (
+    check_league_standings,
+    rebuild_league_standings,
+    update_league_standings,
+)
+from tests.database import DatabaseTestMixin
+
+
+class TestLeagueStanding(DatabaseTestMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.leagues = [LeagueSeason(name="League"), LeagueSeason(name="Other")]
+        self.users = [User(nickname=f"User{i}") for i in range(3)]
+        self.db_session.add_all([*self.leagues, *self.users])
+        self.db_session.flush()
+
+    def play(self, league, players, winner):
+        game = Game(league_season_id=league.id)
+        self.db_session.add(game)
+        self.db_session.flush()
+        self.db_session.add_all(
+            [
+                GameResult(game_id=game.id, user_id=user.id, is_winner=winner is not None and user.id == winner.id)
+                for user in players
+            ]
+        )
+        update_league_standings(self.db_session, league.id, [i.id for i in players], winner and winner.id)
+        self.db_session.commit()
+
+    def get_standings(self):
+        return {
+            (i.user_id, i.league_season_id): (i.games, i.wins, i.losses, i.draws, i.points)
+            for i in self.db_session.query(LeagueStanding).all()
+        }
+
+    def test_update_league_standings(self):
+        user0, user1, user2 = self.users
+        self.play(self.leagues[0], [user0, user1], user0)
+        self.play(self.leagues[0], [user0, user1], None)
+        self.play(self.leagues[1], [user1, user2], user2)
+        self.assertEqual(
+            self.get_standings(),
+            {
+                (user0.id, self.leagues[0].id): (2, 1, 0, 1, 3),
+                (user1.id, self.leagues[0].id): (2, 0, 1, 1, 2),
+                (user1.id, self.leagues[1].id): (1, 0, 1, 0, 1),
+                (user2.id, self.leagues[1].id): (1, 1, 0, 0, 2),
+            },
+        )
+        self.assertEqual(check_league_standings(self.db_session), [])
+
+    def test_rebuild_league_standings(self):
+        user0, user1, user2 = self.users
+        self.play(self.leagues[0], [user0, user1], user0)
+        self.play(self.leagues[0], [user1, user2], None)
+        self.play(self.leagues[1], [user1, user2], user1)
+        # Unfinished game is not counted
+        self.db_session.add(GameResult(game_id=1, user_id=user2.id, is_winner=None))
+        expected = self.get_standings()
+        self.db_session.query(LeagueStanding).filter(LeagueStanding.user_id == user0.id).delete()
+        self.db_session.query(LeagueStanding).filter(LeagueStanding.user_id == user1.id).update({"points": 100})
+        self.db_session.commit()
+
+        inconsistencies = check_league_standings(self.db_session, self.leagues[0].id)
+        self.assertEqual(
+            [i[0] for i in inconsistencies], [(user0.id, self.leagues[0].id), (user1.id, self.leagues[0].id)]
+        )
+        self.assertIsNone(inconsistencies[0][1])
+        self.assertEqual(rebuild_league_standings(self.db_session, self.leagues[0].id), 3)
+        self.assertEqual(len(check_league_standings(self.db_session)), 1)
+        self.assertEqual(rebuild_league_standings(self.db_session), 5)
+        self.assertEqual(self.get_standings(), expected)
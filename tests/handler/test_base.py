@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.components.game.controller import Game
+from src.components.main_menu.controller import MainMenu
+from src.components.management.controller import Management
+from src.components.routing import main_menu
+from src.components.utility.controller import Utility
+from src.handler.base import BaseHandler
+from src.handler.model import Handler, HandlerResponse
+
+
+class TestBaseHandler(unittest.TestCase):
+    def setUp(self):
+        self.db_session = MagicMock()
+        self.controllers_registry = [
+            controller(db_session=self.db_session) for controller in (Game, MainMenu, Management, Utility)
+        ]
+
+    def test_executors(self):
+        base_handler = BaseHandler(self.controllers_registry, main_menu)
+        management = self.controllers_registry[2]
+        self.assertEqual(base_handler.executors[Management, "player_list"], management.player_list)
+        # The methods of the dynamic handlers are dispatched by the same table
+        self.assertEqual(base_handler.executors[Management, "player_details"], management.player_details)
+        self.assertNotIn((MainMenu, "metadata"), base_handler.executors)
+        self.assertFalse(any(name.startswith("_") for _, name in base_handler.executors))
+
+    def test_check_routes(self):
+        routes = Handler(name="Main menu", component=MainMenu, method="welcome")
+        routes.add_children(Handler(name="Player table", component=Management, method="player_table"))
+        with self.assertRaisesRegex(AttributeError, "Method player_table"):
+            BaseHandler(self.controllers_registry, routes)
+        with self.assertRaisesRegex(AttributeError, "Component .*Management.* does not exist"):
+            BaseHandler([i for i in self.controllers_registry if not isinstance(i, Management)], main_menu)
+
+    @patch("src.handler.base.click.clear")
+    @patch("src.handler.base.input", side_effect=["1"])
+    def test_run(self, *_):
+        base_handler = BaseHandler(self.controllers_registry, main_menu)
+        ranking_table = MagicMock(return_value=HandlerResponse())
+        base_handler.executors[MainMenu, "ranking_table"] = ranking_table
+        # The next screen is shown by a recursive call, it is stopped by the mock
+        run, base_handler.run = base_handler.run, MagicMock()
+        with patch("src.handler.base.print"):
+            run(main_menu.children)
+        ranking_table.assert_called_once_with(main_menu)
+        self.assertEqual(base_handler.current_handler, main_menu.children[1])
+        base_handler.run.assert_called_once_with(main_menu.children)
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from src.settings import DEFAULT_SETTINGS, get_settings
+
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "settings.ini")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_default_settings(self):
+        self.assertEqual(get_settings(self.path, {}), DEFAULT_SETTINGS)
+
+    def test_config_file_and_environment(self):
+        with open(self.path, "w", encoding="utf-8") as config_file:
+            config_file.write("[database]\ndb_url = sqlite:////tmp/db\ndb_pool = static\ndb_cache_size = 100\n")
+        environment = {
+            "TIC_TAC_TOE_DB_POOL": "null",
+            "TIC_TAC_TOE_DB_ECHO_FLAG": "true",
+            "TIC_TAC_TOE_DB_SYNCHRONOUS": "",
+            "OTHER_DB_POOL": "queue",
+        }
+        settings = get_settings(self.path, environment)
+        self.assertEqual(settings["db_url"], "sqlite:////tmp/db")
+        self.assertEqual(settings["db_pool"], "null")
+        self.assertEqual(settings["db_cache_size"], 100)
+        self.assertIs(settings["db_echo_flag"], True)
+        self.assertEqual(settings["db_synchronous"], "")
+        self.assertEqual(settings["db_mmap_size"], DEFAULT_SETTINGS["db_mmap_size"])
+
+    def test_wrong_integer(self):
+        with self.assertRaises(ValueError):
+            get_settings(self.path, {"TIC_TAC_TOE_DB_POOL_SIZE": "five"})